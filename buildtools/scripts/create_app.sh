@@ -11,6 +11,9 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)"
 # プロジェクトルートに移動
 cd "$SCRIPT_DIR"
 
+# 加工済みスプライトのアセットパックを生成（assets に含めて同梱される）
+python3 tools/build_asset_pack.py
+
 # PyInstallerでアプリケーションをビルド
 pyinstaller --noconfirm --onefile --windowed --clean --name heruheru3_vansurv \
 --hidden-import=colorsys \
@@ -11,6 +11,9 @@ set SCRIPT_DIR=%~dp0..\..\
 REM プロジェクトルートに移動
 cd /d "%SCRIPT_DIR%"
 
+REM 加工済みスプライトのアセットパックを生成（assets に含めて同梱される）
+python tools\build_asset_pack.py
+
 REM PyInstallerでアプリケーションをビルド
 pyinstaller --noconfirm --onefile --windowed --clean --name heruheru3_vansurv ^
 --hidden-import=colorsys ^
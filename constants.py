@@ -4,13 +4,13 @@ SCREEN_HEIGHT = 720
 FPS = 60
 SURVIVAL_TIME = 180
 
-# フレームスキップ・デルタタイム設定
-ENABLE_FRAME_SKIP = True        # フレームスキップの有効/無効
-TARGET_FRAME_TIME = 1000.0 / FPS  # 目標フレーム時間（ミリ秒）
-MAX_FRAME_SKIP = 5              # 最大フレームスキップ数
-MIN_FPS_THRESHOLD = 45          # この値を下回ったら描画最適化を開始
-DELTA_TIME_CAP = 50.0           # デルタタイムの上限（ミリ秒、約3フレーム相当）
-DELTA_TIME_SMOOTHING = 0.1      # デルタタイムスムージング係数（0.0-1.0、小さいほど滑らか）
+# 固定タイムステップ設定
+# ゲームロジックは常に 1 ティック = TARGET_FRAME_TIME で進める（delta_time は常に 1.0）。
+# 描画が遅れた場合は 1 描画フレームで複数ティックを回して追いつき、描画は前ティックとの補間で行う
+ENABLE_FRAME_SKIP = True        # 遅れたときに追加ティックで追いつくか（False なら描画 1 回につき 1 ティック）
+TARGET_FRAME_TIME = 1000.0 / FPS  # 1 ティックの長さ（ミリ秒）
+MAX_FRAME_SKIP = 5              # 1 描画フレームで追加で回すティック数の上限（超えた分は切り捨ててゲームが遅くなる）
+INTERPOLATION_SNAP_DISTANCE = 64  # 1 ティックでこれ以上動いたエンティティは補間しない（ワープ・再配置）
 
 # ワールドサイズ（画面の4倍）
 WORLD_WIDTH = SCREEN_WIDTH * 4
@@ -72,9 +72,9 @@ MAGNET_ITEM_DROP_RATE = 0.001  # 0.1%の確率でマグネットアイテム
 PARTICLE_LIMIT = 200        # これ以上は古いパーティクルから切る（120から500に大幅増加）
 
 # パフォーマンス最適化設定
-FULLSCREEN_FPS_THRESHOLD = 2.5  # この倍率以上でFPS調整
-FULLSCREEN_FPS = 60  # フルスクリーン時の目標FPS（大画面時）
-NORMAL_FPS = 60  # 通常時のFPS
+FULLSCREEN_FPS_THRESHOLD = 2.5  # この倍率以上で描画FPSを下げる（ゲーム速度は固定ティックで維持）
+FULLSCREEN_FPS = 45  # フルスクリーン時の描画目標FPS（大画面時）
+NORMAL_FPS = 60  # 通常時の描画FPS
 PARTICLE_TRIM_TO = 300      # 切るときに残す数（80から300に大幅増加）
 
 # 画面上に存在可能な経験値ジェムの上限
@@ -91,6 +91,22 @@ PARALLEL_PROCESSING_AGGRESSIVE = True   # 積極的並列処理モード
 PARALLEL_MIN_ENTITIES = 1               # 並列処理開始の最小エンティティ数（CPU使用率最大化）
 PARALLEL_MAX_WORKERS = 8                # 最大ワーカー数（8コア対応）
 
+# ジョブシステム設定（常駐ワーカースレッド）
+JOB_SYSTEM_WORKERS = 0                  # ワーカー数（0: CPUコア数と PARALLEL_MAX_WORKERS の小さい方）
+JOB_INLINE_THRESHOLD = 32               # この件数未満のバッチはワーカーに投げずにその場で実行
+
+# 共有メモリ + ワーカープロセスによるエネミー移動（systems/enemy_process_backend.py、オプション）
+# スレッドは GIL で直列化されるため、マルチコア環境で衝突・地形判定をプロセスに分ける
+ENEMY_PROCESS_BACKEND = False           # True でワーカープロセスを使う（F8 で並列処理を切ると停止）
+ENEMY_PROCESS_WORKERS = 0               # ワーカープロセス数（0: CPUコア数と PARALLEL_MAX_WORKERS の小さい方）
+ENEMY_PROCESS_MIN_ENEMIES = 64          # このティックの更新数がこれ未満ならスレッド側で処理
+ENEMY_PROCESS_CAPACITY = 2048           # 共有メモリに確保するエネミー数（超えたらスレッド側で処理）
+ENEMY_PROCESS_TIMEOUT = 2.0             # バリア待ちのタイムアウト（秒）。超えたらバックエンドを無効化
+
+# CPU 計測設定（systems/cpu_metrics.py）
+CPU_METRICS_SMOOTHING = 0.1             # CPU 使用率・メインスレッド負荷の平滑化係数（1.0 で平滑化なし）
+CPU_METRICS_THREAD_SAMPLE_INTERVAL = 1.0  # psutil でスレッド別 CPU 時間を取る間隔（秒）
+
 # パフォーマンス表示設定（F9で切り替え）
 SHOW_PERFORMANCE_STATS = False  # パフォーマンス統計表示のON/OFF
 
@@ -100,6 +116,19 @@ PERFORMANCE_LOG_INTERVAL = 0.5  # ログ出力間隔（秒）
 PERFORMANCE_LOG_FILE = "logs/performance_log.csv"  # ログファイルパス
 PERFORMANCE_LOG_MAX_ENTRIES = 3600  # ログエントリの最大数（1時間分）
 
+# フレーム単位のバイナリログ設定（1 起動につき 1 ファイル、tools/read_frame_log.py で読む）
+ENABLE_FRAME_LOG = True             # 毎フレームの計測値をバイナリログに記録する（パフォーマンスログ有効時のみ）
+FRAME_LOG_MAX_FILES = 10            # ログディレクトリに残すフレームログの最大数（古いものから削除、0 で無制限）
+FRAME_LOG_RING_SIZE = 4096          # 書き込み待ちレコードのリング容量（あふれたら古いものから捨てる）
+FRAME_LOG_FLUSH_INTERVAL = 0.5      # 書き込みスレッドがファイルへ追記する間隔（秒）
+FRAME_LOG_PREFIX = "frames_"        # ログファイル名の接頭辞（ログディレクトリ内）
+FRAME_LOG_EXTENSION = ".vsfl"       # ログファイルの拡張子
+
+# ゾーンプロファイラ設定（F12 / 終了時に Chrome trace_event JSON を書き出す）
+PROFILER_ENABLED = True             # ゾーン計測の有効/無効
+PROFILER_RING_SIZE = 20000          # 保持するゾーン記録の数（約30ゾーン/フレームで10秒強）
+PROFILER_TRACE_FILE = "profile_trace.json"  # 書き出し先（ログディレクトリ内）
+
 # HP自然回復設定
 NATURAL_HEAL_INTERVAL_MS = 2000  # 自然回復の間隔（ミリ秒）
 NATURAL_HEAL_AMOUNT = 0          # 自然回復時の基本回復量（HPサブアイテムレベル分が追加される）
@@ -148,8 +177,65 @@ ENEMY_WALK_SWAY_SPEED = 6.0      # 左右振動の速度
 ENEMY_WALK_ROTATION_AMPLITUDE = 2.0  # 回転振動の振幅（度）
 ENEMY_WALK_ROTATION_SPEED = 5.0  # 回転振動の速度
 
+# エネミーの弾丸
+ENEMY_PROJECTILE_LIFETIME = 3000        # 弾丸の寿命（ミリ秒）
+ENEMY_PROJECTILE_MAX_PER_ENEMY = 5      # 通常エネミー1体あたりの同時弾数（超えたら古い弾から消す、ボスは無制限）
+ENEMY_PROJECTILE_CULL_DISTANCE = 600    # プレイヤーからこの距離（ピクセル）より離れた通常弾は消す
+ENEMY_PROJECTILE_WORLD_MARGIN = 50      # ワールド外にこの距離（ピクセル）出た弾は消す
+
 # パフォーマンス設定
 ENABLE_ENEMY_WALK_ANIMATION = True  # エネミー歩行アニメーションの有効/無効
+ENEMY_FLASH_LEVELS = 8              # ヒットフラッシュの明るさ段階数（描画フレームキャッシュのキー）
+ENEMY_SPRITE_CACHE_LIMIT = 4096     # エネミー描画フレームキャッシュの上限（超えたらクリア）
+ATTACK_ROTATION_STEPS = 24          # 回転する武器（斧・本）の事前回転の分割数（24 = 15度刻み）
+ATTACK_PULSE_PHASE_STEPS = 16       # ガーリック・聖水のリップルアニメーションの1周期あたりのフレーム数
+ATTACK_PULSE_SIZE_RATIO = 1.04      # パルス描画の半径の量子化（この比率刻みのサイズだけを描画する）
+ATTACK_FRAME_CACHE_MAX_PIXELS = 12000000  # 攻撃描画フレームキャッシュの上限ピクセル数（超えたらクリア）
+MINIMAP_REFRESH_HZ = 12             # ミニマップの敵・ジェム・アイテム表示の更新頻度（ボス・プレイヤーは毎フレーム）
+
+# 品質ガバナー設定（systems/quality_governor.py）
+# 直近のフレーム処理時間を描画フレーム予算（1000 / 描画FPS）と比べ、品質段階を上げ下げする
+QUALITY_GOVERNOR_ENABLED = True     # False なら常に段階 0（最高品質）
+QUALITY_WINDOW_FRAMES = 30          # 負荷の判定に使う直近のフレーム数
+QUALITY_DEGRADE_LOAD = 0.90         # 平均処理時間が予算のこの割合を超え続けたら品質を 1 段下げる
+QUALITY_UPGRADE_LOAD = 0.60         # 予算のこの割合を下回り続けたら品質を 1 段上げる
+QUALITY_DEGRADE_FRAMES = 30         # 品質を下げるまでに超過が続くフレーム数
+QUALITY_UPGRADE_FRAMES = 180        # 品質を上げるまでに余裕が続くフレーム数（下げるより慎重に）
+# 品質段階（0 が最高品質）。各段階で使う上限・頻度
+#   particle_limit / particle_trim_to: パーティクル数がこれを超えたら古いものから trim_to 件まで削る
+#   particle_draw_limit / gem_draw_limit: 1 フレームに描画するパーティクル・ジェムの上限
+#   damage_number_density: ダメージ数値を表示するヒットの割合（1.0 で全ヒット、0.0 で表示しない）
+#   ai_interval / offscreen_ai_interval: 画面内・画面外の敵の攻撃処理を何ティックに 1 回行うか
+#     （((敵数の上限, 間隔), ...) の表なら敵数で選ぶ。段階 0 は従来の敵数による間引きと同じ）
+#   enemy_walk_animation: エネミーの歩行アニメーション
+#   minimap_refresh_hz: ミニマップの点の更新頻度
+QUALITY_LEVELS = (
+    {'particle_limit': PARTICLE_LIMIT, 'particle_trim_to': PARTICLE_TRIM_TO, 'particle_draw_limit': 150,
+     'gem_draw_limit': 100, 'damage_number_density': 1.0,
+     'ai_interval': ((100, 1), (150, 4), (float('inf'), 6)), 'offscreen_ai_interval': ((100, 4), (float('inf'), 8)),
+     'enemy_walk_animation': True, 'minimap_refresh_hz': MINIMAP_REFRESH_HZ},
+    {'particle_limit': 160, 'particle_trim_to': 120, 'particle_draw_limit': 120,
+     'gem_draw_limit': 100, 'damage_number_density': 0.5,
+     'ai_interval': ((100, 2), (150, 4), (float('inf'), 6)), 'offscreen_ai_interval': 8,
+     'enemy_walk_animation': True, 'minimap_refresh_hz': 8},
+    {'particle_limit': 120, 'particle_trim_to': 80, 'particle_draw_limit': 80,
+     'gem_draw_limit': 80, 'damage_number_density': 0.25,
+     'ai_interval': ((150, 4), (float('inf'), 6)), 'offscreen_ai_interval': 12,
+     'enemy_walk_animation': False, 'minimap_refresh_hz': 6},
+    {'particle_limit': 80, 'particle_trim_to': 50, 'particle_draw_limit': 50,
+     'gem_draw_limit': 60, 'damage_number_density': 0.0, 'ai_interval': 8, 'offscreen_ai_interval': 16,
+     'enemy_walk_animation': False, 'minimap_refresh_hz': 4},
+)
+
+# 事前加工済みアセットパック（tools/build_asset_pack.py で生成）
+ASSET_PACK_ENABLED = True           # パックがあれば PNG の代わりに使う（無い/古い場合は PNG にフォールバック）
+ASSET_PACK_FILE = 'assets/asset_pack.bin'
+ASSET_PACK_ICON_SIZES = (16, 32, 48)  # パックに含めるアイコンのサイズ
+
+# 起動時の読み込み
+STARTUP_RESIDENT_SECONDS = 30       # スポーンルール上この秒数までに出現しうる敵の画像は開始前に読み込む
+STARTUP_SOUND_NAMES = ('bomb', 'box_break', 'enemy_hurt', 'gem_pickup', 'heal', 'item_drop', 'player_hurt', 'powerup')
+STARTUP_FONT_SIZES = (14, 18, 22, 28, 30, 34, 36, 40, 72)
 
 # 敵同士の回避判定の係数
 # 1.0 = 半径和を閾値（重なり不可）
@@ -166,6 +252,25 @@ ENEMY_SEPARATION_BOSS_PRIORITY = 1.5
 # 分離（separation）処理の有効/無効フラグ（重い場合は False に切り替え）
 ENABLE_ENEMY_SEPARATION = False
 
+# 画面外エネミーの AI LOD（core/ai_lod.py）
+# カメラ + DRAWING_MARGIN の範囲内のエネミーとボスは毎ティック更新する。
+# それより外のエネミーは距離に応じた間隔でラウンドロビンに更新し、間の経過時間をまとめて渡す
+# 通常エネミーは OFFSCREEN_MARGIN の外でリポップされるため、OFFSCREEN_MARGIN <= DRAWING_MARGIN の間は
+# 間引く帯が無く、スケジューラは自動的に無効になる（全員を毎ティック更新する）
+AI_LOD_ENABLED = True
+AI_LOD_TIERS = (                    # (描画範囲の外側からの距離の上限, 更新間隔ティック)
+    (300, 2),
+    (800, 4),
+    (float('inf'), 8),
+)
+AI_LOD_SIMPLE_MOVE_DISTANCE = 300   # 描画範囲からこれ以上離れたエネミーは分離なしの軽量な移動にする
+
+# 追跡エネミー（行動パターン 1・4）のフローフィールド経路探索（core/flow_field.py）
+# プレイヤーのタイルが変わったときだけ作り直し、障害物を回り込む必要があるエネミーだけが経路に従う
+FLOW_FIELD_ENABLED = True
+FLOW_FIELD_RADIUS = 24              # 探索する経路長の上限（タイル数）。これより遠いエネミーは直進
+FLOW_FIELD_NODES_PER_TICK = 800     # 1 ティックに進める探索ノード数（0: その場で最後まで）
+
 # お金・経済システム設定
 MONEY_PER_ENEMY_KILLED = 10         # 敵1体撃破あたりの基本報酬
 MONEY_PER_LEVEL_BONUS = 50          # レベルアップボーナス
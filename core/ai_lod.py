@@ -0,0 +1,98 @@
+"""
+画面外エネミーの AI LOD（更新頻度の段階化）スケジューラ
+
+カメラ + DRAWING_MARGIN の範囲内のエネミー（とボス）は毎ティック通常の移動処理を行う。
+範囲外のエネミーは範囲からの距離で AI_LOD_TIERS の更新間隔を決め、ラウンドロビンの
+バケットに分けて数ティックに 1 回だけ更新する。更新しなかったティックの delta_time は
+エネミーごとに積算し、次の更新でまとめて渡すため平均の移動速度は変わらない。
+AI_LOD_SIMPLE_MOVE_DISTANCE より遠いエネミーは分離なしの軽量な移動（Enemy.move_simple）にする。
+
+通常エネミーは OFFSCREEN_MARGIN より外に出るとリポップで作り直されるため、
+間引きが効くのは OFFSCREEN_MARGIN が DRAWING_MARGIN より大きい場合の帯の中になる。
+帯が無い（OFFSCREEN_MARGIN <= DRAWING_MARGIN）場合はスケジューラを無効にし、距離判定の走査を省く。
+"""
+
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, DRAWING_MARGIN, OFFSCREEN_MARGIN, AI_LOD_ENABLED,
+                       AI_LOD_TIERS, AI_LOD_SIMPLE_MOVE_DISTANCE)
+
+
+class AiLodScheduler:
+    """ティックごとに schedule() を呼び、返された (enemy, delta_time, simple) を更新する"""
+
+    def __init__(self, tiers=AI_LOD_TIERS, simple_distance=AI_LOD_SIMPLE_MOVE_DISTANCE, enabled=AI_LOD_ENABLED,
+                 offscreen_margin=OFFSCREEN_MARGIN):
+        self.tiers = tuple(sorted((float(limit), max(1, int(interval))) for limit, interval in tiers))
+        self.simple_distance = float(simple_distance)
+        # 描画範囲の外にリポップされずに残る帯が無ければ、間引く対象は常に居ない
+        self.enabled = bool(enabled) and offscreen_margin > DRAWING_MARGIN
+        self.tick = 0
+        self._next_bucket = 0
+        # 直近のティックの内訳（毎ティック更新・間引いて更新・今回は更新なし）
+        self.full_count = 0
+        self.reduced_count = 0
+        self.deferred_count = 0
+
+    def _interval(self, distance):
+        for limit, interval in self.tiers:
+            if distance <= limit:
+                return interval
+        return self.tiers[-1][1] if self.tiers else 1
+
+    def schedule(self, enemies, camera_x, camera_y, delta_time=1.0):
+        """このティックに更新するエネミーを [(enemy, delta_time, simple), ...] で返す
+
+        返す delta_time は前回の更新からの積算値。更新しないエネミーは積算だけ進める。
+        """
+        self.tick += 1
+        if not self.enabled:
+            # 全員を毎ティック通常更新する（距離判定は不要）
+            self.full_count = len(enemies)
+            self.reduced_count = 0
+            self.deferred_count = 0
+            return [(enemy, delta_time, False) for enemy in enemies]
+
+        left = camera_x - DRAWING_MARGIN
+        right = camera_x + SCREEN_WIDTH + DRAWING_MARGIN
+        top = camera_y - DRAWING_MARGIN
+        bottom = camera_y + SCREEN_HEIGHT + DRAWING_MARGIN
+        tick = self.tick
+        updates = []
+        reduced = 0
+        deferred = 0
+
+        for enemy in enemies:
+            pending = getattr(enemy, 'ai_lod_pending', 0.0) + delta_time
+            x = enemy.x
+            y = enemy.y
+            # 描画範囲の外側からの距離（範囲内なら 0 以下）
+            distance = max(left - x, x - right, top - y, y - bottom)
+            if distance <= 0.0 or getattr(enemy, 'is_boss', False):
+                enemy.ai_lod_pending = 0.0
+                updates.append((enemy, pending, False))
+                continue
+
+            bucket = getattr(enemy, 'ai_lod_bucket', None)
+            if bucket is None:
+                # 出現順にバケットを割り当て、同じティックに更新が集中しないようにする
+                bucket = enemy.ai_lod_bucket = self._next_bucket
+                self._next_bucket += 1
+            if (tick + bucket) % self._interval(distance) == 0:
+                enemy.ai_lod_pending = 0.0
+                updates.append((enemy, pending, distance > self.simple_distance))
+                reduced += 1
+            else:
+                enemy.ai_lod_pending = pending
+                deferred += 1
+
+        self.full_count = len(updates) - reduced
+        self.reduced_count = reduced
+        self.deferred_count = deferred
+        return updates
+
+    def publish_stats(self, stats):
+        stats['ai_lod_full'] = self.full_count
+        stats['ai_lod_reduced'] = self.reduced_count
+        stats['ai_lod_deferred'] = self.deferred_count
+
+
+__all__ = ['AiLodScheduler']
@@ -5,7 +5,9 @@
 
 import pygame
 from constants import INVINCIBLE_MS
-from effects.particles import PlayerHurtParticle, HurtFlash, DamageNumber, AvoidanceParticle
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+from systems import game_clock
+from effects.particles import PlayerHurtParticle, HurtFlash, DamageNumber, AvoidanceParticle, emit_particles
 from core.game_logic import handle_enemy_death
 from core.game_utils import calculate_distance
 
@@ -33,7 +35,7 @@ def check_player_enemy_collision(player, enemies, particles, current_time):
             player.set_normal_invincible()
             
             # ヒットエフェクト
-            particles.append(PlayerHurtParticle(player.x, player.y))
+            emit_particles(particles, 'hurt', player.x, player.y)
             particles.append(HurtFlash())
             # サウンド再生（プレイヤー被弾）
             try:
@@ -47,104 +49,158 @@ def check_player_enemy_collision(player, enemies, particles, current_time):
     return player_hit
 
 
+def broadphase_attack_enemy_pairs(attacks, enemies, attack_radii, enemy_radii):
+    """攻撃と敵のブロードフェーズ（矩形判定）
+
+    |dx| <= r かつ |dy| <= r（r = 攻撃半径 + 敵半径）を満たす候補ペアを
+    (攻撃インデックス, 敵インデックス) のリストで返す。
+    並びは攻撃順、同じ攻撃内では敵リスト順（従来の二重ループと同じ順序）。
+    判定は境界を含むため、厳密な判定はナローフェーズで行うこと。
+    """
+    if not attacks or not enemies:
+        return []
+
+    if NUMPY_AVAILABLE:
+        try:
+            ax = np.fromiter((a.x for a in attacks), dtype='f8', count=len(attacks))
+            ay = np.fromiter((a.y for a in attacks), dtype='f8', count=len(attacks))
+            ar = np.asarray(attack_radii, dtype='f8')
+            ex = np.fromiter((e.x for e in enemies), dtype='f8', count=len(enemies))
+            ey = np.fromiter((e.y for e in enemies), dtype='f8', count=len(enemies))
+            er = np.asarray(enemy_radii, dtype='f8')
+
+            r = ar[:, None] + er[None, :]
+            mask = np.abs(ex[None, :] - ax[:, None]) <= r
+            mask &= np.abs(ey[None, :] - ay[:, None]) <= r
+            attack_idx, enemy_idx = np.nonzero(mask)
+            return list(zip(attack_idx.tolist(), enemy_idx.tolist()))
+        except Exception:
+            pass
+
+    # numpy が無い場合のフォールバック
+    pairs = []
+    enemy_pos = [(e.x, e.y, er) for e, er in zip(enemies, enemy_radii)]
+    for ai, attack in enumerate(attacks):
+        ax = attack.x
+        ay = attack.y
+        ar = attack_radii[ai]
+        for ei, (ex, ey, er) in enumerate(enemy_pos):
+            r = ar + er
+            if abs(ex - ax) <= r and abs(ey - ay) <= r:
+                pairs.append((ai, ei))
+    return pairs
+
+
 def check_attack_enemy_collision(attacks, enemies, particles, damage_stats, player):
     """攻撃と敵の衝突判定"""
-    hits_processed = []
+    hits_processed = set()
     
-    for attack in attacks[:]:
-        if not hasattr(attack, 'x') or not hasattr(attack, 'y'):
+    live_attacks = [a for a in attacks if hasattr(a, 'x') and hasattr(a, 'y')]
+    enemies_snapshot = enemies[:]
+    # 攻撃範囲の設定
+    attack_ranges = [getattr(a, 'range', 30) for a in live_attacks]
+    candidate_pairs = broadphase_attack_enemy_pairs(live_attacks, enemies_snapshot,
+                                                    attack_ranges, [0] * len(enemies_snapshot))
+    consumed_attacks = set()
+    dead_enemies = set()
+    
+    for ai, ei in candidate_pairs:
+        if ai in consumed_attacks:
+            continue
+        attack = live_attacks[ai]
+        enemy = enemies_snapshot[ei]
+        # 既に倒された敵は無視
+        if id(enemy) in dead_enemies:
             continue
-            
-        # 攻撃範囲の設定
-        attack_range = getattr(attack, 'range', 30)
         
-        for enemy in enemies[:]:
-            distance = calculate_distance(attack.x, attack.y, enemy.x, enemy.y)
-            
-            if distance <= attack_range:
-                # 同じ攻撃で同じ敵への重複ヒットを防ぐ
-                hit_key = (id(attack), id(enemy))
-                if hit_key in hits_processed:
-                    continue
-                hits_processed.append(hit_key)
-                
-                # ダメージ計算
-                damage = getattr(attack, 'damage', 10)
-                
-                # 回避判定（敵が回避スキルを持つ場合）
-                if hasattr(enemy, 'avoidance') and enemy.avoidance > 0:
-                    import random
-                    if random.random() < enemy.avoidance:
-                        # 回避エフェクト
-                        particles.append(AvoidanceParticle(enemy.x, enemy.y))
-                        continue
-                
-                # ダメージ適用
-                enemy.hp -= damage
-                # サウンド再生（エネミー被弾）
-                try:
-                    from core.audio import audio
-                    audio.play_sound('enemy_hurt')
-                except Exception:
-                    pass
-                
-                # ダメージ統計更新
-                attack_type = getattr(attack, 'type', 'unknown')
-                if attack_type not in damage_stats:
-                    damage_stats[attack_type] = 0
-                damage_stats[attack_type] += damage
-                
-                # ダメージエフェクト
-                particles.append(DamageNumber(enemy.x, enemy.y, damage))
-                
-                # ガーリック効果の回復処理
-                try:
-                    if attack_type == "garlic":
-                        current_time = pygame.time.get_ticks()
-                        if not hasattr(attack, 'last_garlic_heal_time'):
-                            attack.last_garlic_heal_time = 0
-                        
-                        if current_time - attack.last_garlic_heal_time > 3000:  # 3秒間隔
-                            # Try to use player.heal if available so we get actual healed amount
-                            try:
-                                healed = player.heal(1, "garlic")
-                            except Exception:
-                                # Fallback: direct increment
-                                try:
-                                    old = getattr(player, 'hp', 0)
-                                    player.hp = min(100, old + 1)
-                                    healed = player.hp - old
-                                except Exception:
-                                    healed = 0
-
-                            attack.last_garlic_heal_time = current_time
-                            # サウンド再生（回復が発生した場合のみ）
-                            try:
-                                if healed > 0:
-                                    from core.audio import audio
-                                    audio.play_sound('heal')
-                            except Exception:
-                                pass
-                except Exception:
-                    pass
-                
-                # ヒット時の小エフェクト
-                try:
-                    if hasattr(enemy, 'on_hit') and callable(enemy.on_hit):
-                        enemy.on_hit()
-                except Exception:
-                    pass
-                
-                # 敵死亡チェック
-                handle_enemy_death(enemy, enemies, [], [], particles, damage_stats,
-                                 player.x, player.y, player)
+        distance = calculate_distance(attack.x, attack.y, enemy.x, enemy.y)
+        if distance > attack_ranges[ai]:
+            continue
+        
+        # 同じ攻撃で同じ敵への重複ヒットを防ぐ
+        hit_key = (id(attack), id(enemy))
+        if hit_key in hits_processed:
+            continue
+        hits_processed.add(hit_key)
+        
+        # ダメージ計算
+        damage = getattr(attack, 'damage', 10)
+        
+        # 回避判定（敵が回避スキルを持つ場合）
+        if hasattr(enemy, 'avoidance') and enemy.avoidance > 0:
+            import random
+            if random.random() < enemy.avoidance:
+                # 回避エフェクト
+                particles.append(AvoidanceParticle(enemy.x, enemy.y))
+                continue
+        
+        # ダメージ適用
+        enemy.hp -= damage
+        # サウンド再生（エネミー被弾）
+        try:
+            from core.audio import audio
+            audio.play_sound('enemy_hurt')
+        except Exception:
+            pass
+        
+        # ダメージ統計更新
+        attack_type = getattr(attack, 'type', 'unknown')
+        if attack_type not in damage_stats:
+            damage_stats[attack_type] = 0
+        damage_stats[attack_type] += damage
+        
+        # ダメージエフェクト
+        particles.append(DamageNumber(enemy.x, enemy.y, damage))
+        
+        # ガーリック効果の回復処理
+        try:
+            if attack_type == "garlic":
+                current_time = game_clock.get_ticks()
+                if not hasattr(attack, 'last_garlic_heal_time'):
+                    attack.last_garlic_heal_time = 0
                 
-                # ヒット時に消費する攻撃の処理
-                consumable_on_hit = {"magic_wand"}
-                if attack_type in consumable_on_hit:
-                    if attack in attacks:
-                        attacks.remove(attack)
-                    break
+                if current_time - attack.last_garlic_heal_time > 3000:  # 3秒間隔
+                    # Try to use player.heal if available so we get actual healed amount
+                    try:
+                        healed = player.heal(1, "garlic")
+                    except Exception:
+                        # Fallback: direct increment
+                        try:
+                            old = getattr(player, 'hp', 0)
+                            player.hp = min(100, old + 1)
+                            healed = player.hp - old
+                        except Exception:
+                            healed = 0
+
+                    attack.last_garlic_heal_time = current_time
+                    # サウンド再生（回復が発生した場合のみ）
+                    try:
+                        if healed > 0:
+                            from core.audio import audio
+                            audio.play_sound('heal')
+                    except Exception:
+                        pass
+        except Exception:
+            pass
+        
+        # ヒット時の小エフェクト
+        try:
+            if hasattr(enemy, 'on_hit') and callable(enemy.on_hit):
+                enemy.on_hit()
+        except Exception:
+            pass
+        
+        # 敵死亡チェック
+        if handle_enemy_death(enemy, enemies, [], [], particles, damage_stats,
+                              player.x, player.y, player):
+            dead_enemies.add(id(enemy))
+        
+        # ヒット時に消費する攻撃の処理
+        consumable_on_hit = {"magic_wand"}
+        if attack_type in consumable_on_hit:
+            if attack in attacks:
+                attacks.remove(attack)
+            consumed_attacks.add(ai)
 
 
 def check_circle_rect_collision(circle_x, circle_y, radius, rect_x, rect_y, rect_width, rect_height):
@@ -8,10 +8,34 @@ import csv
 import time
 from constants import *
 from utils.file_paths import get_resource_path
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+from core.enemy_pool import pooled_attribute
+from core.enemy_projectiles import get_enemy_projectiles, next_owner_id
+from core.flow_field import get_flow_field
+from systems import asset_pack
+from systems import game_clock
 
 class Enemy:
+    # EnemyPool 登録時は移動関連フィールドがプール配列を参照するビューになる
+    # （x / y は移動・衝突判定で頻繁に読むため通常の属性のまま。プールは compute_steps() で集める）
+    _pool = None
+    _slot = -1
+    base_speed = pooled_attribute('base_speed')
+    behavior_type = pooled_attribute('behavior_type')
+    velocity_x = pooled_attribute('velocity_x')
+    velocity_y = pooled_attribute('velocity_y')
+    initial_direction = pooled_attribute('initial_direction')
+    target_distance = pooled_attribute('target_distance')
+    knockback_timer = pooled_attribute('knockback_timer')
+    noclip_mode = pooled_attribute('noclip_mode')
+
     # 画像キャッシュ（クラス変数）
     _image_cache = {}
+
+    # 描画フレームキャッシュ: (image, facing_right, image_size, foot_offset_y, flash_level) -> (surface, dy)
+    _sprite_frame_cache = {}
+    # pygame.draw.circle の半径ごとの塗りピクセル（オーラ生成用）
+    _circle_stamps = {}
     
     # エネミーステータスのキャッシュ
     _enemy_stats = {}
@@ -20,6 +44,9 @@ class Enemy:
     # ボス設定のキャッシュ
     _boss_stats = {}
     _boss_stats_loaded = False
+
+    # 歩行アニメーションの有効/無効（品質ガバナーが負荷に応じて切り替える）
+    walk_animation = True
     
     @classmethod
     def load_enemy_stats(cls):
@@ -145,6 +172,20 @@ class Enemy:
             # print(f"[DEBUG] Cache hit for key: {cache_key}")
             return cls._image_cache[cache_key]
 
+        # 事前加工済みのアセットパックにあればそれを使う（HSV調整・反転・オーラ生成済み）
+        packed = asset_pack.get_surface(f"enemy/{cache_key}/left")
+        if packed is not None:
+            entry = {
+                'left': packed,
+                'right': asset_pack.get_surface(f"enemy/{cache_key}/right") or pygame.transform.flip(packed, True, False),
+                'size': image_size
+            }
+            aura = asset_pack.get_surface(f"enemy/{cache_key}/aura")
+            if aura is not None:
+                entry['aura'] = aura
+            cls._image_cache[cache_key] = entry
+            return entry
+
         image_path = get_resource_path(os.path.join("assets", "character", "enemy", image_file))
         try:
             if not os.path.exists(image_path):
@@ -183,12 +224,9 @@ class Enemy:
                         (0, aura_thickness),
                         (aura_thickness, aura_thickness)
                     ]
-                    for dx, dy in offsets:
-                        outline_pos = (center_offset + dx, center_offset + dy)
-                        for point in alpha_mask.outline():
-                            x, y = point
-                            # 小さい円でアウトラインを描画（1px）
-                            pygame.draw.circle(aura_surface, red_color, (x + outline_pos[0], y + outline_pos[1]), 1)
+                    # アウトライン点を8方向にずらした位置に小さい円（1px）を描く
+                    cls._stamp_outline(aura_surface, alpha_mask.outline(), offsets, red_color,
+                                       (center_offset, center_offset))
 
                     cls._image_cache[cache_key]['aura'] = aura_surface
             except Exception:
@@ -205,6 +243,60 @@ class Enemy:
             cls._image_cache[cache_key] = None
             return None
     
+    @classmethod
+    def _circle_stamp(cls, radius=1):
+        """pygame.draw.circle(radius) が塗るピクセルの相対座標（実際に描いて求める）"""
+        cache = cls._circle_stamps
+        stamp = cache.get(radius)
+        if stamp is None:
+            size = radius * 2 + 3
+            c = radius + 1
+            probe = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(probe, (255, 255, 255, 255), (c, c), radius)
+            stamp = [(x - c, y - c) for x in range(size) for y in range(size) if probe.get_at((x, y)).a]
+            cache[radius] = stamp
+        return stamp
+
+    @classmethod
+    def _stamp_outline(cls, surface, points, offsets, color, origin, radius=1):
+        """各アウトライン点を offsets だけずらして半径 radius の円を描いたのと同じ結果を書き込む
+
+        点集合のマスクをカーネル（offsets × 円の形）で膨張させ、該当ピクセルを color で塗る。
+        """
+        if not points:
+            return
+        ox, oy = origin
+        if not NUMPY_AVAILABLE:
+            for dx, dy in offsets:
+                for x, y in points:
+                    pygame.draw.circle(surface, color, (x + ox + dx, y + oy + dy), radius)
+            return
+
+        width, height = surface.get_size()
+        seeds = np.zeros((width, height), dtype=bool)
+        pts = np.asarray(points, dtype=np.int64)
+        px = pts[:, 0] + ox
+        py = pts[:, 1] + oy
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        seeds[px[inside], py[inside]] = True
+
+        kernel = {(dx + sx, dy + sy) for dx, dy in offsets for sx, sy in cls._circle_stamp(radius)}
+        hit = np.zeros_like(seeds)
+        for kx, ky in kernel:
+            # seeds を (kx, ky) ずらして OR（はみ出す部分は切り捨て）
+            src_x0, src_x1 = max(0, -kx), min(width, width - kx)
+            src_y0, src_y1 = max(0, -ky), min(height, height - ky)
+            if src_x0 >= src_x1 or src_y0 >= src_y1:
+                continue
+            hit[src_x0 + kx:src_x1 + kx, src_y0 + ky:src_y1 + ky] |= seeds[src_x0:src_x1, src_y0:src_y1]
+
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[hit] = color[:3]
+        del pixels
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha[hit] = color[3] if len(color) > 3 else 255
+        del alpha
+
     @classmethod
     def _adjust_hsv(cls, surface, hue_shift=0.0, saturation_factor=1.0, value_factor=1.0):
         """画像のHSV値を調整する
@@ -216,7 +308,67 @@ class Enemy:
         """
         if hue_shift == 0.0 and saturation_factor == 1.0 and value_factor == 1.0:
             return surface  # 調整不要
-        
+
+        if NUMPY_AVAILABLE:
+            try:
+                return cls._adjust_hsv_array(surface, hue_shift, saturation_factor, value_factor)
+            except Exception:
+                pass  # 配列アクセスできないサーフェスはピクセル単位の処理にフォールバック
+        return cls._adjust_hsv_per_pixel(surface, hue_shift, saturation_factor, value_factor)
+
+    @classmethod
+    def _adjust_hsv_array(cls, surface, hue_shift, saturation_factor, value_factor):
+        """_adjust_hsv の配列版（colorsys と同じ演算順で全ピクセルを一括変換）"""
+        adjusted_surface = surface.copy()
+        rgb = pygame.surfarray.array3d(surface).astype(np.float64) / 255.0
+        alpha = pygame.surfarray.array_alpha(surface)
+        r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+        # RGB -> HSV（colorsys.rgb_to_hsv と同じ）
+        maxc = np.maximum(np.maximum(r, g), b)
+        minc = np.minimum(np.minimum(r, g), b)
+        rangec = maxc - minc
+        gray = minc == maxc
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.where(gray, 0.0, rangec / maxc)
+            rc = (maxc - r) / rangec
+            gc = (maxc - g) / rangec
+            bc = (maxc - b) / rangec
+        h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+        h = np.where(gray, 0.0, (h / 6.0) % 1.0)
+        v = maxc
+
+        # HSV 値を調整
+        h = (h + hue_shift) % 1.0
+        s = np.clip(s * saturation_factor, 0.0, 1.0)
+        v = np.clip(v * value_factor, 0.0, 1.0)
+
+        # HSV -> RGB（colorsys.hsv_to_rgb と同じ）
+        i = (h * 6.0).astype(np.int64)
+        f = (h * 6.0) - i
+        p = v * (1.0 - s)
+        q = v * (1.0 - s * f)
+        t = v * (1.0 - s * (1.0 - f))
+        i = i % 6
+        r_new = np.select([i == 0, i == 1, i == 2, i == 3, i == 4], [v, q, p, p, t], v)
+        g_new = np.select([i == 0, i == 1, i == 2, i == 3, i == 4], [t, v, v, q, p], p)
+        b_new = np.select([i == 0, i == 1, i == 2, i == 3, i == 4], [p, p, t, v, v], q)
+        achromatic = s == 0.0
+        r_new = np.where(achromatic, v, r_new)
+        g_new = np.where(achromatic, v, g_new)
+        b_new = np.where(achromatic, v, b_new)
+
+        # 0-255 に変換（int() と同じく切り捨て）して不透明ピクセルだけ書き戻す
+        result = np.stack([r_new, g_new, b_new], axis=-1) * 255
+        visible = alpha != 0
+        pixels = pygame.surfarray.pixels3d(adjusted_surface)
+        pixels[visible] = result[visible].astype(np.uint8)
+        del pixels  # サーフェスのロックを解除
+        return adjusted_surface
+
+    @classmethod
+    def _adjust_hsv_per_pixel(cls, surface, hue_shift, saturation_factor, value_factor):
+        """_adjust_hsv のピクセル単位版（numpy が無い場合のフォールバック）"""
         # 新しいサーフェスを作成
         adjusted_surface = surface.copy()
         
@@ -331,7 +483,7 @@ class Enemy:
         self.target_distance = 200  # 距離保持タイプ用の目標距離（倍に拡大）
         self.attack_cooldown = 0  # 攻撃クールダウン（ミリ秒）
         self.last_attack_time = 0  # 最後の攻撃時刻
-        self.projectiles = []  # 敵が発射した弾丸
+        self.projectile_owner_id = next_owner_id()  # 弾丸ストアでの発射元番号（攻撃のヒット記録のキーにも使う）
         
         # 跳ね返りタイプ（タイプ2）用の変数
         self.velocity_x = 0  # X方向の速度
@@ -339,7 +491,7 @@ class Enemy:
         self.bounces_remaining = 5  # 残り跳ね返り回数（無限にしたい場合は大きな値）
         
         # 生存時間管理
-        self.spawn_time = pygame.time.get_ticks()  # 生成時刻
+        self.spawn_time = game_clock.get_ticks()  # 生成時刻
         
         # 歩行アニメーション用変数
         self.animation_time = 0.0  # アニメーション用タイマー
@@ -429,18 +581,8 @@ class Enemy:
     
     def _is_position_blocked(self, x, y, stage_map):
         """指定座標が障害物でブロックされているかチェック"""
-        # エネミーの四隅をチェック
-        corners = [
-            (x - self.size//2, y - self.size//2),
-            (x + self.size//2, y - self.size//2),
-            (x - self.size//2, y + self.size//2),
-            (x + self.size//2, y + self.size//2),
-        ]
-        
-        for corner_x, corner_y in corners:
-            if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                return True
-        return False
+        # エネミーの矩形を障害物マスクで判定
+        return stage_map.is_entity_blocked(x, y, self.size)
 
     def setup_enemy_stats(self):
         # ボスの場合はボス設定から読み込み
@@ -686,24 +828,28 @@ class Enemy:
             if self.knockback_cooldown < 0:
                 self.knockback_cooldown = 0
 
-    def move(self, player, camera_x=0, camera_y=0, map_loader=None, enemies=None, delta_time=1.0):
-        """行動パターンに応じた移動処理"""
-        # ノックバック中のみ通常の移動を無効にする（クールダウン中は移動可能）
-        if self.knockback_timer > 0:
-            return
-        
-        # 移動前の位置を記録
-        start_pos = (self.x, self.y)
-            
-        new_x, new_y = self.x, self.y
-        
+    def _chase_angle(self, player):
+        """追跡の進行方向（回り込みが必要な位置ならフローフィールドの次のタイルへ、それ以外はプレイヤーへ）"""
+        target = get_flow_field().target_at(self.x, self.y)
+        if target is not None:
+            return math.atan2(target[1] - self.y, target[0] - self.x)
+        return math.atan2(player.y - self.y, player.x - self.x)
+
+    def _movement_step(self, player, delta_time=1.0):
+        """行動パターンに応じた 1 回分の移動量 (dx, dy)
+
+        EnemyPool で一括計算済みの移動量があればそれを使う（delta_time に合わせて伸縮される）。
+        """
+        step = self._pool.take_step(self._slot, delta_time) if self._pool is not None else None
+        if step is not None:
+            return step
+
         if self.behavior_type == 1:
-            # 1. プレイヤーに寄ってくる（追跡）
-            angle = math.atan2(player.y - self.y, player.x - self.x)
-            new_x = self.x + math.cos(angle) * self.base_speed * delta_time
-            new_y = self.y + math.sin(angle) * self.base_speed * delta_time
-            
-        elif self.behavior_type == 2:
+            # 1. プレイヤーに寄ってくる（追跡、障害物はフローフィールドで回り込む）
+            angle = self._chase_angle(player)
+            return math.cos(angle) * self.base_speed * delta_time, math.sin(angle) * self.base_speed * delta_time
+
+        if self.behavior_type == 2:
             # 2. 直進タイプ（プレイヤー方向へ一直線に進み、画面外に出ていく）
             # ここでは跳ね返りや地形反転を行わず、軽量に直進させる
             if self.initial_direction is None or self.noclip_mode:
@@ -713,47 +859,87 @@ class Enemy:
                 self.velocity_y = math.sin(self.initial_direction) * self.base_speed
 
             # 速度ベクトルによる移動（反転処理は行わない）（delta_timeを適用）
-            new_x = self.x + self.velocity_x * delta_time
-            new_y = self.y + self.velocity_y * delta_time
-            
-        elif self.behavior_type == 3:
+            return self.velocity_x * delta_time, self.velocity_y * delta_time
+
+        if self.behavior_type == 3:
             # 3. プレイヤーから一定の距離を保ち、魔法の杖のような弾を発射する
             distance_to_player = math.hypot(player.x - self.x, player.y - self.y)
-            
+
             if distance_to_player < self.target_distance - 20:
                 # プレイヤーに近すぎる場合は離れる（許容範囲も倍に）
                 angle = math.atan2(self.y - player.y, self.x - player.x)  # プレイヤーから離れる方向
-                new_x = self.x + math.cos(angle) * self.base_speed * delta_time
-                new_y = self.y + math.sin(angle) * self.base_speed * delta_time
-            elif distance_to_player > self.target_distance + 20:
+                return math.cos(angle) * self.base_speed * delta_time, math.sin(angle) * self.base_speed * delta_time
+            if distance_to_player > self.target_distance + 20:
                 # プレイヤーから遠すぎる場合は近づく（許容範囲も倍に）
                 angle = math.atan2(player.y - self.y, player.x - self.x)  # プレイヤーに向かう方向
-                new_x = self.x + math.cos(angle) * self.base_speed * delta_time
-                new_y = self.y + math.sin(angle) * self.base_speed * delta_time
+                return math.cos(angle) * self.base_speed * delta_time, math.sin(angle) * self.base_speed * delta_time
             # 適切な距離の場合は移動しない
-            
-        elif self.behavior_type == 4:
+            return 0.0, 0.0
+
+        if self.behavior_type == 4:
             # 4. プレイヤーに近づきながら射撃攻撃
-            angle = math.atan2(player.y - self.y, player.x - self.x)
-            new_x = self.x + math.cos(angle) * self.base_speed * delta_time
-            new_y = self.y + math.sin(angle) * self.base_speed * delta_time
+            angle = self._chase_angle(player)
+            return math.cos(angle) * self.base_speed * delta_time, math.sin(angle) * self.base_speed * delta_time
+
+        return 0.0, 0.0
+
+    def move(self, player, camera_x=0, camera_y=0, map_loader=None, enemies=None, delta_time=1.0, spatial_index=None):
+        """行動パターンに応じた移動処理
+
+        spatial_index（core.spatial_hash.SpatialHash）が渡された場合は、
+        enemies の代わりにグリッドから近傍を取得する。
+        """
+        # ノックバック中のみ通常の移動を無効にする（クールダウン中は移動可能）
+        if self.knockback_timer > 0:
+            return
         
-        # 敵同士の衝突回避ヘルパー
-        def _would_collide_with_others(px, py, enemies_list):
-            if not enemies_list:
-                return False
-            for other in enemies_list:
+        # 移動前の位置を記録
+        start_x = self.x
+        start_y = self.y
+        start_pos = (start_x, start_y)
+
+        # 行動パターンに応じた移動先
+        step_x, step_y = self._movement_step(player, delta_time)
+        new_x = start_x + step_x
+        new_y = start_y + step_y
+
+        # 近傍エネミーを一度だけ取得し、分離・X/Yフォールバック・脱出判定で共通に使う
+        if spatial_index is not None:
+            # このフレームで動きうる距離（移動量 + 分離の押し量 + 脱出量 + 他エネミーの同時移動分）
+            step = math.hypot(new_x - start_x, new_y - start_y)
+            reach = step + self.base_speed * max(1.0, delta_time) * 2.0 + 4.0
+            neighbors = spatial_index.query_neighbors(self, reach)
+        else:
+            neighbors = enemies
+
+        # 近傍の位置とサイズは自分の移動中には変わらないため、(x, y, size, is_boss) をローカルのタプルに
+        # 一度だけ読み出し、衝突判定のループで属性を何度も引かないようにする
+        others = []
+        if neighbors:
+            for other in neighbors:
                 if other is self:
                     continue
                 # 同期的に削除対象や無効なエネミーは無視
-                if not hasattr(other, 'x') or not hasattr(other, 'y'):
+                other_x = getattr(other, 'x', None)
+                other_y = getattr(other, 'y', None)
+                if other_x is None or other_y is None:
                     continue
+                others.append((other_x, other_y, getattr(other, 'size', 0), getattr(other, 'is_boss', False)))
+        neighbors = others
+
+        from constants import ENEMY_COLLISION_SEPARATION_FACTOR
+        collision_factor = float(ENEMY_COLLISION_SEPARATION_FACTOR)
+        own_size = self.size
+
+        # 敵同士の衝突回避ヘルパー（enemies_list は上の (x, y, size, is_boss) のリスト）
+        def _would_collide_with_others(px, py, enemies_list):
+            if not enemies_list:
+                return False
+            for other_x, other_y, other_size, _ in enemies_list:
                 # 距離で単純判定（中心間距離 < 半径和 * factor）
-                from constants import ENEMY_COLLISION_SEPARATION_FACTOR
-                factor = float(ENEMY_COLLISION_SEPARATION_FACTOR)
-                min_dist = (self.size + getattr(other, 'size', 0)) * factor
-                dx = px - other.x
-                dy = py - other.y
+                min_dist = (own_size + other_size) * collision_factor
+                dx = px - other_x
+                dy = py - other_y
                 if dx * dx + dy * dy < (min_dist * min_dist):
                     return True
             return False
@@ -765,21 +951,10 @@ class Enemy:
                 from ui.stage import get_stage_map
                 stage_map = get_stage_map()
                 
-                # 敵の四隅をチェック
-                corners = [
-                    (new_x - self.size//2, new_y - self.size//2),
-                    (new_x + self.size//2, new_y - self.size//2),
-                    (new_x - self.size//2, new_y + self.size//2),
-                    (new_x + self.size//2, new_y + self.size//2),
-                ]
-                
                 # 障害物にぶつからない場合のみ移動（noclip_mode時は地形を無視）
                 collision = False
                 if not self.noclip_mode:  # noclip_mode時は地形判定をスキップ
-                    for corner_x, corner_y in corners:
-                        if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                            collision = True
-                            break
+                    collision = stage_map.is_entity_blocked(new_x, new_y, self.size)
                 
                 if not collision:
                     # 分離処理の可否を確認。無効なら古いフォールバック処理のみ実行する
@@ -789,10 +964,10 @@ class Enemy:
 
                     if not separation_enabled:
                         # フォールバックのみ実行
-                        if _would_collide_with_others(new_x, new_y, enemies):
-                            if not _would_collide_with_others(new_x, self.y, enemies):
+                        if _would_collide_with_others(new_x, new_y, neighbors):
+                            if not _would_collide_with_others(new_x, self.y, neighbors):
                                 self.x = new_x
-                            elif not _would_collide_with_others(self.x, new_y, enemies):
+                            elif not _would_collide_with_others(self.x, new_y, neighbors):
                                 self.y = new_y
                             else:
                                 pass
@@ -811,17 +986,13 @@ class Enemy:
                         sep_x = 0.0
                         sep_y = 0.0
                         total_w = 0.0
-                        if enemies:
-                            for other in enemies:
-                                if other is self:
-                                    continue
-                                if not hasattr(other, 'x') or not hasattr(other, 'y'):
-                                    continue
-                                dx_o = new_x - other.x
-                                dy_o = new_y - other.y
+                        if neighbors:
+                            for other_x, other_y, other_size, other_is_boss in neighbors:
+                                dx_o = new_x - other_x
+                                dy_o = new_y - other_y
                                 # 距離の二乗で比較して sqrt を避ける
                                 dist2 = dx_o * dx_o + dy_o * dy_o
-                                desired = (self.size + getattr(other, 'size', 0)) * factor
+                                desired = (own_size + other_size) * factor
                                 desired2 = desired * desired
                                 if dist2 <= 0:
                                     # 完全一致のときは小さなランダム方向で押しのけ
@@ -835,18 +1006,18 @@ class Enemy:
                                     ny = dy_o / dist
                                     overlap = (desired - dist)
 
-                            # 重み: 重なりの割合
-                            w = (overlap / max(1.0, desired))
-                            # ボス優先: 他がボスで自分が非ボスなら強めに押しのける
-                            if getattr(other, 'is_boss', False) and not getattr(self, 'is_boss', False):
-                                w *= boss_priority
-                            # ボスは他からの押しを受けにくくする（自分がボスの場合は弱める）
-                            if getattr(self, 'is_boss', False) and not getattr(other, 'is_boss', False):
-                                w *= 0.6
+                                # 重み: 重なりの割合
+                                w = (overlap / max(1.0, desired))
+                                # ボス優先: 他がボスで自分が非ボスなら強めに押しのける
+                                if other_is_boss and not getattr(self, 'is_boss', False):
+                                    w *= boss_priority
+                                # ボスは他からの押しを受けにくくする（自分がボスの場合は弱める）
+                                if getattr(self, 'is_boss', False) and not other_is_boss:
+                                    w *= 0.6
 
-                            sep_x += nx * w
-                            sep_y += ny * w
-                            total_w += w
+                                sep_x += nx * w
+                                sep_y += ny * w
+                                total_w += w
 
                     applied = False
                     if total_w > 0.0:
@@ -862,23 +1033,10 @@ class Enemy:
                             # 候補位置が地形・他エネミーと衝突しないか確認
                             valid_candidate = True
                             if USE_CSV_MAP and not self.noclip_mode:  # noclip_mode時は地形判定をスキップ
-                                from ui.stage import get_stage_map
-                                stage_map = get_stage_map()
-                                half_size = self.size // 2
-                                check_points = [
-                                    (cand_x - half_size, cand_y - half_size),
-                                    (cand_x + half_size, cand_y - half_size),
-                                    (cand_x - half_size, cand_y + half_size),
-                                    (cand_x + half_size, cand_y + half_size),
-                                    (cand_x, cand_y)
-                                ]
-                                for cx, cy in check_points:
-                                    tile_id = map_loader.get_tile_at(cx, cy) if map_loader else stage_map.get_tile_at(cx, cy)
-                                    if tile_id in {5,7,8,9}:
-                                        valid_candidate = False
-                                        break
+                                if stage_map.is_entity_blocked(cand_x, cand_y, self.size):
+                                    valid_candidate = False
                             # 他エネミーとの衝突
-                            if valid_candidate and _would_collide_with_others(cand_x, cand_y, enemies):
+                            if valid_candidate and _would_collide_with_others(cand_x, cand_y, neighbors):
                                 valid_candidate = False
 
                             if valid_candidate:
@@ -888,10 +1046,10 @@ class Enemy:
 
                     if not applied:
                         # 既存のフォールバック: Xのみ/Yのみ/移動キャンセル
-                        if _would_collide_with_others(new_x, new_y, enemies):
-                            if not _would_collide_with_others(new_x, self.y, enemies):
+                        if _would_collide_with_others(new_x, new_y, neighbors):
+                            if not _would_collide_with_others(new_x, self.y, neighbors):
                                 self.x = new_x
-                            elif not _would_collide_with_others(self.x, new_y, enemies):
+                            elif not _would_collide_with_others(self.x, new_y, neighbors):
                                 self.y = new_y
                             else:
                                 pass
@@ -900,42 +1058,22 @@ class Enemy:
                             self.y = new_y
                 else:
                     # 障害物がある場合は X軸かY軸のみの移動を試す
-                    x_only_corners = [
-                        (new_x - self.size//2, self.y - self.size//2),
-                        (new_x + self.size//2, self.y - self.size//2),
-                        (new_x - self.size//2, self.y + self.size//2),
-                        (new_x + self.size//2, self.y + self.size//2),
-                    ]
-                    
-                    y_only_corners = [
-                        (self.x - self.size//2, new_y - self.size//2),
-                        (self.x + self.size//2, new_y - self.size//2),
-                        (self.x - self.size//2, new_y + self.size//2),
-                        (self.x + self.size//2, new_y + self.size//2),
-                    ]
-                    
                     # X軸のみの移動を試す
                     x_collision = False
                     if not self.noclip_mode:  # noclip_mode時は地形判定をスキップ
-                        for corner_x, corner_y in x_only_corners:
-                            if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                                x_collision = True
-                                break
+                        x_collision = stage_map.is_entity_blocked(new_x, self.y, self.size)
                     
                     # Y軸のみの移動を試す
                     y_collision = False
                     if not self.noclip_mode:  # noclip_mode時は地形判定をスキップ
-                        for corner_x, corner_y in y_only_corners:
-                            if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                                y_collision = True
-                                break
+                        y_collision = stage_map.is_entity_blocked(self.x, new_y, self.size)
                     
                     # スライディング移動：どちらか一方向でも移動可能なら適用
                     moved = False
-                    if not x_collision and not _would_collide_with_others(new_x, self.y, enemies):
+                    if not x_collision and not _would_collide_with_others(new_x, self.y, neighbors):
                         self.x = new_x
                         moved = True
-                    if not y_collision and not _would_collide_with_others(self.x, new_y, enemies):
+                    if not y_collision and not _would_collide_with_others(self.x, new_y, neighbors):
                         self.y = new_y
                         moved = True
                     
@@ -952,16 +1090,9 @@ class Enemy:
                             # 脱出先が安全かチェック（簡易）
                             escape_safe = True
                             if not self.noclip_mode:  # noclip_mode時は地形判定をスキップ
-                                escape_corners = [
-                                    (escape_x - self.size//2, escape_y - self.size//2),
-                                    (escape_x + self.size//2, escape_y + self.size//2),
-                                ]
-                                for corner_x, corner_y in escape_corners:
-                                    if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                                        escape_safe = False
-                                        break
+                                escape_safe = not stage_map.is_entity_blocked(escape_x, escape_y, self.size)
                             
-                            if escape_safe and not _would_collide_with_others(escape_x, escape_y, enemies):
+                            if escape_safe and not _would_collide_with_others(escape_x, escape_y, neighbors):
                                 self.x = escape_x
                                 self.y = escape_y
             
@@ -973,22 +1104,22 @@ class Enemy:
             # マップが無効な場合、またはnoclip_mode時は障害物判定なしで移動
             if self.noclip_mode:
                 # noclip_mode: 地形を無視して直接移動（他エネミーとの衝突のみチェック）
-                if not _would_collide_with_others(new_x, new_y, enemies):
+                if not _would_collide_with_others(new_x, new_y, neighbors):
                     self.x = new_x
                     self.y = new_y
                 else:
                     # 他エネミーがいる場合はスライディング移動
-                    if not _would_collide_with_others(new_x, self.y, enemies):
+                    if not _would_collide_with_others(new_x, self.y, neighbors):
                         self.x = new_x
-                    elif not _would_collide_with_others(self.x, new_y, enemies):
+                    elif not _would_collide_with_others(self.x, new_y, neighbors):
                         self.y = new_y
             else:
                 # 通常の処理（マップが無効な場合）
-                if _would_collide_with_others(new_x, new_y, enemies):
+                if _would_collide_with_others(new_x, new_y, neighbors):
                     # Xのみを試す
-                    if not _would_collide_with_others(new_x, self.y, enemies):
+                    if not _would_collide_with_others(new_x, self.y, neighbors):
                         self.x = new_x
-                    elif not _would_collide_with_others(self.x, new_y, enemies):
+                    elif not _would_collide_with_others(self.x, new_y, neighbors):
                         self.y = new_y
                     else:
                         # どちらもダメなら移動をキャンセル
@@ -997,6 +1128,15 @@ class Enemy:
                     self.x = new_x
                     self.y = new_y
         
+        self.finish_move(start_pos, new_x, delta_time)
+
+    def finish_move(self, start_pos, new_x, delta_time=1.0):
+        """移動後の共通処理（向き・歩行アニメーション・詰まり判定と noclip・ヒットフラッシュ）
+
+        start_pos は移動前の位置、new_x は衝突判定前の移動先 X（向きの判定に使う）。
+        移動をワーカープロセスで計算した場合も、結果を反映した後にこれを呼ぶ。
+        """
+        start_x, start_y = start_pos
         # 移動方向に基づいて向きを更新
         movement_x = new_x - getattr(self, '_prev_x', self.x)
         if abs(movement_x) > 0.1:  # 小さな移動は無視
@@ -1013,7 +1153,7 @@ class Enemy:
         
         # アニメーション時間の更新
         if self.is_moving:
-            self.animation_time += 1.0 / 60.0  # 60FPS想定でタイマー更新
+            self.animation_time += delta_time / 60.0  # delta_timeはフレーム数なので秒に変換
         
         # 現在位置を記録（次フレームの比較用）
         self.last_x = self.x
@@ -1021,7 +1161,7 @@ class Enemy:
         
         # 地形無視モードの状態管理（移動処理完了後）
         end_pos = (self.x, self.y)
-        actual_movement = math.sqrt((end_pos[0] - start_pos[0])**2 + (end_pos[1] - start_pos[1])**2)
+        actual_movement = math.sqrt((end_pos[0] - start_x)**2 + (end_pos[1] - start_y)**2)
         
         # 実際の移動量が小さい場合、詰まりタイマーを増加
         if actual_movement < self.movement_epsilon:
@@ -1048,17 +1188,9 @@ class Enemy:
                         from ui.stage import get_stage_map
                         stage_map = get_stage_map()
                         if stage_map:
-                            # 現在位置の4隅が地形に当たっていないかチェック
-                            check_corners = [
-                                (self.x - self.size//2, self.y - self.size//2),
-                                (self.x + self.size//2, self.y - self.size//2),
-                                (self.x - self.size//2, self.y + self.size//2),
-                                (self.x + self.size//2, self.y + self.size//2),
-                            ]
-                            for corner_x, corner_y in check_corners:
-                                if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                                    can_exit_noclip = False
-                                    break
+                            # 現在位置の矩形が地形に当たっていないかチェック
+                            if stage_map.is_entity_blocked(self.x, self.y, self.size):
+                                can_exit_noclip = False
                 except Exception:
                     # 地形チェックに失敗した場合は安全側でnoclip維持
                     can_exit_noclip = False
@@ -1068,9 +1200,57 @@ class Enemy:
                     self.noclip_timer = 0.0
                     # print(f"[NOCLIP] Enemy {id(self)} type {self.behavior_type} exiting noclip mode - clear of terrain")
 
-        # ヒットフラッシュのタイマを減算（フレーム毎に呼ばれることを想定、60FPS基準）
+        # ヒットフラッシュのタイマを減算（delta_timeはフレーム数なので秒に変換）
+        if self.hit_flash_timer > 0.0:
+            self.hit_flash_timer = max(0.0, self.hit_flash_timer - delta_time / 60.0)
+
+    def move_simple(self, player, delta_time=1.0):
+        """画面から遠いエネミー用の軽量な移動（AI LOD）
+
+        敵同士の分離・衝突回避は行わず、地形は移動先と軸ごとのスライドだけを判定する。
+        詰まった場合は通常の移動と同じく noclip に切り替え、地形を無視して抜け出す。
+        """
+        if self.knockback_timer > 0:
+            return
+
+        step_x, step_y = self._movement_step(player, delta_time)
+        old_x, old_y = self.x, self.y
+        new_x, new_y = old_x + step_x, old_y + step_y
+
+        if USE_CSV_MAP and not self.noclip_mode and (step_x or step_y):
+            try:
+                from ui.stage import get_stage_map
+                stage_map = get_stage_map()
+                if stage_map.is_entity_blocked(new_x, new_y, self.size):
+                    if not stage_map.is_entity_blocked(new_x, old_y, self.size):
+                        new_y = old_y
+                    elif not stage_map.is_entity_blocked(old_x, new_y, self.size):
+                        new_x = old_x
+                    else:
+                        new_x, new_y = old_x, old_y
+            except Exception:
+                pass
+        self.x, self.y = new_x, new_y
+
+        if abs(new_x - old_x) > 0.1:
+            self.facing_right = new_x > old_x
+        self._prev_x = self.last_x = self.x
+        self._prev_y = self.last_y = self.y
+        self.is_moving = False  # 描画されない距離なので歩行アニメーションは進めない
+
+        # 詰まり判定と noclip（解除の判定は画面に近づいて通常の移動に戻ってから行う）
+        if math.hypot(new_x - old_x, new_y - old_y) < self.movement_epsilon:
+            self.stuck_timer += delta_time / 60.0
+            if self.stuck_timer >= self.stuck_threshold and not self.noclip_mode:
+                self.noclip_mode = True
+                self.noclip_timer = 0.0
+        else:
+            self.stuck_timer = 0.0
+        if self.noclip_mode:
+            self.noclip_timer += delta_time / 60.0
+
         if self.hit_flash_timer > 0.0:
-            self.hit_flash_timer = max(0.0, self.hit_flash_timer - (1.0/60.0))
+            self.hit_flash_timer = max(0.0, self.hit_flash_timer - delta_time / 60.0)
 
     def draw(self, screen, camera_x=0, camera_y=0):
         # ワールド座標からスクリーン座標に変換
@@ -1098,7 +1278,7 @@ class Enemy:
                 # 歩行アニメーション効果を計算
                 foot_offset_y = 0
                 
-                if (self.is_moving and ENABLE_ENEMY_WALK_ANIMATION and 
+                if (self.is_moving and ENABLE_ENEMY_WALK_ANIMATION and Enemy.walk_animation and
                     ENEMY_WALK_BOB_AMPLITUDE > 0):  # アニメーションが有効な場合のみ
                     # 足部分の上下振動（1ピクセル上下）
                     foot_raw = math.sin(self.animation_time * ENEMY_WALK_BOB_SPEED)
@@ -1108,114 +1288,104 @@ class Enemy:
                 base_x = sx - image_size // 2
                 base_y = sy - image_size // 2
                 
-                # 使用する画像を決定（size_multiplierに応じてスケーリング）
-                if image_size != base_image_size:
-                    # サイズが変更されている場合はスケーリング
-                    current_image = pygame.transform.scale(image, (image_size, image_size))
-                else:
-                    current_image = image
-                
-                # ボス用の赤いオーラ効果（enemy_typeが101以上の場合のみ）
+                # ボス用の赤いオーラ効果とHPバー（enemy_typeが101以上の場合のみ）
                 if hasattr(self, 'enemy_type') and self.enemy_type >= 101:
+                    current_image, _ = Enemy._get_sprite_frame(image, self.facing_right, image_size)
                     self._draw_boss_aura(screen, base_x, base_y, current_image, image_size)
-                
-                # ボス用のHPバー（enemy_typeが101以上の場合のみ）
-                if hasattr(self, 'enemy_type') and self.enemy_type >= 101:
                     self._draw_boss_hp_bar(screen, sx, sy, image_size)
                 
-                # アニメーションが無効または足が動かない場合は通常描画
-                if (not ENABLE_ENEMY_WALK_ANIMATION or not self.is_moving or 
-                    ENEMY_WALK_BOB_AMPLITUDE <= 0 or foot_offset_y == 0):
-                    # 通常の1回描画（最適化）
-                    if self.hit_flash_timer > 0.0:
-                        # フラッシュ効果
-                        elapsed = self.hit_flash_duration - self.hit_flash_timer
-                        half = self.hit_flash_duration / 2.0
-                        if elapsed < half:
-                            alpha = int(255 * (elapsed / half))
-                        else:
-                            alpha = int(255 * ((self.hit_flash_duration - elapsed) / half))
-                        
-                        flashed_image = current_image.copy()
-                        white_surface = pygame.Surface((image_size, image_size), pygame.SRCALPHA)
-                        white_surface.fill((255, 255, 255, alpha))
-                        flashed_image.blit(white_surface, (0, 0), special_flags=pygame.BLEND_ADD)
-                        screen.blit(flashed_image, (base_x, base_y))
-                    else:
-                        # 通常描画
-                        screen.blit(current_image, (base_x, base_y))
-                    return  # 早期リターンで以下の処理をスキップ
-                
-                # 以下はアニメーション有効時のみ実行
-                # 元画像のサイズ（32, 36, 40, 44, 48のいずれか）
-                original_size = 32  # 基準サイズ
-                scale_factor = image_size / original_size
-                
-                # 足部分の領域を計算（向きに応じて左右反転）
-                if self.facing_right:
-                    # 右向き時：左下部分を動かす（反転画像では右足に見える）
-                    foot_start_x = int(0 * scale_factor)   # 画像の左端から
-                    foot_end_x = int(16 * scale_factor)    # 画像の左半分まで
-                else:
-                    # 左向き時：右下部分を動かす（反転画像では左足に見える）
-                    foot_start_x = int(16 * scale_factor)  # 画像の右半分から
-                    foot_end_x = int(32 * scale_factor)    # 画像の右端まで
-                
-                foot_start_y = int(16 * scale_factor)  # 画像の下半分から  
-                foot_end_y = int(32 * scale_factor)    # 画像の下端まで
-                foot_width = foot_end_x - foot_start_x
-                foot_height = foot_end_y - foot_start_y
-                
-                # 足部分以外の領域（メイン画像）
-                main_surface = current_image.copy()
-                
-                # 足部分を抜き出し
-                foot_rect = pygame.Rect(foot_start_x, foot_start_y, foot_width, foot_height)
-                foot_surface = current_image.subsurface(foot_rect)
-                
-                # 足部分をメイン画像から透明にする（足が二重に描画されないように）
-                transparent_rect = pygame.Surface((foot_width, foot_height), pygame.SRCALPHA)
-                transparent_rect.fill((0, 0, 0, 0))  # 完全透明
-                main_surface.blit(transparent_rect, (foot_start_x, foot_start_y))
-                
-                # 描画位置を計算
-                main_x = base_x
-                main_y = base_y
-                foot_x = base_x + foot_start_x
-                foot_y = base_y + foot_start_y + int(foot_offset_y)
-                
-                # ヒット時のフラッシュ効果
-                if self.hit_flash_timer > 0.0:
-                    elapsed = self.hit_flash_duration - self.hit_flash_timer
-                    half = self.hit_flash_duration / 2.0
-                    if elapsed < half:
-                        # フェードイン
-                        alpha = int(255 * (elapsed / half))
-                    else:
-                        # フェードアウト
-                        alpha = int(255 * ((self.hit_flash_duration - elapsed) / half))
-                    
-                    # メイン画像のフラッシュ効果
-                    flashed_main = main_surface.copy()
-                    white_surface_main = pygame.Surface((image_size, image_size), pygame.SRCALPHA)
-                    white_surface_main.fill((255, 255, 255, alpha))
-                    flashed_main.blit(white_surface_main, (0, 0), special_flags=pygame.BLEND_ADD)
-                    screen.blit(flashed_main, (main_x, main_y))
-                    
-                    # 足部分のフラッシュ効果
-                    flashed_foot = foot_surface.copy()
-                    white_surface_foot = pygame.Surface((foot_width, foot_height), pygame.SRCALPHA)
-                    white_surface_foot.fill((255, 255, 255, alpha))
-                    flashed_foot.blit(white_surface_foot, (0, 0), special_flags=pygame.BLEND_ADD)
-                    screen.blit(flashed_foot, (foot_x, foot_y))
-                else:
-                    # 通常描画（メイン画像 + 足部分）
-                    screen.blit(main_surface, (main_x, main_y))
-                    screen.blit(foot_surface, (foot_x, foot_y))
+                # 構築済みフレーム（サイズ・足オフセット・フラッシュ段階ごと）を1回のblitで描画
+                frame, frame_dy = Enemy._get_sprite_frame(
+                    image, self.facing_right, image_size, foot_offset_y, self._hit_flash_level())
+                screen.blit(frame, (base_x, base_y + frame_dy))
         else:
             # 画像がない場合は従来の円描画
             self._draw_circle(screen, sx, sy)
     
+    def _hit_flash_level(self):
+        """ヒットフラッシュの明るさを ENEMY_FLASH_LEVELS 段階に量子化（0 はフラッシュなし）"""
+        if self.hit_flash_timer <= 0.0:
+            return 0
+        elapsed = self.hit_flash_duration - self.hit_flash_timer
+        half = self.hit_flash_duration / 2.0
+        if elapsed < half:
+            alpha = 255 * (elapsed / half)
+        else:
+            alpha = 255 * ((self.hit_flash_duration - elapsed) / half)
+        alpha = max(0.0, min(255.0, alpha))
+        return int(round(alpha * ENEMY_FLASH_LEVELS / 255.0))
+
+    @classmethod
+    def _get_sprite_frame(cls, image, facing_right, image_size, foot_offset_y=0, flash_level=0):
+        """描画用フレームを取得（初回のみ構築してキャッシュ）
+
+        戻り値は (surface, dy)。dy は描画位置 base_y からの縦オフセット
+        （足オフセット付きフレームは足がはみ出さないよう上下に1pxずつ余白を持つ）。
+        """
+        key = (image, facing_right, image_size, foot_offset_y, flash_level)
+        frame = cls._sprite_frame_cache.get(key)
+        if frame is not None:
+            return frame
+
+        if len(cls._sprite_frame_cache) >= ENEMY_SPRITE_CACHE_LIMIT:
+            cls._sprite_frame_cache.clear()
+
+        if flash_level > 0:
+            # フラッシュ: フラッシュなしフレームに白を加算合成
+            base, dy = cls._get_sprite_frame(image, facing_right, image_size, foot_offset_y, 0)
+            alpha = min(255, flash_level * 255 // ENEMY_FLASH_LEVELS)
+            surface = base.copy()
+            white_surface = pygame.Surface(base.get_size(), pygame.SRCALPHA)
+            white_surface.fill((255, 255, 255, alpha))
+            surface.blit(white_surface, (0, 0), special_flags=pygame.BLEND_ADD)
+        elif foot_offset_y != 0:
+            # 歩行: 本体の上に足部分をずらして重ねる
+            base, _ = cls._get_sprite_frame(image, facing_right, image_size, 0, 0)
+            surface, dy = cls._build_walk_frame(base, facing_right, image_size, foot_offset_y)
+        else:
+            # size_multiplier に応じたスケーリングのみ
+            if image.get_width() != image_size:
+                surface = pygame.transform.scale(image, (image_size, image_size))
+            else:
+                surface = image
+            dy = 0
+
+        frame = (surface, dy)
+        cls._sprite_frame_cache[key] = frame
+        return frame
+
+    @staticmethod
+    def _build_walk_frame(current_image, facing_right, image_size, foot_offset_y):
+        """歩行アニメーション用フレームを構築（足部分を上下にずらして重ねる）"""
+        # 元画像のサイズ（32, 36, 40, 44, 48のいずれか）
+        original_size = 32  # 基準サイズ
+        scale_factor = image_size / original_size
+        
+        # 足部分の領域を計算（向きに応じて左右反転）
+        if facing_right:
+            # 右向き時：左下部分を動かす（反転画像では右足に見える）
+            foot_start_x = int(0 * scale_factor)   # 画像の左端から
+            foot_end_x = int(16 * scale_factor)    # 画像の左半分まで
+        else:
+            # 左向き時：右下部分を動かす（反転画像では左足に見える）
+            foot_start_x = int(16 * scale_factor)  # 画像の右半分から
+            foot_end_x = int(32 * scale_factor)    # 画像の右端まで
+        
+        foot_start_y = int(16 * scale_factor)  # 画像の下半分から  
+        foot_end_y = int(32 * scale_factor)    # 画像の下端まで
+        width, height = current_image.get_size()
+        foot_rect = pygame.Rect(foot_start_x, foot_start_y, foot_end_x - foot_start_x, foot_end_y - foot_start_y)
+        foot_rect = foot_rect.clip(pygame.Rect(0, 0, width, height))
+
+        # 足が上下に1pxはみ出せるよう余白付きのフレームに合成
+        pad = 1
+        surface = pygame.Surface((width, height + pad * 2), pygame.SRCALPHA)
+        surface.blit(current_image, (0, pad))
+        if foot_rect.width > 0 and foot_rect.height > 0:
+            foot_surface = current_image.subsurface(foot_rect)
+            surface.blit(foot_surface, (foot_rect.x, foot_rect.y + pad + int(foot_offset_y)))
+        return surface, -pad
+
     def _draw_circle(self, screen, sx, sy):
         """従来の円描画（画像がない場合のフォールバック）"""
         # ボス用の赤いオーラ（円形の場合、enemy_typeが101以上の場合のみ）
@@ -1321,57 +1491,20 @@ class Enemy:
         if self.behavior_type not in [3, 4]:
             return  # 射撃タイプ以外は攻撃しない
         
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         if current_time - self.last_attack_time >= self.attack_cooldown:
             # プレイヤーに向けて弾丸を発射
             angle = math.atan2(player.y - self.y, player.x - self.x)
             # ボスの弾かどうかを判定
             is_boss = hasattr(self, 'enemy_type') and self.enemy_type >= 101
             
-            # 通常エネミーの弾丸数制限（ボスは制限なし）
-            if not is_boss and len(self.projectiles) >= 5:
-                # 古い弾丸を削除
-                self.projectiles.pop(0)
-            
-            projectile = EnemyProjectile(self.x, self.y, angle, self.damage // 2, self.behavior_type, self.enemy_type, is_boss_bullet=is_boss, projectile_speed=self.projectile_speed)
-            self.projectiles.append(projectile)
+            # 通常エネミーの弾丸数制限（古い弾丸から削除、ボスは制限なし）
+            get_enemy_projectiles().spawn(
+                self.x, self.y, angle, self.projectile_speed, self.damage // 2, self.projectile_owner_id,
+                self.behavior_type, self.enemy_type, is_boss=is_boss,
+                max_per_owner=None if is_boss else ENEMY_PROJECTILE_MAX_PER_ENEMY)
             self.last_attack_time = current_time
 
-    def update_projectiles(self, player=None, delta_time=1.0):
-        """弾丸の更新処理"""
-        # 有効期限切れや画面外の弾丸を削除
-        valid_projectiles = []
-        for p in self.projectiles:
-            if p.is_expired() or not p.is_on_screen():
-                continue
-            
-            # プレイヤーから遠い弾丸も削除（パフォーマンス向上、ボスの弾は除外）
-            if player is not None and not p.is_boss_bullet:
-                dx = p.x - player.x
-                dy = p.y - player.y
-                # 通常の弾は600ピクセル、ボスの弾は制限なし
-                max_distance_sq = 360000  # 600ピクセルの二乗
-                if dx * dx + dy * dy > max_distance_sq:
-                    continue
-                    continue
-            
-            valid_projectiles.append(p)
-        
-        self.projectiles = valid_projectiles
-        
-        # 弾丸の移動（delta_timeを渡す）
-        for projectile in self.projectiles:
-            projectile.update(delta_time)
-
-    def draw_projectiles(self, screen, camera_x=0, camera_y=0):
-        """弾丸の描画"""
-        for projectile in self.projectiles:
-            projectile.draw(screen, camera_x, camera_y)
-
-    def get_projectiles(self):
-        """弾丸のリストを取得（プレイヤーとの衝突判定用）"""
-        return self.projectiles
-
     def is_off_screen(self):
         """敵が画面外に出たかどうかを判定（直進タイプ用）"""
         # ボスは画面外でも削除されない
@@ -1462,10 +1595,10 @@ class Enemy:
             
         if self.behavior_type == 2:  # 跳ね返り直進
             # 跳ね返りタイプは60秒で削除（長めに設定）
-            return pygame.time.get_ticks() - self.spawn_time > 60000
+            return game_clock.get_ticks() - self.spawn_time > 60000
         elif self.behavior_type == 3:  # 距離保持射撃
             # 距離保持射撃は45秒で削除
-            return pygame.time.get_ticks() - self.spawn_time > 45000
+            return game_clock.get_ticks() - self.spawn_time > 45000
         else:
             # その他のタイプは時間制限なし
             return False
@@ -1563,11 +1696,8 @@ class Enemy:
                             (offset_distance, offset_distance)
                         ]
                         
-                        for dx, dy in offsets:
-                            for point in outline_points:
-                                x, y = point
-                                pygame.draw.circle(aura_surface, color, 
-                                                 (x + center_offset + dx, y + center_offset + dy), 1)
+                        Enemy._stamp_outline(aura_surface, outline_points, offsets, color,
+                                             (center_offset, center_offset))
                 else:
                     # アウトラインが取得できない場合は円形フォールバック
                     center = aura_size // 2
@@ -1615,9 +1745,15 @@ class Enemy:
 
 
 class EnemyProjectile:
-    """敵が発射する弾丸クラス"""
-    # 描画用のキャッシュサーフェス（クラス変数）
+    """敵が発射する弾丸クラス
+
+    通常は EnemyProjectileStore が配列で弾丸を管理するため、このクラスは色・サイズ・描画用
+    サーフェスの提供と、numpy が無い場合のフォールバックに使われる。
+    """
+    # 描画用のキャッシュサーフェス（クラス変数）: (色, サイズ, ボス弾か) -> (Surface, 描画オフセット)
     _draw_cache = {}
+    # 弾丸の色のキャッシュ: (行動パターン, レベル, ボス弾か) -> RGB
+    _color_cache = {}
     
     def __init__(self, x, y, angle, damage, behavior_type=3, enemy_level=1, is_boss_bullet=False, projectile_speed=2.0):
         self.x = x
@@ -1628,45 +1764,55 @@ class EnemyProjectile:
         self.enemy_level = enemy_level  # 敵のレベルを記録
         self.is_boss_bullet = is_boss_bullet  # ボスの弾かどうか
         self.speed = projectile_speed  # 弾丸の速度（CSVから設定）
-        self.size = 20 if not is_boss_bullet else 24  # 通常弾とボス弾のサイズ調整
-        self.lifetime = 3000  # 3秒で消滅（ミリ秒）
-        self.created_time = pygame.time.get_ticks()
-        self.pulse_alpha = 200  # 脈動エフェクト用のアルファ値（初期化）
-        
-        # 通常の弾丸のサイズを視認性重視で調整
-        if not is_boss_bullet:
-            self.size = 22  # 18から22に拡大（より見やすく）
+        self.size = self.size_for(is_boss_bullet)
+        self.lifetime = ENEMY_PROJECTILE_LIFETIME  # 3秒で消滅（ミリ秒）
+        self.created_time = game_clock.get_ticks()
         
         # 速度ベクトルを計算
         self.vx = math.cos(angle) * self.speed
         self.vy = math.sin(angle) * self.speed
         
         # 敵と同じ彩度設定で弾丸の色を決定
-        self._setup_bullet_color()
+        self.base_color = self.color_for(behavior_type, enemy_level, is_boss_bullet)
+
+    @staticmethod
+    def size_for(is_boss_bullet):
+        """弾丸のサイズ（通常弾は視認性重視で22、ボス弾は24）"""
+        return 24 if is_boss_bullet else 22
 
-    def _setup_bullet_color(self):
-        """敵のレベルと行動パターンに応じた弾丸の色を設定"""
+    @classmethod
+    def color_for(cls, behavior_type, enemy_level, is_boss_bullet=False):
+        """敵のレベルと行動パターンに応じた弾丸の色"""
+        key = (behavior_type, enemy_level, is_boss_bullet)
+        color = cls._color_cache.get(key)
+        if color is None:
+            color = cls._compute_bullet_color(behavior_type, enemy_level, is_boss_bullet)
+            cls._color_cache[key] = color
+        return color
+
+    @classmethod
+    def _compute_bullet_color(cls, behavior_type, enemy_level, is_boss_bullet):
         # ボスの弾は特別な色（金色、相殺不可を表現）
-        if self.is_boss_bullet:
-            self.base_color = (255, 215, 0)  # 金色
-            return
+        if is_boss_bullet:
+            return (255, 215, 0)  # 金色
         
         # 彩度設定：レベル1は低彩度（白っぽい）、レベル5は高彩度（鮮やか）
-        saturation = 0.2 + (self.enemy_level - 1) * 0.2  # 0.2-1.0の範囲
+        saturation = 0.2 + (enemy_level - 1) * 0.2  # 0.2-1.0の範囲
         base_value = 200  # 明度は固定
         
-        if self.behavior_type == 1:  # 追跡 - 赤
-            self.base_color = self._hsv_to_rgb(0.0, saturation, base_value)
-        elif self.behavior_type == 2:  # 直進 - 青
-            self.base_color = self._hsv_to_rgb(240.0, saturation, base_value)
-        elif self.behavior_type == 3:  # 距離保持射撃 - 緑
-            self.base_color = self._hsv_to_rgb(120.0, saturation, base_value)
-        elif self.behavior_type == 4:  # 固定砲台 - 橙
-            self.base_color = self._hsv_to_rgb(30.0, saturation, base_value)
+        if behavior_type == 1:  # 追跡 - 赤
+            return cls._hsv_to_rgb(0.0, saturation, base_value)
+        elif behavior_type == 2:  # 直進 - 青
+            return cls._hsv_to_rgb(240.0, saturation, base_value)
+        elif behavior_type == 3:  # 距離保持射撃 - 緑
+            return cls._hsv_to_rgb(120.0, saturation, base_value)
+        elif behavior_type == 4:  # 固定砲台 - 橙
+            return cls._hsv_to_rgb(30.0, saturation, base_value)
         else:  # デフォルト（青）
-            self.base_color = self._hsv_to_rgb(240.0, saturation, base_value)
+            return cls._hsv_to_rgb(240.0, saturation, base_value)
 
-    def _hsv_to_rgb(self, hue, saturation, value):
+    @staticmethod
+    def _hsv_to_rgb(hue, saturation, value):
         """HSV色空間からRGB色空間に変換"""        
         # HSVをRGBに変換（colorsysは0-1の範囲で動作）
         h = hue / 360.0
@@ -1687,46 +1833,38 @@ class EnemyProjectile:
         self.x += self.vx * delta_time
         self.y += self.vy * delta_time
         
-        # 時間ベースの脈動エフェクト（軽量）
-        current_time = pygame.time.get_ticks()
-        self.pulse_alpha = int(150 + 50 * math.sin(current_time * 0.008))  # 軽いサイン計算
-        
         # 障害物との衝突判定（ボスの弾のみ、通常の弾は軽量化のためスキップ）
         if self.is_boss_bullet and USE_CSV_MAP:
             from ui.stage import get_stage_map
             stage_map = get_stage_map()
             
             # ボス弾は森(5)と石/岩(9)のみでブロック、水(7)と危険地帯(8)は通り抜ける
-            tile_id = stage_map.get_tile_at_world_pos(self.x, self.y)
-            if tile_id in [5, 9]:  # 森と石/岩のみでブロック
+            if stage_map.is_blocked_at(self.x, self.y, 'boss_bullet'):
                 # 障害物に当たった弾丸は削除対象にする（期限切れにする）
-                self.created_time = pygame.time.get_ticks() - self.lifetime
+                self.created_time = game_clock.get_ticks() - self.lifetime
                 return
 
     def draw(self, screen, camera_x=0, camera_y=0):
         """弾丸の描画（キャッシュシステムで最適化）"""
-        # ボスの弾は従来通りの描画（手を加えない）
-        if self.is_boss_bullet:
-            self._draw_boss_bullet(screen, camera_x, camera_y)
-            return
-            
-        sx = int(self.x - camera_x)
-        sy = int(self.y - camera_y)
-        
-        # キャッシュキーを生成（色ベース）
-        cache_key = (self.base_color, self.size)
-        
-        # キャッシュされたサーフェスを使用
-        if cache_key not in self._draw_cache:
-            self._create_cached_surface(cache_key)
-        
-        surf = self._draw_cache[cache_key]
-        r = self.size // 2
-        screen.blit(surf, (sx - r, sy - r))
+        surf, offset = self.get_cached_surface(self.base_color, self.size, self.is_boss_bullet)
+        screen.blit(surf, (int(self.x - camera_x) - offset, int(self.y - camera_y) - offset))
+
+    @classmethod
+    def get_cached_surface(cls, color, size, is_boss_bullet=False):
+        """弾丸の描画サーフェスと描画オフセット（中心からのずれ）を返す"""
+        cache_key = (color, size, is_boss_bullet)
+        entry = cls._draw_cache.get(cache_key)
+        if entry is None:
+            if is_boss_bullet:
+                entry = (cls._create_boss_surface(color, size), size)
+            else:
+                entry = (cls._create_cached_surface(color, size), size // 2)
+            cls._draw_cache[cache_key] = entry
+        return entry
 
-    def _create_cached_surface(self, cache_key):
-        """描画用のサーフェスをキャッシュに作成（視認性向上エフェクト付き）"""
-        color, size = cache_key
+    @staticmethod
+    def _create_cached_surface(color, size):
+        """描画用のサーフェスを作成（視認性向上エフェクト付き）"""
         r = size // 2
         surf = pygame.Surface((size, size), pygame.SRCALPHA)
         
@@ -1752,18 +1890,16 @@ class EnemyProjectile:
         highlight_color = (255, 255, 255, 200)
         pygame.draw.circle(surf, highlight_color, (r, r), max(2, r // 3))  # 少し大きく
         
-        self._draw_cache[cache_key] = surf
+        return surf
 
-    def _draw_boss_bullet(self, screen, camera_x, camera_y):
-        """ボスの弾丸の描画（従来通り、変更なし）"""
-        sx = int(self.x - camera_x)
-        sy = int(self.y - camera_y)
-        
-        r = self.size
+    @staticmethod
+    def _create_boss_surface(color, size):
+        """ボスの弾丸の描画サーフェスを作成（見た目は従来通り、半径 = size）"""
+        r = size
         surf = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
         
         # 基本色から明度の異なるバリエーションを作成
-        r_base, g_base, b_base = self.base_color
+        r_base, g_base, b_base = color
         
         # 外側の光輪（基本色、透明度低め）
         outer_color = (r_base//2, g_base//2, b_base//2, 60)
@@ -1780,15 +1916,15 @@ class EnemyProjectile:
         center_color = (center_r, center_g, center_b, 220)
         pygame.draw.circle(surf, center_color, (r, r), r//3)
         
-        screen.blit(surf, (sx - r, sy - r))
+        return surf
 
     def is_expired(self):
         """弾丸が有効期限切れかどうかを判定"""
-        return pygame.time.get_ticks() - self.created_time >= self.lifetime
+        return game_clock.get_ticks() - self.created_time >= self.lifetime
 
     def is_on_screen(self):
         """弾丸が画面内（ワールド内）にあるかどうかを判定"""
-        margin = 50
+        margin = ENEMY_PROJECTILE_WORLD_MARGIN
         return (-margin <= self.x <= WORLD_WIDTH + margin and 
                 -margin <= self.y <= WORLD_HEIGHT + margin)
 
@@ -0,0 +1,266 @@
+"""
+エネミーの移動関連フィールドを NumPy 配列（Structure of Arrays）で保持するプール
+
+Enemy オブジェクトはプールに登録されると、base_speed / behavior_type などの属性が
+プール配列のスロットを参照する薄いビューになる。
+位置 x / y は Enemy.move() の衝突判定で何十回も読まれ、プロパティ経由の読み出しが
+通常属性の数倍遅いため、通常の属性のままにして compute_steps() でまとめて集める。
+行動パターン 1〜4 の移動量は compute_steps() で全エネミー分をまとめて計算する。
+"""
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+
+
+# プールで管理するフィールド: 名前 -> (dtype, 初期値)
+POOL_FIELDS = {
+    'base_speed': ('f8', 0.0),
+    'behavior_type': ('i4', 0),
+    'velocity_x': ('f8', 0.0),
+    'velocity_y': ('f8', 0.0),
+    'initial_direction': ('f8', float('nan')),   # NaN は未設定（None）
+    'target_distance': ('f8', 0.0),
+    'knockback_timer': ('f8', 0.0),
+    'noclip_mode': ('?', False),
+}
+
+# 距離保持タイプ（3）の許容幅
+KEEP_DISTANCE_TOLERANCE = 20
+
+
+def _none_to_nan(value):
+    return float('nan') if value is None else value
+
+
+def _nan_to_none(value):
+    return None if value != value else value
+
+
+# 配列との変換が必要なフィールド
+_FIELD_CONVERTERS = {
+    'initial_direction': (_none_to_nan, _nan_to_none),
+}
+
+
+def pooled_attribute(name):
+    """プール配列を参照するプロパティを生成する
+
+    プール未登録時は通常のインスタンス属性（_pooled_<name>）として振る舞う。
+    """
+    local_name = '_pooled_' + name
+    to_array, from_array = _FIELD_CONVERTERS.get(name, (None, None))
+
+    def fget(self):
+        pool = self._pool
+        if pool is None:
+            return getattr(self, local_name)
+        value = pool.arrays[name].item(self._slot)
+        return from_array(value) if from_array else value
+
+    def fset(self, value):
+        pool = self._pool
+        if pool is None:
+            setattr(self, local_name, value)
+        else:
+            pool.arrays[name][self._slot] = to_array(value) if to_array else value
+
+    return property(fget, fset)
+
+
+class EnemyPool:
+    """エネミーの移動フィールドを保持する SoA ストア"""
+
+    def __init__(self, capacity=256):
+        self.enabled = NUMPY_AVAILABLE
+        self.capacity = 0
+        self.arrays = {}
+        # スロット -> Enemy（空きスロットは None）
+        self._owners = []
+        self._free_slots = []
+        # 使用中スロットの上限（この範囲だけを計算対象にする）
+        self._high = 0
+        # compute_steps() の結果
+        self.step_x = None
+        self.step_y = None
+        self.has_step = None
+        # step_x / step_y を計算したときの delta_time（take_step で経過時間に合わせて伸縮する）
+        self.step_delta_time = 1.0
+        if self.enabled:
+            self._grow(max(1, int(capacity)))
+
+    def __len__(self):
+        return self._high - len(self._free_slots)
+
+    def _grow(self, new_capacity):
+        """配列容量を拡張（既存値はコピー）"""
+        old = self.capacity
+        for name, (dtype, default) in POOL_FIELDS.items():
+            arr = np.full(new_capacity, default, dtype=dtype)
+            if old:
+                arr[:old] = self.arrays[name]
+            self.arrays[name] = arr
+        active = np.zeros(new_capacity, dtype=bool)
+        step_x = np.zeros(new_capacity, dtype='f8')
+        step_y = np.zeros(new_capacity, dtype='f8')
+        has_step = np.zeros(new_capacity, dtype=bool)
+        if old:
+            active[:old] = self.active
+            step_x[:old] = self.step_x
+            step_y[:old] = self.step_y
+            has_step[:old] = self.has_step
+        self.active = active
+        self.step_x = step_x
+        self.step_y = step_y
+        self.has_step = has_step
+        self._owners.extend([None] * (new_capacity - old))
+        self.capacity = new_capacity
+
+    def attach(self, enemy):
+        """エネミーをプールに登録し、属性をスロット参照に切り替える"""
+        if not self.enabled or enemy._pool is self:
+            return
+        if enemy._pool is not None:
+            enemy._pool.detach(enemy)
+
+        # スカラー値を退避してからスロットを割り当てる
+        values = {name: getattr(enemy, name) for name in POOL_FIELDS}
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self._high >= self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self._high
+            self._high += 1
+
+        for name, value in values.items():
+            to_array = _FIELD_CONVERTERS.get(name, (None, None))[0]
+            self.arrays[name][slot] = to_array(value) if to_array else value
+        self.active[slot] = True
+        self.has_step[slot] = False
+        self._owners[slot] = enemy
+        enemy._pool = self
+        enemy._slot = slot
+
+    def detach(self, enemy):
+        """エネミーをプールから外し、現在値をインスタンス属性に書き戻す"""
+        if enemy._pool is not self:
+            return
+        slot = enemy._slot
+        values = {name: getattr(enemy, name) for name in POOL_FIELDS}
+        enemy._pool = None
+        enemy._slot = -1
+        for name, value in values.items():
+            setattr(enemy, name, value)
+
+        self.active[slot] = False
+        self.has_step[slot] = False
+        self._owners[slot] = None
+        if slot == self._high - 1:
+            self._high -= 1
+            # 末尾の空きスロットを詰める
+            while self._high > 0 and not self.active[self._high - 1]:
+                self._high -= 1
+            self._free_slots = [s for s in self._free_slots if s < self._high]
+        else:
+            self._free_slots.append(slot)
+
+    def clear(self):
+        """全エネミーをプールから外す"""
+        for enemy in list(self._owners[:self._high]):
+            if enemy is not None:
+                self.detach(enemy)
+
+    def sync(self, enemies):
+        """エネミーリストとプールを同期（新規登録・消えたエネミーの解放）"""
+        if not self.enabled:
+            return
+        alive_ids = set()
+        for enemy in enemies:
+            alive_ids.add(id(enemy))
+            if enemy._pool is not self:
+                self.attach(enemy)
+        for enemy in self._owners[:self._high]:
+            if enemy is not None and id(enemy) not in alive_ids:
+                self.detach(enemy)
+
+    def compute_steps(self, player_x, player_y, delta_time=1.0, flow_field=None):
+        """行動パターン 1〜4 の移動量を全エネミー分まとめて計算する
+
+        結果は step_x / step_y に格納され、Enemy.move() が自分のスロットから取り出す。
+        直進タイプ（2）の初期方向と速度ベクトルもここで確定させる。
+        flow_field（core.flow_field.FlowField）を渡すと、追跡タイプは障害物を回り込む経路に沿って進む。
+        """
+        if not self.enabled or self._high == 0:
+            return
+        n = self._high
+        a = self.arrays
+        owners = self._owners[:n]
+        x = np.fromiter((0.0 if e is None else e.x for e in owners), dtype='f8', count=n)
+        y = np.fromiter((0.0 if e is None else e.y for e in owners), dtype='f8', count=n)
+        base_speed = a['base_speed'][:n]
+        behavior = a['behavior_type'][:n]
+        active = self.active[:n]
+
+        # プレイヤー方向の単位ベクトル（atan2(0, 0) = 0 と同じく重なり時は +X 方向）
+        dx = player_x - x
+        dy = player_y - y
+        dist = np.hypot(dx, dy)
+        nonzero = dist > 0
+        safe_dist = np.where(nonzero, dist, 1.0)
+        ux = np.where(nonzero, dx / safe_dist, 1.0)
+        uy = np.where(nonzero, dy / safe_dist, 0.0)
+        # 離れる方向（atan2(0, 0) = 0 なので重なり時は同じく +X 方向）
+        away_x = np.where(nonzero, -ux, 1.0)
+        away_y = np.where(nonzero, -uy, 0.0)
+
+        speed = base_speed * delta_time
+        step_x = np.zeros(n)
+        step_y = np.zeros(n)
+
+        # 1 / 4: 追跡（フローフィールドがあれば回り込みが必要なエネミーだけ経路方向へ）
+        chase = (behavior == 1) | (behavior == 4)
+        chase_x, chase_y = ux, uy
+        if flow_field is not None and chase.any():
+            chase_x, chase_y = flow_field.steer(x, y, ux, uy)
+        step_x[chase] = (chase_x * speed)[chase]
+        step_y[chase] = (chase_y * speed)[chase]
+
+        # 3: 距離保持
+        keep = behavior == 3
+        target = a['target_distance'][:n]
+        too_close = keep & (dist < target - KEEP_DISTANCE_TOLERANCE)
+        too_far = keep & (dist > target + KEEP_DISTANCE_TOLERANCE)
+        step_x[too_close] = (away_x * speed)[too_close]
+        step_y[too_close] = (away_y * speed)[too_close]
+        step_x[too_far] = (ux * speed)[too_far]
+        step_y[too_far] = (uy * speed)[too_far]
+
+        # 2: 直進（初回または noclip 中のみプレイヤー方向を再計算）
+        straight = behavior == 2
+        direction = a['initial_direction'][:n]
+        redirect = straight & active & (np.isnan(direction) | a['noclip_mode'][:n])
+        if redirect.any():
+            angle = np.arctan2(dy[redirect], dx[redirect])
+            direction[redirect] = angle
+            a['velocity_x'][:n][redirect] = np.cos(angle) * base_speed[redirect]
+            a['velocity_y'][:n][redirect] = np.sin(angle) * base_speed[redirect]
+        step_x[straight] = (a['velocity_x'][:n] * delta_time)[straight]
+        step_y[straight] = (a['velocity_y'][:n] * delta_time)[straight]
+
+        self.step_x[:n] = step_x
+        self.step_y[:n] = step_y
+        self.has_step[:n] = active
+        self.step_delta_time = delta_time
+
+    def take_step(self, slot, delta_time=None):
+        """スロットの計算済み移動量を取り出す（未計算なら None）
+
+        delta_time が compute_steps() の値と異なる場合（AI LOD で数ティック分まとめて動かす場合）は
+        移動量をその経過時間に合わせて伸縮する。移動量はどの行動パターンでも delta_time に比例する。
+        """
+        if not self.has_step[slot]:
+            return None
+        self.has_step[slot] = False
+        if delta_time is None or delta_time == self.step_delta_time or self.step_delta_time <= 0.0:
+            return self.step_x.item(slot), self.step_y.item(slot)
+        scale = delta_time / self.step_delta_time
+        return self.step_x.item(slot) * scale, self.step_y.item(slot) * scale
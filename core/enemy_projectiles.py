@@ -0,0 +1,330 @@
+"""
+エネミー弾丸の一括管理ストア（Structure of Arrays）
+
+全エネミーの弾丸を 1 つのストアに集め、位置・速度・サイズ・ダメージ・消滅時刻・発射元を
+連続した NumPy 配列で保持する。移動・寿命切れ・カリングは update() の 1 回のベクトル演算、
+プレイヤーとの当たり判定と武器による迎撃判定もそれぞれ 1 回の一括判定で行う。
+
+生存弾丸は先頭 count 件に発射順で詰めて保持するため、インデックスの小さい弾ほど古い。
+numpy が無い場合は EnemyProjectile オブジェクトのリストで同じ処理を行う。
+"""
+import itertools
+import math
+from constants import *
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+from systems import game_clock
+
+
+# 発射元（エネミー）ごとの一意な番号。id() と違い、倒された敵の番号が再利用されない
+_owner_ids = itertools.count(1)
+
+
+def next_owner_id():
+    return next(_owner_ids)
+
+
+class EnemyProjectileStore:
+    """全エネミーの弾丸を保持する SoA ストア"""
+
+    FLOAT_FIELDS = ('x', 'y', 'vx', 'vy', 'damage', 'expire_time')
+    INT_FIELDS = ('size', 'owner', 'behavior', 'color')
+
+    def __init__(self, capacity=256):
+        self.enabled = NUMPY_AVAILABLE
+        self.count = 0
+        self.capacity = 0
+        # 色パレット（color 列はこのリストのインデックス）
+        self._palette = []
+        self._palette_index = {}
+        # numpy が無い場合の弾丸オブジェクト
+        self._objects = []
+        if self.enabled:
+            self._grow(max(16, int(capacity)))
+
+    def __len__(self):
+        return self.count if self.enabled else len(self._objects)
+
+    def _grow(self, new_capacity):
+        """配列容量を拡張（既存値はコピー）"""
+        n = self.count
+        for name in self.FLOAT_FIELDS + self.INT_FIELDS + ('boss',):
+            if name == 'boss':
+                arr = np.zeros(new_capacity, dtype=bool)
+            elif name in self.INT_FIELDS:
+                arr = np.zeros(new_capacity, dtype='i8')
+            else:
+                arr = np.zeros(new_capacity, dtype='f8')
+            if self.capacity:
+                arr[:n] = getattr(self, name)[:n]
+            setattr(self, name, arr)
+        self.capacity = new_capacity
+
+    def _color_index(self, color):
+        index = self._palette_index.get(color)
+        if index is None:
+            index = len(self._palette)
+            self._palette.append(color)
+            self._palette_index[color] = index
+        return index
+
+    def clear(self):
+        self.count = 0
+        self._objects = []
+
+    # --- 生成・削除 ---
+
+    def spawn(self, x, y, angle, speed, damage, owner, behavior_type=3, enemy_level=1,
+              is_boss=False, max_per_owner=None):
+        """弾丸を 1 発生成する
+
+        max_per_owner を指定すると、同じ発射元の弾がその数に達している場合に最も古い弾を消す。
+        """
+        from core.enemy import EnemyProjectile
+
+        if not self.enabled:
+            if max_per_owner is not None:
+                owned = [p for p in self._objects if p.owner == owner]
+                if len(owned) >= max_per_owner:
+                    self._objects.remove(owned[0])
+            projectile = EnemyProjectile(x, y, angle, damage, behavior_type, enemy_level,
+                                         is_boss_bullet=is_boss, projectile_speed=speed)
+            projectile.owner = owner
+            self._objects.append(projectile)
+            return
+
+        if max_per_owner is not None:
+            owned = np.flatnonzero(self.owner[:self.count] == owner)
+            if len(owned) >= max_per_owner:
+                remove = np.zeros(self.count, dtype=bool)
+                remove[owned[:len(owned) - max_per_owner + 1]] = True
+                self._remove_mask(remove)
+
+        if self.count >= self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.count += 1
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = math.cos(angle) * speed
+        self.vy[i] = math.sin(angle) * speed
+        self.damage[i] = damage
+        self.expire_time[i] = game_clock.get_ticks() + ENEMY_PROJECTILE_LIFETIME
+        self.size[i] = EnemyProjectile.size_for(is_boss)
+        self.owner[i] = owner
+        self.behavior[i] = behavior_type
+        self.color[i] = self._color_index(EnemyProjectile.color_for(behavior_type, enemy_level, is_boss))
+        self.boss[i] = is_boss
+
+    def _remove_mask(self, remove):
+        """remove が True の弾を削除し、残りを発射順のまま先頭に詰める"""
+        n = self.count
+        keep = ~remove[:n]
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return
+        for name in self.FLOAT_FIELDS + self.INT_FIELDS + ('boss',):
+            arr = getattr(self, name)
+            arr[:kept] = arr[:n][keep]
+        self.count = kept
+
+    def remove(self, indices):
+        """インデックス（hit_player / intercepted の戻り値）の弾を削除"""
+        if not indices:
+            return
+        if not self.enabled:
+            drop = set(indices)
+            self._objects = [p for i, p in enumerate(self._objects) if i not in drop]
+            return
+        remove = np.zeros(self.count, dtype=bool)
+        remove[list(indices)] = True
+        self._remove_mask(remove)
+
+    # --- 更新 ---
+
+    def update(self, player=None, delta_time=1.0, live_owners=None):
+        """寿命切れ・ワールド外・プレイヤーから遠い通常弾・発射元が消えた弾を削除してから移動する"""
+        now = game_clock.get_ticks()
+        margin = ENEMY_PROJECTILE_WORLD_MARGIN
+        cull_sq = ENEMY_PROJECTILE_CULL_DISTANCE * ENEMY_PROJECTILE_CULL_DISTANCE
+
+        if not self.enabled:
+            owners = set(live_owners) if live_owners is not None else None
+            valid = []
+            for p in self._objects:
+                if p.is_expired() or not p.is_on_screen():
+                    continue
+                if owners is not None and p.owner not in owners:
+                    continue
+                if player is not None and not p.is_boss_bullet:
+                    dx = p.x - player.x
+                    dy = p.y - player.y
+                    if dx * dx + dy * dy > cull_sq:
+                        continue
+                valid.append(p)
+            self._objects = valid
+            for p in self._objects:
+                p.update(delta_time)
+            return
+
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        remove = self.expire_time[:n] <= now
+        remove |= (x < -margin) | (x > WORLD_WIDTH + margin) | (y < -margin) | (y > WORLD_HEIGHT + margin)
+        if live_owners is not None:
+            remove |= ~np.isin(self.owner[:n], np.fromiter(live_owners, dtype='i8'))
+        if player is not None:
+            dx = x - player.x
+            dy = y - player.y
+            remove |= ~self.boss[:n] & (dx * dx + dy * dy > cull_sq)
+        if remove.any():
+            self._remove_mask(remove)
+            n = self.count
+
+        self.x[:n] += self.vx[:n] * delta_time
+        self.y[:n] += self.vy[:n] * delta_time
+
+        # ボスの弾は森(5)と石/岩(9)でブロック（当たった弾は次の update で消える）
+        if USE_CSV_MAP and n:
+            boss_idx = np.flatnonzero(self.boss[:n])
+            if len(boss_idx):
+                from ui.stage import get_stage_map
+                blocked = np.asarray(get_stage_map().are_points_blocked(
+                    self.x[boss_idx], self.y[boss_idx], 'boss_bullet'), dtype=bool)
+                self.expire_time[boss_idx[blocked]] = now
+
+    # --- 当たり判定 ---
+
+    def hit_player(self, px, py, player_half):
+        """プレイヤーの矩形に重なる弾を古い順に (index, x, y, damage) のリストで返す"""
+        if not self.enabled:
+            hits = []
+            for i, p in enumerate(self._objects):
+                half = player_half + p.size // 2
+                if abs(px - p.x) < half and abs(py - p.y) < half:
+                    hits.append((i, p.x, p.y, p.damage))
+            return hits
+
+        n = self.count
+        if n == 0:
+            return []
+        half = player_half + self.size[:n] // 2
+        mask = (np.abs(self.x[:n] - px) < half) & (np.abs(self.y[:n] - py) < half)
+        idx = np.flatnonzero(mask)
+        return list(zip(idx.tolist(), self.x[idx].tolist(), self.y[idx].tolist(), self.damage[idx].tolist()))
+
+    def intercepted(self, attacks, exclude=()):
+        """武器の矩形に重なった通常弾（ボスの弾は相殺不可）を (index, x, y) のリストで返す
+
+        exclude のインデックス（このフレームでプレイヤーに当たった弾など）は対象外。
+        """
+        if not attacks:
+            return []
+        attack_data = [(a.x, a.y, getattr(a, 'size', 0) // 2) for a in attacks]
+
+        if not self.enabled:
+            skip = set(exclude)
+            hits = []
+            for i, p in enumerate(self._objects):
+                if i in skip or p.is_boss_bullet:
+                    continue
+                proj_half = p.size // 2
+                for ax, ay, attack_half in attack_data:
+                    half = attack_half + proj_half
+                    if abs(ax - p.x) < half and abs(ay - p.y) < half:
+                        hits.append((i, p.x, p.y))
+                        break
+            return hits
+
+        n = self.count
+        if n == 0:
+            return []
+        candidates = ~self.boss[:n]
+        if exclude:
+            candidates[list(exclude)] = False
+        idx = np.flatnonzero(candidates)
+        if len(idx) == 0:
+            return []
+        ax, ay, ah = (np.asarray(col, dtype='f8') for col in zip(*attack_data))
+        bx = self.x[idx]
+        by = self.y[idx]
+        half = ah[None, :] + (self.size[idx] // 2)[:, None]
+        mask = np.abs(bx[:, None] - ax[None, :]) < half
+        mask &= np.abs(by[:, None] - ay[None, :]) < half
+        hit = idx[mask.any(axis=1)]
+        return list(zip(hit.tolist(), self.x[hit].tolist(), self.y[hit].tolist()))
+
+    # --- 描画・統計 ---
+
+    def draw(self, screen, camera_x=0, camera_y=0, margin=0, alpha=1.0):
+        """画面内の弾をまとめて描画し、描画数を返す
+
+        alpha < 1.0 のときは前ティックとの間の位置（現在位置から速度 * (1 - alpha) 戻した位置）に描く。
+        """
+        from core.enemy import EnemyProjectile
+
+        width, height = screen.get_size()
+        if not self.enabled:
+            drawn = 0
+            for p in self._objects:
+                if (camera_x - margin <= p.x <= camera_x + width + margin and
+                        camera_y - margin <= p.y <= camera_y + height + margin):
+                    p.draw(screen, camera_x, camera_y)
+                    drawn += 1
+            return drawn
+
+        n = self.count
+        if n == 0:
+            return 0
+        x = self.x[:n]
+        y = self.y[:n]
+        visible = np.flatnonzero((x >= camera_x - margin) & (x <= camera_x + width + margin) &
+                                 (y >= camera_y - margin) & (y <= camera_y + height + margin))
+        if len(visible) == 0:
+            return 0
+        if alpha < 1.0:
+            back = 1.0 - alpha
+            sx = (x[visible] - self.vx[visible] * back - camera_x).astype(np.int64).tolist()
+            sy = (y[visible] - self.vy[visible] * back - camera_y).astype(np.int64).tolist()
+        else:
+            sx = (x[visible] - camera_x).astype(np.int64).tolist()
+            sy = (y[visible] - camera_y).astype(np.int64).tolist()
+        palette = self._palette
+        get_surface = EnemyProjectile.get_cached_surface
+        blits = []
+        for color, size, boss, bx, by in zip(self.color[visible].tolist(), self.size[visible].tolist(),
+                                             self.boss[visible].tolist(), sx, sy):
+            surf, offset = get_surface(palette[color], size, boss)
+            blits.append((surf, (bx - offset, by - offset)))
+        screen.blits(blits, doreturn=False)
+        return len(blits)
+
+    def counts_by_behavior(self):
+        """行動パターンごとの弾数 {behavior_type: count}"""
+        if not self.enabled:
+            counts = {}
+            for p in self._objects:
+                counts[p.behavior_type] = counts.get(p.behavior_type, 0) + 1
+            return counts
+        n = self.count
+        if n == 0:
+            return {}
+        behaviors, counts = np.unique(self.behavior[:n], return_counts=True)
+        return dict(zip(behaviors.tolist(), counts.tolist()))
+
+
+# ゲーム全体で共有するストア
+_store = None
+
+
+def get_enemy_projectiles():
+    """エネミー弾丸ストアのシングルトンインスタンスを取得"""
+    global _store
+    if _store is None:
+        _store = EnemyProjectileStore()
+    return _store
+
+
+__all__ = ['EnemyProjectileStore', 'get_enemy_projectiles', 'next_owner_id']
@@ -0,0 +1,311 @@
+"""
+追跡エネミー用のフローフィールド（タイルグリッド上の経路探索）
+
+ステージマップの障害物マスク（obstacle）の上で、プレイヤーのいるタイルを起点に
+8 近傍のダイクストラ法で距離場を作り、各タイルから 1 歩進むべき隣のタイルを記録する。
+追跡タイプ（行動パターン 1・4）のエネミーは自分のタイルの次のタイルの中心へ向かうだけでよく、
+経路計算は全エネミーで 1 回を共有する。
+
+- 作り直すのはプレイヤーのタイルが変わったときだけ。探索は FLOW_FIELD_NODES_PER_TICK ずつ
+  ティックに分けて進め、完成するまでは前回のフィールドを使う（メインスレッドのみで実行するため
+  ヘッドレス実行の再現性も保たれる）
+- 探索は起点から FLOW_FIELD_RADIUS タイル分の経路長までで打ち切る
+- 壁際・1 タイル幅の隙間はコストを上乗せし、群れが角や隙間で詰まりにくい経路を選ぶ
+- 起点から障害物に遮られずに見えるタイル・起点とその隣・探索範囲外では
+  従来どおりプレイヤーへ直進する（経路に従うのは回り込みが必要なエネミーだけ）
+- 斜め移動は両隣のタイルが空いている場合のみ（角のすり抜けをしない）
+"""
+
+import time
+import heapq
+from constants import USE_CSV_MAP, FLOW_FIELD_ENABLED, FLOW_FIELD_RADIUS, FLOW_FIELD_NODES_PER_TICK
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+
+# 移動コスト（直進 10、斜め 14 ≒ 10√2）
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
+NEIGHBORS = (
+    (1, 0, STRAIGHT_COST), (-1, 0, STRAIGHT_COST), (0, 1, STRAIGHT_COST), (0, -1, STRAIGHT_COST),
+    (1, 1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST),
+)
+# 障害物に隣接するタイルへ入る追加コスト（壁際を避けて角に引っかかりにくくする）
+WALL_PENALTY = 4
+# 両側を障害物に挟まれた 1 タイル幅の隙間へ入る追加コスト（群れが詰まりやすいので大きく回り込む）
+NARROW_PENALTY = 40
+# 直進してよいとみなす可視度（起点側の可視度の補間値。1.0 に近いほど障害物の影の縁から離れる）
+VISIBLE_THRESHOLD = 0.75
+UNREACHED = 1 << 30
+
+
+class FlowField:
+    """プレイヤーへのフローフィールド
+
+    ティックごとに update(player_x, player_y) を呼び、エネミーは target_at()（1 体）または
+    steer()（numpy 配列でまとめて）で進む方向を得る。
+    """
+
+    def __init__(self, radius=FLOW_FIELD_RADIUS, nodes_per_tick=FLOW_FIELD_NODES_PER_TICK, enabled=FLOW_FIELD_ENABLED):
+        self.radius_cost = max(1, int(radius)) * STRAIGHT_COST
+        self.nodes_per_tick = max(0, int(nodes_per_tick))
+        self.enabled = bool(enabled) and USE_CSV_MAP
+        self.width = 0
+        self.height = 0
+        self.tile_size = 1
+        self._blocked = None
+        self._penalty = None
+        # 完成したフィールド: タイルごとの向かう先のワールド座標（NaN は直進）
+        self.source = None
+        self.target_x = None
+        self.target_y = None
+        self._targets = None  # numpy が無い場合のリスト版（None は直進）
+        # 作成中の探索
+        self._build_source = None
+        self._heap = None
+        self._dist = None
+        self._next = None
+        # 統計
+        self.builds = 0
+        self.build_time = 0.0  # 直近に完成したフィールドの探索時間の合計（ms、ティックをまたいだ分も含む）
+
+    # --- マップ ---
+
+    def load(self, stage_map=None):
+        """ステージマップの障害物マスクを読み込む（初回の update で呼ばれる）"""
+        if stage_map is None:
+            try:
+                from ui.stage import get_stage_map
+                stage_map = get_stage_map()
+            except Exception:
+                stage_map = None
+        rows, tile_size, width = stage_map.get_mask_rows('obstacle') if stage_map is not None else ([], 1, 0)
+        if not rows or width <= 0:
+            self.enabled = False
+            return False
+        self.width = width
+        self.height = len(rows)
+        self.tile_size = tile_size
+        self._blocked = [(rows[ty] >> tx) & 1 == 1 for ty in range(self.height) for tx in range(width)]
+        self._penalty = [self._tile_penalty(i) for i in range(width * self.height)]
+        return True
+
+    def _is_blocked(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and self._blocked[y * self.width + x]
+
+    def _tile_penalty(self, i):
+        """タイルへ入るときの追加コスト（1 タイル幅の隙間・壁際）"""
+        x = i % self.width
+        y = i // self.width
+        if (self._is_blocked(x - 1, y) and self._is_blocked(x + 1, y)) or \
+                (self._is_blocked(x, y - 1) and self._is_blocked(x, y + 1)):
+            return NARROW_PENALTY
+        for dx, dy, _ in NEIGHBORS:
+            if self._is_blocked(x + dx, y + dy):
+                return WALL_PENALTY
+        return 0
+
+    def tile_of(self, x, y):
+        """ワールド座標のタイル番号（マップ外は -1）"""
+        tx = int(x // self.tile_size)
+        ty = int(y // self.tile_size)
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return ty * self.width + tx
+        return -1
+
+    # --- 作成 ---
+
+    def update(self, player_x, player_y):
+        """プレイヤーのタイルが変わっていれば探索を始め、作成中の探索を 1 ティック分進める"""
+        if not self.enabled:
+            return
+        if self._blocked is None and not self.load():
+            return
+        source = self.tile_of(player_x, player_y)
+        if source < 0 or self._blocked[source]:
+            # マップ外・障害物の上（noclip などで）にいる間は作り直さない
+            return
+        if source != self.source and source != self._build_source:
+            self._begin(source)
+        if self._heap:
+            self._advance()
+        elif self._heap is not None:
+            # 探索が終わった次のティックで向かう先を作って切り替える（1 ティックに処理を集中させない）
+            self._finish()
+
+    def _begin(self, source):
+        self._build_source = source
+        self._dist = [UNREACHED] * (self.width * self.height)
+        self._next = [-1] * (self.width * self.height)
+        self._dist[source] = 0
+        self._heap = [(0, source)]
+        self.build_time = 0.0
+
+    def _advance(self):
+        """ダイクストラ法を nodes_per_tick 回（0 なら最後まで）進める"""
+        start = time.perf_counter()
+        heap = self._heap
+        dist = self._dist
+        next_tile = self._next
+        blocked = self._blocked
+        penalty = self._penalty
+        width = self.width
+        height = self.height
+        limit = self.radius_cost
+        budget = self.nodes_per_tick or len(dist) * 8
+        heappop = heapq.heappop
+        heappush = heapq.heappush
+
+        while heap and budget > 0:
+            budget -= 1
+            d, i = heappop(heap)
+            if d != dist[i]:
+                continue
+            x = i % width
+            y = i // width
+            for dx, dy, cost in NEIGHBORS:
+                nx = x + dx
+                ny = y + dy
+                if nx < 0 or ny < 0 or nx >= width or ny >= height:
+                    continue
+                j = ny * width + nx
+                if blocked[j]:
+                    continue
+                if dx and dy and (blocked[y * width + nx] or blocked[ny * width + x]):
+                    continue
+                nd = d + cost + penalty[j]
+                if nd < dist[j] and nd <= limit:
+                    dist[j] = nd
+                    # j からは i に向かえば起点に近づく
+                    next_tile[j] = i
+                    heappush(heap, (nd, j))
+
+        self.build_time += (time.perf_counter() - start) * 1000.0
+
+    def _finish(self):
+        """探索結果からタイルごとの向かう先を作り、完成したフィールドとして切り替える"""
+        start = time.perf_counter()
+        source = self._build_source
+        width = self.width
+        half = self.tile_size * 0.5
+        visible = self._visibility(source % width, source // width)
+        if NUMPY_AVAILABLE:
+            next_tile = np.array(self._next, dtype=np.int64)
+            # 起点の隣・起点まで障害物に遮られないタイルは直進でよい（NaN）
+            routed = (next_tile >= 0) & (next_tile != source) & ~np.array(visible, dtype=bool)
+            self.target_x = np.where(routed, (next_tile % width) * self.tile_size + half, np.nan)
+            self.target_y = np.where(routed, (next_tile // width) * self.tile_size + half, np.nan)
+        else:
+            ts = self.tile_size
+            targets = [None] * len(self._next)
+            for i, j in enumerate(self._next):
+                if j >= 0 and j != source and not visible[i]:
+                    targets[i] = ((j % width) * ts + half, (j // width) * ts + half)
+            self._targets = targets
+        self.source = source
+        self.builds += 1
+        self.build_time += (time.perf_counter() - start) * 1000.0
+        self._build_source = None
+        self._heap = None
+        self._dist = None
+        self._next = None
+
+    def _visibility(self, sx, sy):
+        """起点タイルから遮られずに見えるタイル（探索範囲内のみ）
+
+        起点から外側へ 1 周ずつ、起点側の 2 つのタイル（主軸方向と斜め方向）の可視度を
+        傾きで線形補間して伝播する。障害物の影の縁も「見えない」として扱うため、
+        直進してよいのは障害物から少し離れた直線が通るタイルだけになる。
+        """
+        width = self.width
+        height = self.height
+        blocked = self._blocked
+        reach = self.radius_cost // STRAIGHT_COST
+        value = [0.0] * (width * height)
+        value[sy * width + sx] = 1.0
+        visible = [False] * (width * height)
+        for ring in range(1, reach + 1):
+            # 四隅（斜め 45 度）は同じ周の両隣を参照するため、周の他のタイルを先に処理する
+            for corners in (False, True):
+                for dy in range(max(-ring, -sy), min(ring, height - 1 - sy) + 1):
+                    ay = abs(dy)
+                    if corners and ay != ring:
+                        continue
+                    y = sy + dy
+                    uy = (dy > 0) - (dy < 0)
+                    row = y * width
+                    if corners:
+                        xs = (-ring, ring)
+                    elif ay == ring:
+                        xs = range(-ring + 1, ring)
+                    else:
+                        xs = (-ring, ring)
+                    for dx in xs:
+                        x = sx + dx
+                        if x < 0 or x >= width or blocked[row + x]:
+                            continue
+                        ax = abs(dx)
+                        ux = (dx > 0) - (dx < 0)
+                        i = row + x
+                        diagonal = value[i - uy * width - ux]
+                        if ax > ay:
+                            t = ay / ax
+                            v = (1.0 - t) * value[i - ux] + t * diagonal
+                        elif ay > ax:
+                            t = ax / ay
+                            v = (1.0 - t) * value[i - uy * width] + t * diagonal
+                        else:
+                            # 斜め 45 度は角のすり抜けをしないよう両隣も見えている必要がある
+                            v = min(diagonal, value[i - ux], value[i - uy * width])
+                        value[i] = v
+                        visible[i] = v >= VISIBLE_THRESHOLD
+        return visible
+
+    # --- 参照 ---
+
+    def target_at(self, x, y):
+        """(x, y) のエネミーが向かうべき位置（直進でよい場合は None）"""
+        i = self.tile_of(x, y)
+        if i < 0:
+            return None
+        if self.target_x is not None:
+            tx = self.target_x.item(i)
+            return None if tx != tx else (tx, self.target_y.item(i))
+        return self._targets[i] if self._targets is not None else None
+
+    def steer(self, xs, ys, ux, uy):
+        """プレイヤー方向の単位ベクトル (ux, uy) を、回り込みが必要なエネミーだけ経路方向に置き換える（numpy 配列）"""
+        if self.target_x is None or len(xs) == 0:
+            return ux, uy
+        tx = np.floor_divide(xs, self.tile_size).astype(np.int64)
+        ty = np.floor_divide(ys, self.tile_size).astype(np.int64)
+        inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+        index = np.where(inside, ty * self.width + tx, 0)
+        goal_x = np.where(inside, self.target_x[index], np.nan)
+        goal_y = np.where(inside, self.target_y[index], np.nan)
+        routed = ~np.isnan(goal_x)
+        if not routed.any():
+            return ux, uy
+        dx = np.where(routed, goal_x - xs, 0.0)
+        dy = np.where(routed, goal_y - ys, 0.0)
+        length = np.hypot(dx, dy)
+        routed &= length > 0
+        safe = np.where(routed, length, 1.0)
+        return np.where(routed, dx / safe, ux), np.where(routed, dy / safe, uy)
+
+    def publish_stats(self, stats):
+        stats['flow_field_builds'] = self.builds
+        stats['flow_field_time'] = self.build_time
+
+
+# ゲーム全体で共有するフローフィールド
+_flow_field = None
+
+
+def get_flow_field():
+    """フローフィールドのシングルトンインスタンスを取得"""
+    global _flow_field
+    if _flow_field is None:
+        _flow_field = FlowField()
+    return _flow_field
+
+
+__all__ = ['FlowField', 'get_flow_field']
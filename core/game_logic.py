@@ -8,7 +8,7 @@ import pygame
 from constants import *
 from core.enemy import Enemy
 from effects.items import ExperienceGem, GameItem
-from effects.particles import DeathParticle, SpawnParticle
+from effects.particles import DeathParticle, SpawnParticle, emit_particles
 from core.game_utils import enforce_experience_gems_limit
 
 
@@ -111,8 +111,7 @@ def handle_enemy_death(enemy, enemies, experience_gems, items, particles, damage
     """敵死亡時の処理"""
     if enemy.hp <= 0:
         # 死亡エフェクト
-        for _ in range(8):
-            particles.append(DeathParticle(enemy.x, enemy.y, enemy.color))
+        emit_particles(particles, 'death', enemy.x, enemy.y, enemy.color, count=8)
         
         # アイテムドロップ判定
         rand = random.random()
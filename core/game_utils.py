@@ -6,6 +6,7 @@
 import random
 from constants import MAX_GEMS_ON_SCREEN
 from effects.items import ExperienceGem
+from effects.particles import ParticleList
 
 
 def enforce_experience_gems_limit(gems, max_gems=MAX_GEMS_ON_SCREEN, player_x=None, player_y=None):
@@ -114,6 +115,9 @@ def init_game_state(screen, save_system=None):
         pass
     
     enemies = []
+    # 前のゲームの敵弾を破棄
+    from core.enemy_projectiles import get_enemy_projectiles
+    get_enemy_projectiles().clear()
     experience_gems = []
     items = []
     game_over = False
@@ -124,7 +128,7 @@ def init_game_state(screen, save_system=None):
     spawn_interval = 60
     game_time = 0
     last_difficulty_increase = 0
-    particles = []  # パーティクルリストを追加
+    particles = ParticleList()  # パーティクルリスト（単純パーティクルは配列で管理）
     # ダメージ記録: { weapon_type: total_damage }
     damage_stats = {}
     # 無敵タイマー初期化（ミリ秒タイムスタンプ）
@@ -156,5 +160,8 @@ def is_point_in_rect(point_x, point_y, rect_x, rect_y, rect_width, rect_height):
 
 def limit_particles(particles, max_particles=300, trim_to=220):
     """パーティクル数を制限して古いものから削除"""
-    if len(particles) > max_particles:
+    trim = getattr(particles, 'trim', None)
+    if trim is not None:
+        trim(max_particles, trim_to)
+    elif len(particles) > max_particles:
         particles[:] = particles[-trim_to:]
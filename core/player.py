@@ -4,6 +4,7 @@ import random
 import os
 import sys
 from constants import *
+from systems import game_clock
 from weapons.melee import Whip, Garlic
 from weapons.projectile import HolyWater, MagicWand, Axe, Stone, RotatingBook, Knife, Thunder
 from ui.subitems import get_default_subitems, random_upgrade
@@ -144,7 +145,7 @@ class Player:
         # フラグ・サブアイテム
         self.auto_heal_on_level_up = False
         self.natural_regen_base = 0
-        self.last_regen_ms = pygame.time.get_ticks()
+        self.last_regen_ms = game_clock.get_ticks()
         try:
             self.subitem_templates = get_default_subitems()
         except Exception:
@@ -243,35 +244,12 @@ class Player:
                     from ui.stage import get_stage_map
                     stage_map = get_stage_map()
                     
-                    # プレイヤーの四隅をチェック
-                    corners = [
-                        (new_x - self.size//2, new_y - self.size//2),  # 左上
-                        (new_x + self.size//2, new_y - self.size//2),  # 右上
-                        (new_x - self.size//2, new_y + self.size//2),  # 左下
-                        (new_x + self.size//2, new_y + self.size//2),  # 右下
-                    ]
-                    
-                    # X軸方向の移動をチェック
-                    x_blocked = False
+                    # X軸方向・Y軸方向それぞれの移動先の矩形を障害物マスクで判定
                     test_x = self.x + nx * sp * delta_time
-                    for corner_x, corner_y in [(test_x - self.size//2, self.y - self.size//2), 
-                                               (test_x + self.size//2, self.y - self.size//2),
-                                               (test_x - self.size//2, self.y + self.size//2),
-                                               (test_x + self.size//2, self.y + self.size//2)]:
-                        if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                            x_blocked = True
-                            break
+                    x_blocked = stage_map.is_entity_blocked(test_x, self.y, self.size)
                     
-                    # Y軸方向の移動をチェック
-                    y_blocked = False
                     test_y = self.y + ny * sp * delta_time
-                    for corner_x, corner_y in [(self.x - self.size//2, test_y - self.size//2),
-                                               (self.x + self.size//2, test_y - self.size//2),
-                                               (self.x - self.size//2, test_y + self.size//2),
-                                               (self.x + self.size//2, test_y + self.size//2)]:
-                        if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                            y_blocked = True
-                            break
+                    y_blocked = stage_map.is_entity_blocked(self.x, test_y, self.size)
                     
                     # 移動を適用
                     if not x_blocked:
@@ -305,6 +283,17 @@ class Player:
         self.prev_x = float(self.x)
         self.prev_y = float(self.y)
 
+        # 歩行アニメーションはティックごとに進める（描画FPSに依存しないように）
+        if self.frames:
+            if math.hypot(self.vx, self.vy) > 0.1:
+                self.anim_tick += 1
+                if self.anim_tick >= self.anim_speed:
+                    self.anim_tick = 0
+                    self.frame_index = (self.frame_index + 1) % len(self.frames)
+            else:
+                self.frame_index = 0
+                self.anim_tick = 0
+
     def update_attacks(self, enemies, camera_x=None, camera_y=None, get_virtual_mouse_pos=None):
         self.active_attacks = [a for a in self.active_attacks if not a.is_expired()]
         import inspect
@@ -362,18 +351,8 @@ class Player:
         elif self.vx > 0.1:
             self.facing = 'right'
 
-        moving = math.hypot(self.vx, self.vy) > 0.1
         if self.frames:
-            if moving:
-                self.anim_tick += 1
-                if self.anim_tick >= self.anim_speed:
-                    self.anim_tick = 0
-                    self.frame_index = (self.frame_index + 1) % len(self.frames)
-            else:
-                self.frame_index = 0
-                self.anim_tick = 0
-
-            frame = self.frames[self.frame_index]
+            frame = self.frames[self.frame_index % len(self.frames)]
             target_size = (int(r * 2), int(r * 2))
             frame_s = pygame.transform.scale(frame, target_size)
             if self.facing == 'right':
@@ -795,7 +774,7 @@ class Player:
     def update_regen(self, delta_time=1.0):
         """自然回復（HPサブアイテム所持時のみ有効）。2秒ごとに1回復。"""
         try:
-            now = pygame.time.get_ticks()
+            now = game_clock.get_ticks()
             # 死亡中は回復しない
             if getattr(self, 'hp', 0) <= 0:
                 self.last_regen_ms = now
@@ -855,14 +834,14 @@ class Player:
 
     def activate_magnet(self):
         """マグネット効果を有効化"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         self.magnet_active = True
         self.magnet_end_time = current_time + MAGNET_EFFECT_DURATION_MS
 
     def update_magnet_effect(self):
         """マグネット効果の状態を更新"""
         if self.magnet_active:
-            current_time = pygame.time.get_ticks()
+            current_time = game_clock.get_ticks()
             if current_time >= self.magnet_end_time:
                 self.magnet_active = False
 
@@ -877,7 +856,7 @@ class Player:
 
     def activate_screen_shake(self, intensity=None):
         """画面揺れエフェクトを有効化"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         self.screen_shake_active = True
         self.screen_shake_end_time = current_time + SCREEN_SHAKE_DURATION_MS
         self.screen_shake_intensity = intensity if intensity is not None else SCREEN_SHAKE_INTENSITY
@@ -885,7 +864,7 @@ class Player:
     def update_screen_shake(self):
         """画面揺れエフェクトの状態を更新"""
         if self.screen_shake_active:
-            current_time = pygame.time.get_ticks()
+            current_time = game_clock.get_ticks()
             if current_time >= self.screen_shake_end_time:
                 self.screen_shake_active = False
                 self.screen_shake_intensity = 0
@@ -897,7 +876,7 @@ class Player:
         
         import random
         # 時間経過で強度を減衰
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         remaining_time = max(0, self.screen_shake_end_time - current_time)
         time_ratio = remaining_time / SCREEN_SHAKE_DURATION_MS
         current_intensity = self.screen_shake_intensity * time_ratio
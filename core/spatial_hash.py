@@ -0,0 +1,149 @@
+"""
+エネミー近傍検索用の永続ユニフォームグリッド（空間ハッシュ）
+
+毎フレーム辞書を作り直す代わりに、セルをまたいだエンティティだけを
+移動させるインクリメンタル更新を行う。
+"""
+from constants import ENEMY_COLLISION_SEPARATION_FACTOR
+
+# 近傍検索のセルサイズ（ピクセル）
+SPATIAL_HASH_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """ユニフォームグリッドによる空間ハッシュ
+
+    エンティティは x, y, size 属性を持つ任意のオブジェクト。
+    セル内は挿入順を保持する辞書で管理するため、検索結果の順序は実行ごとに安定する。
+    """
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = int(cell_size)
+        # (gx, gy) -> {id(obj): obj}
+        self._cells = {}
+        # id(obj) -> (gx, gy)
+        self._where = {}
+        # id(obj) -> obj（削除検出用）
+        self._objects = {}
+        # 登録エンティティの最大サイズ（検索半径の決定に使用）
+        self.max_size = 0
+
+    def _cell_of(self, x, y):
+        try:
+            return (int(x) // self.cell_size, int(y) // self.cell_size)
+        except Exception:
+            return (0, 0)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, obj):
+        return id(obj) in self._objects
+
+    def clear(self):
+        """全エンティティを削除"""
+        self._cells.clear()
+        self._where.clear()
+        self._objects.clear()
+        self.max_size = 0
+
+    def insert(self, obj):
+        """エンティティを登録（登録済みなら位置を更新）"""
+        oid = id(obj)
+        if oid in self._objects:
+            self.update(obj)
+            return
+        key = self._cell_of(obj.x, obj.y)
+        self._cells.setdefault(key, {})[oid] = obj
+        self._where[oid] = key
+        self._objects[oid] = obj
+        size = getattr(obj, 'size', 0)
+        if size > self.max_size:
+            self.max_size = size
+
+    def remove(self, obj):
+        """エンティティを削除（未登録なら何もしない）"""
+        oid = id(obj)
+        key = self._where.pop(oid, None)
+        self._objects.pop(oid, None)
+        if key is None:
+            return
+        cell = self._cells.get(key)
+        if cell is not None:
+            cell.pop(oid, None)
+            if not cell:
+                del self._cells[key]
+
+    def update(self, obj):
+        """エンティティの位置変化を反映（セルが変わった場合のみ移動）"""
+        oid = id(obj)
+        old_key = self._where.get(oid)
+        if old_key is None:
+            self.insert(obj)
+            return
+        new_key = self._cell_of(obj.x, obj.y)
+        if new_key == old_key:
+            return
+        cell = self._cells.get(old_key)
+        if cell is not None:
+            cell.pop(oid, None)
+            if not cell:
+                del self._cells[old_key]
+        self._cells.setdefault(new_key, {})[oid] = obj
+        self._where[oid] = new_key
+
+    def sync(self, objects):
+        """リストの内容とグリッドを同期する
+
+        新規エンティティの登録・消えたエンティティの削除・セル移動をまとめて行う。
+        スポーンやリポップなどリストが様々な箇所で変更される場合に使う。
+        """
+        current = {}
+        max_size = 0
+        for obj in objects:
+            current[id(obj)] = obj
+            size = getattr(obj, 'size', 0)
+            if size > max_size:
+                max_size = size
+
+        # 消えたエンティティを削除
+        for oid in [oid for oid in self._objects if oid not in current]:
+            self.remove(self._objects[oid])
+
+        # 新規登録とセル移動
+        for obj in current.values():
+            self.update(obj)
+
+        self.max_size = max_size
+
+    def query(self, x, y, radius):
+        """(x, y) から半径 radius の正方形に重なるセルのエンティティを返す
+
+        セル単位の粗い判定なので、呼び出し側で距離判定を行うこと。
+        """
+        cs = self.cell_size
+        try:
+            min_gx = int(x - radius) // cs
+            max_gx = int(x + radius) // cs
+            min_gy = int(y - radius) // cs
+            max_gy = int(y + radius) // cs
+        except Exception:
+            return []
+
+        result = []
+        cells = self._cells
+        for gy in range(min_gy, max_gy + 1):
+            for gx in range(min_gx, max_gx + 1):
+                cell = cells.get((gx, gy))
+                if cell:
+                    result.extend(cell.values())
+        return result
+
+    def query_neighbors(self, obj, reach=0.0):
+        """obj と衝突しうる近傍エンティティを返す（obj 自身は除く）
+
+        reach にはこのフレームで obj が動きうる距離を渡す。
+        """
+        factor = float(ENEMY_COLLISION_SEPARATION_FACTOR)
+        radius = (getattr(obj, 'size', 0) + self.max_size) * factor + reach
+        return [o for o in self.query(obj.x, obj.y, radius) if o is not obj]
@@ -4,10 +4,16 @@ import os
 import sys
 from constants import *
 from utils.file_paths import get_resource_path
+from systems import asset_pack
+from systems import game_clock
 
 class Attack:
     # 武器画像のキャッシュ
     _weapon_image_cache = {}
+
+    # 描画フレームキャッシュ（全インスタンス共有）: key -> Surface または回転フレームのリスト
+    _frame_cache = {}
+    _frame_cache_pixels = 0
     
     def __init__(self, x, y, size_x, size_y, type_, duration=1000, target=None, 
                  speed=0, bounces=0, follow_player=None, direction=None, 
@@ -19,7 +25,7 @@ class Attack:
         self.size_y = size_y
         self.size = max(size_x, size_y) // 2  # 当たり判定用
         self.type = type_
-        self.creation_time = pygame.time.get_ticks()
+        self.creation_time = game_clock.get_ticks()
         self.duration = duration
         self.target = target
         self.speed = speed
@@ -40,7 +46,7 @@ class Attack:
         self.spawn_delay = 0
         self._pending = False
 
-        # 同一攻撃が同じ敵を繰り返しヒットするのを防ぐための記録（id(enemy)を格納）
+        # 同一攻撃が同じ敵を繰り返しヒットするのを防ぐための記録（enemy.projectile_owner_id を格納）
         self.hit_targets = set()
 
         # 魔法の杖の場合、ターゲットへの移動方向を設定
@@ -55,16 +61,17 @@ class Attack:
         self.original_size = max(size_x, size_y)  # パルスエフェクト用に元のサイズを保存
         self.pulse_timer = 0  # パルスのタイミング用
 
-        # holy_water 用の描画キャッシュサーフェス
-        if self.type == "holy_water":
-            self.holy_surf = None
-            self.holy_surf_size = 0
-
     @classmethod
     def _load_weapon_image(cls, weapon_type):
         """武器の画像を読み込む（キャッシュ機能付き）"""
         if weapon_type in cls._weapon_image_cache:
             return cls._weapon_image_cache[weapon_type]
+
+        # アセットパックにあればそれを使う
+        packed = asset_pack.get_surface(f"weapon/{weapon_type}")
+        if packed is not None:
+            cls._weapon_image_cache[weapon_type] = packed
+            return packed
         
         # 画像ファイルパスを構築
         image_path = get_resource_path(os.path.join("assets", "weapons", f"{weapon_type}.png"))
@@ -81,10 +88,127 @@ class Attack:
             cls._weapon_image_cache[weapon_type] = None
             return None
 
+    @classmethod
+    def _store_frame(cls, key, frame, pixels):
+        """描画フレームをキャッシュに登録（上限ピクセル数を超える場合は一度クリア）"""
+        if cls._frame_cache_pixels + pixels > ATTACK_FRAME_CACHE_MAX_PIXELS:
+            cls._frame_cache.clear()
+            cls._frame_cache_pixels = 0
+        cls._frame_cache[key] = frame
+        cls._frame_cache_pixels += pixels
+        return frame
+
+    @classmethod
+    def _get_rotated_frame(cls, name, image, w, h, angle_degrees, alpha=255):
+        """スケール済み・回転済みの画像を取得
+
+        (name, w, h, alpha) ごとに ATTACK_ROTATION_STEPS 方向分をまとめて事前回転し、
+        angle_degrees に最も近い向きのフレームを返す（pygame.transform.rotate と同じく -angle で回転）。
+        """
+        key = ('rotate', name, w, h, alpha)
+        frames = cls._frame_cache.get(key)
+        if frames is None:
+            base = pygame.transform.scale(image, (w, h))
+            step = 360.0 / ATTACK_ROTATION_STEPS
+            frames = []
+            pixels = 0
+            for i in range(ATTACK_ROTATION_STEPS):
+                frame = pygame.transform.rotate(base, -i * step) if i else base.copy()
+                if alpha < 255:
+                    frame.set_alpha(alpha)
+                frames.append(frame)
+                pixels += frame.get_width() * frame.get_height()
+            cls._store_frame(key, frames, pixels)
+        index = int(round(angle_degrees * ATTACK_ROTATION_STEPS / 360.0)) % ATTACK_ROTATION_STEPS
+        return frames[index]
+
+    @classmethod
+    def _get_pulse_frame(cls, kind, r, phase):
+        """ガーリック・聖水のリップル描画済みフレームを取得
+
+        半径は ATTACK_PULSE_SIZE_RATIO 刻み、位相（ラジアン）は1周期 ATTACK_PULSE_PHASE_STEPS 段階に
+        量子化し、同じ (種類, 半径, 位相) のフレームを全インスタンスで共有する。
+        """
+        r = max(2, int(round(ATTACK_PULSE_SIZE_RATIO ** round(math.log(max(2, r)) / math.log(ATTACK_PULSE_SIZE_RATIO)))))
+        step = int(phase / (2 * math.pi) * ATTACK_PULSE_PHASE_STEPS) % ATTACK_PULSE_PHASE_STEPS
+        key = ('pulse', kind, r, step)
+        frame = cls._frame_cache.get(key)
+        if frame is None:
+            phase = step * 2 * math.pi / ATTACK_PULSE_PHASE_STEPS
+            if kind == "garlic":
+                frame = cls._render_garlic_frame(r, phase)
+            else:
+                frame = cls._render_holy_water_frame(r, phase)
+            cls._store_frame(key, frame, frame.get_width() * frame.get_height())
+        return frame
+
+    @staticmethod
+    def _render_holy_water_frame(r, phase):
+        """聖水の半透明の水面（塗り + リップル）を描画したサーフェスを作る"""
+        surf_size = r * 2 + 8
+        s = pygame.Surface((surf_size, surf_size), pygame.SRCALPHA)
+        center = (surf_size // 2, surf_size // 2)
+
+        # ベースの半透明フィル
+        base_alpha = 110
+        pygame.draw.circle(s, (30, 140, 200, base_alpha), center, r)
+
+        # 位相に応じて動くリップル（同心円）を数本描く
+        for i in range(3):
+            frac = (math.sin(phase + i * 0.6) * 0.5 + 0.5)
+            rr = int(r * (0.6 + 0.6 * frac))
+            alpha = int(80 * (1.0 - i * 0.25) * (0.4 + 0.6 * (1 - frac)))
+            if alpha > 0:
+                pygame.draw.circle(s, (80, 180, 230, max(10, alpha)), center, rr, 2)
+
+        # 軽いノイズのストロークを追加（薄め）
+        try:
+            pygame.draw.circle(s, (20, 100, 160, 24), center, int(r*0.9), 1)
+        except Exception:
+            pass
+        return s
+
+    @staticmethod
+    def _render_garlic_frame(r, phase):
+        """ガーリックの中心から透過した赤で拡散する見た目を描画したサーフェスを作る"""
+        surf_size = r * 2 + 12
+        gs = pygame.Surface((surf_size, surf_size), pygame.SRCALPHA)
+        center = (surf_size // 2, surf_size // 2)
+
+        # 中心の半透明フィルでソフトな光を作る
+        base_alpha = 90
+        pygame.draw.circle(gs, (200, 40, 40, base_alpha), center, r)
+
+        # 位相に応じて動く薄いリップル（同心円）を数本描画して拡散感を演出
+        for i in range(3):
+            frac = (math.sin(phase + i * 0.6) * 0.5 + 0.5)
+            rr = int(r * (0.7 + 0.8 * frac))
+            alpha = int(100 * (1.0 - i * 0.25) * (0.4 + 0.6 * (1 - frac)))
+            if alpha > 0:
+                pygame.draw.circle(gs, (255, 80, 80, max(8, alpha)), center, rr, 2)
+
+        # 内側の柔らかいグローを追加
+        try:
+            pygame.draw.circle(gs, (255, 120, 120, 40), center, int(r*0.6))
+        except Exception:
+            pass
+        return gs
+
+    @classmethod
+    def _get_circle_frame(cls, radius, color):
+        """塗りつぶし円（半透明）のサーフェスを取得（グロー・閃光用）"""
+        key = ('circle', radius, color)
+        frame = cls._frame_cache.get(key)
+        if frame is None:
+            frame = pygame.Surface((radius*2+2, radius*2+2), pygame.SRCALPHA)
+            pygame.draw.circle(frame, color, (radius+1, radius+1), radius)
+            cls._store_frame(key, frame, frame.get_width() * frame.get_height())
+        return frame
+
     def update(self, camera_x=None, camera_y=None):
         # spawn_delay が設定されている場合は開始まで待機する
         if getattr(self, '_pending', False) and getattr(self, 'spawn_delay', 0) > 0:
-            now = pygame.time.get_ticks()
+            now = game_clock.get_ticks()
             if now - self.creation_time < self.spawn_delay:
                 # まだ待機中: 何もせず早期リターン
                 return
@@ -113,7 +237,7 @@ class Attack:
                 self.size = self.size_x // 2
             elif self.type == "whip":
                 # プレイヤーからシュッと一直線に伸び縮みするムチ表現
-                elapsed = pygame.time.get_ticks() - self.creation_time
+                elapsed = game_clock.get_ticks() - self.creation_time
                 t = min(max(elapsed / max(1, self.duration), 0.0), 1.0)
                 extend = math.sin(math.pi * t) ** 2
 
@@ -221,7 +345,7 @@ class Attack:
                         self.y = target_y
                         self.struck = True
                         # 小さなウェーブ/エフェクトが出るように duration を短く保つ
-                        self.creation_time = pygame.time.get_ticks()
+                        self.creation_time = game_clock.get_ticks()
                         self.duration = 300
                 else:
                     # 既に着地後は短時間その場に留まる（is_expired によって消える）
@@ -308,7 +432,7 @@ class Attack:
                 pass
 
     def is_expired(self):
-        return (pygame.time.get_ticks() - self.creation_time >= self.duration or 
+        return (game_clock.get_ticks() - self.creation_time >= self.duration or 
                 (self.type == "stone" and self.bounces_remaining < 0))
 
     def draw(self, screen, camera_x=0, camera_y=0):
@@ -331,7 +455,7 @@ class Attack:
             pts = getattr(self, 'whip_points', None)
             # フォールバック: update() が未実行でもここでポイントを計算
             if not pts:
-                elapsed = pygame.time.get_ticks() - self.creation_time
+                elapsed = game_clock.get_ticks() - self.creation_time
                 t = min(max(elapsed / max(1, self.duration), 0.0), 1.0)
                 extend = math.sin(math.pi * t) ** 2
                 length = getattr(self, 'length', max(self.size_x, self.size_y))
@@ -374,36 +498,10 @@ class Attack:
         elif self.type == "holy_water":
             # 半透明の水面を描画（塗り + リップル）
             try:
-                r = max(2, int(self.size))
-                surf_size = r * 2 + 8
-                # キャッシュサーフェスをサイズ変化時に生成
-                if getattr(self, 'holy_surf', None) is None or self.holy_surf_size != surf_size:
-                    self.holy_surf = pygame.Surface((surf_size, surf_size), pygame.SRCALPHA)
-                    self.holy_surf_size = surf_size
-
-                s = self.holy_surf
-                s.fill((0, 0, 0, 0))
-
-                # ベースの半透明フィル
-                base_alpha = 110
-                pygame.draw.circle(s, (30, 140, 200, base_alpha), (surf_size//2, surf_size//2), r)
-
-                # 時間に応じて動くリップル（同心円）を数本描く
-                elapsed = pygame.time.get_ticks() - self.creation_time
-                # 周期を200msに設定して滑らかに動かす
-                for i in range(3):
-                    phase = (elapsed / 200.0 + i * 0.6)
-                    frac = (math.sin(phase) * 0.5 + 0.5)
-                    rr = int(r * (0.6 + 0.6 * frac))
-                    alpha = int(80 * (1.0 - i * 0.25) * (0.4 + 0.6 * (1 - frac)))
-                    if alpha > 0:
-                        pygame.draw.circle(s, (80, 180, 230, max(10, alpha)), (surf_size//2, surf_size//2), rr, 2)
-
-                # 軽いノイズのストロークを追加（薄め）
-                try:
-                    pygame.draw.circle(s, (20, 100, 160, 24), (surf_size//2, surf_size//2), int(r*0.9), 1)
-                except Exception:
-                    pass
+                # 時間に応じて動くリップル（周期200ms基準）の描画済みフレームを使う
+                elapsed = game_clock.get_ticks() - self.creation_time
+                s = Attack._get_pulse_frame("holy_water", self.size, elapsed / 200.0)
+                surf_size = s.get_width()
 
                 # ブリット（カメラオフセットを考慮）
                 screen.blit(s, (sx - surf_size//2, sy - surf_size//2))
@@ -412,36 +510,10 @@ class Attack:
                 pygame.draw.circle(screen, CYAN, (int(sx), int(sy)), self.size, 2)
         elif self.type == "garlic":
             try:
-                # 中心から透過した赤で拡散する見た目を作る
-                r = max(2, int(self.size_x/2))
-                surf_size = r * 2 + 12
-                # サイズが変わったらキャッシュサーフェスを再生成
-                if getattr(self, 'garlic_surf', None) is None or getattr(self, 'garlic_surf_size', 0) != surf_size:
-                    self.garlic_surf = pygame.Surface((surf_size, surf_size), pygame.SRCALPHA)
-                    self.garlic_surf_size = surf_size
-
-                gs = self.garlic_surf
-                gs.fill((0, 0, 0, 0))
-
-                # 中心の半透明フィルでソフトな光を作る
-                base_alpha = 90
-                pygame.draw.circle(gs, (200, 40, 40, base_alpha), (surf_size//2, surf_size//2), r)
-
-                # 時間経過で動く薄いリップル（同心円）を数本描画して拡散感を演出
-                elapsed = pygame.time.get_ticks() - self.creation_time
-                for i in range(3):
-                    phase = (elapsed / 180.0 + i * 0.6)
-                    frac = (math.sin(phase) * 0.5 + 0.5)
-                    rr = int(r * (0.7 + 0.8 * frac))
-                    alpha = int(100 * (1.0 - i * 0.25) * (0.4 + 0.6 * (1 - frac)))
-                    if alpha > 0:
-                        pygame.draw.circle(gs, (255, 80, 80, max(8, alpha)), (surf_size//2, surf_size//2), rr, 2)
-
-                # 内側の柔らかいグローを追加
-                try:
-                    pygame.draw.circle(gs, (255, 120, 120, 40), (surf_size//2, surf_size//2), int(r*0.6))
-                except Exception:
-                    pass
+                # 中心から透過した赤で拡散する見た目（パルスで毎フレーム変わる半径は量子化して共有）
+                elapsed = game_clock.get_ticks() - self.creation_time
+                gs = Attack._get_pulse_frame("garlic", self.size_x / 2, elapsed / 180.0)
+                surf_size = gs.get_width()
 
                 # ブリット（カメラオフセットを考慮）
                 screen.blit(gs, (sx - surf_size//2, sy - surf_size//2))
@@ -494,10 +566,8 @@ class Attack:
                 glow_layers = [ (self.size+6, (200,120,255,20)), (self.size+3, (210,140,255,60)), (self.size, (255,200,255,200)) ]
                 for radius, col in glow_layers:
                     rr = int(radius)
-                    gs = pygame.Surface((rr*2+2, rr*2+2), pygame.SRCALPHA)
                     try:
-                        pygame.draw.circle(gs, col, (rr+1, rr+1), rr)
-                        screen.blit(gs, (sx - rr - 1, sy - rr - 1))
+                        screen.blit(Attack._get_circle_frame(rr, col), (sx - rr - 1, sy - rr - 1))
                     except Exception:
                         pass
 
@@ -515,32 +585,9 @@ class Attack:
                     # 画像サイズを90%に縮小（当たり判定とのバランス調整）
                     w, h = int(self.size_x * 0.8), int(self.size_y * 0.8)
                     angle_degrees = math.degrees(self.angle)
-                    
-                    # 回転角度を30度刻みに丸めてキャッシュ効率をさらに改善
-                    angle_rounded = round(angle_degrees / 30) * 30
-                    
-                    # 統合キャッシュを使用
-                    if not hasattr(Attack, '_axe_unified_cache'):
-                        Attack._axe_unified_cache = {}
-                    
-                    cache_key = f"axe_{w}x{h}_r{angle_rounded}"
-                    
-                    if cache_key not in Attack._axe_unified_cache:
-                        # 一度に全ての変換を適用
-                        scaled_image = pygame.transform.scale(self.weapon_image, (w, h))
-                        if angle_rounded != 0:
-                            rotated_image = pygame.transform.rotate(scaled_image, -angle_rounded)
-                        else:
-                            rotated_image = scaled_image
-                        Attack._axe_unified_cache[cache_key] = rotated_image
-                        
-                        # キャッシュサイズ制限を強化
-                        if len(Attack._axe_unified_cache) > 48:  # 360/30 = 12方向 × 4サイズ程度
-                            keys = list(Attack._axe_unified_cache.keys())
-                            for old_key in keys[:12]:
-                                del Attack._axe_unified_cache[old_key]
-                    
-                    cached_image = Attack._axe_unified_cache[cache_key]
+
+                    # サイズごとに事前回転したフレームから最も近い向きを選ぶ
+                    cached_image = Attack._get_rotated_frame("axe", self.weapon_image, w, h, angle_degrees)
                     rotated_rect = cached_image.get_rect()
                     rotated_rect.center = (sx, sy)
                     screen.blit(cached_image, rotated_rect.topleft)
@@ -599,7 +646,7 @@ class Attack:
             # 回転する本のテクスチャを描画（プレイヤーを中心に外向き）- 軽量化版
             try:
                 # フレームスキップによる軽量化（2フレームに1回だけ角度更新）
-                current_frame = pygame.time.get_ticks() // 16  # 約60FPS基準
+                current_frame = game_clock.get_ticks() // 16  # 約60FPS基準
                 if not hasattr(self, '_last_rotation_frame'):
                     self._last_rotation_frame = -1
                     self._cached_rotation = 0
@@ -619,11 +666,8 @@ class Attack:
                         self._cached_rotation = 0
                     self._last_rotation_frame = current_frame
                 
-                # 回転角度を30度刻みに丸めてキャッシュ効率をさらに改善
-                book_rotation_rounded = round(self._cached_rotation / 30) * 30
-                
                 # フェード計算を簡略化
-                elapsed = pygame.time.get_ticks() - getattr(self, 'creation_time', 0)
+                elapsed = game_clock.get_ticks() - getattr(self, 'creation_time', 0)
                 dur = max(1, int(getattr(self, 'duration', 1000)))
                 
                 # 簡単なフェード計算（計算量削減）
@@ -638,37 +682,12 @@ class Attack:
                 alpha_level = int(alpha_ratio * 4) * 25  # 5段階に削減: 0, 25, 50, 75, 100
                 alpha = int(255 * alpha_level / 100)
                 
-                # キャッシュキーを簡略化
-                cache_key = f"book_{w}x{h}_r{book_rotation_rounded}_a{alpha_level}"
-                
-                # 統合キャッシュ（1段階キャッシュに簡略化）
-                if not hasattr(Attack, '_book_unified_cache'):
-                    Attack._book_unified_cache = {}
-                
-                if cache_key not in Attack._book_unified_cache:
-                    try:
-                        book_image = Attack._load_weapon_image("rotating_book")
-                        if book_image:
-                            # 一度に全ての変換を適用
-                            book_scaled = pygame.transform.scale(book_image, (w, h))
-                            if book_rotation_rounded != 0:
-                                book_scaled = pygame.transform.rotate(book_scaled, -book_rotation_rounded)
-                            if alpha < 255:
-                                book_scaled = book_scaled.copy()
-                                book_scaled.set_alpha(alpha)
-                            Attack._book_unified_cache[cache_key] = book_scaled
-                        else:
-                            Attack._book_unified_cache[cache_key] = None
-                    except Exception:
-                        Attack._book_unified_cache[cache_key] = None
-                    
-                    # キャッシュサイズ制限を強化
-                    if len(Attack._book_unified_cache) > 60:  # 制限をより厳しく
-                        keys = list(Attack._book_unified_cache.keys())
-                        for old_key in keys[:15]:
-                            del Attack._book_unified_cache[old_key]
-                
-                final_texture = Attack._book_unified_cache[cache_key]
+                # サイズ・フェード段階ごとに事前回転したフレームから最も近い向きを選ぶ
+                book_image = Attack._load_weapon_image("rotating_book")
+                final_texture = None
+                if book_image:
+                    final_texture = Attack._get_rotated_frame("rotating_book", book_image, w, h,
+                                                              self._cached_rotation, alpha)
                 if final_texture:
                     tw, th = final_texture.get_size()
                     screen.blit(final_texture, (sx - tw//2, sy - th//2))
@@ -721,10 +740,8 @@ class Attack:
                     cx = int(self.x - camera_x)
                     cy = int(self.y - camera_y)
                     r = max(6, int(self.size))
-                    s = pygame.Surface((r*4+4, r*4+4), pygame.SRCALPHA)
-                    pygame.draw.circle(s, (255, 255, 200, 180), (r*2+2, r*2+2), r)
                     try:
-                        screen.blit(s, (cx - (r*2+2), cy - (r*2+2)))
+                        screen.blit(Attack._get_circle_frame(r, (255, 255, 200, 180)), (cx - (r+1), cy - (r+1)))
                     except Exception:
                         pass
                     pygame.draw.circle(screen, (255, 230, 120), (cx, cy), r, 2)
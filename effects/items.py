@@ -4,6 +4,7 @@ import math
 import random
 from constants import *
 from systems.resources import load_icons
+from systems import game_clock
 
 
 class ExperienceGem:
@@ -19,7 +20,7 @@ class ExperienceGem:
         # 引き寄せ状態フラグ（プレイヤーに向かって移動中かどうか）
         self.being_attracted = False
         # 生成時刻
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
         # 基本寿命（ミリ秒）- この値はピックアップ範囲に応じて延長される
         self.base_lifetime = 30000  # 30秒
         self.extended_lifetime = 0  # 延長された寿命
@@ -62,7 +63,7 @@ class ExperienceGem:
 
     def is_expired(self):
         """ジェムが寿命切れかどうかを判定"""
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         total_lifetime = self.base_lifetime + self.extended_lifetime
         return (current_time - self.spawn_time) > total_lifetime
 
@@ -134,7 +135,7 @@ class GameItem:
         self.collected = False
         
         # 出現アニメーション用
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
         self.spawn_scale = 0.0  # 開始時はサイズ0
         self.spawn_duration = 300  # 出現アニメーション時間（ミリ秒）
         
@@ -179,7 +180,7 @@ class GameItem:
 
     def draw(self, screen, camera_x=0, camera_y=0):
         # 出現アニメーションのスケール計算
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         time_since_spawn = current_time - self.spawn_time
         
         if time_since_spawn < self.spawn_duration:
@@ -292,7 +293,7 @@ class MoneyItem:
         self.collected = False
         
         # 出現アニメーション用
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
         self.spawn_scale = 0.0  # 開始時はサイズ0
         self.spawn_duration = 300  # 出現アニメーション時間（ミリ秒）
         
@@ -413,7 +414,7 @@ class MoneyItem:
 
     def draw(self, screen, camera_x=0, camera_y=0):
         # 出現アニメーションのスケール計算
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         time_since_spawn = current_time - self.spawn_time
         
         if time_since_spawn < self.spawn_duration:
@@ -427,8 +428,8 @@ class MoneyItem:
         if self.spawn_scale <= 0:
             return
             
-        # アニメーション更新
-        self.animation_time += 0.1
+        # アニメーション更新（経過時間ベース。60FPS で 1 フレーム 0.1 進むのと同じ速さ）
+        self.animation_time = time_since_spawn * 0.006
         self.bob_offset = math.sin(self.animation_time) * 2  # 上下にふわふわ
         
         display_y = self.y + self.bob_offset
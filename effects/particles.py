@@ -2,7 +2,8 @@ import pygame
 import math
 import random
 from constants import *
-from systems.resources import get_font
+from systems.resources import get_font, render_text, draw_text, text_size
+from utils.optional_numpy import np, NUMPY_AVAILABLE
 
 class DeathParticle:
     def __init__(self, x, y, color):
@@ -177,6 +178,9 @@ class SpawnParticle:
 class DamageNumber:
     """敵の上に一時的に表示されるダメージ数。素早くフェードイン・フェードアウトする."""
     font = None
+    # (amount, color, alpha) -> グリフアトラスから組み立て済みのサーフェス（全インスタンス共有）
+    _surface_cache = {}
+    _surface_cache_limit = 8192
 
     def __init__(self, x, y, amount, color=WHITE):
         self.x = x
@@ -195,6 +199,24 @@ class DamageNumber:
             except Exception:
                 DamageNumber.font = pygame.font.SysFont(None, 18)
 
+    @classmethod
+    def _get_surface(cls, amount, color, alpha=255):
+        """ダメージ値の描画済みサーフェスを取得（初回のみグリフから組み立て）
+
+        フェード中のアルファは寿命が固定なので数段階しかなく、ピクセルのアルファに焼き込んでおく
+        （サーフェスアルファ付きのブリットより速い）。
+        """
+        key = (amount, color, alpha)
+        surf = cls._surface_cache.get(key)
+        if surf is None:
+            if len(cls._surface_cache) >= cls._surface_cache_limit:
+                cls._surface_cache.clear()
+            surf = render_text(cls.font, str(amount), color).copy()
+            if alpha < 255:
+                surf.fill((255, 255, 255, max(0, alpha)), special_flags=pygame.BLEND_RGBA_MULT)
+            cls._surface_cache[key] = surf
+        return surf
+
     def update(self):
         # 上に移動しつつタイマーを減らす
         self.y += self.vy
@@ -211,13 +233,8 @@ class DamageNumber:
         else:
             alpha = 255
 
-        # テキストを描画（中央揃え）
-        text_surf = DamageNumber.font.render(str(self.amount), True, self.color)
-        # サーフェスにアルファを適用してからブリット
-        try:
-            text_surf.set_alpha(alpha)
-        except Exception:
-            pass
+        # テキストを描画（中央揃え）。同じ値・色・アルファのサーフェスは使い回す
+        text_surf = self._get_surface(self.amount, self.color, alpha)
         screen.blit(text_surf, (int(self.x - text_surf.get_width() / 2 - camera_x), int(self.y - text_surf.get_height() / 2 - camera_y)))
 
 
@@ -254,24 +271,19 @@ class LuckyText:
             alpha = 255
         alpha = max(0, min(255, alpha))
 
-        text_surf = LuckyText.font.render(str(self.text), True, self.color)
-        try:
-            text_surf.set_alpha(alpha)
-        except Exception:
-            pass
-
+        # 毎フレームの font.render を避け、グリフアトラス（またはテキストキャッシュ）から描く
+        text = str(self.text)
         sx = int(self.x - camera_x)
         sy = int(self.y - camera_y)
-        rect = text_surf.get_rect(center=(sx, sy))
+        rect = pygame.Rect((0, 0), text_size(LuckyText.font, text))
+        rect.center = (sx, sy)
 
         # ささやかなシャドウ
         try:
-            shadow = LuckyText.font.render(str(self.text), True, (0, 0, 0))
-            shadow.set_alpha(max(40, int(alpha * 0.6)))
-            screen.blit(shadow, rect.move(1, 1))
+            draw_text(screen, LuckyText.font, text, (0, 0, 0), rect.move(1, 1).topleft, max(40, int(alpha * 0.6)))
         except Exception:
             pass
-        screen.blit(text_surf, rect)
+        draw_text(screen, LuckyText.font, text, self.color, rect.topleft, alpha)
 
 
 class HealEffect:
@@ -480,4 +492,292 @@ class BossDeathFlash:
         sy = int(self.y - camera_y)
         surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
         pygame.draw.circle(surf, (200, 200, 0, alpha), (radius, radius), radius)
-        screen.blit(surf, (sx - radius, sy - radius))
\ No newline at end of file
+        screen.blit(surf, (sx - radius, sy - radius))
+
+
+# --- 配列ベースの単純パーティクル ---
+
+# 単純パーティクルの種類: kind -> (寿命フレーム, 1フレームの縮小量)
+SIMPLE_PARTICLE_KINDS = {
+    'death': (30, 0.1),
+    'hurt': (20, 0.12),
+    'spawn': (18, 0.15),
+}
+
+# 配列エンジンに取り込むクラス -> kind
+_SIMPLE_PARTICLE_CLASSES = {
+    DeathParticle: 'death',
+    PlayerHurtParticle: 'hurt',
+    SpawnParticle: 'spawn',
+}
+
+HURT_PARTICLE_COLOR = (255, 100, 100)
+
+
+class SimpleParticleEngine:
+    """DeathParticle / PlayerHurtParticle / SpawnParticle を NumPy 配列で一括管理する
+
+    生存パーティクルは先頭 count 件に詰めて保持し（生成順）、それ以降の領域を
+    空きスロットとして再利用する。update() は 1 回のベクトル演算と詰め直しで終わる。
+    emit() は要求を溜めるだけで、配列への生成（乱数を含む）は次の update / draw でまとめて行う。
+    """
+
+    FIELDS = ('x', 'y', 'dx', 'dy', 'life', 'size', 'shrink')
+
+    def __init__(self, capacity=512):
+        self.count = 0
+        self.capacity = 0
+        # 未生成の emit 要求: (kind, x, y, color, count)
+        self._pending = []
+        self._pending_count = 0
+        self._grow(max(16, int(capacity)))
+
+    def __len__(self):
+        return self.count + self._pending_count
+
+    def _grow(self, new_capacity):
+        """配列容量を拡張（既存値はコピー）"""
+        n = self.count
+        for name in self.FIELDS:
+            arr = np.zeros(new_capacity, dtype='f8')
+            if self.capacity:
+                arr[:n] = getattr(self, name)[:n]
+            setattr(self, name, arr)
+        color = np.zeros((new_capacity, 3), dtype='u1')
+        if self.capacity:
+            color[:n] = self.color[:n]
+        self.color = color
+        self.capacity = new_capacity
+
+    def _reserve(self, count):
+        """count 件分の空きスロットを確保して先頭インデックスを返す"""
+        start = self.count
+        need = start + count
+        if need > self.capacity:
+            new_capacity = self.capacity
+            while new_capacity < need:
+                new_capacity *= 2
+            self._grow(new_capacity)
+        self.count = need
+        return start
+
+    def clear(self):
+        self.count = 0
+        self._pending = []
+        self._pending_count = 0
+
+    def emit(self, kind, x, y, color, count=1):
+        """kind のパーティクルを count 個生成する要求を追加"""
+        count = int(count)
+        if count <= 0:
+            return
+        self._pending.append((kind, x, y, color, count))
+        self._pending_count += count
+
+    def flush(self):
+        """溜まった emit 要求を種類ごとにまとめて配列へ生成（乱数もまとめて引く）"""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        self._pending_count = 0
+
+        by_kind = {}
+        for request in pending:
+            by_kind.setdefault(request[0], []).append(request)
+
+        for kind, requests in by_kind.items():
+            lifetime, shrink = SIMPLE_PARTICLE_KINDS[kind]
+            counts = [r[4] for r in requests]
+            total = sum(counts)
+            start = self._reserve(total)
+            sl = slice(start, start + total)
+
+            if kind == 'spawn':
+                self.dx[sl] = np.random.uniform(-1.5, 1.5, total)
+                self.dy[sl] = np.random.uniform(-1.5, 1.5, total)
+                self.size[sl] = np.random.randint(3, 7, total)
+            else:
+                speed = np.random.uniform(2, 5, total)
+                angle = np.radians(np.random.uniform(0, 360, total))
+                self.dx[sl] = np.cos(angle) * speed
+                self.dy[sl] = np.sin(angle) * speed
+                self.size[sl] = np.random.randint(2, 5, total)
+
+            self.x[sl] = np.repeat([r[1] for r in requests], counts)
+            self.y[sl] = np.repeat([r[2] for r in requests], counts)
+            self.color[sl] = np.repeat([tuple(r[3])[:3] for r in requests], counts, axis=0)
+            self.life[sl] = lifetime
+            self.shrink[sl] = shrink
+
+    def add_object(self, particle, kind):
+        """生成済みのパーティクルオブジェクトを配列に取り込む"""
+        self.flush()
+        i = self._reserve(1)
+        lifetime, shrink = SIMPLE_PARTICLE_KINDS[kind]
+        self.x[i] = particle.x
+        self.y[i] = particle.y
+        self.dx[i] = particle.dx
+        self.dy[i] = particle.dy
+        self.life[i] = getattr(particle, 'timer', getattr(particle, 'lifetime', lifetime))
+        self.size[i] = particle.size
+        self.shrink[i] = shrink
+        self.color[i] = tuple(particle.color)[:3]
+
+    def update(self):
+        """全パーティクルを 1 フレーム進め、寿命切れを詰めて取り除く"""
+        self.flush()
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        x += self.dx[:n]
+        y += self.dy[:n]
+        life = self.life[:n]
+        life -= 1
+        size = self.size[:n]
+        size -= self.shrink[:n]
+        np.maximum(size, 0, out=size)
+
+        alive = life > 0
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        k = len(keep)
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:k] = arr[:n][keep]
+        self.color[:k] = self.color[:n][keep]
+        self.count = k
+
+    def trim(self, keep):
+        """新しいものから keep 件だけ残す"""
+        self.flush()
+        keep = max(0, int(keep))
+        n = self.count
+        if n <= keep:
+            return
+        drop = n - keep
+        for name in self.FIELDS:
+            arr = getattr(self, name)
+            arr[:keep] = arr[drop:n]
+        self.color[:keep] = self.color[drop:n]
+        self.count = keep
+
+    def draw(self, screen, camera_x, camera_y, bounds=None, limit=None):
+        """画面内のパーティクルを描画し、(描画数, カリング数) を返す
+
+        bounds は (left, top, right, bottom) のワールド座標。limit を超える分は古いものから省く。
+        """
+        self.flush()
+        n = self.count
+        if n == 0:
+            return 0, 0
+        radius = self.size[:n].astype(np.int32)
+        visible = radius > 0
+        if bounds is not None:
+            left, top, right, bottom = bounds
+            x, y = self.x[:n], self.y[:n]
+            visible &= (x >= left) & (x <= right) & (y >= top) & (y <= bottom)
+        idx = np.flatnonzero(visible)
+        culled = n - len(idx)
+        if limit is not None and len(idx) > limit:
+            idx = idx[len(idx) - max(0, int(limit)):]
+
+        sx = (self.x[idx] - camera_x).astype(np.int32).tolist()
+        sy = (self.y[idx] - camera_y).astype(np.int32).tolist()
+        rr = radius[idx].tolist()
+        colors = [tuple(c) for c in self.color[idx].tolist()]
+        draw_circle = pygame.draw.circle
+        for px, py, r, c in zip(sx, sy, rr, colors):
+            draw_circle(screen, c, (px, py), r)
+        return len(idx), culled
+
+
+class ParticleList(list):
+    """パーティクル管理リスト
+
+    DamageNumber や BossDeathEffect などの複雑なエフェクトは従来通りオブジェクトとして
+    リストに保持し、DeathParticle / PlayerHurtParticle / SpawnParticle は append された時点で
+    配列エンジン（simple）に取り込む。len() は両方の合計を返す。
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__()
+        self.simple = SimpleParticleEngine() if NUMPY_AVAILABLE else None
+        for particle in iterable:
+            self.append(particle)
+
+    def __len__(self):
+        simple = self.simple
+        return list.__len__(self) + (len(simple) if simple is not None else 0)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def object_count(self):
+        return list.__len__(self)
+
+    def append(self, particle):
+        simple = self.simple
+        if simple is not None:
+            kind = _SIMPLE_PARTICLE_CLASSES.get(type(particle))
+            if kind is not None:
+                simple.add_object(particle, kind)
+                return
+        list.append(self, particle)
+
+    def emit(self, kind, x, y, color=None, count=1):
+        """単純パーティクルを count 個生成"""
+        emit_particles(self, kind, x, y, color, count)
+
+    def clear(self):
+        list.clear(self)
+        if self.simple is not None:
+            self.simple.clear()
+
+    def update(self):
+        """全パーティクルを 1 フレーム進め、終了したエフェクトを取り除く"""
+        if self.simple is not None:
+            self.simple.update()
+        alive = []
+        for p in list.__iter__(self):
+            try:
+                if p.update():
+                    alive.append(p)
+            except Exception:
+                # エフェクトの update で例外が出てもゲームを継続する
+                pass
+        self[:] = alive
+
+    def trim(self, max_particles, trim_to):
+        """合計が max_particles を超えたら古いものから削って trim_to 件にする（単純パーティクル優先）"""
+        if len(self) <= max_particles:
+            return
+        objects = list.__len__(self)
+        if self.simple is not None:
+            self.simple.trim(max(0, trim_to - objects))
+        if objects > trim_to:
+            del self[:objects - trim_to]
+
+
+def emit_particles(particles, kind, x, y, color=None, count=1):
+    """単純パーティクルを count 個生成して particles に追加する
+
+    particles が ParticleList なら配列エンジンにまとめて生成し、
+    通常のリストなら従来のパーティクルオブジェクトを追加する。
+    """
+    if kind == 'hurt':
+        color = HURT_PARTICLE_COLOR
+    simple = getattr(particles, 'simple', None)
+    if simple is not None:
+        simple.emit(kind, x, y, color, count)
+        return
+    for _ in range(int(count)):
+        if kind == 'death':
+            particles.append(DeathParticle(x, y, color))
+        elif kind == 'hurt':
+            particles.append(PlayerHurtParticle(x, y))
+        else:
+            particles.append(SpawnParticle(x, y, color))
@@ -5,61 +5,21 @@ import random
 import os
 import time
 import multiprocessing as mp
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from constants import *
 from core.audio import audio
 
-# マルチプロセシング対応関数
-def process_enemy_batch(enemy_data_batch, player_data, game_data):
-    """エネミーバッチの並列処理"""
-    results = []
-    player_x, player_y, player_half, player_avoidance = player_data
-    current_time = game_data.get('current_time', 0)
-    
-    for enemy_data in enemy_data_batch:
-        enemy_id, enemy_x, enemy_y, projectiles_data = enemy_data
-        
-        for proj_id, proj_x, proj_y, proj_size in projectiles_data:
-            proj_half = proj_size // 2
-            # 衝突判定
-            if (abs(player_x - proj_x) < player_half + proj_half and 
-                abs(player_y - proj_y) < player_half + proj_half):
-                # 回避判定
-                avoided = random.random() < player_avoidance
-                results.append({
-                    'enemy_id': enemy_id,
-                    'projectile_id': proj_id,
-                    'collision': True,
-                    'avoided': avoided,
-                    'hit_pos': (proj_x, proj_y)
-                })
-    
-    return results
+def interpolation_offset(x, y, prev_x, prev_y, alpha):
+    """補間描画用のオフセット（前ティックと現ティックの位置を alpha で補間した位置 - 現在位置）
 
-def process_enemy_updates(enemy_data_batch, player_data, dt):
-    """エネミーの更新処理を並列化"""
-    results = []
-    player_x, player_y = player_data
-    
-    for enemy_data in enemy_data_batch:
-        enemy_id, enemy_x, enemy_y, enemy_type = enemy_data
-        # 簡単な移動計算（実際のAIロジックは簡素化）
-        dx = player_x - enemy_x
-        dy = player_y - enemy_y
-        distance = math.sqrt(dx*dx + dy*dy)
-        
-        if distance > 0:
-            speed = 1.0  # 基本速度
-            move_x = (dx / distance) * speed * dt
-            move_y = (dy / distance) * speed * dt
-            
-            results.append({
-                'enemy_id': enemy_id,
-                'new_x': enemy_x + move_x,
-                'new_y': enemy_y + move_y
-            })
-    
-    return results
+    カメラ座標からこの値を引いて描画すると補間位置に描かれる。
+    1 ティックで INTERPOLATION_SNAP_DISTANCE 以上動いた場合（ワープ・再配置）は補間しない。
+    """
+    dx = prev_x - x
+    dy = prev_y - y
+    if alpha >= 1.0 or abs(dx) > INTERPOLATION_SNAP_DISTANCE or abs(dy) > INTERPOLATION_SNAP_DISTANCE:
+        return 0, 0
+    t = 1.0 - alpha
+    return int(round(dx * t)), int(round(dy * t))
 
 def draw_test_checkerboard(surface, camera_x, camera_y):
     """テスト用の市松模様背景を描画"""
@@ -88,19 +48,32 @@ def draw_test_checkerboard(surface, camera_x, camera_y):
 from core.player import Player
 from core.enemy import Enemy
 from core.enemy_spawn_manager import EnemySpawnManager
+from core.spatial_hash import SpatialHash
+from core.enemy_pool import EnemyPool
+from core.ai_lod import AiLodScheduler
+from core.flow_field import get_flow_field
+from core.enemy_projectiles import get_enemy_projectiles
 from effects.items import ExperienceGem, GameItem, MoneyItem
-from effects.particles import DeathParticle, PlayerHurtParticle, HurtFlash, LevelUpEffect, SpawnParticle, DamageNumber, AvoidanceParticle, HealEffect, AutoHealEffect
-from ui.ui import draw_ui, draw_minimap, draw_level_choice, draw_end_buttons, get_end_button_rects
+from effects.particles import DeathParticle, PlayerHurtParticle, HurtFlash, LevelUpEffect, SpawnParticle, DamageNumber, AvoidanceParticle, HealEffect, AutoHealEffect, ParticleList
+from ui.ui import draw_ui, hud_state_key, draw_minimap, draw_level_choice, draw_end_buttons, get_end_button_rects
+from ui.compositor import LayerCompositor
 from ui.stage import draw_stage_background
 from ui.box import BoxManager  # アイテムボックス管理用
 import systems.resources as resources
-from core.game_utils import init_game_state, limit_particles, enforce_experience_gems_limit
+from core.game_utils import init_game_state, enforce_experience_gems_limit
 from core.game_logic import (spawn_enemies, handle_enemy_death, handle_bomb_item_effect, 
                        update_difficulty, handle_player_level_up, collect_experience_gems, collect_items)
-from core.collision import check_player_enemy_collision, check_attack_enemy_collision
+from core.collision import check_player_enemy_collision, check_attack_enemy_collision, broadphase_attack_enemy_pairs
 from map import MapLoader
 from systems.save_system import SaveSystem
 from systems.performance_logger import PerformanceLogger
+from systems.job_system import JobSystem
+from systems.enemy_process_backend import EnemyProcessBackend
+from systems.cpu_metrics import CpuMetrics
+from systems.quality_governor import QualityGovernor
+from systems.profiler import profiler
+from systems import game_clock
+from systems.startup_loader import create_game_loader, LoadingScreen
 
 # ランタイムで切り替え可能なデバッグフラグ（F3でトグル）
 DEBUG_MODE = DEBUG
@@ -112,6 +85,15 @@ performance_stats = {
     'collision_check_time': 0.0,
     'enemy_update_time': 0.0,
     'render_time': 0.0,
+    'frame_skip_count': 0,    # 描画を省略して追加で回したティック数（遅れの取り戻し）
+    'render_fps': NORMAL_FPS,  # 描画の目標FPS（大画面時は FULLSCREEN_FPS）
+    'quality_level': 0,       # 品質ガバナーの段階（0 が最高品質）
+    'quality_load': 0.0,      # 直近の平均処理時間（フレーム予算に対する %）
+    'ai_lod_full': 0,         # 毎ティック更新したエネミー数（描画範囲内・ボス）
+    'ai_lod_reduced': 0,      # AI LOD で間引いた間隔の更新を行ったエネミー数
+    'ai_lod_deferred': 0,     # AI LOD でこのティックの更新を見送ったエネミー数
+    'flow_field_builds': 0,   # フローフィールドを作り直した回数
+    'flow_field_time': 0.0,   # 直近のフローフィールドの探索時間の合計（ms）
     'entities_count': {
         'enemies': 0,
         'particles': 0,
@@ -120,23 +102,32 @@ performance_stats = {
     },
     'parallel_enabled': PARALLEL_PROCESSING_ENABLED,
     'parallel_threads': 0,
-    'cpu_usage': 0.0,
-    'cpu_cores_used': 0,      # 実際に使用中のCPUコア数
-    'cpu_efficiency': 0.0,    # CPU効率（理論値に対する実際の使用率）
+    'parallel_jobs': 0,           # ワーカーに投入したバッチ数
+    'parallel_inline_jobs': 0,    # その場で実行したバッチ数
+    'parallel_queue_time': 0.0,   # バッチ投入から実行開始までの平均待ち時間（ms）
+    'parallel_max_queue_time': 0.0,
+    'parallel_wait_time': 0.0,    # メインスレッドがバリアで待った時間（ms）
+    'parallel_busy_time': 0.0,    # ワーカーの処理時間の合計（ms）
+    'parallel_busy_cpu_time': 0.0,  # そのうちワーカーが CPU を使っていた時間（ms）
+    'parallel_speedup': 0.0,      # バリア待ち 1ms あたりのワーカーの CPU 時間（1.0 未満なら並列化が逆効果）
+    'process_backend_workers': 0,   # エネミー移動のワーカープロセス数（無効時は 0）
+    'process_backend_enemies': 0,   # このティックにワーカープロセスで動かしたエネミー数
+    'process_backend_wait': 0.0,    # ワーカープロセスのバリア待ち時間（ms）
+    'process_backend_main': 0.0,    # ワーカープロセス使用時のメインプロセス側の逐次処理時間（ms）
+    'cpu_usage': 0.0,         # プロセス全体の CPU 使用率（全コアに対する %）
+    'cpu_cores_used': 0.0,    # 実際に使っているコア数（CPU 時間 / 経過時間）
+    'cpu_efficiency': 0.0,    # ワーカーがバッチ処理中に CPU を使えていた割合（%）
+    'cpu_frame_wall_time': 0.0,   # 描画フレーム 1 回分の経過時間（ms）
+    'cpu_process_time': 0.0,      # その間のプロセス全体の CPU 時間（ms）
+    'cpu_main_thread_time': 0.0,  # その間のメインスレッドの CPU 時間（ms）
+    'cpu_worker_time': 0.0,       # その間のワーカーの CPU 時間（ms）
+    'main_thread_load': 0.0,  # メインスレッドの負荷（フレーム予算に対する %、平滑化）
+    'gil_contention': 0.0,    # GIL 競合の推定（ワーカーが CPU を使えなかった割合 %）
     'draw_calls': 0,          # 描画呼び出し数
     'culled_entities': 0,     # カリングされたエンティティ数
     'visible_entities': 0,    # 描画されたエンティティ数
 }
 
-def measure_time(func):
-    """時間測定デコレータ"""
-    def wrapper(*args, **kwargs):
-        start_time = pygame.time.get_ticks()
-        result = func(*args, **kwargs)
-        end_time = pygame.time.get_ticks()
-        return result, (end_time - start_time)
-    return wrapper
-
 def draw_performance_stats(surface, font):
     """パフォーマンス統計を描画"""
     if not SHOW_PERFORMANCE_STATS or not font:
@@ -153,33 +144,49 @@ def draw_performance_stats(surface, font):
         f"Collision: {stats['collision_check_time']:.1f}ms", 
         f"Enemies: {stats['enemy_update_time']:.1f}ms",
         f"Render: {stats['render_time']:.1f}ms",
+        f"Ticks/frame: {stats.get('frame_skip_count', 0) + 1} (render target {stats.get('render_fps', NORMAL_FPS)} FPS)",
+        f"Quality: level {stats.get('quality_level', 0)} (load {stats.get('quality_load', 0):.0f}% of budget)",
         f"",
         f"=== CPU Usage ===",
-        f"CPU: {stats.get('cpu_usage', 0):.1f}% ({stats.get('cpu_cores_used', 0)}/{mp.cpu_count()} cores)",
-        f"CPU Efficiency: {stats.get('cpu_efficiency', 0):.1f}%",
-        f"Threads: {stats.get('parallel_threads', 0)}",
+        f"CPU: {stats.get('cpu_usage', 0):.1f}% ({stats.get('cpu_cores_used', 0):.2f}/{mp.cpu_count()} cores busy)",
+        f"Main thread: {stats.get('cpu_main_thread_time', 0):.1f}ms CPU ({stats.get('main_thread_load', 0):.0f}% of frame)",
+        f"Workers: {stats.get('parallel_busy_cpu_time', 0):.2f}ms CPU / {stats.get('parallel_busy_time', 0):.2f}ms busy",
+        f"GIL contention: ~{stats.get('gil_contention', 0):.0f}%  speedup: x{stats.get('parallel_speedup', 0):.2f}",
+        f"Threads: {stats.get('parallel_threads', 0)} (jobs {stats.get('parallel_jobs', 0)} / inline {stats.get('parallel_inline_jobs', 0)})",
+        f"Job queue: {stats.get('parallel_queue_time', 0):.2f}ms  wait: {stats.get('parallel_wait_time', 0):.2f}ms",
+        f"Processes: {stats.get('process_backend_workers', 0)} ({stats.get('process_backend_enemies', 0)} enemies, main {stats.get('process_backend_main', 0):.2f}ms, wait {stats.get('process_backend_wait', 0):.2f}ms)",
+        "Top threads: " + (", ".join(f"{name} {pct:.0f}%" for name, pct in stats.get('cpu_thread_usage', [])[:3]) or "n/a (psutil)"),
         f"",
         f"=== Entity Counts ===",
         f"Enemies: {stats['entities_count']['enemies']}",
         f"Particles: {stats['entities_count']['particles']}",
         f"Gems: {stats['entities_count']['gems']}",
         f"Projectiles: {stats['entities_count']['projectiles']}",
+        f"AI LOD: {stats.get('ai_lod_full', 0)} full / {stats.get('ai_lod_reduced', 0)} reduced / {stats.get('ai_lod_deferred', 0)} deferred",
+        f"Flow field: {stats.get('flow_field_builds', 0)} builds ({stats.get('flow_field_time', 0):.2f}ms last)",
         f"",
         f"Parallel: {'ON' if stats['parallel_enabled'] else 'OFF'}",
         f"F8: Toggle Parallel Processing",
         f"F9: Toggle Performance Stats",
-        f"F10: Toggle Performance Log"
+        f"F10: Toggle Performance Log",
+        f"F12: Export Profiler Trace"
     ]
     
     for i, text in enumerate(perf_texts):
         if text:  # 空行はスキップ
             color = GREEN if "ON" in text else (RED if "OFF" in text else WHITE)
-            text_surface = font.render(text, True, color)
-            surface.blit(text_surface, (10, y_offset + i * 15))
+            # 計測値は毎フレーム変わるため、テキストキャッシュを通さずグリフを直接描く
+            resources.draw_text(surface, font, text, color, (10, y_offset + i * 15))
+
 
+def main(sim=None):
+    """ゲームのメインループ
 
-def main():
-    global DEBUG_MODE
+    sim に systems.headless_sim.HeadlessSimulation を渡すと、固定ステップ・自動選択・
+    フレーム待ちなしで本番の更新パスを回すヘッドレス実行になる。
+    """
+    global DEBUG_MODE, PARALLEL_PROCESSING_ENABLED
+    startup_start = time.perf_counter()  # 起動から操作可能になるまでの時間計測用
     
     # マルチプロセシング対応の初期化
     mp.set_start_method('spawn', force=True)  # Windowsでの安定性向上
@@ -206,7 +213,9 @@ def main():
     pygame.display.set_caption("Van Survivor Clone")
     
     # 仮想画面（ゲームロジックは常にこのサイズで動作）
-    virtual_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # 背景・HUD のレイヤーと合わせてフレーム間で使い回す
+    compositor = LayerCompositor((SCREEN_WIDTH, SCREEN_HEIGHT))
+    virtual_screen = compositor.target
     
     # スケーリング係数（描画用）とキャッシュサーフェス
     scale_factor = 1.0
@@ -214,8 +223,25 @@ def main():
     offset_y = 0
     scaled_surface = None  # スケール済みサーフェスのキャッシュ
 
-    # リソースをプリロード（アイコン・フォント・サウンド等）
-    preload_res = resources.preload_all(icon_size=16)
+    # CSV・セーブ・マップ・フォント・サウンド・画像をバックグラウンドで読み込み、その間ローディング画面を表示
+    startup_loader = create_game_loader()
+    if sim is not None:
+        startup_loader.run()
+    else:
+        loading_screen = LoadingScreen(startup_loader, screen.get_size())
+        loading_clock = pygame.time.Clock()
+        startup_loader.start()
+        while not startup_loader.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+            loading_screen.draw(screen)
+            pygame.display.flip()
+            loading_clock.tick(60)
+    startup_results = startup_loader.results
+
+    preload_res = startup_results.get('icons') or {}
     ICONS = preload_res.get('icons', {})
 
     # Start background music (level1) if available
@@ -231,31 +257,21 @@ def main():
     except Exception:
         pass
 
-    # --- ボス設定のプリロード: ボス画像を事前に読み込んでおく（スポーン時のIO/変換を避ける）
-    try:
-        from core.enemy import Enemy
-        # get_all_boss_configs 内で load_boss_stats が呼ばれる
-        boss_configs = Enemy.get_all_boss_configs()
-        # 画像を一通りキャッシュしておく（Noベースのエントリのみ）
-        for key, cfg in boss_configs.items():
-            if isinstance(key, int):  # Noベースのエントリのみ処理
-                try:
-                    boss_no = key
-                    boss_type = cfg['type']
-                    Enemy._load_enemy_image(boss_type, 1, cfg.get('image_file'), boss_no=boss_no)
-                except Exception:
-                    pass
-    except Exception:
-        pass
-
-    # セーブシステムを初期化
-    save_system = SaveSystem()
+    # セーブシステム（読み込みに失敗した場合はここで作り直す）
+    save_system = startup_results.get('save') or SaveSystem()
     print(f"[INFO] Save system initialized. Current money: {save_system.get_money()}G")
 
-    # パフォーマンスログシステムを初期化
-    performance_logger = PerformanceLogger()
+    # パフォーマンスログシステムを初期化（ヘッドレス実行ではプレイヤーのログファイルに書き込まない）
+    performance_logger = PerformanceLogger(use_log_file=sim is None)
     log_timer = 0.0  # ログ出力タイマー
 
+    # 起動ステージごとの読み込み時間と、操作可能になるまでの時間を記録
+    time_to_interactive = (time.perf_counter() - startup_start) * 1000.0
+    if sim is None:
+        performance_logger.log_startup(startup_loader.timings, time_to_interactive)
+    print(f"[INFO] Startup finished in {time_to_interactive:.0f}ms (" +
+          ", ".join(f"{name} {ms:.0f}ms" for name, ms in startup_loader.timings.items()) + ")")
+
     clock = pygame.time.Clock()
     # FPSカウンター用
     fps_values = []
@@ -285,11 +301,23 @@ def main():
     # ゲーム状態の初期化
     player, enemies, experience_gems, items, game_over, game_clear, spawn_timer, spawn_interval, game_time, last_difficulty_increase, particles, damage_stats, boss_spawn_timer, spawned_boss_types = init_game_state(screen, save_system)
 
-    # エネミースポーンマネージャーの初期化
-    try:
-        spawn_manager = EnemySpawnManager()
-    except Exception as e:
-        print(f"ERROR: Failed to initialize EnemySpawnManager: {e}")
+    # エネミー近傍検索用の永続グリッド（毎フレーム sync でインクリメンタル更新）
+    enemy_grid = SpatialHash()
+    # エネミー移動フィールドの SoA ストア（numpy が無い場合は無効）
+    enemy_pool = EnemyPool()
+    # 画面外エネミーの更新を距離に応じて間引くスケジューラ
+    ai_lod = AiLodScheduler()
+    # 追跡エネミーが障害物を回り込むためのフローフィールド（プレイヤーのタイルが変わったときだけ作り直す）
+    flow_field = get_flow_field()
+    # ゲーム内時計（ゲームロジックのタイマー用。更新処理を回したティックだけ進める）
+    logic_clock = game_clock.get_game_clock()
+    # 全エネミーの弾丸を保持する SoA ストア（init_game_state でクリアされる）
+    enemy_projectiles = get_enemy_projectiles()
+
+    # エネミースポーンマネージャー（起動時に読み込み済み）
+    spawn_manager = startup_results.get('spawn_rules')
+    if spawn_manager is None:
+        print(f"ERROR: Failed to initialize EnemySpawnManager: {startup_loader.errors.get('spawn_rules')}")
         pygame.quit()
         sys.exit(1)
     
@@ -300,182 +328,19 @@ def main():
     from ui.stage import StageMap
     stage_map = StageMap()
 
-    # マルチプロセシング対応の並列処理関数
-    def aggressive_parallel_update_enemies(enemies, player_data, dt, camera_data, map_loader):
-        """エネミー更新の積極的並列処理（ProcessPoolExecutor使用でCPU使用率最大化）"""
-        if not PARALLEL_PROCESSING_ENABLED or len(enemies) <= 1:
-            return enemies  # 逐次処理にフォールバック
-        
-        try:
-            # CPUコア数フル活用
-            num_processes = min(mp.cpu_count(), 8)
-            performance_stats['parallel_threads'] = max(performance_stats.get('parallel_threads', 0), num_processes)
-            
-            # エネミーを小さなバッチに分割（より多くのプロセスを活用）
-            batch_size = max(1, len(enemies) // (num_processes * 2))  # プロセス数の2倍のバッチ数
-            enemy_batches = [enemies[i:i + batch_size] for i in range(0, len(enemies), batch_size)]
-            
-            # 複数の処理を並列実行
-            with ProcessPoolExecutor(max_workers=num_processes) as executor:
-                def process_enemy_batch_intensive(batch, dt):
-                    """CPU集約的なエネミー処理"""
-                    for enemy in batch:
-                        try:
-                            # 移動計算（CPU集約的）
-                            dx = player_data['x'] - enemy.x
-                            dy = player_data['y'] - enemy.y
-                            distance = (dx * dx + dy * dy) ** 0.5
-                            
-                            # AI行動計算（CPU集約的）
-                            if hasattr(enemy, 'update_ai_behavior'):
-                                enemy.update_ai_behavior(distance, dx, dy)
-                            
-                            # ノックバック処理
-                            if hasattr(enemy, 'update_knockback'):
-                                enemy.update_knockback(dt * (1.0/60.0))
-                        except Exception:
-                            pass
-                    return batch
-                
-                # 並列実行でCPU使用率を最大化（delta_timeを渡す）
-                futures = [executor.submit(process_enemy_batch_intensive, batch, delta_time) for batch in enemy_batches]
-                results = [future.result() for future in futures]
-                
-                # 結果をマージ
-                updated_enemies = []
-                for batch_result in results:
-                    updated_enemies.extend(batch_result)
-                return updated_enemies
-                
-        except Exception:
-            return enemies  # エラー時は元のリストを返す
-
-    def parallel_update_particles(particles):
-        """パーティクルの並列更新処理"""
-        # 並列処理が無効化されている場合は逐次処理
-        if not PARALLEL_PROCESSING_ENABLED:
-            new_particles = []
-            for p in particles:
-                try:
-                    if p.update():
-                        new_particles.append(p)
-                except Exception:
-                    pass
-            return new_particles
-            
-        max_particles = PARTICLE_LIMIT
-        if len(particles) > max_particles:
-            particles = particles[-max_particles:]
-        
-        if len(particles) <= 5:  # 閾値を10から5に大幅に下げる（並列処理をより積極的に使用）
-            # 少数の場合は逐次処理が高速
-            new_particles = []
-            for p in particles:
-                try:
-                    if p.update():
-                        new_particles.append(p)
-                except Exception:
-                    pass
-            return new_particles
-        
-        # 大量の場合はマルチスレッド処理
-        try:
-            num_threads = min(mp.cpu_count(), 8)  # 8コア環境をフル活用（6→8に増加）
-            performance_stats['parallel_threads'] = max(performance_stats.get('parallel_threads', 0), num_threads)
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
-                # パーティクルを複数のバッチに分割
-                batch_size = max(1, len(particles) // num_threads)
-                batches = [particles[i:i + batch_size] for i in range(0, len(particles), batch_size)]
-                
-                def update_batch(batch):
-                    result = []
-                    for p in batch:
-                        try:
-                            if p.update():
-                                result.append(p)
-                        except Exception:
-                            pass
-                    return result
-                
-                futures = [executor.submit(update_batch, batch) for batch in batches]
-                
-                # 結果をまとめる
-                new_particles = []
-                for future in futures:
-                    new_particles.extend(future.result())
-                return new_particles
-                
-        except Exception:
-            # エラー時は逐次処理にフォールバック
-            new_particles = []
-            for p in particles:
-                try:
-                    if p.update():
-                        new_particles.append(p)
-                except Exception:
-                    pass
-            return new_particles
-
-    def parallel_collision_check(enemies, player, total_projectiles):
-        """衝突判定の並列処理"""
-        # 並列処理が無効化されている場合は逐次処理
-        if not PARALLEL_PROCESSING_ENABLED:
-            return sequential_collision_check(enemies, player, total_projectiles)
-            
-        if len(enemies) <= 2 or total_projectiles <= 5:  # 閾値を大幅に下げる（5→2, 20→5）より積極的な並列化
-            # 少数の場合は逐次処理
-            return sequential_collision_check(enemies, player, total_projectiles)
-        
-        try:
-            # エネミーデータを準備
-            enemy_data = []
-            for i, enemy in enumerate(enemies):
-                projectiles = enemy.get_projectiles()
-                projectiles_data = [(j, p.x, p.y, p.size) for j, p in enumerate(projectiles)]
-                enemy_data.append((i, enemy.x, enemy.y, projectiles_data))
-            
-            # プレイヤーデータ
-            player_data = (player.x, player.y, getattr(player, 'size', 32) // 2, player.get_avoidance())
-            game_data = {'current_time': pygame.time.get_ticks()}
-            
-            # バッチに分割（CPUコア数に基づく）
-            num_cores = min(mp.cpu_count(), 8)  # 8コア環境をフル活用（6→8に増加）
-            performance_stats['parallel_threads'] = max(performance_stats.get('parallel_threads', 0), num_cores)
-            batch_size = max(1, len(enemy_data) // num_cores)
-            batches = [enemy_data[i:i + batch_size] for i in range(0, len(enemy_data), batch_size)]
-            
-            collision_results = []
-            with ThreadPoolExecutor(max_workers=num_cores) as executor:
-                futures = [executor.submit(process_enemy_batch, batch, player_data, game_data) for batch in batches]
-                for future in futures:
-                    collision_results.extend(future.result())
-            
-            return collision_results
-            
-        except Exception as e:
-            # エラー時は逐次処理にフォールバック
-            return sequential_collision_check(enemies, player, total_projectiles)
-
-    def sequential_collision_check(enemies, player, total_projectiles):
-        """従来の逐次衝突判定（フォールバック用）"""
-        collision_results = []
-        player_half = getattr(player, 'size', 32) // 2
-        
-        for i, enemy in enumerate(enemies):
-            projectiles = enemy.get_projectiles()
-            for j, projectile in enumerate(projectiles):
-                proj_half = projectile.size // 2
-                if (abs(player.x - projectile.x) < player_half + proj_half and 
-                    abs(player.y - projectile.y) < player_half + proj_half):
-                    avoided = random.random() < player.get_avoidance()
-                    collision_results.append({
-                        'enemy_id': i,
-                        'projectile_id': j,
-                        'collision': True,
-                        'avoided': avoided,
-                        'hit_pos': (projectile.x, projectile.y)
-                    })
-        return collision_results
+    # 並列処理用のジョブシステム（常駐スレッドをフレーム間で使い回す）
+    job_system = JobSystem()
+    job_system.enabled = PARALLEL_PROCESSING_ENABLED
+    # エネミー移動のワーカープロセス（ENEMY_PROCESS_BACKEND が True の場合のみ。初回の使用時に起動）
+    enemy_backend = EnemyProcessBackend(enabled=ENEMY_PROCESS_BACKEND)
+    # 実際の CPU 時間の計測（performance_stats の cpu_* / main_thread_load / gil_contention）
+    cpu_metrics = CpuMetrics()
+    # フレーム予算に基づく品質ガバナー（パーティクル上限・敵の攻撃処理の頻度などを負荷に応じて切り替える）
+    quality_governor = QualityGovernor()
+    if sim is not None:
+        # ヘッドレス実行では実測の負荷が実行ごとに揺れるため、段階を固定して再現性を保つ
+        quality_governor.enabled = False
+        quality_governor.set_level(sim.quality_level)
 
     # お金関連の初期化
     current_game_money = 0  # 現在のゲームセッションで獲得したお金
@@ -486,29 +351,10 @@ def main():
     # ボックスマネージャーの初期化
     box_manager = BoxManager()
 
-    # マップローダーの初期化
-    map_loader = MapLoader()
-    if USE_CSV_MAP:
-        # CSVマップファイルを読み込み（存在しない場合はサンプルを作成）
-        csv_path = CSV_MAP_FILE
-        
-        # 通常のPython実行時のみサンプル作成
-        try:
-            # PyInstallerで実行されているか確認
-            import sys
-            is_frozen = getattr(sys, 'frozen', False)
-        except:
-            is_frozen = False
-            
-        if not is_frozen and not os.path.exists(csv_path):
-            map_loader.create_sample_csv(csv_path)
-            
-        # マップを読み込み（PyInstallerの場合はリソースから）
-        success = map_loader.load_csv_map(csv_path)
-        if not success:
-            map_loader.generate_default_map()
-    else:
-        # デフォルトマップ（市松模様）を生成
+    # マップローダー（起動時に読み込み済み。失敗時はデフォルトマップ）
+    map_loader = startup_results.get('map')
+    if map_loader is None:
+        map_loader = MapLoader()
         map_loader.generate_default_map()
 
     # カメラをプレイヤーの初期位置に設定
@@ -533,75 +379,75 @@ def main():
     running = True
     frame_count = 0  # フレームカウンターを初期化
     
-    # デルタタイム管理の初期化
+    # 固定タイムステップ管理の初期化
+    # ループ 1 周 = ゲームロジック 1 ティック（delta_time は常に 1.0 = 60FPS の 1 フレーム）。
+    # 描画フレームの開始時に経過時間を蓄積し、そのフレームで回すティック数を決める
     last_time = time.perf_counter() * 1000.0  # ミリ秒に変換
-    accumulator = 0.0  # フレーム更新の蓄積時間
-    game_time_accumulator = 0.0  # ゲーム時間の蓄積
-    
-    print("[INFO] Entering main loop with delta time system")
+    delta_time_ms = 0.0  # 前の描画フレームからの実経過時間
+    accumulator = 0.0  # まだティックに消費していない経過時間（ミリ秒）
+    pending_ticks = 0  # この描画フレームで残っているティック数
+    frame_ticks = 0  # この描画フレームで回すティック数
+    frame_skip_count = 0  # 描画を省略して追加で回したティック数
+    last_tick_simulated = False  # 直近のティックでゲーム更新が行われたか（一時停止中は補間しない）
+    render_alpha = 1.0  # 描画の補間係数（0.0: 前ティック、1.0: 現ティック）
+    delta_time = 1.0
+    tick_seconds = TARGET_FRAME_TIME / 1000.0
+    max_ticks_per_frame = 1 + (MAX_FRAME_SKIP if ENABLE_FRAME_SKIP else 0)
+    prev_camera_x, prev_camera_y = camera_x, camera_y
+    player_prev_x, player_prev_y = player.x, player.y
+
+    print("[INFO] Entering main loop with fixed timestep")
     while running:
         try:
-            # デルタタイム計算（エクスポネンシャル・スムージング）
-            current_time = time.perf_counter() * 1000.0  # ミリ秒に変換
-            delta_time_ms = current_time - last_time
-            last_time = current_time
-            
-            # エクスポネンシャル・スムージングの初期化
-            if not hasattr(main, 'smoothed_delta_time_ms'):
-                main.smoothed_delta_time_ms = delta_time_ms
-            
-            # エクスポネンシャル・スムージング（より滑らかな補間）
-            main.smoothed_delta_time_ms = (
-                DELTA_TIME_SMOOTHING * delta_time_ms + 
-                (1.0 - DELTA_TIME_SMOOTHING) * main.smoothed_delta_time_ms
-            )
-            
-            # デルタタイムのキャップ（異常な値を防ぐ）
-            if main.smoothed_delta_time_ms > DELTA_TIME_CAP:
-                main.smoothed_delta_time_ms = DELTA_TIME_CAP
-            
-            # デルタタイムを60FPS基準で正規化（1.0 = 60FPSでの1フレーム）
-            delta_time = main.smoothed_delta_time_ms / TARGET_FRAME_TIME
-            
-            # デバッグ：delta_time値を定期的に表示（10フレームごと）
-            # フレームスキップ判定
-            frame_skip_count = 0
-            if ENABLE_FRAME_SKIP and main.smoothed_delta_time_ms > TARGET_FRAME_TIME:
-                # FPSが低下している場合のフレームスキップ計算
-                frame_skip_count = min(int(main.smoothed_delta_time_ms / TARGET_FRAME_TIME) - 1, MAX_FRAME_SKIP)
-            
-            # ゲーム更新の蓄積時間に追加
-            accumulator += delta_time
-            
-            # フレーム開始時間を記録（高精度）
-            frame_start_time = time.perf_counter()
-            
-            # 並列処理スレッド数をリセット（フレーム開始時）
-            performance_stats['parallel_threads'] = 0
-            
-            # エンティティ数を記録
-            total_projectiles = sum(len(enemy.get_projectiles()) for enemy in enemies)
-            performance_stats['entities_count'].update({
-                'enemies': len(enemies),
-                'particles': len(particles),
-                'gems': len(experience_gems),
-                'projectiles': total_projectiles
-            })
-            
-            # CPU効率測定（8コア環境での実際の使用率）
-            try:
-                actual_threads = performance_stats.get('parallel_threads', 0)
-                max_threads = mp.cpu_count()
-                if max_threads > 0:
-                    performance_stats['cpu_cores_used'] = actual_threads
-                    performance_stats['cpu_efficiency'] = (actual_threads / max_threads) * 100.0
-                else:
-                    performance_stats['cpu_cores_used'] = 0
-                    performance_stats['cpu_efficiency'] = 0.0
-            except Exception:
-                performance_stats['cpu_cores_used'] = 0
-                performance_stats['cpu_efficiency'] = 0.0
+            # 新しい描画フレームの開始（前のフレームのティックを使い切った）
+            if pending_ticks == 0:
+                current_time = time.perf_counter() * 1000.0  # ミリ秒に変換
+                delta_time_ms = current_time - last_time
+                last_time = current_time
+
+                # ヘッドレス実行では仮想時計の固定ステップを使う
+                if sim is not None:
+                    delta_time_ms = sim.advance()
+
+                # 遅れている分は最大 MAX_FRAME_SKIP ティックまで追加で回して取り戻す。
+                # それ以上の遅れ（ウィンドウのドラッグ中など）は切り捨てて一気に進まないようにする
+                accumulator += delta_time_ms
+                frame_ticks = min(int((accumulator + 1e-6) / TARGET_FRAME_TIME), max_ticks_per_frame)
+                accumulator = min(max(0.0, accumulator - frame_ticks * TARGET_FRAME_TIME), TARGET_FRAME_TIME)
+                pending_ticks = frame_ticks
+                frame_skip_count = max(0, frame_ticks - 1)
+                render_alpha = accumulator / TARGET_FRAME_TIME
+                performance_stats['frame_skip_count'] = frame_skip_count
+
+                # フレーム開始（プロファイラの 'frame' ゾーンを開く）
+                profiler.begin_frame()
+
+                # ジョブシステムのフレーム統計をリセット（フレーム開始時）
+                job_system.begin_frame()
+
+                # エンティティ数を記録
+                performance_stats['entities_count'].update({
+                    'enemies': len(enemies),
+                    'particles': len(particles),
+                    'gems': len(experience_gems),
+                    'projectiles': len(enemy_projectiles)
+                })
+
+                # 前の描画フレーム分の CPU 時間を集計（ワーカーの値は前フレームのジョブ統計）
+                cpu_metrics.sample(performance_stats)
+
+                # このフレームの品質設定（段階は前フレームまでの処理時間で決まる）
+                quality = quality_governor.settings
+                Enemy.walk_animation = quality['enemy_walk_animation']
+
+            # このループでティックを進めるか（描画が 1 ティックより速い場合は描画だけ行う）
+            run_tick = pending_ticks > 0
+            if run_tick:
+                pending_ticks -= 1
+                last_tick_simulated = False
+
             # イベント処理
+            profiler.begin('events')
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
@@ -683,9 +529,10 @@ def main():
 
                     # 並列処理のオン/オフ切り替え（F8）
                     if event.key == pygame.K_F8:
-                        global PARALLEL_PROCESSING_ENABLED
                         PARALLEL_PROCESSING_ENABLED = not PARALLEL_PROCESSING_ENABLED
                         performance_stats['parallel_enabled'] = PARALLEL_PROCESSING_ENABLED
+                        job_system.enabled = PARALLEL_PROCESSING_ENABLED
+                        enemy_backend.enabled = ENEMY_PROCESS_BACKEND and PARALLEL_PROCESSING_ENABLED and not enemy_backend.failed
                         print(f"[INFO] PARALLEL_PROCESSING_ENABLED set to {PARALLEL_PROCESSING_ENABLED}")
                         continue
 
@@ -704,6 +551,11 @@ def main():
                             print(f"[INFO] Log file: {performance_logger.log_file}")
                         continue
 
+                    # プロファイラのトレースを書き出し（F12、chrome://tracing / Perfetto で開ける）
+                    if event.key == pygame.K_F12:
+                        profiler.export_chrome_trace()
+                        continue
+
                     # ESCキーでゲーム途中でも強制終了
                     if event.key == pygame.K_ESCAPE and not game_over and not game_clear:
                         print("[INFO] Game forcibly ended by ESC key")
@@ -804,8 +656,7 @@ def main():
                                         player.apply_level_choice(choice)
                                         player.is_initial_weapon_selection = False
                                         try:
-                                            for _ in range(8):
-                                                particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN, count=8)
                                         except Exception:
                                             pass
                                         continue
@@ -815,7 +666,7 @@ def main():
                                         player.set_input_method("keyboard")
                                         player.selected_weapon_choice_index = new_index
                                         try:
-                                            particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN)
                                         except Exception:
                                             pass
                                     continue
@@ -825,7 +676,7 @@ def main():
                                         player.set_input_method("keyboard")
                                         player.selected_weapon_choice_index = (player.selected_weapon_choice_index - 1) % n
                                         try:
-                                            particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN)
                                         except Exception:
                                             pass
                                         continue
@@ -833,7 +684,7 @@ def main():
                                         player.set_input_method("keyboard")
                                         player.selected_weapon_choice_index = (player.selected_weapon_choice_index + 1) % n
                                         try:
-                                            particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN)
                                         except Exception:
                                             pass
                                         continue
@@ -843,8 +694,7 @@ def main():
                                         choice = player.last_level_choices[idx]
                                         player.apply_level_choice(choice)
                                         try:
-                                            for _ in range(8):
-                                                particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN, count=8)
                                         except Exception:
                                             pass
                                         continue
@@ -855,7 +705,7 @@ def main():
                                     player.set_input_method("keyboard")
                                     player.selected_subitem_choice_index = (player.selected_subitem_choice_index - 1) % n
                                     try:
-                                        particles.append(DeathParticle(player.x, player.y, CYAN))
+                                        particles.emit('death', player.x, player.y, CYAN)
                                     except Exception:
                                         pass
                                     continue
@@ -863,7 +713,7 @@ def main():
                                     player.set_input_method("keyboard")
                                     player.selected_subitem_choice_index = (player.selected_subitem_choice_index + 1) % n
                                     try:
-                                        particles.append(DeathParticle(player.x, player.y, CYAN))
+                                        particles.emit('death', player.x, player.y, CYAN)
                                     except Exception:
                                         pass
                                     continue
@@ -873,8 +723,7 @@ def main():
                                     key = player.last_subitem_choices[idx]
                                     player.apply_subitem_choice(key)
                                     try:
-                                        for _ in range(8):
-                                            particles.append(DeathParticle(player.x, player.y, CYAN))
+                                        particles.emit('death', player.x, player.y, CYAN, count=8)
                                     except Exception:
                                         pass
                                     continue
@@ -896,8 +745,7 @@ def main():
                                 player.set_special_invincible(3.0)
                                 game_over = False
                                 force_ended = False  # 強制終了フラグもリセット
-                                for _ in range(8):
-                                    particles.append(DeathParticle(player.x, player.y, CYAN))
+                                particles.emit('death', player.x, player.y, CYAN, count=8)
                             elif end_screen_selection == 0 or game_clear:  # Restart (left) または GameClear時
                                 # ゲームクリア時のボーナス処理
                                 if game_clear:
@@ -924,7 +772,7 @@ def main():
                                 enemies = []
                                 experience_gems = []
                                 items = []
-                                particles = []
+                                particles = ParticleList()
                                 spawn_timer = 0
                                 boss_spawn_timer = 0
                                 spawn_interval = 60
@@ -996,8 +844,7 @@ def main():
                                         player.apply_level_choice(choice)
                                         player.is_initial_weapon_selection = False
                                         try:
-                                            for _ in range(8):
-                                                particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN, count=8)
                                         except Exception:
                                             pass
                                         break
@@ -1018,8 +865,7 @@ def main():
                                     if rect.collidepoint(mx, my):
                                         player.apply_level_choice(choice)
                                         try:
-                                            for _ in range(8):
-                                                particles.append(DeathParticle(player.x, player.y, CYAN))
+                                            particles.emit('death', player.x, player.y, CYAN, count=8)
                                         except Exception:
                                             pass
                                         hit = True
@@ -1053,8 +899,7 @@ def main():
                                 if rect.collidepoint(mx, my):
                                     player.apply_subitem_choice(key)
                                     try:
-                                        for _ in range(8):
-                                            particles.append(DeathParticle(player.x, player.y, CYAN))
+                                        particles.emit('death', player.x, player.y, CYAN, count=8)
                                     except Exception:
                                         pass
                                     hit = True
@@ -1080,8 +925,7 @@ def main():
                                 player.set_special_invincible(3.0)
                                 game_over = False
                                 force_ended = False  # 強制終了フラグもリセット
-                                for _ in range(8):
-                                    particles.append(DeathParticle(player.x, player.y, CYAN))
+                                particles.emit('death', player.x, player.y, CYAN, count=8)
                                 continue
                             # Restart
                             if rects.get('restart') and rects['restart'].collidepoint(mx, my):
@@ -1108,6 +952,7 @@ def main():
                                 enemies_killed_this_game = 0
                                 enemy_kill_stats = {}
                                 force_ended = False  # 強制終了フラグもリセット
+                                player_prev_x, player_prev_y = player.x, player.y  # 補間の基準も新しいプレイヤーに合わせる
                                 # ボックスマネージャーをリセット
                                 box_manager = BoxManager()
                                 # HP回復エフェクト用のコールバックを設定
@@ -1120,12 +965,18 @@ def main():
                         except Exception:
                             pass
 
+            profiler.end('events')
+
             # キーボードでのレベルアップ選択処理は KEYDOWN イベントで単発処理に変更済み
 
             # ループ冒頭でプレイヤー位置からターゲットカメラを算出（まだスムーズは適用しない）
             target_cam_x = max(0, min(WORLD_WIDTH - SCREEN_WIDTH, int(player.x - SCREEN_WIDTH // 2)))
             target_cam_y = max(0, min(WORLD_HEIGHT - SCREEN_HEIGHT, int(player.y - SCREEN_HEIGHT // 2)))
 
+            # ヘッドレス実行では選択 UI を自動で処理する
+            if sim is not None:
+                sim.drive_player(player)
+
             # UI が表示されてゲームを停止すべきかを判定する。
             # フラグだけでなく、実際に候補リストが存在するかもチェックする（フラグが残留していると攻撃できなくなる不具合対策）。
             awaiting_weapon_active = bool(getattr(player, 'awaiting_weapon_choice', False) and getattr(player, 'last_level_choices', None))
@@ -1150,7 +1001,11 @@ def main():
                 player._last_virtual_mouse_pos = virtual_mouse_pos
 
             # ゲームの更新処理。武器/サブアイテム選択UIが開いている間はゲームを一時停止する
-            if not game_over and not game_clear and not (awaiting_weapon_active or awaiting_subitem_active):
+            if run_tick and not game_over and not game_clear and not (awaiting_weapon_active or awaiting_subitem_active):
+                profiler.begin('update')
+                last_tick_simulated = True
+                # ゲーム内時計を 1 ティック進める（攻撃・弾・アイテムなどのタイマーはこの時計で進む）
+                logic_clock.advance()
                 # マウス座標変換関数を定義
                 def get_virtual_mouse_pos():
                     mouse_x, mouse_y = pygame.mouse.get_pos()
@@ -1163,10 +1018,14 @@ def main():
                     return int(virtual_x), int(virtual_y)
                 
                 # プレイヤーの移動（現在のカメラ位置と仮想マウス座標を渡す）
-                player.move(int(camera_x), int(camera_y), get_virtual_mouse_pos, delta_time)
+                # 移動前の位置は描画時の補間に使う
+                player_prev_x, player_prev_y = player.x, player.y
+                with profiler.zone('player_move'):
+                    player.move(int(camera_x), int(camera_y), get_virtual_mouse_pos, delta_time)
 
                 # 自動攻撃の更新（仮想マウス座標も渡す）
-                player.update_attacks(enemies, camera_x=int(camera_x), camera_y=int(camera_y), get_virtual_mouse_pos=get_virtual_mouse_pos)
+                with profiler.zone('update_attacks'):
+                    player.update_attacks(enemies, camera_x=int(camera_x), camera_y=int(camera_y), get_virtual_mouse_pos=get_virtual_mouse_pos)
 
                 # 自然回復（HPサブアイテム所持時のみ、2秒で1回復）（delta_timeを渡す）
                 try:
@@ -1174,9 +1033,8 @@ def main():
                 except Exception:
                     pass
 
-                # 無敵時間の更新（秒単位でのdelta_timeを渡す）
-                delta_time_seconds = main.smoothed_delta_time_ms / 1000.0
-                player.update_invincible(delta_time_seconds)
+                # 無敵時間の更新（1 ティック分の秒数を渡す）
+                player.update_invincible(tick_seconds)
 
                 # マグネット効果の更新
                 player.update_magnet_effect()
@@ -1185,7 +1043,8 @@ def main():
                 player.update_screen_shake()
 
                 # ボックスの更新処理
-                current_time = pygame.time.get_ticks()
+                profiler.begin('box_collisions')
+                current_time = game_clock.get_ticks()
                 box_manager.update(current_time, player)
                 
                 # ボックスと攻撃の当たり判定（敵より先にチェック）
@@ -1249,11 +1108,10 @@ def main():
                                 items.extend(dropped_items)
                                 
                                 # 破壊エフェクト
-                                for _ in range(6):
-                                    particles.append(DeathParticle(box.x, box.y, (139, 69, 19)))  # 茶色の破片
+                                particles.emit('death', box.x, box.y, (139, 69, 19), count=6)  # 茶色の破片
                             
                             # ヒット時のエフェクト
-                            particles.append(DeathParticle(box.x, box.y, (255, 255, 255)))
+                            particles.emit('death', box.x, box.y, (255, 255, 255))
                             # ヒット時に消費する攻撃（弾丸系など）のみ削除する
                             consumable_on_hit = {"magic_wand"}
                             if getattr(attack, 'type', '') in consumable_on_hit:
@@ -1267,195 +1125,209 @@ def main():
 
                 # 破壊されたボックスを削除
                 box_manager.clear_destroyed_boxes()
+                box_collision_ms = profiler.end('box_collisions')
 
                 # 攻撃と敵の当たり判定
-                for attack in player.active_attacks[:]:
-                    # spawn_delay によってまだ発生していない攻撃は無視する
-                    if getattr(attack, '_pending', False):
+                # 持続系攻撃（一定間隔で再ヒット）・ヒットで消費される攻撃・貫通攻撃
+                persistent_types = {"garlic", "holy_water"}
+                consumable_on_hit = {"magic_wand"}
+                penetrating_types = {"stone"}
+                # 武器ごとのノックバック量
+                knockback_forces = {
+                    "whip": 80.0,          # ムチ：強い
+                    "magic_wand": 60.0,    # 魔法の杖：中程度
+                    "axe": 120.0,          # 斧：非常に強い
+                    "stone": 40.0,         # 石：弱い
+                    "knife": 50.0,         # ナイフ：弱め
+                    "rotating_book": 30.0, # 回転する本：弱い
+                    "thunder": 100.0,      # 雷：強い
+                    "garlic": 20.0,        # にんにく：很弱い
+                    "holy_water": 25.0,    # 聖水：弱い
+                }
+
+                profiler.begin('attack_collisions')
+                # ブロードフェーズ: 全攻撃×全敵の矩形判定を一括で行い候補ペアを得る
+                # spawn_delay によってまだ発生していない攻撃は除外する
+                hit_attacks = [a for a in player.active_attacks if not getattr(a, '_pending', False)]
+                hit_enemies = enemies[:]
+                attack_radii = [getattr(a, 'size', 0) for a in hit_attacks]
+                enemy_radii = [getattr(e, 'size', 0) for e in hit_enemies]
+                candidate_pairs = broadphase_attack_enemy_pairs(hit_attacks, hit_enemies, attack_radii, enemy_radii)
+                finished_attacks = set()  # このフレームのヒット処理を終えた攻撃
+                killed_enemies = set()    # このフレームで倒した敵
+
+                # ナローフェーズ: 候補ペアを従来の二重ループと同じ順序で処理
+                for ai, ei in candidate_pairs:
+                    if ai in finished_attacks:
                         continue
-                    for enemy in enemies[:]:
-                        # 矩形当たり判定（高速化：円形より計算が軽い）
-                        dx = abs(enemy.x - attack.x)
-                        dy = abs(enemy.y - attack.y)
-                        # 攻撃の半径 + 敵の半径で判定（従来は誤って/2していた）
-                        r = getattr(attack, 'size', 0) + getattr(enemy, 'size', 0)
-                        if dx < r and dy < r:
-                            # 持続系攻撃は0.2秒ごとにダメージ再発生
-                            persistent_types = {"garlic", "holy_water"}
-                            is_persistent = getattr(attack, 'type', '') in persistent_types
+                    attack = hit_attacks[ai]
+                    enemy = hit_enemies[ei]
+                    if id(enemy) in killed_enemies:
+                        continue
+                    # 矩形当たり判定（攻撃の半径 + 敵の半径）
+                    r = attack_radii[ai] + enemy_radii[ei]
+                    if abs(enemy.x - attack.x) >= r or abs(enemy.y - attack.y) >= r:
+                        continue
+                    # 持続系攻撃は0.2秒ごとにダメージ再発生
+                    is_persistent = getattr(attack, 'type', '') in persistent_types
+
+                    # attack に必要な構造を初期化（動的に追加）
+                    if not hasattr(attack, 'hit_targets'):
+                        attack.hit_targets = set()
+                    if not hasattr(attack, 'last_hit_times'):
+                        attack.last_hit_times = {}
+
+                    # ヒット記録のキーはエネミーごとの一意な番号（id() は倒された敵のアドレスが
+                    # 新しい敵に再利用されると、別の敵をヒット済みと誤判定する）
+                    hit_key = enemy.projectile_owner_id
+
+                    # 非持続系は一度ヒットしたら再ヒットさせない
+                    if not is_persistent:
+                        if hit_key in attack.hit_targets:
+                            continue
+                    else:
+                        # 持続系は最後にダメージを与えた時刻から適切な間隔経過していれば再ダメージ
+                        last = attack.last_hit_times.get(hit_key, -999)
+                        damage_interval = 0.2  # デフォルト間隔（秒）
+
+                        # 武器タイプごとの間隔設定
+                        attack_type = getattr(attack, 'type', '')
+                        if attack_type == "garlic":
+                            damage_interval = GARLIC_DAMAGE_INTERVAL_MS / 1000.0  # ミリ秒から秒に変換
+                        elif attack_type == "holy_water":
+                            damage_interval = HOLY_WATER_DAMAGE_INTERVAL_MS / 1000.0  # ミリ秒から秒に変換
+
+                        if game_time - last < damage_interval:
+                            continue
 
-                            # attack に必要な構造を初期化（動的に追加）
-                            if not hasattr(attack, 'hit_targets'):
-                                attack.hit_targets = set()
-                            if not hasattr(attack, 'last_hit_times'):
-                                attack.last_hit_times = {}
+                    # 攻撃のダメージを適用
+                    # ダメージにランダム性を追加（±10%の範囲）
+                    dmg = max(0.0, float(getattr(attack, 'damage', 0)) * random.uniform(0.9, 1.1))
+                    hp_before = enemy.hp
+                    enemy.hp -= dmg
 
-                            # 非持続系は一度ヒットしたら再ヒットさせない
-                            if not is_persistent:
-                                if id(enemy) in attack.hit_targets:
-                                    continue
-                            else:
-                                # 持続系は最後にダメージを与えた時刻から適切な間隔経過していれば再ダメージ
-                                last = attack.last_hit_times.get(id(enemy), -999)
-                                damage_interval = 0.2  # デフォルト間隔（秒）
-                                
-                                # 武器タイプごとの間隔設定
-                                attack_type = getattr(attack, 'type', '')
-                                if attack_type == "garlic":
-                                    damage_interval = GARLIC_DAMAGE_INTERVAL_MS / 1000.0  # ミリ秒から秒に変換
-                                elif attack_type == "holy_water":
-                                    damage_interval = HOLY_WATER_DAMAGE_INTERVAL_MS / 1000.0  # ミリ秒から秒に変換
-                                
-                                if game_time - last < damage_interval:
-                                    continue
+                    # サウンド: 敵被弾
+                    # from audio import audio (先頭でインポート済み)
+                    audio.play_sound('enemy_hurt')
 
-                            # 攻撃のダメージを適用
-                            # ダメージにランダム性を追加（±10%の範囲）
-                            dmg = max(0.0, float(getattr(attack, 'damage', 0)) * random.uniform(0.9, 1.1))
-                            hp_before = enemy.hp
-                            enemy.hp -= dmg
+                    # ノックバック処理
+                    weapon_type = getattr(attack, 'type', '')
+                    knockback_force = knockback_forces.get(weapon_type, 50.0)  # デフォルト値
 
-                            # サウンド: 敵被弾
-                            # from audio import audio (先頭でインポート済み)
-                            audio.play_sound('enemy_hurt')
-
-                            # ノックバック処理
-                            # 武器ごとのノックバック量を定義（元の値に戻す）
-                            knockback_forces = {
-                                "whip": 80.0,          # ムチ：強い
-                                "magic_wand": 60.0,    # 魔法の杖：中程度
-                                "axe": 120.0,          # 斧：非常に強い
-                                "stone": 40.0,         # 石：弱い
-                                "knife": 50.0,         # ナイフ：弱め
-                                "rotating_book": 30.0, # 回転する本：弱い
-                                "thunder": 100.0,      # 雷：強い
-                                "garlic": 20.0,        # にんにく：很弱い
-                                "holy_water": 25.0,    # 聖水：弱い
-                            }
-                            
-                            weapon_type = getattr(attack, 'type', '')
-                            knockback_force = knockback_forces.get(weapon_type, 50.0)  # デフォルト値
-                            
-                            # ノックバックを適用
-                            if hasattr(enemy, 'apply_knockback'):
-                                enemy.apply_knockback(attack.x, attack.y, knockback_force)
+                    # ノックバックを適用
+                    if hasattr(enemy, 'apply_knockback'):
+                        enemy.apply_knockback(attack.x, attack.y, knockback_force)
 
-                            # ヒット時の記録: 非持続系は hit_targets に追加、持続系は last_hit_times を更新
-                            if is_persistent:
-                                attack.last_hit_times[id(enemy)] = game_time
+                    # ヒット時の記録: 非持続系は hit_targets に追加、持続系は last_hit_times を更新
+                    if is_persistent:
+                        attack.last_hit_times[hit_key] = game_time
+                    else:
+                        attack.hit_targets.add(hit_key)
+
+                    # ダメージ集計: 武器(type)ごとに合計ダメージを記録
+                    atk_type = getattr(attack, 'type', 'unknown') or 'unknown'
+                    damage_stats[atk_type] = damage_stats.get(atk_type, 0) + dmg
+
+                    # Garlic がヒットしたらプレイヤーを1回復する（クールダウン: 500ms）
+                    if getattr(attack, 'type', '') == 'garlic':
+                        now = game_clock.get_ticks()
+                        # attack にクールダウン時刻を保持
+                        if not hasattr(attack, 'last_garlic_heal_time'):
+                            attack.last_garlic_heal_time = -999999
+                        if now - attack.last_garlic_heal_time >= GARLIC_HEAL_INTERVAL_MS:
+                            # HPサブアイテムのレベルに応じた回復量を使用
+                            garlic_heal_amount = player.get_garlic_heal_amount()
+                            healed = player.heal(garlic_heal_amount, "garlic")
+                            if healed > 0:
+                                # from audio import audio (先頭でインポート済み)
+                                audio.play_sound('heal')
+                            attack.last_garlic_heal_time = now
+
+                    # ヒット時の小エフェクト
+                    if hasattr(enemy, 'on_hit') and callable(enemy.on_hit):
+                        enemy.on_hit()
+
+                    particles.emit('death', enemy.x, enemy.y, enemy.color, count=2)  # 4から2に削減
+
+                    # ダメージ数表示を追加（敵の上部に素早くフェードイン・アウト）
+                    # 品質段階が低いときは表示するヒットを間引く
+                    if quality_governor.allow_damage_number():
+                        try:
+                            dval = float(dmg)
+                            if dval <= 10.0:
+                                color = WHITE
                             else:
-                                attack.hit_targets.add(id(enemy))
+                                t = min(1.0, max(0.0, (dval - 10.0) / 40.0))
+                                r = 255
+                                g = int(255 - (215 * t))
+                                b = int(255 - (215 * t))
+                                color = (r, g, b)
+                            particles.append(DamageNumber(enemy.x, enemy.y - enemy.size - 6, int(dmg), color=color))
+                        except Exception:
+                            pass
 
-                            # ダメージ集計: 武器(type)ごとに合計ダメージを記録
-                            atk_type = getattr(attack, 'type', 'unknown') or 'unknown'
-                            damage_stats[atk_type] = damage_stats.get(atk_type, 0) + dmg
-                            
-                            # Garlic がヒットしたらプレイヤーを1回復する（クールダウン: 500ms）
-                            if getattr(attack, 'type', '') == 'garlic':
-                                now = pygame.time.get_ticks()
-                                # attack にクールダウン時刻を保持
-                                if not hasattr(attack, 'last_garlic_heal_time'):
-                                    attack.last_garlic_heal_time = -999999
-                                if now - attack.last_garlic_heal_time >= GARLIC_HEAL_INTERVAL_MS:
-                                    # HPサブアイテムのレベルに応じた回復量を使用
-                                    garlic_heal_amount = player.get_garlic_heal_amount()
-                                    healed = player.heal(garlic_heal_amount, "garlic")
-                                    if healed > 0:
-                                        # from audio import audio (先頭でインポート済み)
-                                        audio.play_sound('heal')
-                                    attack.last_garlic_heal_time = now
-
-                            # ヒット時の小エフェクト
-                            if hasattr(enemy, 'on_hit') and callable(enemy.on_hit):
-                                enemy.on_hit()
-
-                            for _ in range(2):  # 4から2に削減
-                                particles.append(DeathParticle(enemy.x, enemy.y, enemy.color))
-
-                            # ダメージ数表示を追加（敵の上部に素早くフェードイン・アウト）
+                    # 敵のHPが0以下なら死亡処理
+                    if enemy.hp <= 0:
+                        particles.emit('death', enemy.x, enemy.y, enemy.color, count=4)  # 8から4に削減
+
+                        # ボス死亡時の特別エフェクト（赤いドット＋拡大赤円フラッシュ＋画面揺れ）
+                        if getattr(enemy, 'is_boss', False):
                             try:
-                                dval = float(dmg)
-                                if dval <= 10.0:
-                                    color = WHITE
-                                else:
-                                    t = min(1.0, max(0.0, (dval - 10.0) / 40.0))
-                                    r = 255
-                                    g = int(255 - (215 * t))
-                                    b = int(255 - (215 * t))
-                                    color = (r, g, b)
-                                particles.append(DamageNumber(enemy.x, enemy.y - enemy.size - 6, int(dmg), color=color))
-                            except Exception:
+                                from effects.particles import BossDeathEffect, BossDeathFlash
+                                particles.append(BossDeathEffect(enemy.x, enemy.y))
+                                particles.append(BossDeathFlash(enemy.x, enemy.y))
+                                # 画面揺れ（ボム取得時と同じ）
+                                if hasattr(player, 'activate_screen_shake'):
+                                    player.activate_screen_shake()
+                            except Exception as e:
+                                print(f"[WARNING] Failed to create boss death effect: {e}")
+
+                            # ボス撃破時に特別な宝箱 (box4.png) をドロップ
+                            try:
+                                # ItemBox は BoxManager を通じて管理されるべきなので、box_manager に追加
+                                from ui.box import ItemBox
+                                special_box = ItemBox(enemy.x, enemy.y, box_type=4)
+                                box_manager.boxes.append(special_box)
+                                # 大きめのスポーンエフェクト
+                                if len(particles) < 300:
+                                    particles.emit('spawn', special_box.x, special_box.y, (255, 100, 100), count=12)
+                            except Exception as e:
                                 pass
 
-                            # 敵のHPが0以下なら死亡処理
-                            if enemy.hp <= 0:
-                                for _ in range(4):  # 8から4に削減
-                                    particles.append(DeathParticle(enemy.x, enemy.y, enemy.color))
+                        # 撃破カウンターを増加
+                        enemies_killed_this_game += 1
+                        current_game_money += MONEY_PER_ENEMY_KILLED
 
-                                # ボス死亡時の特別エフェクト（赤いドット＋拡大赤円フラッシュ＋画面揺れ）
-                                if getattr(enemy, 'is_boss', False):
-                                    try:
-                                        from effects.particles import BossDeathEffect, BossDeathFlash
-                                        particles.append(BossDeathEffect(enemy.x, enemy.y))
-                                        particles.append(BossDeathFlash(enemy.x, enemy.y))
-                                        # 画面揺れ（ボム取得時と同じ）
-                                        if hasattr(player, 'activate_screen_shake'):
-                                            player.activate_screen_shake()
-                                    except Exception as e:
-                                        print(f"[WARNING] Failed to create boss death effect: {e}")
-
-                                    # ボス撃破時に特別な宝箱 (box4.png) をドロップ
-                                    try:
-                                        # ItemBox は BoxManager を通じて管理されるべきなので、box_manager に追加
-                                        from ui.box import ItemBox
-                                        special_box = ItemBox(enemy.x, enemy.y, box_type=4)
-                                        box_manager.boxes.append(special_box)
-                                        # 大きめのスポーンエフェクト
-                                        if len(particles) < 300:
-                                            for _ in range(12):
-                                                particles.append(SpawnParticle(special_box.x, special_box.y, (255, 100, 100)))
-                                    except Exception as e:
-                                        pass
+                        # エネミーNo.別撃破統計を更新
+                        enemy_no = getattr(enemy, 'enemy_no', 1)  # デフォルトはNo.1
+                        if enemy_no in enemy_kill_stats:
+                            enemy_kill_stats[enemy_no] += 1
+                        else:
+                            enemy_kill_stats[enemy_no] = 1
 
-                                # 撃破カウンターを増加
-                                enemies_killed_this_game += 1
-                                current_game_money += MONEY_PER_ENEMY_KILLED
-                                
-                                # エネミーNo.別撃破統計を更新
-                                enemy_no = getattr(enemy, 'enemy_no', 1)  # デフォルトはNo.1
-                                if enemy_no in enemy_kill_stats:
-                                    enemy_kill_stats[enemy_no] += 1
-                                else:
-                                    enemy_kill_stats[enemy_no] = 1
+                        # エネミーからは100%経験値ジェムのみドロップ
+                        experience_gems.append(ExperienceGem(enemy.x, enemy.y))
+                        enforce_experience_gems_limit(experience_gems, player_x=player.x, player_y=player.y)
 
-                                # エネミーからは100%経験値ジェムのみドロップ
-                                experience_gems.append(ExperienceGem(enemy.x, enemy.y))
-                                enforce_experience_gems_limit(experience_gems, player_x=player.x, player_y=player.y)
+                        # リストからの削除はループ後にまとめて行う
+                        killed_enemies.add(id(enemy))
 
-                                if enemy in enemies:
-                                    enemies.remove(enemy)
+                    # ヒット時に消費する攻撃（弾丸系など）のみ削除する
+                    if getattr(attack, 'type', '') in consumable_on_hit:
+                        if attack in player.active_attacks:
+                            player.active_attacks.remove(attack)
 
-                            # ヒット時に消費する攻撃（弾丸系など）のみ削除する
-                            consumable_on_hit = {"magic_wand"}
-                            if getattr(attack, 'type', '') in consumable_on_hit:
-                                if attack in player.active_attacks:
-                                    player.active_attacks.remove(attack)
+                    # stone は貫通させる（それ以外はこのフレームのヒット処理を終了）
+                    if getattr(attack, 'type', '') not in penetrating_types:
+                        finished_attacks.add(ai)
 
-                            # stone は貫通させるため、貫通攻撃の一覧を定義
-                            penetrating_types = {"stone"}
-                            if getattr(attack, 'type', '') not in penetrating_types:
-                                break
+                # 倒した敵をまとめてリストから削除
+                if killed_enemies:
+                    enemies[:] = [e for e in enemies if id(e) not in killed_enemies]
+                attack_collision_ms = profiler.end('attack_collisions')
 
-                # ゲーム時間の更新（デルタタイムベース）
-                # フレームスキップが発生してもゲーム時間は正確に進む
-                frame_time_seconds = TARGET_FRAME_TIME / 1000.0
-                game_time_accumulator += main.smoothed_delta_time_ms / 1000.0  # ミリ秒を秒に変換
-                
-                # 固定タイムステップでゲーム進行（フレームスキップ対応）
-                updates_needed = int(game_time_accumulator / frame_time_seconds)
-                if updates_needed > 0:
-                    game_time += updates_needed * frame_time_seconds
-                    game_time_accumulator -= updates_needed * frame_time_seconds
+                # ゲーム時間の更新（1 ティック分。描画が遅れても追加ティックで正確に進む）
+                game_time += tick_seconds
 
                 # クリア判定
                 if game_time >= SURVIVAL_TIME:
@@ -1467,6 +1339,7 @@ def main():
                     last_difficulty_increase = game_time
 
                 # ボス生成処理（CSVの各行を個別チェック）
+                profiler.begin('spawn')
                 boss_spawn_timer += 1
                 
                 # 全てのボス設定を取得
@@ -1540,8 +1413,7 @@ def main():
                             
                             # ボススポーンエフェクト（軽量化）
                             if len(particles) < 300:
-                                for _ in range(6):  # スパイクを抑える
-                                    particles.append(SpawnParticle(boss_x, boss_y, (255, 215, 0)))  # 金色
+                                particles.emit('spawn', boss_x, boss_y, (255, 215, 0), count=6)  # スパイクを抑える
 
                 # 敵の生成を爆発的に
                 # spawn_frequency倍率を適用してスポーン頻度を調整
@@ -1609,7 +1481,7 @@ def main():
                         enemy = Enemy(screen, game_time, spawn_x=sx, spawn_y=sy, spawn_side=side, 
                                      enemy_no=enemy_no, strength_multiplier=strength_mult, size_multiplier=size_mult)
                         enemies.append(enemy)
-                        particles.append(SpawnParticle(enemy.x, enemy.y, enemy.color))
+                        particles.emit('spawn', enemy.x, enemy.y, enemy.color)
                     spawn_timer = 0
 
                 # 敵の数を制限（バランス調整）
@@ -1649,96 +1521,69 @@ def main():
                         # リストを再構築（ボスを含める）
                         enemies[:] = boss_enemies + on_screen_enemies + off_screen_enemies
 
+                profiler.end('spawn')
+
                 # 削除対象の敵を記録するリスト
                 enemies_to_remove = []
                 # 画面外に出た通常エネミーを即時リポップするためのキュー
                 new_enemies_to_add = []
 
-                # --- ユニフォームグリッドによる近傍検索構築 ---
-                # 近傍探索の対象を隣接セルに限定して separation の計算コストを削減
-                try:
-                    # セルサイズは敵サイズや視界に合わせて調整可能
-                    GRID_CELL_SIZE = 128
-                    grid = {}
-                    for e in enemies:
+                # --- 永続ユニフォームグリッドを現在のエネミーリストに同期 ---
+                # スポーン・削除・リポップを反映し、セルをまたいだエネミーだけを移動させる
+                profiler.begin('enemy_sync')
+                enemy_grid.sync(enemies)
+
+                # SoA プールに同期し、行動パターン 1〜4 の移動量を一括計算
+                enemy_pool.sync(enemies)
+                profiler.end('enemy_sync')
+
+                # フローフィールドの探索を進め（作り直し中のみ）、追跡タイプはその経路方向で移動量を計算
+                profiler.begin('flow_field')
+                flow_field.update(player.x, player.y)
+                flow_field.publish_stats(performance_stats)
+                enemy_pool.compute_steps(player.x, player.y, delta_time, flow_field)
+                profiler.end('flow_field')
+
+                # エネミー移動処理（並列化対応・ゾーン計測付き）
+                profiler.begin('enemy_update')
+                profiler.begin('enemy_move')
+                
+                def update_enemy_batch(enemy_batch):
+                    for enemy, enemy_dt, simple in enemy_batch:
                         try:
-                            gx = int(e.x) // GRID_CELL_SIZE
-                            gy = int(e.y) // GRID_CELL_SIZE
-                        except Exception:
-                            gx, gy = 0, 0
-                        key = (gx, gy)
-                        grid.setdefault(key, []).append(e)
-                except Exception:
-                    grid = None
+                            # 移動前の位置は描画時の補間に使う
+                            enemy.render_prev_x = enemy.x
+                            enemy.render_prev_y = enemy.y
 
-                # エネミー移動処理（並列化対応・高精度パフォーマンス測定付き）
-                enemy_update_start_time = time.perf_counter()
-                
-                if len(enemies) > 2 and PARALLEL_PROCESSING_ENABLED:  # 閾値を5から2に大幅に下げる（より積極的な並列化）
-                    # 大量のエネミーの場合は並列処理
-                    try:
-                        # エネミーを複数バッチに分割
-                        batch_size = max(1, len(enemies) // 8)  # 8つのバッチに分割（6→8に増加）
-                        enemy_batches = [enemies[i:i + batch_size] for i in range(0, len(enemies), batch_size)]
-                        
-                        num_workers = min(8, len(enemy_batches), mp.cpu_count())  # 8コアをフル活用
-                        performance_stats['parallel_threads'] = max(performance_stats.get('parallel_threads', 0), num_workers)
-                        with ThreadPoolExecutor(max_workers=num_workers) as executor:  # 最大8スレッド
-                            def update_enemy_batch(enemy_batch):
-                                for enemy in enemy_batch:
-                                    try:
-                                        # ノックバック更新処理
-                                        if hasattr(enemy, 'update_knockback'):
-                                            # delta_timeをframe_timeとして渡す（1/60秒を基準としたframe time）
-                                            enemy.update_knockback(delta_time * (1.0/60.0))
-                                        
-                                        # 簡素化された近傍処理
-                                        nearby = enemies if len(enemies) <= 50 else enemy_batch
-                                        enemy.move(player, camera_x=int(camera_x), camera_y=int(camera_y), map_loader=map_loader, enemies=nearby, delta_time=delta_time)
-                                        
-                                        # ボスの画面外チェック
-                                        if hasattr(enemy, 'is_boss') and enemy.is_boss:
-                                            if hasattr(enemy, 'is_boss_off_screen') and enemy.is_boss_off_screen():
-                                                pass  # リスポーン処理は後で実行
-                                    except Exception:
-                                        pass  # エラー時は個々のエネミーをスキップ
-                            
-                            # 並列実行
-                            futures = [executor.submit(update_enemy_batch, batch) for batch in enemy_batches]
-                            for future in futures:
-                                future.result()  # 完了を待つ
-                                
-                    except Exception:
-                        # 並列処理エラー時は逐次処理にフォールバック
-                        for enemy in enemies[:]:
+                            # ノックバック更新処理
                             if hasattr(enemy, 'update_knockback'):
-                                enemy.update_knockback(delta_time * (1.0/60.0))
-                            nearby = enemies
-                            enemy.move(player, camera_x=int(camera_x), camera_y=int(camera_y), map_loader=map_loader, enemies=nearby, delta_time=delta_time)
-                else:
-                    # 少数のエネミーまたは並列処理無効の場合は従来の処理
-                    for enemy in enemies[:]:
-                        # ノックバック更新処理
-                        if hasattr(enemy, 'update_knockback'):
-                            enemy.update_knockback(delta_time * (1.0/60.0))
-                        # 近傍リスト構築の大幅軽量化（動作は維持）
-                        nearby = enemies  # デフォルトは全エネミー
-                        if grid is not None and len(enemies) > 50:  # 閾値を下げて早期適用
-                            try:
-                                gx = int(enemy.x) // GRID_CELL_SIZE
-                                gy = int(enemy.y) // GRID_CELL_SIZE
-                                # より効率的なグリッド検索（計算量削減）
-                                nearby_set = []
-                                nearby_set.extend(grid.get((gx, gy), []))  # 中心セルのみ
-                                # エネミー数が多い場合のみ周辺セルを追加
-                                if len(enemies) > 100:
-                                    for ox, oy in [(gx-1, gy), (gx+1, gy), (gx, gy-1), (gx, gy+1)]:  # 十字のみ
-                                        nearby_set.extend(grid.get((ox, oy), []))
-                                nearby = nearby_set if len(nearby_set) < len(enemies) // 2 else enemies
-                            except Exception:
-                                nearby = enemies
+                                # delta_timeをframe_timeとして渡す（1/60秒を基準としたframe time）
+                                enemy.update_knockback(enemy_dt * (1.0/60.0))
+
+                            if simple:
+                                # 画面から遠いエネミーは分離なしの軽量な移動
+                                enemy.move_simple(player, delta_time=enemy_dt)
+                            else:
+                                # 近傍は空間グリッドから取得（逐次・並列で同じ近傍集合）
+                                enemy.move(player, camera_x=int(camera_x), camera_y=int(camera_y), map_loader=map_loader, delta_time=enemy_dt, spatial_index=enemy_grid)
+                        except Exception:
+                            pass  # エラー時は個々のエネミーをスキップ
 
-                        enemy.move(player, camera_x=int(camera_x), camera_y=int(camera_y), map_loader=map_loader, enemies=nearby, delta_time=delta_time)
+                # 画面外のエネミーは AI LOD で間引き、このティックに更新する分だけを処理する
+                # （間引いたティックの経過時間は各エネミーに積算され、次の更新でまとめて進む）
+                enemy_updates = ai_lod.schedule(enemies, int(camera_x), int(camera_y), delta_time)
+                ai_lod.publish_stats(performance_stats)
+
+                # ワーカープロセスが有効なら通常移動はそちらで処理し、残り（軽量移動など）だけをスレッドで処理する
+                enemy_updates = enemy_backend.run(enemy_updates, enemies, player)
+                enemy_backend.publish_stats(performance_stats)
+
+                # 常駐ワーカーでバッチ実行（少数・並列無効時はその場で逐次実行）
+                try:
+                    job_system.run(update_enemy_batch, enemy_updates)
+                except Exception:
+                    # 並列処理エラー時は逐次処理にフォールバック
+                    update_enemy_batch(enemy_updates)
                 
                 # ボスの画面外チェックとリスポーン処理（全エネミーをチェック）
                 for enemy in enemies[:]:
@@ -1749,47 +1594,19 @@ def main():
                             
                             # リスポーンエフェクト
                             if len(particles) < 300:
-                                for _ in range(10):
-                                    particles.append(SpawnParticle(enemy.x, enemy.y, (255, 215, 0)))  # 金色
+                                particles.emit('spawn', enemy.x, enemy.y, (255, 215, 0), count=10)  # 金色
+
+                profiler.end('enemy_move')
 
                 # 敵の攻撃処理（動作継続、頻度調整で軽量化）
+                profiler.begin('enemy_attacks')
+                # 攻撃処理の頻度は品質ガバナーの段階と敵数で決まる（画面外の敵はさらに間引く）
+                ai_interval = quality_governor.ai_interval(False, len(enemies))
+                offscreen_ai_interval = quality_governor.ai_interval(True, len(enemies))
                 for enemy in enemies[:]:
-                    # パフォーマンス重視：攻撃更新頻度をより積極的に制限
-                    # CPU使用率に応じて動的に調整
-                    cpu_usage = performance_stats.get('cpu_usage', 50.0)
-                    attack_should_update = True
-                    
-                    if cpu_usage > 80.0:  # CPU使用率が80%超過時は大幅に頻度を下げる
-                        if len(enemies) > 100:
-                            attack_should_update = (frame_count % 16 == 0)  # 1/16頻度
-                        elif len(enemies) > 50:
-                            attack_should_update = (frame_count % 12 == 0)  # 1/12頻度
-                        else:
-                            attack_should_update = (frame_count % 8 == 0)   # 1/8頻度
-                    elif cpu_usage > 65.0:  # CPU使用率が65%超過時は頻度を下げる
-                        if len(enemies) > 100:
-                            attack_should_update = (frame_count % 12 == 0)  # 1/12頻度
-                        elif len(enemies) > 50:
-                            attack_should_update = (frame_count % 8 == 0)   # 1/8頻度
-                        else:
-                            attack_should_update = (frame_count % 6 == 0)   # 1/6頻度
-                    else:  # 通常時
-                        if enemy.is_off_screen():
-                            # 画面外は頻度を下げる
-                            if len(enemies) > 100:
-                                attack_should_update = (frame_count % 8 == 0)  # 1/8頻度
-                            else:
-                                attack_should_update = (frame_count % 4 == 0)  # 1/4頻度
-                        elif len(enemies) > 150:
-                            attack_should_update = (frame_count % 6 == 0)   # 1/6頻度
-                        elif len(enemies) > 100:
-                            attack_should_update = (frame_count % 4 == 0)   # 1/4頻度
-                    
-                    if attack_should_update:
+                    interval = offscreen_ai_interval if enemy.is_off_screen() else ai_interval
+                    if interval <= 1 or frame_count % interval == 0:
                         enemy.update_attack(player)
-                    
-                    # 弾丸更新は常に実行（ゲームプレイの重要な要素なので軽量化対象から除外）
-                    enemy.update_projectiles(player, delta_time)
 
                     # --- 画面外リポップ仕様: ノーマルエネミーがカメラ外（マージン付き）に出たら削除して
                     #     画面外からポップする形で再出現させる（ボスは除外） ---
@@ -1870,6 +1687,8 @@ def main():
                                 enemies_to_remove.append(enemy)
                                 continue
                 
+                profiler.end('enemy_attacks')
+
                 # 削除対象の敵を一括削除
                 for enemy in enemies_to_remove:
                     if enemy in enemies:
@@ -1877,8 +1696,14 @@ def main():
                 # キューされた新しい敵を追加
                 if new_enemies_to_add:
                     enemies.extend(new_enemies_to_add)
+
+                # 弾丸の一括更新（寿命切れ・カリング・発射元が消えた弾の削除と移動）
+                # 弾丸更新は常に実行（ゲームプレイの重要な要素なので軽量化対象から除外）
+                with profiler.zone('bullets_update'):
+                    enemy_projectiles.update(player, delta_time, (e.projectile_owner_id for e in enemies))
                 
                 # 残った敵の当たり判定処理
+                profiler.begin('player_contact')
                 for enemy in enemies:
                     # 削除対象に含まれている敵はスキップ
                     if enemy in enemies_to_remove:
@@ -1914,7 +1739,7 @@ def main():
                                 player.hp -= enemy.damage
 
                             # 被弾時刻を更新（新しいシステムで管理）
-                            player.last_hit_time = pygame.time.get_ticks()
+                            player.last_hit_time = game_clock.get_ticks()
                             
                             # 通常無敵時間を設定（連続ダメージ防止）
                             player.set_normal_invincible()
@@ -1937,109 +1762,71 @@ def main():
                                 # except Exception:
                                 #     pass
 
-                # 敵の弾丸とプレイヤーの衝突判定（負荷軽減）
-                # エネミー弾丸処理（効率化：事前計算）
-                total_projectiles = sum(len(enemy.get_projectiles()) for enemy in enemies)
-                
-                # エネミー更新処理の時間を記録（高精度）
-                enemy_update_end_time = time.perf_counter()
-                performance_stats['enemy_update_time'] = (enemy_update_end_time - enemy_update_start_time) * 1000  # ms変換
-                
-                # 弾丸数が多い場合はより厳しく制限
-                if total_projectiles > 150:
-                    enemy_limit = max(1, len(enemies) // 4)  # 1/4まで削減
-                elif total_projectiles > 100:
-                    enemy_limit = max(1, len(enemies) // 3)  # 1/3まで削減
-                elif total_projectiles > 50:
-                    enemy_limit = max(1, len(enemies) * 2 // 3)
-                else:
-                    enemy_limit = len(enemies)
+                profiler.end('player_contact')
+
+                # エネミー更新処理の時間を記録
+                performance_stats['enemy_update_time'] = profiler.end('enemy_update')
                 
-                # プレイヤーサイズの事前計算（重複計算削除）
+                # 敵の弾丸とプレイヤーの衝突判定（全弾丸を一括判定、古い弾から処理）
+                profiler.begin('bullet_collisions')
                 player_half = getattr(player, 'size', 0) // 2
-                
-                for enemy in enemies[:enemy_limit]:
-                    projectiles = enemy.get_projectiles()
-                    # 弾丸数による厳格制限
-                    if total_projectiles > 150:
-                        projectile_limit = min(5, len(projectiles))  # 大幅制限
-                    elif total_projectiles > 100:
-                        projectile_limit = min(8, len(projectiles))
-                    else:
-                        projectile_limit = min(10, len(projectiles))
+                projectile_hits = enemy_projectiles.hit_player(player.x, player.y, player_half)
+                removed_projectiles = []
+                for index, proj_x, proj_y, proj_damage in projectile_hits:
+                    # 無敵時間チェック（最優先）
+                    if not player.can_take_damage():
+                        break  # 無敵時間中はダメージも回避も発生しない（弾丸は残る）
                     
-                    for projectile in projectiles[:projectile_limit]:
-                        # プレイヤーとの正方形衝突判定（事前計算済みを使用）
-                        proj_half = projectile.size // 2
-                        if (abs(player.x - projectile.x) < player_half + proj_half and 
-                            abs(player.y - projectile.y) < player_half + proj_half):
-                                # 無敵時間チェック（最優先）
-                                if not player.can_take_damage():
-                                    continue  # 無敵時間中はダメージも回避も発生しない
-                                
-                                if random.random() < player.get_avoidance():
-                                    # 攻撃を回避
-                                    particles.append(AvoidanceParticle(player.x, player.y))
-                                    try:
-                                        from effects.particles import LuckyText
-                                        particles.append(LuckyText(player.x, player.y - getattr(player, 'size', 32) - 6, "Lukey!", color=CYAN))
-                                    except Exception:
-                                        pass
-                                else:
-                                    # ダメージ処理
-                                    particles.append(HurtFlash(player.x, player.y, size=player.size))
+                    if random.random() < player.get_avoidance():
+                        # 攻撃を回避
+                        particles.append(AvoidanceParticle(player.x, player.y))
+                        try:
+                            from effects.particles import LuckyText
+                            particles.append(LuckyText(player.x, player.y - getattr(player, 'size', 32) - 6, "Lukey!", color=CYAN))
+                        except Exception:
+                            pass
+                    else:
+                        # ダメージ処理
+                        particles.append(HurtFlash(player.x, player.y, size=player.size))
 
-                                    # ダメージを適用
-                                    try:
-                                        player.hp -= max(1, int(projectile.damage - player.get_defense()))
-                                    except Exception:
-                                        player.hp -= projectile.damage
+                        # ダメージを適用
+                        try:
+                            player.hp -= max(1, int(proj_damage - player.get_defense()))
+                        except Exception:
+                            player.hp -= proj_damage
 
-                                    # 被弾時刻を更新（新しいシステムで管理）
-                                    player.last_hit_time = pygame.time.get_ticks()
-                                    
-                                    # 通常無敵時間を設定（連続ダメージ防止）
-                                    player.set_normal_invincible()
+                        # 被弾時刻を更新（新しいシステムで管理）
+                        player.last_hit_time = game_clock.get_ticks()
+                        
+                        # 通常無敵時間を設定（連続ダメージ防止）
+                        player.set_normal_invincible()
 
-                                    # サウンド: プレイヤー被弾（弾）
-                                    try:
-                                        # from audio import audio (先頭でインポート済み)
-                                        audio.play_sound('player_hurt')
-                                    except Exception:
-                                        pass
+                        # サウンド: プレイヤー被弾（弾）
+                        try:
+                            # from audio import audio (先頭でインポート済み)
+                            audio.play_sound('player_hurt')
+                        except Exception:
+                            pass
 
-                                    if player.hp <= 0:
-                                        game_over = True
-                                
-                                # 弾丸を削除
-                                enemy.projectiles.remove(projectile)
-                                continue  # 弾丸が削除されたので次の弾丸へ
-                            
-                        # 弾丸とプレイヤーの武器の衝突判定（ボスの弾は相殺不可）
-                        projectile_hit = False
-                        if not getattr(projectile, 'is_boss_bullet', False):  # ボスの弾でない場合のみ相殺可能
-                            for attack in player.active_attacks:
-                                if projectile_hit:
-                                    break
-                                
-                                # 武器と弾丸の正方形衝突判定（最高速化）
-                                attack_half = getattr(attack, 'size', 0) // 2
-                                proj_half = projectile.size // 2
-                                
-                                if (abs(attack.x - projectile.x) < attack_half + proj_half and 
-                                    abs(attack.y - projectile.y) < attack_half + proj_half):
-                                    # 武器が弾丸を迎撃
-                                    projectile_hit = True
-                                    break
-                        
-                        if projectile_hit:
-                            # 弾丸迎撃エフェクトを追加
-                            particles.append(DeathParticle(projectile.x, projectile.y, (255, 255, 100)))  # 黄色いエフェクト
-                            
-                            # 弾丸を削除
-                            enemy.projectiles.remove(projectile)
+                        if player.hp <= 0:
+                            game_over = True
+                    
+                    # 弾丸を削除
+                    removed_projectiles.append(index)
+                
+                # 弾丸とプレイヤーの武器の衝突判定（一括判定、ボスの弾は相殺不可）
+                # プレイヤーに重なっている弾は迎撃対象外
+                for index, proj_x, proj_y in enemy_projectiles.intercepted(
+                        player.active_attacks, exclude=[hit[0] for hit in projectile_hits]):
+                    # 弾丸迎撃エフェクトを追加
+                    particles.emit('death', proj_x, proj_y, (255, 255, 100))  # 黄色いエフェクト
+                    removed_projectiles.append(index)
+                enemy_projectiles.remove(removed_projectiles)
+                bullet_collision_ms = profiler.end('bullet_collisions')
+                performance_stats['collision_check_time'] = box_collision_ms + attack_collision_ms + bullet_collision_ms
 
                 # 経験値ジェム処理（効率化：ループ外事前計算）
+                profiler.begin('gems')
                 gems_collected_this_frame = 0  # このフレームで取得したジェム数
                 
                 # ⚡ 最適化：ループ外で1回だけ計算
@@ -2080,8 +1867,7 @@ def main():
                         gems_collected_this_frame += 1  # 取得数をカウント
                         if player.level > prev_level:
                             particles.append(LevelUpEffect(player.x, player.y))
-                            for _ in range(12):
-                                particles.append(DeathParticle(player.x, player.y, CYAN))
+                            particles.emit('death', player.x, player.y, CYAN, count=12)
                             # レベルアップボーナス
                             current_game_money += MONEY_PER_LEVEL_BONUS
                 
@@ -2095,8 +1881,11 @@ def main():
                     except Exception:
                         pass
 
+                profiler.end('gems')
+
                 # アイテム処理（効率化：ループ外事前計算）
                 # ⚡ 最適化：ループ外で1回だけ計算（ジェム処理と共通化）
+                profiler.begin('items')
                 for item in items[:]:
                     item.move_to_player(player)
                     
@@ -2132,68 +1921,74 @@ def main():
                             money_type = getattr(item, 'money_type', 'money1')
                             current_game_money += money_amount
                             # お金取得のエフェクト（金色の爆発）
-                            for _ in range(3):
-                                particles.append(DeathParticle(item.x, item.y, (255, 215, 0)))
+                            particles.emit('death', item.x, item.y, (255, 215, 0), count=3)
                         items.remove(item)
+                profiler.end('items')
+                profiler.end('update')
 
             # パーティクルの更新と描画
             # パーティクルはカメラに依存しないため従来通り呼び出す
             # パーティクル数が多すぎる場合は古いものから削減して負荷を抑える
-            if len(particles) > PARTICLE_LIMIT:
-                # 最も新しいものを残す（古いものは削除）
-                particles = particles[-PARTICLE_TRIM_TO:]
-
-            # パーティクル更新処理（2フレームに1回で負荷軽減）
-            if frame_count % 2 == 0:
-                # 安全に順次更新して生存するものだけ残す
-                new_particles = []
-                for p in particles:
-                    try:
-                        if p.update():
-                            new_particles.append(p)
-                    except Exception:
-                        # エフェクトの update で例外が出てもゲームを継続する
-                        pass
-                # パーティクルの更新（高精度パフォーマンス測定付き）
-                particle_start_time = time.perf_counter()
-                particles = parallel_update_particles(particles)
-                particle_end_time = time.perf_counter()
-                performance_stats['particle_update_time'] = (particle_end_time - particle_start_time) * 1000  # ms変換
-
-            # カメラ目標を現在のプレイヤー位置から再計算（プレイヤー移動後）
-            # 仮想画面サイズ（常に1280x720）を基準にカメラ計算
-            desired_x = max(0, min(WORLD_WIDTH - SCREEN_WIDTH, player.x - SCREEN_WIDTH // 2))
-            desired_y = max(0, min(WORLD_HEIGHT - SCREEN_HEIGHT, player.y - SCREEN_HEIGHT // 2))
-            # 補間（スムージング）
-            camera_x += (desired_x - camera_x) * CAMERA_LERP
-            camera_y += (desired_y - camera_y) * CAMERA_LERP
-            
+            # 単純パーティクルは配列上でまとめて更新・詰め直しを行う（毎フレーム1回）
+            if run_tick:
+                profiler.begin('particles')
+                particles.trim(quality['particle_limit'], quality['particle_trim_to'])
+                particles.update()
+                performance_stats['particle_update_time'] = profiler.end('particles')
+
+                # カメラ目標を現在のプレイヤー位置から再計算（プレイヤー移動後）
+                # 仮想画面サイズ（常に1280x720）を基準にカメラ計算
+                desired_x = max(0, min(WORLD_WIDTH - SCREEN_WIDTH, player.x - SCREEN_WIDTH // 2))
+                desired_y = max(0, min(WORLD_HEIGHT - SCREEN_HEIGHT, player.y - SCREEN_HEIGHT // 2))
+                # 補間（スムージング）。前ティックの位置は描画時の補間に使う
+                prev_camera_x, prev_camera_y = camera_x, camera_y
+                camera_x += (desired_x - camera_x) * CAMERA_LERP
+                camera_y += (desired_y - camera_y) * CAMERA_LERP
+
+            # 遅れを取り戻している間は描画せずに次のティックへ
+            if pending_ticks > 0:
+                frame_count += 1
+                continue
+
+            # このフレームのジョブ統計（ワーカー数・キュー待ち・バリア待ち）を反映
+            job_system.publish_stats(performance_stats)
+
+            # 描画は前ティックと現ティックの間を render_alpha で補間する（描画は最大 1 ティック遅れる）。
+            # 直近のティックでゲームが進んでいない（一時停止中など）場合は現在位置をそのまま描く
+            entity_alpha = render_alpha if last_tick_simulated else 1.0
+
             # 画面揺れオフセットを適用
             shake_offset_x, shake_offset_y = player.get_screen_shake_offset()
-            
-            # 描画で使用する整数カメラ座標（画面揺れを加味）
-            int_cam_x = int(camera_x) + shake_offset_x
-            int_cam_y = int(camera_y) + shake_offset_y
 
-            # 描画処理の開始時間を記録（高精度）
-            render_start_time = time.perf_counter()
+            # 描画で使用する整数カメラ座標（補間位置に画面揺れを加味）
+            int_cam_x = int(prev_camera_x + (camera_x - prev_camera_x) * render_alpha) + shake_offset_x
+            int_cam_y = int(prev_camera_y + (camera_y - prev_camera_y) * render_alpha) + shake_offset_y
 
-            # 仮想画面をクリア
-            virtual_screen.fill((0, 0, 0))
+            # ヘッドレス実行（描画なし）はここでフレームを終える
+            if sim is not None and not sim.render:
+                performance_stats['render_time'] = 0.0
+                performance_stats['frame_time'] = profiler.end_frame()
+                running = sim.end_frame(performance_stats, player, enemies, game_time)
+                frame_count += 1
+                continue
 
-            # ワールド用サーフェスの最適化（SRCALPHA不要、convert使用）
-            world_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
-            world_surf.fill((0, 0, 0))  # 背景を黒で塗りつぶし
+            # 描画処理のゾーンを開始
+            profiler.begin('render')
 
             # 背景描画（設定により切り替え）
+            # 背景レイヤーはカメラが動いたときだけ更新され、仮想画面にコピーされる。
+            # エンティティはその上（仮想画面）に直接描画する
+            profiler.begin('map_draw')
             if USE_CSV_MAP:
                 # CSVマップ背景
-                map_loader.draw_map(world_surf, int_cam_x, int_cam_y)
+                world_surf = compositor.begin_frame(map_loader.draw_map, int_cam_x, int_cam_y)
             else:
                 # テスト用市松模様背景
-                draw_test_checkerboard(world_surf, int_cam_x, int_cam_y)
+                world_surf = compositor.begin_frame(draw_test_checkerboard, int_cam_x, int_cam_y)
+            profiler.end('map_draw')
             
             # 敵の描画（厳格な画面内カリング + 距離ソート最適化）
+            profiler.begin('entity_draw')
             screen_left = int_cam_x - DRAWING_MARGIN
             screen_right = int_cam_x + SCREEN_WIDTH + DRAWING_MARGIN
             screen_top = int_cam_y - DRAWING_MARGIN
@@ -2218,11 +2013,16 @@ def main():
             
             # 画面内エネミーのみ描画（画面外描画を完全停止でパフォーマンス向上）
             for enemy in screen_enemies:
-                enemy.draw(world_surf, int_cam_x, int_cam_y)
-                enemy.draw_projectiles(world_surf, int_cam_x, int_cam_y)
-                performance_stats['draw_calls'] += 2  # enemy + projectiles
+                ox, oy = interpolation_offset(enemy.x, enemy.y, getattr(enemy, 'render_prev_x', enemy.x),
+                                              getattr(enemy, 'render_prev_y', enemy.y), entity_alpha)
+                enemy.draw(world_surf, int_cam_x - ox, int_cam_y - oy)
+                performance_stats['draw_calls'] += 1
                 performance_stats['visible_entities'] += 1
             
+            # 敵の弾丸（発射元が画面外でも画面内の弾は描画）
+            enemy_projectiles.draw(world_surf, int_cam_x, int_cam_y, margin=DRAWING_MARGIN, alpha=entity_alpha)
+            performance_stats['draw_calls'] += 1
+            
             # ボックスの描画（敵の後、パーティクルの前）
             box_manager.draw_all(world_surf, int_cam_x, int_cam_y)
 
@@ -2232,7 +2032,8 @@ def main():
             overlay_particles = [p for p in particles if isinstance(p, (HurtFlash, LevelUpEffect))]
             
             # パーティクル描画数を制限（描画負荷軽減） + 視錐台カリング
-            max_particles_draw = min(150, len(world_particles))  # パーティクル描画を150個まで制限
+            particle_draw_limit = quality['particle_draw_limit']
+            max_particles_draw = min(particle_draw_limit, len(world_particles))  # 品質段階ごとの上限まで描画
             visible_particles = []
             
             # パーティクルも画面内カリングを適用
@@ -2243,6 +2044,16 @@ def main():
                         visible_particles.append(particle)
                 else:
                     visible_particles.append(particle)  # 座標がない場合はそのまま描画
+
+            # 単純パーティクル（配列）を先に描画（残りの描画枠の範囲で新しいものを優先）
+            if particles.simple is not None:
+                drawn, culled = particles.simple.draw(
+                    world_surf, int_cam_x, int_cam_y,
+                    bounds=(screen_left, screen_top, screen_right, screen_bottom),
+                    limit=particle_draw_limit - len(visible_particles))
+                performance_stats['draw_calls'] += drawn
+                performance_stats['culled_entities'] += culled
+                performance_stats['visible_entities'] += drawn
             
             # 画面内パーティクルのみ描画
             for particle in visible_particles:
@@ -2255,7 +2066,7 @@ def main():
             performance_stats['visible_entities'] += len(visible_particles)
 
             # 経験値ジェムの描画（制限付き + 視錐台カリング）
-            max_gems_draw = min(100, len(experience_gems))  # ジェム描画を100個まで制限
+            max_gems_draw = min(quality['gem_draw_limit'], len(experience_gems))  # 品質段階ごとの上限まで描画
             visible_gems = []
             
             # ジェムも画面内カリングを適用
@@ -2288,11 +2099,14 @@ def main():
             performance_stats['culled_entities'] += (len(items) - len(visible_items))
             performance_stats['visible_entities'] += len(visible_items)
 
+            # プレイヤーの補間オフセット（プレイヤーに追従する武器エフェクトも同じ位置にずらす）
+            player_ox, player_oy = interpolation_offset(player.x, player.y, player_prev_x, player_prev_y, entity_alpha)
+
             # まず武器のエフェクトを描画（プレイヤーより後ろに表示されるべきなので先に描く）
-            player.draw_attacks(world_surf, int_cam_x, int_cam_y)
+            player.draw_attacks(world_surf, int_cam_x - player_ox, int_cam_y - player_oy)
 
             # プレイヤー本体は武器エフェクトより手前に表示する
-            player.draw(world_surf, int_cam_x, int_cam_y)
+            player.draw(world_surf, int_cam_x - player_ox, int_cam_y - player_oy)
 
             # ジェム回収範囲の可視化（デバッグ用）
             if SHOW_PICKUP_RANGE:
@@ -2363,9 +2177,6 @@ def main():
                 except Exception:
                     pass
 
-            # ワールドを仮想画面にブリット
-            virtual_screen.blit(world_surf, (0, 0))
-
             # オーバーレイ系パーティクルを仮想画面に直接描画（全画面フラッシュ等）
             for particle in overlay_particles:
                 # overlay パーティクルはワールド座標を保持しているためカメラオフセットを渡す
@@ -2373,15 +2184,22 @@ def main():
                     particle.draw(virtual_screen, int_cam_x, int_cam_y)
                 except TypeError:
                     particle.draw(virtual_screen)
+            profiler.end('entity_draw')
 
             # 右上にミニマップを描画（毎フレーム描画でちらつき防止）
+            profiler.begin('hud')
             try:
-                draw_minimap(virtual_screen, player, enemies, experience_gems, items, int_cam_x, int_cam_y)
+                with profiler.zone('minimap'):
+                    draw_minimap(virtual_screen, player, enemies, experience_gems, items, int_cam_x, int_cam_y,
+                                 refresh_hz=quality['minimap_refresh_hz'])
             except Exception:
                 pass
 
-            # UI描画を仮想画面に（毎フレーム描画でちらつき防止）
-            draw_ui(virtual_screen, player, game_time, game_over, game_clear, damage_stats, ICONS, show_status=show_status, game_money=current_game_money, enemy_kill_stats=enemy_kill_stats, force_ended=force_ended)
+            # UI描画（HUD レイヤーは表示内容が変わったときだけ描き直して合成）
+            compositor.draw_hud(
+                hud_state_key(player, game_time, game_over, game_clear, damage_stats, show_status=show_status,
+                              game_money=current_game_money, enemy_kill_stats=enemy_kill_stats, force_ended=force_ended),
+                lambda hud_surf: draw_ui(hud_surf, player, game_time, game_over, game_clear, damage_stats, ICONS, show_status=show_status, game_money=current_game_money, enemy_kill_stats=enemy_kill_stats, force_ended=force_ended))
             # エンド画面のボタンを描画（描画だけでクリックはイベントハンドラで処理）
             if game_over or game_clear:
                 from ui.ui import draw_end_buttons
@@ -2408,9 +2226,10 @@ def main():
                 virtual_mouse_y = max(0, min(SCREEN_HEIGHT, virtual_mouse_y))
                 draw_level_choice(virtual_screen, player, ICONS, virtual_mouse_pos=(int(virtual_mouse_x), int(virtual_mouse_y)))
 
-            # 仮想画面を実際の画面にスケールして転送
-            screen.fill((0, 0, 0))  # レターボックス部分を黒で塗りつぶし
-            
+            profiler.end('hud')
+
+            # 仮想画面を実際の画面にスケールして転送（塗りつぶすのはレターボックス部分のみ）
+            profiler.begin('present')
             if scale_factor != 1.0:
                 # スケール済みサーフェスをキャッシュして再利用
                 scaled_size = (int(SCREEN_WIDTH * scale_factor), int(SCREEN_HEIGHT * scale_factor))
@@ -2418,44 +2237,37 @@ def main():
                     # キャッシュが無効またはサイズが変わった場合のみ新しいサーフェスを作成
                     scaled_surface = pygame.Surface(scaled_size)
                     print(f"[INFO] Created scaled surface cache: {scaled_size}")
-                
-                # キャッシュされたサーフェスにスケールして描画（最適化版）
-                pygame.transform.scale(virtual_screen, scaled_size, scaled_surface)
-                screen.blit(scaled_surface, (offset_x, offset_y))
-            else:
-                # 等倍で描画（キャッシュ不要）
-                screen.blit(virtual_screen, (offset_x, offset_y))
+            compositor.present(screen, scale_factor, (offset_x, offset_y), scaled_surface)
+            profiler.end('present')
 
             # FPS表示（実画面の左下に直接描画）
+            profiler.begin('debug_overlay')
             if SHOW_FPS and fps_font and len(fps_values) > 0:
                 # 過去のFPS値の平均を計算
                 avg_fps = sum(fps_values[-30:]) / len(fps_values[-30:])  # 直近30フレーム
                 
                 # 弾丸数をカウント
-                total_projectiles = sum(len(enemy.get_projectiles()) for enemy in enemies)
+                total_projectiles = len(enemy_projectiles)
                 
                 # 回収範囲情報を取得
                 pickup_range = player.get_gem_pickup_range() if hasattr(player, 'get_gem_pickup_range') else 0
                 pickup_level = player.get_magnet_level() if hasattr(player, 'get_magnet_level') else 0
                 
                 # 統計情報をまとめて表示
-                fps_text = fps_font.render(f"FPS: {avg_fps:.1f} | Enemies: {len(enemies)} | Bullets: {total_projectiles} | Gems: {len(experience_gems)} | Particles: {len(particles)} | Range: {pickup_range:.1f}px (Lv{pickup_level})", True, (255, 255, 255))
-                fps_rect = fps_text.get_rect()
+                fps_line = f"FPS: {avg_fps:.1f} | Enemies: {len(enemies)} | Bullets: {total_projectiles} | Gems: {len(experience_gems)} | Particles: {len(particles)} | Range: {pickup_range:.1f}px (Lv{pickup_level})"
+                # 毎フレーム変わる文字列はテキストキャッシュに入れず、グリフを直接描く
+                fps_rect = pygame.Rect((0, 0), resources.text_size(fps_font, fps_line))
                 fps_rect.bottomleft = (10, screen.get_height() - 10)
                 
                 # 敵の統計情報を集計
                 enemy_stats = {}
-                projectile_stats = {}
+                # 弾丸の統計（行動パターン別）
+                projectile_stats = enemy_projectiles.counts_by_behavior()
                 for enemy in enemies:
                     behavior_type = enemy.behavior_type
                     enemy_level = enemy.enemy_type
                     key = f"{behavior_type}-{enemy_level}"
                     enemy_stats[key] = enemy_stats.get(key, 0) + 1
-                    
-                    # 弾丸の統計も集計
-                    projectiles = enemy.get_projectiles()
-                    if projectiles:
-                        projectile_stats[behavior_type] = projectile_stats.get(behavior_type, 0) + len(projectiles)
                 
                 # 統計情報のテキストを作成
                 stat_lines = []
@@ -2490,15 +2302,14 @@ def main():
                 bg_surf.set_alpha(128)
                 bg_surf.fill((0, 0, 0))
                 screen.blit(bg_surf, bg_rect.topleft)
-                screen.blit(fps_text, fps_rect)
+                resources.draw_text(screen, fps_font, fps_line, (255, 255, 255), fps_rect.topleft)
                 
                 # 敵統計表示
                 y_offset = fps_rect.top - 5
                 for line in stat_lines:
                     if y_offset < 20:  # 画面上部に近づいたら表示を停止
                         break
-                    stat_text = fps_font.render(line, True, (255, 255, 255))
-                    stat_rect = stat_text.get_rect()
+                    stat_rect = pygame.Rect((0, 0), resources.text_size(fps_font, line))
                     stat_rect.bottomleft = (10, y_offset)
                     
                     stat_bg_rect = stat_rect.inflate(8, 4)
@@ -2507,7 +2318,7 @@ def main():
                     stat_bg_surf.set_alpha(128)
                     stat_bg_surf.fill((0, 0, 0))
                     screen.blit(stat_bg_surf, stat_bg_rect.topleft)
-                    screen.blit(stat_text, stat_rect)
+                    resources.draw_text(screen, fps_font, line, (255, 255, 255), stat_rect.topleft)
                     
                     y_offset = stat_rect.top - 5
                 
@@ -2517,16 +2328,26 @@ def main():
                 # 全体を一度に更新
                 update_rect = pygame.Rect(0, 0, 300, screen.get_height() - y_offset + 20)
 
-            # 描画処理の終了時間を記録（高精度）
-            render_end_time = time.perf_counter()
-            performance_stats['render_time'] = (render_end_time - render_start_time) * 1000  # ミリ秒に変換
+            profiler.end('debug_overlay')
 
-            pygame.display.flip()
-            
-            # フレーム時間を記録（高精度）
-            frame_end_time = time.perf_counter()
-            performance_stats['frame_time'] = (frame_end_time - frame_start_time) * 1000  # ミリ秒に変換
+            # 描画処理の時間を記録
+            performance_stats['render_time'] = profiler.end('render')
+
+            with profiler.zone('flip'):
+                pygame.display.flip()
             
+            # フレーム時間を記録
+            performance_stats['frame_time'] = profiler.end_frame()
+
+            # ヘッドレス実行ではログ出力とフレーム待ちを行わない
+            if sim is not None:
+                running = sim.end_frame(performance_stats, player, enemies, game_time)
+                frame_count += 1
+                continue
+
+            # フレームごとのバイナリログ（書き込みはバックグラウンドスレッド）
+            performance_logger.log_frame(performance_stats, game_time, delta_time_ms, clock.get_fps())
+
             # パフォーマンスログの記録（1秒間隔）
             current_time = time.time()
             if performance_logger.should_log(current_time):
@@ -2552,27 +2373,17 @@ def main():
                 except Exception as e:
                     print(f"[WARNING] Failed to log performance: {e}")
             
-            # フレームスキップ対応のフレームレート制御
-            if ENABLE_FRAME_SKIP:
-                # デルタタイムベースでフレームレートを制御
-                target_fps = FPS  # constants.pyからインポートされたFPSを使用
-                current_fps = clock.get_fps() if hasattr(clock, 'get_fps') else target_fps
-                if current_fps >= MIN_FPS_THRESHOLD:
-                    # FPSが十分な場合は通常通り制御（delta_time補間は常に有効）
-                    clock.tick(target_fps)
-                else:
-                    # FPS低下時は描画最適化でフレームレート向上を図る
-                    # delta_time補間により、ゲーム進行速度は既に維持されている
-                    target_frame_time_ms = 1000.0 / target_fps
-                    actual_frame_time = clock.get_time()
-                    if actual_frame_time < target_frame_time_ms:
-                        # まだ時間に余裕がある場合は少し待機
-                        pygame.time.wait(int(target_frame_time_ms - actual_frame_time))
-                    clock.tick(max(MIN_FPS_THRESHOLD, target_fps // 2))  # 最低限のフレームレート保証
-            else:
-                # 従来のフレームレート制御
-                clock.tick(target_fps)
-            
+            # 描画のフレームレート制御。ゲーム速度は固定ティックで決まるため、
+            # 大きく拡大表示しているとき（フルスクリーン等）は描画FPSを下げて負荷を抑える
+            render_fps = FULLSCREEN_FPS if scale_factor >= FULLSCREEN_FPS_THRESHOLD else NORMAL_FPS
+            performance_stats['render_fps'] = render_fps
+
+            # このフレームの処理時間を予算と比べて次フレーム以降の品質段階を決める
+            quality_governor.update(performance_stats['frame_time'], 1000.0 / render_fps)
+            quality_governor.publish_stats(performance_stats)
+
+            clock.tick(render_fps)
+
             # フレームカウンターをインクリメント（最適化処理で使用）
             frame_count += 1
             if frame_count > 1000000:  # オーバーフロー防止
@@ -2598,11 +2409,20 @@ def main():
             running = False
 
     print("[INFO] Exited main loop")
+
+    # ジョブシステムのワーカーを停止
+    job_system.shutdown()
+    enemy_backend.shutdown()
+
+    # 直近のプロファイラ記録を書き出し（ヘッドレス実行ではツール側で指定されたときだけ）
+    if sim is None:
+        profiler.export_chrome_trace()
     
     # パフォーマンスログを閉じる
     try:
         performance_logger.close()
-        print(f"[INFO] Performance log saved: {performance_logger.log_file}")
+        if performance_logger.file_ready:
+            print(f"[INFO] Performance log saved: {performance_logger.log_file}")
         print(performance_logger.get_log_summary())
     except Exception as e:
         print(f"[WARNING] Failed to close performance log: {e}")
@@ -2610,5 +2430,7 @@ def main():
     pygame.quit()
 
 if __name__ == "__main__":
+    # PyInstaller（--onefile）で固めた実行ファイルから spawn したワーカーがメインを再実行しないようにする
+    mp.freeze_support()
     main()
     sys.exit(0)
\ No newline at end of file
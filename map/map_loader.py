@@ -10,6 +10,11 @@ import sys
 from constants import *
 from utils.file_paths import get_resource_path
 
+# 事前描画チャンクの一辺のタイル数（8タイル = 512px）
+MAP_CHUNK_TILES = 8
+# 保持するチャンクの最大数（画面内は最大 4x3 = 12 枚）
+MAP_CHUNK_CACHE_LIMIT = 24
+
 class MapLoader:
     def __init__(self):
         self.map_data = []
@@ -38,6 +43,9 @@ class MapLoader:
             8: (32, 8, 8),       # 危険地帯：より濃い赤
             9: (24, 24, 24),     # 石/岩：より濃いグレー
         }
+        
+        # 事前描画チャンクのキャッシュ（map_data が変わったら作り直す）
+        self.invalidate_tile_cache()
     
     def load_csv_map(self, csv_file_path):
         """CSVファイルからマップデータを読み込む"""
@@ -61,6 +69,7 @@ class MapLoader:
                             int_row.append(0)  # 変換できない場合は0
                     self.map_data.append(int_row)
             
+            self.invalidate_tile_cache()
             if self.map_data:
                 self.map_height = len(self.map_data)
                 self.map_width = len(self.map_data[0]) if self.map_data[0] else 0
@@ -89,6 +98,7 @@ class MapLoader:
         
         self.map_width = expected_width
         self.map_height = expected_height
+        self.invalidate_tile_cache()
         print(f"[INFO] Generated default map: {self.map_width}x{self.map_height} tiles")
         return True
     
@@ -103,70 +113,118 @@ class MapLoader:
         else:
             return 0  # 範囲外はデフォルトタイル
     
+    def set_tile(self, tile_x, tile_y, tile_id):
+        """タイルを書き換える（描画キャッシュも無効化）"""
+        if 0 <= tile_y < len(self.map_data) and 0 <= tile_x < len(self.map_data[tile_y]):
+            self.map_data[tile_y][tile_x] = tile_id
+            self.invalidate_tile_cache()
+    
+    def invalidate_tile_cache(self):
+        """描画済みチャンクを破棄（map_data を直接書き換えた場合に呼ぶ）"""
+        self._chunk_cache = {}
+        self._border_specs = None
+        self._cached_map_ref = None
+    
+    def _ensure_tile_cache(self):
+        """マップデータが差し替えられていればチャンクキャッシュを作り直す"""
+        map_ref = (id(self.map_data), self.map_width, self.map_height, len(self.map_data))
+        if getattr(self, '_cached_map_ref', None) != map_ref or getattr(self, '_border_specs', None) is None:
+            self._chunk_cache = {}
+            self._border_specs = self._collect_blocker_borders()
+            self._cached_map_ref = map_ref
+    
     def draw_map(self, screen, camera_x, camera_y):
-        """マップを描画"""
+        """マップを描画（事前描画したチャンクをカメラ範囲分だけブリット）"""
         if not self.map_data:
             return
         
-        # 描画範囲を計算
-        start_tile_x = max(0, int(camera_x // self.tile_size))
-        end_tile_x = min(self.map_width, int((camera_x + SCREEN_WIDTH) // self.tile_size) + 1)
-        start_tile_y = max(0, int(camera_y // self.tile_size))
-        end_tile_y = min(self.map_height, int((camera_y + SCREEN_HEIGHT) // self.tile_size) + 1)
+        self._ensure_tile_cache()
+        
+        chunk_px = MAP_CHUNK_TILES * self.tile_size
+        map_px_w = self.map_width * self.tile_size
+        map_px_h = self.map_height * self.tile_size
+        
+        # 描画範囲のチャンクを計算
+        start_chunk_x = max(0, int(camera_x // chunk_px))
+        end_chunk_x = min((map_px_w - 1) // chunk_px, int((camera_x + SCREEN_WIDTH) // chunk_px))
+        start_chunk_y = max(0, int(camera_y // chunk_px))
+        end_chunk_y = min((map_px_h - 1) // chunk_px, int((camera_y + SCREEN_HEIGHT) // chunk_px))
+        
+        for chunk_y in range(start_chunk_y, end_chunk_y + 1):
+            for chunk_x in range(start_chunk_x, end_chunk_x + 1):
+                chunk = self._get_chunk(chunk_x, chunk_y)
+                if chunk is None:
+                    continue
+                screen.blit(chunk, (int(chunk_x * chunk_px - camera_x), int(chunk_y * chunk_px - camera_y)))
+    
+    def _get_chunk(self, chunk_x, chunk_y):
+        """チャンクサーフェスを取得（未生成なら描画してキャッシュ）"""
+        key = (chunk_x, chunk_y)
+        cache = self._chunk_cache
+        chunk = cache.pop(key, None)
+        if chunk is None:
+            chunk = self._render_chunk(chunk_x, chunk_y)
+            # 遠くのチャンクから破棄（挿入順 = 最後に使った順）
+            while len(cache) >= MAP_CHUNK_CACHE_LIMIT:
+                del cache[next(iter(cache))]
+        cache[key] = chunk
+        return chunk
+    
+    def _render_chunk(self, chunk_x, chunk_y):
+        """チャンク1枚分のタイルとブロッカー縁を描画"""
+        ts = self.tile_size
+        start_tile_x = chunk_x * MAP_CHUNK_TILES
+        start_tile_y = chunk_y * MAP_CHUNK_TILES
+        end_tile_x = min(self.map_width, start_tile_x + MAP_CHUNK_TILES)
+        end_tile_y = min(self.map_height, start_tile_y + MAP_CHUNK_TILES)
+        if end_tile_x <= start_tile_x or end_tile_y <= start_tile_y:
+            return None
+        
+        surface = pygame.Surface(((end_tile_x - start_tile_x) * ts, (end_tile_y - start_tile_y) * ts))
+        try:
+            surface = surface.convert()
+        except Exception:
+            pass
+        origin_x = start_tile_x * ts
+        origin_y = start_tile_y * ts
         
         # タイルを描画
         for tile_y in range(start_tile_y, end_tile_y):
-            if tile_y >= len(self.map_data):
-                continue
             row = self.map_data[tile_y]
-            
-            for tile_x in range(start_tile_x, end_tile_x):
-                if tile_x >= len(row):
-                    continue
-                
+            for tile_x in range(start_tile_x, min(end_tile_x, len(row))):
                 tile_id = row[tile_x]
                 color = self.tile_colors.get(tile_id, self.tile_colors[0])
-                
-                # スクリーン座標を計算
-                screen_x = tile_x * self.tile_size - camera_x
-                screen_y = tile_y * self.tile_size - camera_y
-                
-                # タイルを描画
-                pygame.draw.rect(screen, color, 
-                               (screen_x, screen_y, self.tile_size, self.tile_size))
+                pygame.draw.rect(surface, color, 
+                               (tile_x * ts - origin_x, tile_y * ts - origin_y, ts, ts))
         
         # ブロッカータイルの縁を描画
-        self._draw_blocker_borders(screen, camera_x, camera_y, start_tile_x, end_tile_x, start_tile_y, end_tile_y)
+        for tile_y in range(start_tile_y, end_tile_y):
+            for tile_x in range(start_tile_x, end_tile_x):
+                spec = self._border_specs.get((tile_x, tile_y))
+                if spec:
+                    self._draw_tile_border(surface, tile_x * ts - origin_x, tile_y * ts - origin_y, *spec)
+        
+        return surface
     
-    def _draw_blocker_borders(self, screen, camera_x, camera_y, start_tile_x, end_tile_x, start_tile_y, end_tile_y):
-        """ブロッカータイル（障害物）の縁を描画"""
+    def _collect_blocker_borders(self):
+        """マップ全体のブロッカーエリアを検出し、タイルごとの縁情報を返す
+        
+        Returns:
+            {(tile_x, tile_y): (border_sides, top_left_color, bottom_right_color)}
+        """
         # ブロッカータイル: 5(森), 7(水), 8(危険地帯), 9(石/岩)
         blocker_tiles = {5, 7, 8, 9}
         
-        # 画面内のブロッカータイルを収集
-        screen_blockers = set()
-        for tile_y in range(start_tile_y, end_tile_y):
-            if tile_y >= len(self.map_data):
-                continue
-            row = self.map_data[tile_y]
-            
-            for tile_x in range(start_tile_x, end_tile_x):
-                if tile_x >= len(row):
-                    continue
-                
-                tile_id = row[tile_x]
-                if tile_id in blocker_tiles:
-                    screen_blockers.add((tile_x, tile_y))
-        
-        if screen_blockers:
-            # 画面内のブロッカーエリアを検出して縁を描画
-            visited = set()
-            for tile_pos in screen_blockers:
-                if tile_pos not in visited:
+        specs = {}
+        visited = set()
+        for tile_y, row in enumerate(self.map_data):
+            for tile_x, tile_id in enumerate(row):
+                if tile_id in blocker_tiles and (tile_x, tile_y) not in visited:
                     # このブロッカーから連続するエリアを検出
-                    region = self._flood_fill_blocker_region(tile_pos[0], tile_pos[1], visited, blocker_tiles)
+                    region = self._flood_fill_blocker_region(tile_x, tile_y, visited, blocker_tiles)
                     if region:
-                        self._draw_blocker_region_border(screen, region, camera_x, camera_y)
+                        self._collect_region_border(region, specs)
+        return specs
     
     def _flood_fill_blocker_region(self, start_x, start_y, visited, blocker_tiles):
         """指定座標から連続するブロッカーエリアを検出"""
@@ -207,12 +265,10 @@ class MapLoader:
         
         return region
     
-    def _draw_blocker_region_border(self, screen, region, camera_x, camera_y):
-        """ブロッカーエリアの内側縁を描画"""
+    def _collect_region_border(self, region, specs):
+        """ブロッカーエリアの各タイルについて、内側縁を描く辺と色を specs に登録"""
         if not region:
             return
-            
-        blocker_tiles = {5, 7, 8, 9}
         
         # このエリアの代表的なタイル種類を決定（最も多いタイル種類を使用）
         tile_type_count = {}
@@ -245,18 +301,7 @@ class MapLoader:
             top_left_color = make_lighter_color(border_color)
             bottom_right_color = border_color
         
-        border_thickness = BORDER_THICKNESS  # 縁の厚さ
-        
         for tile_x, tile_y in region:
-            # スクリーン座標でのタイル位置
-            screen_x = tile_x * self.tile_size - camera_x
-            screen_y = tile_y * self.tile_size - camera_y
-            
-            # 画面外の場合はスキップ
-            if (screen_x < -self.tile_size or screen_x > SCREEN_WIDTH or 
-                screen_y < -self.tile_size or screen_y > SCREEN_HEIGHT):
-                continue
-            
             # このタイルの4辺について、隣接タイルがこのエリア内にない辺に内側縁を描画
             directions = [
                 (0, -1, 'top'),     # 上
@@ -276,68 +321,75 @@ class MapLoader:
                 if (neighbor_x, neighbor_y) not in region:
                     border_sides.append(side)
             
-            for side in border_sides:
-                if side == 'top':
-                    # 上辺の内側縁
-                    pygame.draw.rect(screen, top_left_color, 
-                                   (screen_x, screen_y, 
-                                    self.tile_size, border_thickness))
-                elif side == 'bottom':
-                    # 下辺の内側縁
-                    pygame.draw.rect(screen, bottom_right_color, 
-                                   (screen_x, screen_y + self.tile_size - border_thickness, 
-                                    self.tile_size, border_thickness))
-                elif side == 'left':
-                    # 左辺の内側縁
-                    pygame.draw.rect(screen, top_left_color, 
-                                   (screen_x, screen_y, 
-                                    border_thickness, self.tile_size))
-                elif side == 'right':
-                    # 右辺の内側縁
-                    pygame.draw.rect(screen, bottom_right_color, 
-                                   (screen_x + self.tile_size - border_thickness, screen_y, 
-                                    border_thickness, self.tile_size))
-            
-            # 角部分の処理：2つの境界辺が交わる角に矩形を描画
-            corner_combinations = [
-                (['top', 'left'], (screen_x, screen_y), top_left_color),  # 左上
-                (['bottom', 'right'], (screen_x + self.tile_size - border_thickness, screen_y + self.tile_size - border_thickness), bottom_right_color)  # 右下
-            ]
-            
-            for corner_sides, corner_pos, corner_color in corner_combinations:
-                if all(side in border_sides for side in corner_sides):
-                    # 角の矩形を描画
-                    pygame.draw.rect(screen, corner_color, 
-                                   (corner_pos[0], corner_pos[1], border_thickness, border_thickness))
-            
-            # 右上と左下の角は斜めカット処理
-            if all(side in border_sides for side in ['top', 'right']):
-                # 右上角：斜めカット
-                corner_x = screen_x + self.tile_size - border_thickness
-                corner_y = screen_y
-                # 斜め分割：三角形で描画
-                for i in range(border_thickness):
-                    for j in range(border_thickness):
-                        if i + j < border_thickness:
-                            # 左上三角形部分（上辺の色）
-                            pygame.draw.rect(screen, top_left_color, (corner_x + j, corner_y + i, 1, 1))
-                        else:
-                            # 右下三角形部分（右辺の色）
-                            pygame.draw.rect(screen, bottom_right_color, (corner_x + j, corner_y + i, 1, 1))
-            
-            if all(side in border_sides for side in ['bottom', 'left']):
-                # 左下角：斜めカット
-                corner_x = screen_x
-                corner_y = screen_y + self.tile_size - border_thickness
-                # 斜め分割：三角形で描画
-                for i in range(border_thickness):
-                    for j in range(border_thickness):
-                        if i + j >= border_thickness:
-                            # 右下三角形部分（下辺の色）
-                            pygame.draw.rect(screen, bottom_right_color, (corner_x + j, corner_y + i, 1, 1))
-                        else:
-                            # 左上三角形部分（左辺の色）
-                            pygame.draw.rect(screen, top_left_color, (corner_x + j, corner_y + i, 1, 1))
+            if border_sides:
+                specs[(tile_x, tile_y)] = (border_sides, top_left_color, bottom_right_color)
+    
+    def _draw_tile_border(self, screen, screen_x, screen_y, border_sides, top_left_color, bottom_right_color):
+        """1タイル分の内側縁を描画"""
+        border_thickness = BORDER_THICKNESS  # 縁の厚さ
+        
+        for side in border_sides:
+            if side == 'top':
+                # 上辺の内側縁
+                pygame.draw.rect(screen, top_left_color, 
+                               (screen_x, screen_y, 
+                                self.tile_size, border_thickness))
+            elif side == 'bottom':
+                # 下辺の内側縁
+                pygame.draw.rect(screen, bottom_right_color, 
+                               (screen_x, screen_y + self.tile_size - border_thickness, 
+                                self.tile_size, border_thickness))
+            elif side == 'left':
+                # 左辺の内側縁
+                pygame.draw.rect(screen, top_left_color, 
+                               (screen_x, screen_y, 
+                                border_thickness, self.tile_size))
+            elif side == 'right':
+                # 右辺の内側縁
+                pygame.draw.rect(screen, bottom_right_color, 
+                               (screen_x + self.tile_size - border_thickness, screen_y, 
+                                border_thickness, self.tile_size))
+
+        # 角部分の処理：2つの境界辺が交わる角に矩形を描画
+        corner_combinations = [
+            (['top', 'left'], (screen_x, screen_y), top_left_color),  # 左上
+            (['bottom', 'right'], (screen_x + self.tile_size - border_thickness, screen_y + self.tile_size - border_thickness), bottom_right_color)  # 右下
+        ]
+
+        for corner_sides, corner_pos, corner_color in corner_combinations:
+            if all(side in border_sides for side in corner_sides):
+                # 角の矩形を描画
+                pygame.draw.rect(screen, corner_color, 
+                               (corner_pos[0], corner_pos[1], border_thickness, border_thickness))
+
+        # 右上と左下の角は斜めカット処理
+        if all(side in border_sides for side in ['top', 'right']):
+            # 右上角：斜めカット
+            corner_x = screen_x + self.tile_size - border_thickness
+            corner_y = screen_y
+            # 斜め分割：三角形で描画
+            for i in range(border_thickness):
+                for j in range(border_thickness):
+                    if i + j < border_thickness:
+                        # 左上三角形部分（上辺の色）
+                        pygame.draw.rect(screen, top_left_color, (corner_x + j, corner_y + i, 1, 1))
+                    else:
+                        # 右下三角形部分（右辺の色）
+                        pygame.draw.rect(screen, bottom_right_color, (corner_x + j, corner_y + i, 1, 1))
+
+        if all(side in border_sides for side in ['bottom', 'left']):
+            # 左下角：斜めカット
+            corner_x = screen_x
+            corner_y = screen_y + self.tile_size - border_thickness
+            # 斜め分割：三角形で描画
+            for i in range(border_thickness):
+                for j in range(border_thickness):
+                    if i + j >= border_thickness:
+                        # 右下三角形部分（下辺の色）
+                        pygame.draw.rect(screen, bottom_right_color, (corner_x + j, corner_y + i, 1, 1))
+                    else:
+                        # 左上三角形部分（左辺の色）
+                        pygame.draw.rect(screen, top_left_color, (corner_x + j, corner_y + i, 1, 1))
     
     def create_sample_csv(self, output_path):
         """サンプルCSVファイルを作成"""
@@ -0,0 +1,271 @@
+"""
+事前加工済みアセットパック
+敵・ボス・武器・アイコン・ボックスの画像を、スケール・反転・HSV調整・オーラ生成まで済ませた
+RGBA ピクセル列として 1 ファイルにまとめ、起動時にまとめて Surface 化する。
+
+ファイル形式（リトルエンディアン）:
+    MAGIC(8) | インデックス長 uint32 | インデックス JSON | パディング | ピクセルデータ
+インデックスには各キーのオフセット・幅・高さと、生成元ファイルのハッシュを持つ。
+ピクセルデータは mmap で読み、キーごとに pygame.image.frombuffer で Surface にする。
+
+パックが無い・生成元の PNG/CSV/加工パラメータが変わっている（ハッシュ不一致）場合は
+何も返さず、各ローダーは従来どおり PNG から読み込む。
+"""
+
+import os
+import io
+import json
+import mmap
+import struct
+import hashlib
+import time
+import pygame
+from constants import (ASSET_PACK_ENABLED, ASSET_PACK_FILE, ASSET_PACK_ICON_SIZES, BOX_SIZE,
+                       ENEMY_IMAGE_HUE_SHIFT, ENEMY_IMAGE_SATURATION, ENEMY_IMAGE_VALUE)
+from utils.file_paths import get_resource_path
+
+PACK_MAGIC = b'VSPACK01'
+PACK_VERSION = 1
+PACK_ALIGN = 16
+
+# パックの生成元（このディレクトリ/ファイルが変わったらパックは古いとみなす）
+SOURCE_DIRS = (
+    os.path.join('assets', 'character', 'enemy'),
+    os.path.join('assets', 'weapons'),
+    os.path.join('assets', 'icons'),
+)
+SOURCE_FILES = (
+    os.path.join('data', 'enemy_stats.csv'),
+    os.path.join('data', 'boss_stats.csv'),
+)
+
+# 読み込み済みのパック: key -> Surface
+_surfaces = {}
+_loaded = False
+# ビルド中はパックを参照せず PNG から加工させる
+_suspended = False
+
+
+def source_hash():
+    """パックの生成元（PNG・CSV・加工パラメータ）のハッシュ"""
+    h = hashlib.sha1()
+    params = (PACK_VERSION, ENEMY_IMAGE_HUE_SHIFT, ENEMY_IMAGE_SATURATION, ENEMY_IMAGE_VALUE,
+              BOX_SIZE, tuple(ASSET_PACK_ICON_SIZES))
+    h.update(repr(params).encode('ascii'))
+    paths = []
+    for rel_dir in SOURCE_DIRS:
+        directory = get_resource_path(rel_dir)
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.lower().endswith('.png'))
+        except OSError:
+            names = []
+        paths.extend(os.path.join(rel_dir, n) for n in names)
+    paths.extend(SOURCE_FILES)
+    for rel in paths:
+        h.update(rel.replace(os.sep, '/').encode('utf-8'))
+        try:
+            with open(get_resource_path(rel), 'rb') as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b'<missing>')
+    return h.hexdigest()
+
+
+def _read_index(f):
+    """ヘッダを読み、(index, data_offset) を返す。形式が違えば None"""
+    if f.read(len(PACK_MAGIC)) != PACK_MAGIC:
+        return None
+    (index_len,) = struct.unpack('<I', f.read(4))
+    index = json.loads(f.read(index_len).decode('utf-8'))
+    header_len = len(PACK_MAGIC) + 4 + index_len
+    data_offset = (header_len + PACK_ALIGN - 1) // PACK_ALIGN * PACK_ALIGN
+    return index, data_offset
+
+
+def load(path=None):
+    """パックを読み込み、全エントリを Surface 化してキャッシュする。読み込めたエントリ数を返す
+
+    pygame.display.set_mode() の後に呼ぶと convert_alpha() 済みの Surface になる。
+    """
+    global _loaded
+    _loaded = True
+    _surfaces.clear()
+    if not ASSET_PACK_ENABLED or _suspended:
+        return 0
+    path = get_resource_path(path or ASSET_PACK_FILE)
+    if not os.path.exists(path):
+        return 0
+
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            header = _read_index(f)
+            if header is None:
+                print(f"[WARNING] Asset pack has an unknown format, using PNG files: {path}")
+                return 0
+            index, data_offset = header
+            if index.get('version') != PACK_VERSION or index.get('source_hash') != source_hash():
+                print(f"[INFO] Asset pack is stale, using PNG files (run tools/build_asset_pack.py)")
+                return 0
+
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                view = memoryview(buf)
+                try:
+                    for key, (offset, width, height) in index['entries'].items():
+                        start_byte = data_offset + offset
+                        pixels = view[start_byte:start_byte + width * height * 4]
+                        surf = pygame.image.frombuffer(pixels, (width, height), 'RGBA')
+                        # frombuffer は mmap を参照するため、変換（コピー）してから手放す
+                        try:
+                            surf = surf.convert_alpha()
+                        except pygame.error:
+                            surf = surf.copy()
+                        _surfaces[key] = surf
+                        del surf, pixels
+                finally:
+                    view.release()
+            finally:
+                buf.close()
+    except Exception as e:
+        print(f"[WARNING] Failed to load asset pack, using PNG files: {e}")
+        _surfaces.clear()
+        return 0
+
+    elapsed = (time.perf_counter() - start) * 1000.0
+    print(f"[INFO] Asset pack loaded: {len(_surfaces)} surfaces in {elapsed:.1f}ms")
+    return len(_surfaces)
+
+
+def ensure_loaded():
+    """まだ読み込んでいなければパックを読み込む"""
+    if not _loaded:
+        load()
+    return len(_surfaces)
+
+
+def get_surface(key):
+    """パック内の Surface を返す（パックが無い・キーが無い場合は None）"""
+    if not _loaded:
+        load()
+    return _surfaces.get(key)
+
+
+def unload():
+    """読み込んだ Surface を破棄（次の get_surface で読み直す）"""
+    global _loaded
+    _surfaces.clear()
+    _loaded = False
+
+
+# --- ビルド ---
+
+def _collect_surfaces():
+    """各ローダーを PNG 経由で動かし、加工済みの Surface を key -> Surface で集める"""
+    from core.enemy import Enemy
+    from effects.attack import Attack
+    from ui.box import ItemBox
+    from systems import resources
+
+    collected = {}
+
+    # 敵（通常）: enemy_stats.csv の全エントリ
+    Enemy.load_enemy_stats()
+    for enemy_no in sorted(Enemy._enemy_stats):
+        Enemy._image_cache.clear()
+        Enemy._load_enemy_image(enemy_no, 0)
+        for cache_key, entry in Enemy._image_cache.items():
+            if entry:
+                for variant in ('left', 'right', 'aura'):
+                    if entry.get(variant) is not None:
+                        collected[f"enemy/{cache_key}/{variant}"] = entry[variant]
+
+    # ボス: boss_stats.csv の全エントリ（スポーン時と同じ引数で読み込む）
+    for boss_no, cfg in sorted(Enemy.get_all_boss_configs().items()):
+        Enemy._image_cache.clear()
+        Enemy._load_enemy_image(cfg['type'], cfg['level'], cfg.get('image_file'), boss_no=boss_no)
+        for cache_key, entry in Enemy._image_cache.items():
+            if entry:
+                for variant in ('left', 'right', 'aura'):
+                    if entry.get(variant) is not None:
+                        collected[f"enemy/{cache_key}/{variant}"] = entry[variant]
+    Enemy._image_cache.clear()
+
+    # 武器画像
+    weapons_dir = get_resource_path(os.path.join('assets', 'weapons'))
+    for name in sorted(os.listdir(weapons_dir)):
+        if name.lower().endswith('.png'):
+            weapon_type = name[:-4]
+            Attack._weapon_image_cache.pop(weapon_type, None)
+            image = Attack._load_weapon_image(weapon_type)
+            Attack._weapon_image_cache.pop(weapon_type, None)
+            if image is not None:
+                collected[f"weapon/{weapon_type}"] = image
+
+    # アイコン（サイズ別）とボックス
+    icons_dir = get_resource_path(os.path.join('assets', 'icons'))
+    icon_names = sorted(n[:-4] for n in os.listdir(icons_dir) if n.lower().endswith('.png'))
+    for size in ASSET_PACK_ICON_SIZES:
+        for name in icon_names:
+            resources._icon_cache.pop(f"{name}_{size}", None)
+            surf = resources.load_icons(size=size, icon_names=[name]).get(name)
+            resources._icon_cache.pop(f"{name}_{size}", None)
+            if surf is not None:
+                collected[f"icon/{name}/{size}"] = surf
+    for name in icon_names:
+        if name.startswith('box') and name[3:].isdigit():
+            box_type = int(name[3:])
+            ItemBox._image_cache.pop(box_type, None)
+            image = ItemBox._load_box_image(box_type)
+            ItemBox._image_cache.pop(box_type, None)
+            if image is not None:
+                collected[f"box/{box_type}"] = image
+
+    return collected
+
+
+def build(path=None):
+    """アセットパックを生成して書き出す。書き出したエントリ数を返す
+
+    pygame.display.set_mode() 済みの状態で呼ぶこと（ローダーが convert_alpha() を使うため）。
+    """
+    global _suspended
+    path = get_resource_path(path or ASSET_PACK_FILE)
+    _suspended = True
+    unload()
+    try:
+        surfaces = _collect_surfaces()
+    finally:
+        _suspended = False
+        unload()
+
+    to_bytes = getattr(pygame.image, 'tobytes', None) or pygame.image.tostring
+    entries = {}
+    data = io.BytesIO()
+    for key in sorted(surfaces):
+        surf = surfaces[key]
+        width, height = surf.get_size()
+        entries[key] = (data.tell(), width, height)
+        data.write(to_bytes(surf, 'RGBA'))
+        pad = -data.tell() % PACK_ALIGN
+        if pad:
+            data.write(b'\0' * pad)
+
+    index = {
+        'version': PACK_VERSION,
+        'source_hash': source_hash(),
+        'entries': entries,
+    }
+    index_bytes = json.dumps(index, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    header = PACK_MAGIC + struct.pack('<I', len(index_bytes)) + index_bytes
+    header += b'\0' * (-len(header) % PACK_ALIGN)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(data.getbuffer())
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+__all__ = ['load', 'ensure_loaded', 'get_surface', 'unload', 'build', 'source_hash']
@@ -0,0 +1,136 @@
+"""
+CPU 使用量の計測
+描画フレームごとに実際の CPU 時間を測り、performance_stats に書き込む。
+
+- プロセス全体: time.process_time（全スレッドの CPU 時間）をループ 1 周の経過時間で割る
+- メインスレッド: time.thread_time。フレーム予算（TARGET_FRAME_TIME）に対する負荷として出す
+- ワーカー: ジョブシステムが各バッチの実行中に計った thread_time と経過時間
+- GIL 競合の推定: ワーカーがバッチを処理していた経過時間のうち、CPU を使えていなかった割合
+  （GIL 待ちのほか OS のプリエンプションも含むため目安の値）
+- スレッド別: psutil があれば一定間隔でスレッドごとの CPU 時間を取り、名前付きで集計する
+"""
+
+import os
+import time
+import threading
+from constants import TARGET_FRAME_TIME, CPU_METRICS_SMOOTHING, CPU_METRICS_THREAD_SAMPLE_INTERVAL
+
+# psutilの安全なインポート
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+    print("[WARNING] psutil not available - per-thread CPU breakdown disabled")
+
+
+class CpuMetrics:
+    """描画フレームごとの CPU 時間の集計
+
+    sample(stats) を描画フレームの開始時に毎回呼ぶ（追いつきのための複数ティックも 1 フレームに含まれる）。前回の呼び出しからの差分を集計して stats を更新する。
+    ワーカーの値は前フレームに JobSystem.publish_stats が書いた値を使う。
+    """
+
+    def __init__(self, smoothing=CPU_METRICS_SMOOTHING, thread_sample_interval=CPU_METRICS_THREAD_SAMPLE_INTERVAL):
+        self.cores = os.cpu_count() or 1
+        self.smoothing = min(1.0, max(0.0, float(smoothing)))
+        self.thread_sample_interval = float(thread_sample_interval)
+
+        self._last_wall = None
+        self._last_process = 0.0
+        self._last_main = 0.0
+        # 平滑化した値（スロットリング判定がフレームごとの揺れで切り替わらないように）
+        self.cpu_usage = 0.0
+        self.main_thread_load = 0.0
+
+        # スレッド別の CPU 使用率 [(スレッド名, %), ...]（psutil がある場合のみ）
+        self.thread_usage = []
+        self._process = None
+        self._thread_times = {}
+        self._thread_sample_time = None
+        if PSUTIL_AVAILABLE:
+            try:
+                self._process = psutil.Process()
+            except Exception:
+                self._process = None
+
+    def _smooth(self, previous, value):
+        return previous + (value - previous) * self.smoothing
+
+    def sample(self, stats):
+        """前回の sample() からの CPU 時間を集計して stats に書き込む"""
+        wall = time.perf_counter()
+        process = time.process_time()
+        main = time.thread_time()
+        if self._last_wall is None:
+            self._last_wall, self._last_process, self._last_main = wall, process, main
+            return
+
+        wall_ms = (wall - self._last_wall) * 1000.0
+        process_ms = (process - self._last_process) * 1000.0
+        main_ms = (main - self._last_main) * 1000.0
+        self._last_wall, self._last_process, self._last_main = wall, process, main
+        if wall_ms <= 0.0:
+            return
+
+        # プロセス全体の CPU 使用率（全コアに対する %）と、実際に使っているコア数
+        cores_busy = process_ms / wall_ms
+        self.cpu_usage = self._smooth(self.cpu_usage, min(100.0, cores_busy / self.cores * 100.0))
+        # メインスレッドの負荷（フレーム予算に対する %。フレームが延びている場合は実際の経過時間に対する %）
+        load = main_ms / max(wall_ms, TARGET_FRAME_TIME) * 100.0
+        self.main_thread_load = self._smooth(self.main_thread_load, load)
+
+        # ワーカー: バッチ処理中の経過時間と CPU 時間の差を GIL 競合の目安にする
+        busy_ms = stats.get('parallel_busy_time', 0.0)
+        busy_cpu_ms = stats.get('parallel_busy_cpu_time', 0.0)
+        wait_ms = stats.get('parallel_wait_time', 0.0)
+        if busy_ms > 0.5:
+            contention = max(0.0, min(100.0, (1.0 - busy_cpu_ms / busy_ms) * 100.0))
+        else:
+            contention = 0.0
+        # バリア待ちの間にワーカーが実際に使った CPU 時間の倍率（GIL で直列化されていれば 1.0 前後、
+        # 1.0 未満ならメインスレッドで逐次実行したほうが速い）
+        speedup = busy_cpu_ms / wait_ms if wait_ms > 0.0 else 0.0
+
+        stats['cpu_usage'] = self.cpu_usage
+        stats['cpu_cores_used'] = cores_busy
+        stats['cpu_efficiency'] = (busy_cpu_ms / busy_ms * 100.0) if busy_ms > 0.5 else 0.0
+        stats['cpu_frame_wall_time'] = wall_ms
+        stats['cpu_process_time'] = process_ms
+        stats['cpu_main_thread_time'] = main_ms
+        stats['cpu_worker_time'] = busy_cpu_ms
+        stats['main_thread_load'] = self.main_thread_load
+        stats['gil_contention'] = contention
+        stats['parallel_speedup'] = speedup
+
+        self._sample_threads(wall)
+        stats['cpu_thread_usage'] = self.thread_usage
+
+    def _sample_threads(self, now):
+        """psutil でスレッドごとの CPU 時間を取り、前回との差分を使用率にする（一定間隔）"""
+        if self._process is None:
+            return
+        if self._thread_sample_time is not None and now - self._thread_sample_time < self.thread_sample_interval:
+            return
+        try:
+            threads = self._process.threads()
+        except Exception:
+            self._process = None
+            return
+        names = {t.native_id: t.name for t in threading.enumerate() if getattr(t, 'native_id', None)}
+        times = {t.id: t.user_time + t.system_time for t in threads}
+        if self._thread_sample_time is not None:
+            elapsed = now - self._thread_sample_time
+            usage = []
+            for tid, cpu in times.items():
+                delta = cpu - self._thread_times.get(tid, cpu)
+                if delta > 0.0:
+                    usage.append((names.get(tid, f"native-{tid}"), delta / elapsed * 100.0))
+            usage.sort(key=lambda item: item[1], reverse=True)
+            self.thread_usage = usage
+        self._thread_times = times
+        self._thread_sample_time = now
+
+
+__all__ = ['CpuMetrics', 'PSUTIL_AVAILABLE']
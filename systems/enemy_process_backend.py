@@ -0,0 +1,543 @@
+"""
+共有メモリ + 常駐ワーカープロセスによるエネミー移動バックエンド（オプション）
+スレッドのジョブシステムは GIL で直列化されるため、エネミーの衝突・地形判定をプロセスに分けて実行する。
+
+- エネミーの位置・移動量などを multiprocessing.shared_memory 上の float64 配列（SoA）に置く
+  （Enemy オブジェクトはプロセス間で受け渡さない）
+- 毎ティック、エネミーを X 座標でソートしてワーカー数の帯（空間スライス）に分け、
+  各ワーカーは自分の帯のエネミーだけを動かす
+- 帯の境界から halo 幅以内にいる隣の帯のエネミーはティック開始時の位置で近傍（ゴースト）として参照する
+- 開始・完了の 2 つのバリアでティックごとに同期する。タイムアウト・ワーカー停止時は無効化して
+  呼び出し側のスレッド処理に戻す
+
+ワーカー側の移動判定は Enemy.move の地形・敵同士の判定と同じ規則で行う。
+帯の中は X 順に逐次更新、帯の外はティック開始時の位置を使うため、逐次処理とは結果がわずかに異なる。
+行動パターンごとの移動量・ノックバック・向きやアニメーションなどの後処理はメインプロセスで行う。
+
+ワーカーに移るのは衝突・地形判定だけで、移動量の計算・ソート・共有メモリへの書き込み・
+finish_move はメインプロセスで逐次に行う（この時間は process_backend_main として計測する）。
+コア数を増やして短くなるのはバリア待ち（process_backend_wait）の部分だけ。
+"""
+
+import math
+import time
+from operator import attrgetter
+from array import array
+from bisect import bisect_left
+from threading import BrokenBarrierError
+import multiprocessing as mp
+from constants import (ENEMY_PROCESS_BACKEND, ENEMY_PROCESS_WORKERS, ENEMY_PROCESS_MIN_ENEMIES,
+                       ENEMY_PROCESS_CAPACITY, ENEMY_PROCESS_TIMEOUT, PARALLEL_MAX_WORKERS,
+                       USE_CSV_MAP, ENABLE_ENEMY_SEPARATION, ENEMY_COLLISION_SEPARATION_FACTOR,
+                       ENEMY_SEPARATION_STRENGTH, ENEMY_SEPARATION_BOSS_PRIORITY)
+
+# shared_memory は Python 3.8 以降
+try:
+    from multiprocessing import shared_memory
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    shared_memory = None
+    SHARED_MEMORY_AVAILABLE = False
+    print("[WARNING] multiprocessing.shared_memory not available - enemy process backend disabled")
+
+# エネミー配列の列（各列 capacity 個の float64）
+FIELD_X, FIELD_Y, FIELD_STEP_X, FIELD_STEP_Y, FIELD_SIZE, FIELD_SPEED, FIELD_NOCLIP, FIELD_BOSS, \
+    FIELD_ACTIVE, FIELD_DT, FIELD_OUT_X, FIELD_OUT_Y = range(12)
+FIELD_COUNT = 12
+
+# 制御ブロック（先頭の固定項目 + ワーカーごとの担当範囲の開始位置 workers+1 個）
+CTRL_STOP, CTRL_COUNT, CTRL_PLAYER_X, CTRL_PLAYER_Y, CTRL_HALO, CTRL_USE_MAP = range(6)
+CTRL_SLICES = 6
+
+# 近傍検索のセルサイズ（core.spatial_hash と同じ）
+CELL_SIZE = 128
+
+
+def default_worker_count():
+    """ワーカープロセス数の既定値（CPUコア数と PARALLEL_MAX_WORKERS の小さい方）"""
+    if ENEMY_PROCESS_WORKERS > 0:
+        return int(ENEMY_PROCESS_WORKERS)
+    try:
+        cores = mp.cpu_count()
+    except Exception:
+        cores = 1
+    return max(1, min(cores, PARALLEL_MAX_WORKERS))
+
+
+# --- ワーカープロセス側 ---
+
+def _area_blocked(rows, tile_size, left, top, right, bottom):
+    """StageMap.is_area_blocked と同じ判定（ワーカーは pygame を読み込まないため障害物ビット列だけを持つ）"""
+    if not rows:
+        return False
+    tile_x0 = max(0, int(left // tile_size))
+    tile_x1 = int(right // tile_size)
+    tile_y0 = max(0, int(top // tile_size))
+    tile_y1 = min(len(rows) - 1, int(bottom // tile_size))
+    if tile_x1 < tile_x0 or tile_y1 < tile_y0:
+        return False
+    span = ((1 << (tile_x1 - tile_x0 + 1)) - 1) << tile_x0
+    for tile_y in range(tile_y0, tile_y1 + 1):
+        if rows[tile_y] & span:
+            return True
+    return False
+
+
+def _entity_blocked(rows, tile_size, x, y, size):
+    """StageMap.is_entity_blocked と同じ判定"""
+    try:
+        half = size // 2
+        return _area_blocked(rows, tile_size, x - half, y - half, x + half, y + half)
+    except Exception:
+        return True
+
+
+def _step_slice(data, capacity, ctrl, worker_index, rows, tile_size):
+    """担当範囲のエネミーを 1 ティック分動かし、結果を OUT_X / OUT_Y 列に書く"""
+    start = int(ctrl[CTRL_SLICES + worker_index])
+    end = int(ctrl[CTRL_SLICES + worker_index + 1])
+    if end <= start:
+        return
+    n = int(ctrl[CTRL_COUNT])
+    halo = ctrl[CTRL_HALO]
+    player_x = ctrl[CTRL_PLAYER_X]
+    player_y = ctrl[CTRL_PLAYER_Y]
+    use_map = ctrl[CTRL_USE_MAP] > 0.0
+
+    def column(field, lo, hi):
+        base = field * capacity
+        return data[base + lo:base + hi].tolist()
+
+    # 担当範囲 + 前後の halo（X でソート済みなので二分探索で切り出す）
+    all_x = column(FIELD_X, 0, n)
+    lo = bisect_left(all_x, all_x[start] - halo, 0, start)
+    hi = bisect_left(all_x, all_x[end - 1] + halo, end, n)
+    xs = all_x[lo:hi]
+    ys = column(FIELD_Y, lo, hi)
+    sizes = column(FIELD_SIZE, lo, hi)
+    bosses = column(FIELD_BOSS, lo, hi)
+    step_xs = column(FIELD_STEP_X, lo, hi)
+    step_ys = column(FIELD_STEP_Y, lo, hi)
+    speeds = column(FIELD_SPEED, lo, hi)
+    noclips = column(FIELD_NOCLIP, lo, hi)
+    actives = column(FIELD_ACTIVE, lo, hi)
+    dts = column(FIELD_DT, lo, hi)
+
+    factor = float(ENEMY_COLLISION_SEPARATION_FACTOR)
+    max_size = max(sizes) if sizes else 0.0
+
+    # ティック開始時の位置でセルに登録（近傍の取りこぼしは reach 分の検索半径で補う）
+    cells = {}
+    for i in range(len(xs)):
+        cells.setdefault((int(xs[i] // CELL_SIZE), int(ys[i] // CELL_SIZE)), []).append(i)
+
+    def neighbors_of(i, reach):
+        radius = (sizes[i] + max_size) * factor + reach
+        cx0 = int((xs[i] - radius) // CELL_SIZE)
+        cx1 = int((xs[i] + radius) // CELL_SIZE)
+        cy0 = int((ys[i] - radius) // CELL_SIZE)
+        cy1 = int((ys[i] + radius) // CELL_SIZE)
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def collides(i, px, py, near):
+        size = sizes[i]
+        for j in near:
+            if j == i:
+                continue
+            min_dist = (size + sizes[j]) * factor
+            dx = px - xs[j]
+            dy = py - ys[j]
+            if dx * dx + dy * dy < min_dist * min_dist:
+                return True
+        return False
+
+    def blocked(i, px, py):
+        return _entity_blocked(rows, tile_size, px, py, sizes[i])
+
+    out_x = FIELD_OUT_X * capacity
+    out_y = FIELD_OUT_Y * capacity
+    for i in range(start - lo, end - lo):
+        if actives[i] <= 0.0:
+            continue
+        x = xs[i]
+        y = ys[i]
+        new_x = x + step_xs[i]
+        new_y = y + step_ys[i]
+        noclip = noclips[i] > 0.0
+        dt = dts[i]
+        reach = math.hypot(new_x - x, new_y - y) + speeds[i] * max(1.0, dt) * 2.0 + 4.0
+        near = neighbors_of(i, reach)
+
+        if use_map and (new_x != x or new_y != y):
+            if noclip or not blocked(i, new_x, new_y):
+                if not ENABLE_ENEMY_SEPARATION:
+                    # 分離が無効な場合、地形に当たらなければ移動先へそのまま進む（Enemy.move と同じ結果）
+                    x, y = new_x, new_y
+                else:
+                    x, y = _separate(i, x, y, new_x, new_y, near, xs, ys, sizes, bosses, speeds,
+                                     noclip, factor, collides, blocked)
+            else:
+                # 障害物がある場合は X 軸・Y 軸のみの移動を試す
+                x_collision = not noclip and blocked(i, new_x, y)
+                y_collision = not noclip and blocked(i, x, new_y)
+                moved = False
+                if not x_collision and not collides(i, new_x, y, near):
+                    x = new_x
+                    moved = True
+                if not y_collision and not collides(i, x, new_y, near):
+                    y = new_y
+                    moved = True
+                if not moved and x_collision and y_collision:
+                    # プレイヤーから離れる方向に少し押し返す
+                    away_x = x - player_x
+                    away_y = y - player_y
+                    if away_x != 0 or away_y != 0:
+                        length = math.sqrt(away_x * away_x + away_y * away_y)
+                        escape_x = x + (away_x / length) * 3
+                        escape_y = y + (away_y / length) * 3
+                        if (noclip or not blocked(i, escape_x, escape_y)) and not collides(i, escape_x, escape_y, near):
+                            x, y = escape_x, escape_y
+        elif collides(i, new_x, new_y, near):
+            # マップ無効・noclip 時は敵同士の判定のみ（X のみ → Y のみ → キャンセル）
+            if not collides(i, new_x, y, near):
+                x = new_x
+            elif not collides(i, x, new_y, near):
+                y = new_y
+        else:
+            x, y = new_x, new_y
+
+        # 帯の中では更新後の位置を後続のエネミーの近傍判定に使う
+        xs[i] = x
+        ys[i] = y
+        data[out_x + lo + i] = x
+        data[out_y + lo + i] = y
+
+
+def _separate(i, x, y, new_x, new_y, near, xs, ys, sizes, bosses, speeds, noclip, factor, collides, blocked):
+    """分離ベクトルによる押しのけ（Enemy.move の ENABLE_ENEMY_SEPARATION 有効時と同じ規則）"""
+    boss_priority = float(ENEMY_SEPARATION_BOSS_PRIORITY)
+    is_boss = bosses[i] > 0.0
+    sep_x = 0.0
+    sep_y = 0.0
+    total_w = 0.0
+    for j in near:
+        if j == i:
+            continue
+        dx_o = new_x - xs[j]
+        dy_o = new_y - ys[j]
+        dist2 = dx_o * dx_o + dy_o * dy_o
+        desired = (sizes[i] + sizes[j]) * factor
+        if dist2 <= 0:
+            nx, ny = 1.0, 0.0
+            overlap = desired
+        else:
+            if dist2 >= desired * desired:
+                continue
+            dist = math.sqrt(dist2)
+            nx = dx_o / dist
+            ny = dy_o / dist
+            overlap = desired - dist
+        w = overlap / max(1.0, desired)
+        other_boss = bosses[j] > 0.0
+        if other_boss and not is_boss:
+            w *= boss_priority
+        if is_boss and not other_boss:
+            w *= 0.6
+        sep_x += nx * w
+        sep_y += ny * w
+        total_w += w
+
+    if total_w > 0.0:
+        mag = math.hypot(sep_x, sep_y)
+        if mag > 0.0:
+            max_push = speeds[i] * float(ENEMY_SEPARATION_STRENGTH)
+            cand_x = new_x + (sep_x / mag) * max_push
+            cand_y = new_y + (sep_y / mag) * max_push
+            if (noclip or not blocked(i, cand_x, cand_y)) and not collides(i, cand_x, cand_y, near):
+                return cand_x, cand_y
+
+    # フォールバック: X のみ / Y のみ / 移動キャンセル
+    if collides(i, new_x, new_y, near):
+        if not collides(i, new_x, y, near):
+            return new_x, y
+        if not collides(i, x, new_y, near):
+            return x, new_y
+        return x, y
+    return new_x, new_y
+
+
+def _worker_main(data_name, ctrl_name, capacity, worker_index, rows, tile_size, start_barrier, done_barrier):
+    """ワーカープロセスのメインループ（開始バリア → 担当範囲の更新 → 完了バリア を繰り返す）"""
+    data_shm = shared_memory.SharedMemory(name=data_name)
+    ctrl_shm = shared_memory.SharedMemory(name=ctrl_name)
+    data = data_shm.buf.cast('d')
+    ctrl = ctrl_shm.buf.cast('d')
+    try:
+        while True:
+            start_barrier.wait()
+            if ctrl[CTRL_STOP] > 0.0:
+                break
+            try:
+                _step_slice(data, capacity, ctrl, worker_index, rows, tile_size)
+            except Exception as e:
+                print(f"[WARNING] Enemy process worker {worker_index} failed: {e}")
+            done_barrier.wait()
+    except BrokenBarrierError:
+        pass
+    finally:
+        data.release()
+        ctrl.release()
+        data_shm.close()
+        ctrl_shm.close()
+
+
+# --- メインプロセス側 ---
+
+class EnemyProcessBackend:
+    """エネミーの衝突・地形判定を常駐ワーカープロセスで行うバックエンド
+
+    ティックごとに run(enemy_updates, enemies, player) を呼ぶ。
+    通常の移動（simple でないもの）をワーカーで処理し、処理しなかった更新（AI LOD の軽量移動、
+    無効時・少数時・失敗時は全部）を返すので、残りは従来どおりジョブシステムで処理する。
+    """
+
+    def __init__(self, workers=None, capacity=ENEMY_PROCESS_CAPACITY, min_enemies=ENEMY_PROCESS_MIN_ENEMIES,
+                 timeout=ENEMY_PROCESS_TIMEOUT, enabled=ENEMY_PROCESS_BACKEND):
+        self.workers = max(1, int(workers)) if workers else default_worker_count()
+        self.capacity = max(1, int(capacity))
+        self.min_enemies = max(1, int(min_enemies))
+        self.timeout = float(timeout)
+        self.enabled = bool(enabled) and SHARED_MEMORY_AVAILABLE
+        self.failed = False
+        self._processes = []
+        self._data_shm = None
+        self._ctrl_shm = None
+        self._data = None
+        self._ctrl = None
+        self._start_barrier = None
+        self._done_barrier = None
+        # 直近のティックの集計
+        self.moved_count = 0
+        self.wait_time = 0.0  # バリアで待った時間（ms）
+        self.main_time = 0.0  # メインプロセスでの準備・書き込み・後処理の時間（ms、バリア待ちを除く）
+
+    @property
+    def running(self):
+        return bool(self._processes)
+
+    # --- ライフサイクル ---
+
+    def start(self, stage_map=None):
+        """共有メモリを確保してワーカープロセスを起動する（初回の run で呼ばれる）"""
+        rows = []
+        tile_size = 1
+        if stage_map is None and USE_CSV_MAP:
+            # Enemy.move と同じステージマップ（シングルトン）の障害物マスクを使う
+            try:
+                from ui.stage import get_stage_map
+                stage_map = get_stage_map()
+            except Exception:
+                stage_map = None
+        if stage_map is not None:
+            rows = list(getattr(stage_map, '_mask_rows', {}).get('obstacle', []))
+            tile_size = getattr(stage_map, '_tile_size', 1) or 1
+        try:
+            ctx = mp.get_context('spawn')
+            self._data_shm = shared_memory.SharedMemory(create=True, size=FIELD_COUNT * self.capacity * 8)
+            self._ctrl_shm = shared_memory.SharedMemory(create=True, size=(CTRL_SLICES + self.workers + 1) * 8)
+            self._data = self._data_shm.buf.cast('d')
+            self._ctrl = self._ctrl_shm.buf.cast('d')
+            self._ctrl[CTRL_STOP] = 0.0
+            self._start_barrier = ctx.Barrier(self.workers + 1)
+            self._done_barrier = ctx.Barrier(self.workers + 1)
+            for index in range(self.workers):
+                process = ctx.Process(
+                    target=_worker_main,
+                    args=(self._data_shm.name, self._ctrl_shm.name, self.capacity, index,
+                          rows, tile_size, self._start_barrier, self._done_barrier),
+                    name=f'enemy-proc-{index}',
+                    daemon=True,
+                )
+                process.start()
+                self._processes.append(process)
+        except Exception as e:
+            print(f"[WARNING] Cannot start enemy process backend: {e}")
+            self._fail()
+            return False
+        print(f"[INFO] Enemy process backend: {self.workers} workers, capacity {self.capacity}")
+        return True
+
+    def shutdown(self):
+        """ワーカーを停止し、共有メモリを解放する"""
+        if self._processes:
+            try:
+                self._ctrl[CTRL_STOP] = 1.0
+                self._start_barrier.wait(timeout=self.timeout)
+            except Exception:
+                pass
+            for process in self._processes:
+                process.join(timeout=self.timeout)
+                if process.is_alive():
+                    process.terminate()
+            self._processes = []
+        self._release()
+
+    def _release(self):
+        for view in (self._data, self._ctrl):
+            if view is not None:
+                try:
+                    view.release()
+                except Exception:
+                    pass
+        self._data = None
+        self._ctrl = None
+        for shm in (self._data_shm, self._ctrl_shm):
+            if shm is not None:
+                try:
+                    shm.close()
+                    shm.unlink()
+                except Exception:
+                    pass
+        self._data_shm = None
+        self._ctrl_shm = None
+
+    def _fail(self):
+        """ワーカーの異常時: バリアを壊してワーカーを止め、以降はスレッド処理に任せる"""
+        self.failed = True
+        self.enabled = False
+        for barrier in (self._start_barrier, self._done_barrier):
+            if barrier is not None:
+                try:
+                    barrier.abort()
+                except Exception:
+                    pass
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._release()
+
+    # --- 実行 ---
+
+    def run(self, enemy_updates, enemies, player, stage_map=None):
+        """このティックの移動をワーカーで処理し、処理しなかった (enemy, delta_time, simple) を返す"""
+        self.moved_count = 0
+        self.wait_time = 0.0
+        self.main_time = 0.0
+        if not self.enabled or len(enemy_updates) < self.min_enemies or len(enemies) > self.capacity:
+            return enemy_updates
+        if not self._processes and not self.start(stage_map):
+            return enemy_updates
+        main_start = time.perf_counter()
+
+        # 通常移動のエネミーはノックバックと移動量の計算までメインで行う（Enemy.move の前半と同じ）
+        remaining = []
+        moving = {}
+        for update in enemy_updates:
+            enemy, enemy_dt, simple = update
+            if simple:
+                remaining.append(update)
+                continue
+            try:
+                enemy.render_prev_x = enemy.x
+                enemy.render_prev_y = enemy.y
+                enemy.update_knockback(enemy_dt * (1.0/60.0))
+                if enemy.knockback_timer > 0:
+                    continue
+                step_x, step_y = enemy._movement_step(player, enemy_dt)
+                moving[id(enemy)] = (enemy, enemy_dt, enemy.x, enemy.y, step_x, step_y)
+            except Exception:
+                pass
+        if not moving:
+            self.main_time = (time.perf_counter() - main_start) * 1000.0
+            return remaining
+
+        # 全エネミーを X でソートして書き込む（動かないエネミーも近傍として参照される）
+        ordered = sorted(enemies, key=attrgetter('x'))
+        n = len(ordered)
+        columns = [array('d', bytes(8 * n)) for _ in range(FIELD_DT + 1)]
+        max_size = 0.0
+        max_reach = 0.0
+        moved_indices = []
+        for index, enemy in enumerate(ordered):
+            size = float(getattr(enemy, 'size', 0))
+            columns[FIELD_X][index] = enemy.x
+            columns[FIELD_Y][index] = enemy.y
+            columns[FIELD_SIZE][index] = size
+            columns[FIELD_BOSS][index] = 1.0 if getattr(enemy, 'is_boss', False) else 0.0
+            if size > max_size:
+                max_size = size
+            entry = moving.get(id(enemy))
+            if entry is None:
+                continue
+            moved_indices.append(index)
+            _, enemy_dt, _, _, step_x, step_y = entry
+            speed = float(enemy.base_speed)
+            columns[FIELD_STEP_X][index] = step_x
+            columns[FIELD_STEP_Y][index] = step_y
+            columns[FIELD_SPEED][index] = speed
+            columns[FIELD_NOCLIP][index] = 1.0 if enemy.noclip_mode else 0.0
+            columns[FIELD_ACTIVE][index] = 1.0
+            columns[FIELD_DT][index] = enemy_dt
+            reach = math.hypot(step_x, step_y) + speed * max(1.0, enemy_dt) * 2.0 + 4.0
+            if reach > max_reach:
+                max_reach = reach
+
+        data = self._data
+        capacity = self.capacity
+        for field, values in enumerate(columns):
+            data[field * capacity:field * capacity + n] = values
+        ctrl = self._ctrl
+        ctrl[CTRL_COUNT] = n
+        ctrl[CTRL_PLAYER_X] = player.x
+        ctrl[CTRL_PLAYER_Y] = player.y
+        # 帯の外で参照する範囲: 最大の衝突距離 + 双方の移動量
+        ctrl[CTRL_HALO] = max_size * 2.0 * float(ENEMY_COLLISION_SEPARATION_FACTOR) + max_reach * 2.0
+        ctrl[CTRL_USE_MAP] = 1.0 if USE_CSV_MAP else 0.0
+        for index in range(self.workers + 1):
+            ctrl[CTRL_SLICES + index] = n * index // self.workers
+
+        # 開始バリア → ワーカーが担当範囲を処理 → 完了バリア
+        wait_start = time.perf_counter()
+        self.main_time = (wait_start - main_start) * 1000.0
+        try:
+            self._start_barrier.wait(timeout=self.timeout)
+            self._done_barrier.wait(timeout=self.timeout)
+        except (BrokenBarrierError, OSError) as e:
+            print(f"[WARNING] Enemy process backend stalled ({e!r}) - falling back to threads")
+            self._fail()
+            for enemy, enemy_dt, x, y, _, _ in moving.values():
+                # この回は移動させず、後処理（詰まり判定など）だけ行う
+                enemy.finish_move((x, y), x, enemy_dt)
+            return remaining
+        finish_start = time.perf_counter()
+        self.wait_time = (finish_start - wait_start) * 1000.0
+
+        out_x = data[FIELD_OUT_X * capacity:FIELD_OUT_X * capacity + n].tolist()
+        out_y = data[FIELD_OUT_Y * capacity:FIELD_OUT_Y * capacity + n].tolist()
+        for index in moved_indices:
+            enemy, enemy_dt, x, y, step_x, _ = moving[id(ordered[index])]
+            try:
+                enemy.x = out_x[index]
+                enemy.y = out_y[index]
+                enemy.finish_move((x, y), x + step_x, enemy_dt)
+            except Exception:
+                pass
+        self.moved_count = len(moving)
+        self.main_time += (time.perf_counter() - finish_start) * 1000.0
+        return remaining
+
+    def publish_stats(self, stats):
+        stats['process_backend_workers'] = len(self._processes)
+        stats['process_backend_enemies'] = self.moved_count
+        stats['process_backend_wait'] = self.wait_time
+        stats['process_backend_main'] = self.main_time
+
+
+__all__ = ['EnemyProcessBackend', 'SHARED_MEMORY_AVAILABLE', 'default_worker_count']
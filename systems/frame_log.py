@@ -0,0 +1,239 @@
+"""
+フレーム単位のバイナリパフォーマンスログ
+毎フレームの計測値を固定長レコード（struct）にしてリングバッファに積み、
+バックグラウンドの書き込みスレッドがまとめて追記する。メインスレッドの処理は
+struct.pack 1 回と deque への追加だけなので、フレームごとに記録してもスパイクを生まない。
+
+ファイル形式（1 起動につき 1 ファイル、新規作成のみで既存ファイルには書き足さない）:
+    MAGIC (4 bytes) + ヘッダ長 (uint32 LE) + ヘッダ JSON (UTF-8) + レコード * N
+ヘッダ JSON には列名・struct フォーマット・レコード長・セッション開始時刻が入る。
+読み出しは tools/read_frame_log.py を使う。
+ログディレクトリには新しい順に FRAME_LOG_MAX_FILES 個までのファイルを残す。
+"""
+
+import os
+import glob
+import json
+import time
+import struct
+import threading
+from datetime import datetime
+from collections import deque
+from constants import FRAME_LOG_RING_SIZE, FRAME_LOG_FLUSH_INTERVAL, FRAME_LOG_PREFIX, FRAME_LOG_EXTENSION, FRAME_LOG_MAX_FILES
+from utils.file_paths import get_log_file_path, ensure_directory_exists
+
+FRAME_LOG_MAGIC = b'VSFL'
+FRAME_LOG_VERSION = 2
+
+# 列の定義（列名, struct フォーマット文字）。列名は CSV ログ（performance_log.csv）と揃える
+FRAME_LOG_FIELDS = (
+    ('frame', 'I'),                 # フレーム番号
+    ('wall_time_ms', 'd'),          # セッション開始からの経過時間(ms)
+    ('game_time', 'f'),             # ゲーム内時間(秒)
+    ('delta_ms', 'f'),              # 前フレームからの実経過時間(ms、平滑化前)
+    ('fps', 'f'),                   # FPS（pygame.Clock の平均）
+    ('frame_time_ms', 'f'),         # フレーム処理時間(ms)
+    ('enemy_update_ms', 'f'),       # 敵更新時間(ms)
+    ('particle_update_ms', 'f'),    # パーティクル更新時間(ms)
+    ('collision_check_ms', 'f'),    # 衝突判定時間(ms)
+    ('render_time_ms', 'f'),        # 描画時間(ms)
+    ('enemies_count', 'I'),         # 敵の数
+    ('particles_count', 'I'),       # パーティクル数
+    ('gems_count', 'I'),            # ジェム数
+    ('projectiles_count', 'I'),     # 弾丸数
+    ('parallel_enabled', 'B'),      # 並列処理有効フラグ
+    ('parallel_threads', 'H'),      # 並列処理スレッド数
+    ('cpu_usage_percent', 'f'),     # CPU使用率(%)
+    ('cpu_cores_used', 'f'),        # 使用中CPUコア数（CPU 時間 / 経過時間）
+    ('cpu_efficiency', 'f'),        # ワーカーがバッチ処理中に CPU を使えていた割合(%)
+    ('main_thread_cpu_ms', 'f'),    # メインスレッドの CPU 時間(ms)
+    ('main_thread_load', 'f'),      # メインスレッドの負荷（フレーム予算に対する %）
+    ('gil_contention', 'f'),        # GIL 競合の推定(%)
+    ('parallel_wait_ms', 'f'),      # ワーカーのバリア待ち時間(ms)
+)
+
+FRAME_LOG_FORMAT = '<' + ''.join(fmt for _, fmt in FRAME_LOG_FIELDS)
+FRAME_LOG_RECORD = struct.Struct(FRAME_LOG_FORMAT)
+
+
+def new_session_path(now=None):
+    """このセッション用のログファイルパス（例: logs/frames_20250101_120000.vsfl）"""
+    stamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    path = get_log_file_path(f"{FRAME_LOG_PREFIX}{stamp}{FRAME_LOG_EXTENSION}")
+    # 同じ秒に起動した場合は連番を付けて上書きを避ける
+    base, ext = os.path.splitext(path)
+    index = 1
+    while os.path.exists(path):
+        path = f"{base}_{index}{ext}"
+        index += 1
+    return path
+
+
+def prune_old_logs(directory, keep=FRAME_LOG_MAX_FILES):
+    """directory 内のフレームログを新しい順に keep 個だけ残して削除する。削除した数を返す"""
+    keep = max(0, int(keep))
+    pattern = os.path.join(directory, f"{FRAME_LOG_PREFIX}*{FRAME_LOG_EXTENSION}")
+    try:
+        paths = sorted(glob.glob(pattern), key=os.path.getmtime, reverse=True)
+    except OSError:
+        return 0
+    removed = 0
+    for path in paths[keep:]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class FrameLog:
+    """フレームごとの固定長レコードをリングに積み、書き込みスレッドで追記するログ
+
+    - record(...): メインスレッドから毎フレーム呼ぶ（pack して deque に追加するだけ）
+    - 書き込みスレッドは FRAME_LOG_FLUSH_INTERVAL 秒ごとにリングを空にしてファイルへ追記する
+    - 書き込みが追いつかずリングがあふれた場合は古いレコードから捨て、dropped に数える
+    """
+
+    def __init__(self, path=None, ring_size=FRAME_LOG_RING_SIZE, flush_interval=FRAME_LOG_FLUSH_INTERVAL):
+        self.path = path
+        self.ring = deque(maxlen=max(1, int(ring_size)))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.enabled = True
+        self.frame = 0
+        self.appended = 0
+        self.written = 0
+        self._file = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._start_ns = time.perf_counter_ns()
+
+    @property
+    def dropped(self):
+        """リングがあふれて書き込まれなかったレコード数"""
+        return max(0, self.appended - self.written - len(self.ring))
+
+    # --- ライフサイクル ---
+
+    def _open(self):
+        """ファイルを作成してヘッダを書き、書き込みスレッドを起動する（初回の record で呼ばれる）
+
+        既存ファイルへの追記はしない（途中にヘッダが挟まると読み出し側がレコードとして解釈してしまう）。
+        """
+        try:
+            session_path = self.path is None
+            if session_path:
+                self.path = new_session_path()
+            directory = os.path.dirname(self.path)
+            if directory and not ensure_directory_exists(directory):
+                print(f"[WARNING] Cannot create frame log directory: {directory}")
+                self.enabled = False
+                return False
+            if session_path and directory and FRAME_LOG_MAX_FILES > 0:
+                # 今回作るファイルの分を空けて古いセッションのログを削除する
+                prune_old_logs(directory, FRAME_LOG_MAX_FILES - 1)
+            header = json.dumps({
+                'version': FRAME_LOG_VERSION,
+                'fields': [name for name, _ in FRAME_LOG_FIELDS],
+                'format': FRAME_LOG_FORMAT,
+                'record_size': FRAME_LOG_RECORD.size,
+                'session_start': datetime.now().isoformat(timespec='seconds'),
+            }).encode('utf-8')
+            self._file = open(self.path, 'xb')
+            self._file.write(FRAME_LOG_MAGIC + struct.pack('<I', len(header)) + header)
+            self._file.flush()
+        except OSError as e:
+            print(f"[WARNING] Cannot open frame log {self.path}: {e}")
+            self.enabled = False
+            return False
+
+        self._thread = threading.Thread(target=self._writer_loop, name='frame-log-writer', daemon=True)
+        self._thread.start()
+        print(f"[INFO] Frame log: {self.path}")
+        return True
+
+    def close(self):
+        """書き込みスレッドを止め、残りのレコードを書き出してファイルを閉じる"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.flush()
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    # --- 記録 ---
+
+    def record(self, stats, game_time=0.0, delta_ms=0.0, fps=0.0):
+        """performance_stats の 1 フレーム分をリングに積む"""
+        if not self.enabled:
+            return
+        if self._file is None and not self._open():
+            return
+        counts = stats.get('entities_count', {})
+        self.frame += 1
+        try:
+            packed = FRAME_LOG_RECORD.pack(
+                self.frame & 0xFFFFFFFF,
+                (time.perf_counter_ns() - self._start_ns) / 1e6,
+                game_time,
+                delta_ms,
+                fps,
+                stats.get('frame_time', 0.0),
+                stats.get('enemy_update_time', 0.0),
+                stats.get('particle_update_time', 0.0),
+                stats.get('collision_check_time', 0.0),
+                stats.get('render_time', 0.0),
+                counts.get('enemies', 0),
+                counts.get('particles', 0),
+                counts.get('gems', 0),
+                counts.get('projectiles', 0),
+                1 if stats.get('parallel_enabled', False) else 0,
+                min(0xFFFF, int(stats.get('parallel_threads', 0))),
+                stats.get('cpu_usage', 0.0),
+                stats.get('cpu_cores_used', 0.0),
+                stats.get('cpu_efficiency', 0.0),
+                stats.get('cpu_main_thread_time', 0.0),
+                stats.get('main_thread_load', 0.0),
+                stats.get('gil_contention', 0.0),
+                stats.get('parallel_wait_time', 0.0),
+            )
+        except (struct.error, TypeError, ValueError):
+            return
+        self.ring.append(packed)
+        self.appended += 1
+
+    # --- 書き込み（バックグラウンド） ---
+
+    def flush(self):
+        """リングに溜まったレコードをファイルへ追記する"""
+        if self._file is None:
+            return
+        with self._write_lock:
+            chunks = []
+            ring = self.ring
+            try:
+                while True:
+                    chunks.append(ring.popleft())
+            except IndexError:
+                pass
+            if not chunks:
+                return
+            try:
+                self._file.write(b''.join(chunks))
+                self._file.flush()
+                self.written += len(chunks)
+            except OSError as e:
+                print(f"[WARNING] Failed to write frame log: {e}")
+
+    def _writer_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+__all__ = ['FrameLog', 'FRAME_LOG_FIELDS', 'FRAME_LOG_FORMAT', 'FRAME_LOG_MAGIC', 'new_session_path', 'prune_old_logs']
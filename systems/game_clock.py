@@ -0,0 +1,44 @@
+"""
+ゲーム内時計
+固定タイムステップの 1 ティックごとに TARGET_FRAME_TIME ミリ秒ずつ進む時計。
+
+攻撃の寿命・クールダウン、弾やアイテムの寿命、ボックスの落下などのゲームロジックのタイマーは
+pygame.time.get_ticks()（実時間）ではなくこの時計を読む。描画が遅れてキャッチアップの
+ティックをまとめて回した場合も、一時停止中（武器・サブアイテム選択中）も、
+タイマーはゲームの進行（ティック数）と同じ速さで進む。
+"""
+
+from constants import TARGET_FRAME_TIME
+
+
+class GameClock:
+    """ティック数から経過ミリ秒を返す時計（メインループが advance() で 1 ティックずつ進める）"""
+
+    def __init__(self, tick_ms=TARGET_FRAME_TIME):
+        self.tick_ms = float(tick_ms)
+        self.ticks = 0
+
+    def advance(self, ticks=1):
+        """ticks ティック分進める"""
+        self.ticks += ticks
+
+    def get_ticks(self):
+        """経過ミリ秒（pygame.time.get_ticks() と同じく整数）"""
+        return int(self.ticks * self.tick_ms)
+
+
+# グローバルインスタンス（リスタートしても巻き戻さない。保持中のタイマーとの比較が崩れないようにする）
+_game_clock = GameClock()
+
+
+def get_game_clock():
+    """ゲーム内時計のシングルトンを取得"""
+    return _game_clock
+
+
+def get_ticks():
+    """ゲーム内の経過ミリ秒（ゲームロジックのタイマーで pygame.time.get_ticks() の代わりに使う）"""
+    return int(_game_clock.ticks * _game_clock.tick_ms)
+
+
+__all__ = ['GameClock', 'get_game_clock', 'get_ticks']
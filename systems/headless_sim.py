@@ -0,0 +1,208 @@
+"""
+ヘッドレス決定論シミュレーション
+SDL のダミードライバ・固定シード・固定ステップで main() の本番更新パスを回し、
+performance_stats の各バケットについてフレームごとのサンプルを集計する。
+（CI やローカルでの性能比較を再現可能にするためのもの）
+"""
+
+import os
+import random
+import hashlib
+from constants import TARGET_FRAME_TIME
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+
+
+# 集計対象のタイミングバケット（performance_stats のキー、単位 ms）
+TIMING_BUCKETS = (
+    'frame_time',
+    'enemy_update_time',
+    'particle_update_time',
+    'collision_check_time',
+    'render_time',
+    'parallel_queue_time',
+    'parallel_wait_time',
+    'process_backend_main',
+    'process_backend_wait',
+)
+
+# 集計対象のエンティティ数（performance_stats['entities_count'] のキー）
+ENTITY_BUCKETS = ('enemies', 'particles', 'gems', 'projectiles')
+
+# レポートに出すパーセンタイル
+REPORT_PERCENTILES = (50, 95, 99)
+
+
+def use_dummy_drivers():
+    """SDL のビデオ/オーディオをダミードライバに切り替える（pygame.init() より前に呼ぶ）"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+
+def percentile(sorted_values, pct):
+    """ソート済みリストのパーセンタイル（線形補間）"""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    pos = (len(sorted_values) - 1) * (pct / 100.0)
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    frac = pos - lo
+    return float(sorted_values[lo]) * (1.0 - frac) + float(sorted_values[hi]) * frac
+
+
+class HeadlessSimulation:
+    """main(sim=...) に渡すシミュレーション制御オブジェクト
+
+    - 仮想時計: pygame.time.get_ticks() を固定ステップで進む時計に差し替える
+    - 入力: 武器/サブアイテム選択は常に先頭の候補を自動で選ぶ
+    - 終了: seconds 秒分のフレームを回したらメインループを抜ける
+    """
+
+    def __init__(self, seconds=60.0, seed=0, render=True, keep_alive=True, frame_ms=TARGET_FRAME_TIME):
+        self.seconds = float(seconds)
+        self.seed = int(seed)
+        self.render = bool(render)
+        # プレイヤーが倒れると更新処理が止まり負荷が変わるため、既定では HP を維持する
+        self.keep_alive = bool(keep_alive)
+        self.frame_ms = float(frame_ms)
+        self.max_frames = max(1, int(round(self.seconds * 1000.0 / self.frame_ms)))
+
+        self.frame = 0
+        self.now_ms = 0.0
+        self.samples = {name: [] for name in TIMING_BUCKETS}
+        self.entity_samples = {name: [] for name in ENTITY_BUCKETS}
+        self.choices_made = 0
+        # 品質ガバナーの段階。実測の負荷は実行ごとに揺れるため最高品質に固定する
+        self.quality_level = 0
+        self.final_state = {}
+        self._state_hash = hashlib.sha1()
+        self._original_get_ticks = None
+
+    # --- セットアップ ---
+
+    def install(self):
+        """乱数シードと仮想時計を設定する（main() 呼び出し前に一度だけ）"""
+        random.seed(self.seed)
+        if NUMPY_AVAILABLE:
+            try:
+                np.random.seed(self.seed)
+            except Exception:
+                pass
+
+        import pygame
+        if self._original_get_ticks is None:
+            self._original_get_ticks = pygame.time.get_ticks
+            pygame.time.get_ticks = self.get_ticks
+
+    def uninstall(self):
+        """差し替えた get_ticks を元に戻す"""
+        if self._original_get_ticks is not None:
+            import pygame
+            pygame.time.get_ticks = self._original_get_ticks
+            self._original_get_ticks = None
+
+    def get_ticks(self):
+        """仮想時計のミリ秒（pygame.time.get_ticks の代替）"""
+        return int(self.now_ms)
+
+    # --- メインループから呼ばれるフック ---
+
+    def advance(self):
+        """仮想時計を 1 フレーム進め、このフレームの経過時間（ms）を返す"""
+        self.now_ms += self.frame_ms
+        return self.frame_ms
+
+    @property
+    def finished(self):
+        return self.frame >= self.max_frames
+
+    def drive_player(self, player):
+        """選択 UI の自動処理と HP 維持"""
+        try:
+            if getattr(player, 'awaiting_subitem_choice', False) and getattr(player, 'last_subitem_choices', None):
+                player.apply_subitem_choice(player.last_subitem_choices[0])
+                self.choices_made += 1
+            elif getattr(player, 'awaiting_weapon_choice', False) and getattr(player, 'last_level_choices', None):
+                player.apply_level_choice(player.last_level_choices[0])
+                player.is_initial_weapon_selection = False
+                self.choices_made += 1
+        except Exception as e:
+            print(f"[WARNING] Headless auto choice failed: {e}")
+
+        if self.keep_alive:
+            try:
+                player.hp = player.get_max_hp()
+            except Exception:
+                pass
+
+    def end_frame(self, stats, player=None, enemies=None, game_time=0.0):
+        """フレーム終了時にサンプルを記録する。ループを続けるなら True を返す"""
+        for name in TIMING_BUCKETS:
+            self.samples[name].append(float(stats.get(name, 0.0)))
+        counts = stats.get('entities_count', {})
+        for name in ENTITY_BUCKETS:
+            self.entity_samples[name].append(int(counts.get(name, 0)))
+
+        # 再現性チェック用の状態ダイジェスト（実行ごとに一致するはず）
+        if player is not None:
+            self._state_hash.update(
+                f"{self.frame}:{player.x:.3f}:{player.y:.3f}:{getattr(player, 'level', 0)}:"
+                f"{len(enemies) if enemies is not None else 0}".encode('ascii')
+            )
+            self.final_state = {
+                'game_time': round(float(game_time), 3),
+                'player_level': getattr(player, 'level', 0),
+                'player_pos': (round(player.x, 3), round(player.y, 3)),
+                'enemies': len(enemies) if enemies is not None else 0,
+            }
+
+        self.frame += 1
+        return not self.finished
+
+    # --- 結果 ---
+
+    @property
+    def state_digest(self):
+        return self._state_hash.hexdigest()
+
+    def summary(self):
+        """バケットごとの p50/p95/p99 と最大値をまとめた辞書を返す"""
+        result = {
+            'seed': self.seed,
+            'frames': self.frame,
+            'sim_seconds': round(self.frame * self.frame_ms / 1000.0, 3),
+            'render': self.render,
+            'choices_made': self.choices_made,
+            'state_digest': self.state_digest,
+            'final_state': self.final_state,
+            'timings_ms': {},
+            'entities': {},
+        }
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            entry = {f'p{p}': round(percentile(ordered, p), 3) for p in REPORT_PERCENTILES}
+            entry['max'] = round(ordered[-1], 3) if ordered else 0.0
+            result['timings_ms'][name] = entry
+        for name, values in self.entity_samples.items():
+            ordered = sorted(values)
+            entry = {f'p{p}': round(percentile(ordered, p), 1) for p in REPORT_PERCENTILES}
+            entry['max'] = ordered[-1] if ordered else 0
+            result['entities'][name] = entry
+        return result
+
+    def format_report(self):
+        """summary() を表形式の文字列にする"""
+        data = self.summary()
+        lines = [
+            f"=== Headless simulation: seed={data['seed']} frames={data['frames']} "
+            f"({data['sim_seconds']:.1f}s simulated, render={'on' if data['render'] else 'off'}) ===",
+            f"{'bucket':<28}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        for name, entry in data['timings_ms'].items():
+            lines.append(f"{name + ' (ms)':<28}{entry['p50']:>10.3f}{entry['p95']:>10.3f}{entry['p99']:>10.3f}{entry['max']:>10.3f}")
+        for name, entry in data['entities'].items():
+            lines.append(f"{name + ' (count)':<28}{entry['p50']:>10.1f}{entry['p95']:>10.1f}{entry['p99']:>10.1f}{entry['max']:>10}")
+        lines.append(f"final state: {data['final_state']}")
+        lines.append(f"state digest: {data['state_digest']}")
+        return "\n".join(lines)
@@ -0,0 +1,146 @@
+"""
+常駐ワーカースレッドによるジョブシステム
+起動時に一度だけスレッドプールを作り、毎フレームのバッチ処理で使い回す。
+バッチ投入 → フレーム内バリア（全バッチ完了待ち）の形で使う。
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from constants import PARALLEL_MAX_WORKERS, JOB_SYSTEM_WORKERS, JOB_INLINE_THRESHOLD
+
+
+def default_worker_count():
+    """ワーカー数の既定値（CPUコア数と PARALLEL_MAX_WORKERS の小さい方）"""
+    if JOB_SYSTEM_WORKERS > 0:
+        return int(JOB_SYSTEM_WORKERS)
+    try:
+        cores = os.cpu_count() or 1
+    except Exception:
+        cores = 1
+    return max(1, min(cores, PARALLEL_MAX_WORKERS))
+
+
+class JobSystem:
+    """常駐スレッドプールを使ったバッチ実行
+
+    - run(func, items, *args): items をワーカー数に分割して func(batch, *args) を並列実行し、
+      全バッチの完了を待ってからバッチ順に結果リストを返す
+    - items が inline_threshold 未満、または enabled が False の場合は呼び出しスレッドで実行
+    - フレーム単位でキュー待ち時間・バリア待ち時間・実際に動いたワーカー数を集計する
+    """
+
+    def __init__(self, workers=None, inline_threshold=JOB_INLINE_THRESHOLD):
+        self.workers = max(1, int(workers)) if workers else default_worker_count()
+        self.inline_threshold = max(1, int(inline_threshold))
+        self.enabled = True
+        self._executor = None
+        self._lock = threading.Lock()
+        self.begin_frame()
+
+    # --- ライフサイクル ---
+
+    def _get_executor(self):
+        """スレッドプールを取得（初回のみ生成し、以降は使い回す）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+        return self._executor
+
+    def shutdown(self):
+        """スレッドプールを停止"""
+        if self._executor is not None:
+            try:
+                self._executor.shutdown(wait=True)
+            except Exception:
+                pass
+            self._executor = None
+
+    # --- フレーム統計 ---
+
+    def begin_frame(self):
+        """フレーム単位の統計をリセット"""
+        self._thread_ids = set()
+        self.jobs = 0            # ワーカーに投入したバッチ数
+        self.inline_jobs = 0     # 呼び出しスレッドで実行したバッチ数
+        self.queue_time = 0.0    # 投入から実行開始までの待ち時間の合計（ms）
+        self.max_queue_time = 0.0
+        self.wait_time = 0.0     # 呼び出しスレッドがバリアで待った時間の合計（ms）
+        self.busy_time = 0.0     # ワーカーが実際に処理していた時間の合計（ms）
+        self.busy_cpu_time = 0.0 # そのうちワーカースレッドが CPU を使っていた時間の合計（ms、thread_time）
+
+    def publish_stats(self, stats):
+        """このフレームの集計を performance_stats に書き込む"""
+        stats['parallel_threads'] = len(self._thread_ids)
+        stats['parallel_jobs'] = self.jobs
+        stats['parallel_inline_jobs'] = self.inline_jobs
+        stats['parallel_queue_time'] = self.queue_time / self.jobs if self.jobs else 0.0
+        stats['parallel_max_queue_time'] = self.max_queue_time
+        stats['parallel_wait_time'] = self.wait_time
+        stats['parallel_busy_time'] = self.busy_time
+        stats['parallel_busy_cpu_time'] = self.busy_cpu_time
+
+    # --- 実行 ---
+
+    def split(self, items, batch_count=None):
+        """items をおおよそ均等なバッチに分割"""
+        n = len(items)
+        if n == 0:
+            return []
+        batch_count = max(1, min(n, batch_count or self.workers))
+        batch_size = (n + batch_count - 1) // batch_count
+        return [items[i:i + batch_size] for i in range(0, n, batch_size)]
+
+    def run(self, func, items, *args):
+        """func(batch, *args) をバッチごとに実行し、結果をバッチ順のリストで返す
+
+        ワーカーで例外が出た場合は全バッチの完了を待ってから最初の例外を送出する
+        （呼び出し側で逐次処理にフォールバックできるように）。
+        """
+        if not items:
+            return []
+        if not self.enabled or self.workers <= 1 or len(items) < self.inline_threshold:
+            self.inline_jobs += 1
+            return [func(items, *args)]
+
+        batches = self.split(items)
+        executor = self._get_executor()
+        futures = []
+        for batch in batches:
+            futures.append(executor.submit(self._run_job, func, batch, args, time.perf_counter()))
+        self.jobs += len(futures)
+
+        # バリア: 全バッチの完了を待つ
+        wait_start = time.perf_counter()
+        results = []
+        error = None
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if error is None:
+                    error = e
+                results.append(None)
+        self.wait_time += (time.perf_counter() - wait_start) * 1000.0
+
+        if error is not None:
+            raise error
+        return results
+
+    def _run_job(self, func, batch, args, submit_time):
+        """ワーカースレッド側: キュー待ち時間と処理時間（経過時間・CPU 時間）を記録して実行"""
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return func(batch, *args)
+        finally:
+            end = time.perf_counter()
+            cpu = (time.thread_time() - cpu_start) * 1000.0
+            queued = (start - submit_time) * 1000.0
+            with self._lock:
+                self._thread_ids.add(threading.get_ident())
+                self.queue_time += queued
+                if queued > self.max_queue_time:
+                    self.max_queue_time = queued
+                self.busy_time += (end - start) * 1000.0
+                self.busy_cpu_time += cpu
@@ -1,6 +1,7 @@
 """
 パフォーマンス測定用ログシステム
 FPS、エンティティ数、処理時間などを定期的にCSVファイルに記録
+毎フレームの値はバイナリのフレームログ（systems/frame_log.py）に記録する
 PyInstaller対応（macでの権限問題解決）
 """
 
@@ -11,28 +12,25 @@ from datetime import datetime
 from collections import deque
 from constants import *
 from utils.file_paths import get_log_file_path, ensure_directory_exists
-
-# psutilの安全なインポート
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    print("[WARNING] psutil not available - CPU usage will be 0")
+from systems.frame_log import FrameLog
 
 
 class PerformanceLogger:
     """パフォーマンス測定データをCSVファイルに記録するクラス"""
     
-    def __init__(self, log_file=None, max_entries=PERFORMANCE_LOG_MAX_ENTRIES):
+    def __init__(self, log_file=None, max_entries=PERFORMANCE_LOG_MAX_ENTRIES, use_log_file=True):
         self.log_file = get_log_file_path("performance_log.csv") if log_file is None else log_file
         self.max_entries = max_entries
-        self.enabled = ENABLE_PERFORMANCE_LOG
+        # use_log_file=False（ヘッドレス実行など）はファイルに一切書かない
+        self.use_log_file = bool(use_log_file)
+        self.enabled = ENABLE_PERFORMANCE_LOG and self.use_log_file
         self.last_log_time = 0.0
         self.log_interval = PERFORMANCE_LOG_INTERVAL
         
         # ログデータのバッファ（メモリ効率のため）
         self.log_buffer = deque(maxlen=max_entries)
+        # ログファイルの初期化に成功したか（起動時間などの1回きりの記録に使う）
+        self.file_ready = False
         
         # CSV列の定義
         self.csv_headers = [
@@ -57,8 +55,12 @@ class PerformanceLogger:
             'total_processing_ms' # 総処理時間(ms)
         ]
         
+        # フレームごとのバイナリログ（最初のフレームでセッションファイルを作る）
+        self.frame_log = FrameLog() if ENABLE_FRAME_LOG and self.use_log_file else None
+
         # ログファイルの初期化
-        self._initialize_log_file()
+        if self.use_log_file:
+            self._initialize_log_file()
 
     def _initialize_log_file(self):
         """ログファイルとディレクトリを初期化"""
@@ -69,21 +71,19 @@ class PerformanceLogger:
                 self.enabled = False
                 return
 
-            # 古いログファイルは削除
-            if os.path.exists(self.log_file):
-                try:
-                    os.remove(self.log_file)
-                except PermissionError as e:
-                    print(f"[WARNING] Cannot remove existing log file: {e}")
+            # 過去のセッションは残して追記する（ヘッダは新規ファイルのときだけ書く）
+            is_new_file = not os.path.exists(self.log_file) or os.path.getsize(self.log_file) == 0
 
             # ログファイル初期化
             with open(self.log_file, 'a', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(self.csv_headers)
+                if is_new_file:
+                    writer.writerow(self.csv_headers)
                 
                 session_start = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 writer.writerow([f'# New session started at {session_start}'] + [''] * (len(self.csv_headers) - 1))
             
+            self.file_ready = True
             print(f"[INFO] Performance log initialized: {self.log_file}")
                 
         except (PermissionError, OSError) as e:
@@ -93,6 +93,8 @@ class PerformanceLogger:
     
     def toggle_logging(self):
         """ログ記録のON/OFF切り替え"""
+        if not self.use_log_file:
+            return False
         self.enabled = not self.enabled
         status = "enabled" if self.enabled else "disabled"
         print(f"[INFO] Performance logging {status}")
@@ -118,8 +120,8 @@ class PerformanceLogger:
             # 現在時刻の取得
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]  # ミリ秒まで
             
-            # CPU使用率の取得
-            cpu_usage = self._get_cpu_usage()
+            # CPU使用率（systems/cpu_metrics.py がプロセスの CPU 時間から計測した値）
+            cpu_usage = performance_data.get('cpu_usage', 0.0)
             
             # メモリ使用量の概算（エンティティ数から推定）
             memory_estimate = self._estimate_memory_usage(performance_data)
@@ -149,7 +151,7 @@ class PerformanceLogger:
                 1 if performance_data.get('parallel_enabled', False) else 0,
                 performance_data.get('parallel_threads', 0),
                 round(cpu_usage, 1),
-                performance_data.get('cpu_cores_used', 0),
+                round(performance_data.get('cpu_cores_used', 0), 2),
                 round(performance_data.get('cpu_efficiency', 0), 1),
                 round(memory_estimate, 1),
                 round(total_processing, 1)
@@ -164,18 +166,34 @@ class PerformanceLogger:
         except Exception as e:
             print(f"[ERROR] Failed to log performance data: {e}")
     
-    def _get_cpu_usage(self):
-        """現在のCPU使用率を取得"""
-        if not PSUTIL_AVAILABLE:
-            return 0.0
+    def log_frame(self, performance_data, game_time=0.0, delta_ms=0.0, fps=0.0):
+        """1 フレーム分の計測値をバイナリのフレームログに記録（毎フレーム呼ぶ）
+
+        CSV ログと同じく enabled（ENABLE_PERFORMANCE_LOG / F10）の間だけ記録する。
+        ファイルは最初に記録したフレームで作られるため、無効のままならファイルも作られない。
+        """
+        if self.enabled and self.frame_log is not None:
+            self.frame_log.record(performance_data, game_time, delta_ms, fps)
+
+    def log_startup(self, stage_timings, time_to_interactive):
+        """起動時の読み込みステージごとの時間（ms）を記録
+
+        セッション開始行と同じくコメント行として書き込む（例: "# startup stage=map ms=12.3"）。
+        定期ログの ON/OFF に関係なく、ログファイルが使えれば毎回記録する。
+        """
+        if not self.file_ready:
+            return
+
+        rows = [f'# startup stage={name} ms={ms:.1f}' for name, ms in stage_timings.items()]
+        rows.append(f'# startup time_to_interactive ms={time_to_interactive:.1f}')
         try:
-            # 短時間での測定（非ブロッキング）
-            cpu_percent = psutil.cpu_percent(interval=None)
-            return cpu_percent
+            with open(self.log_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                for row in rows:
+                    writer.writerow([row] + [''] * (len(self.csv_headers) - 1))
         except Exception as e:
-            # psutilエラー時は0を返す
-            return 0.0
-    
+            print(f"[WARNING] Failed to write startup timings: {e}")
+
     def _estimate_memory_usage(self, performance_data):
         """エンティティ数からメモリ使用量を概算（MB）"""
         try:
@@ -257,6 +275,11 @@ class PerformanceLogger:
     
     def close(self):
         """ログシステムを終了（バッファをフラッシュ）"""
+        if self.frame_log is not None:
+            self.frame_log.close()
+            if self.frame_log.dropped:
+                print(f"[WARNING] Frame log dropped {self.frame_log.dropped} records")
+
         if self.enabled and self.log_buffer:
             self.flush_buffer()
             
@@ -0,0 +1,198 @@
+"""
+ゾーン単位の階層プロファイラ
+フレーム内の処理区間（ゾーン）をネストして計測し、直近の記録をリングバッファに保持する。
+Chrome の trace_event 形式（chrome://tracing / Perfetto で開ける JSON）に書き出せる。
+
+使い方:
+    with profiler.zone('enemy_move'):
+        ...
+    profiler.begin('events'); ...; profiler.end('events')   # 長いブロック向け
+
+    @profiled('spawn')
+    def spawn_enemies(...): ...
+
+1 ゾーンあたりの処理は perf_counter_ns 2 回とタプル 1 個の追加だけなので、常時有効のままでよい。
+enabled（PROFILER_ENABLED）はリングバッファへの記録だけを切り替え、直近の所要時間（last_ms）は常に更新する。
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from constants import PROFILER_ENABLED, PROFILER_RING_SIZE, PROFILER_TRACE_FILE
+from utils.file_paths import get_log_file_path, ensure_directory_exists
+
+_now_ns = time.perf_counter_ns
+
+
+class _Zone:
+    """with 文用のゾーン（名前ごとに 1 つ作って使い回す）"""
+
+    __slots__ = ('profiler', 'name')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.begin(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.end(self.name)
+        return False
+
+
+class Profiler:
+    """ネスト可能なゾーン計測とリングバッファ
+
+    記録は (name, start_ns, duration_ns, depth, frame) のタプル。
+    ゾーンの終了順に追加されるので、親ゾーンは子ゾーンより後に並ぶ。
+    """
+
+    def __init__(self, ring_size=PROFILER_RING_SIZE, enabled=PROFILER_ENABLED):
+        self.enabled = bool(enabled)
+        self.events = deque(maxlen=max(1, int(ring_size)))
+        self.frame = 0
+        # 開いているゾーン [(name, start_ns), ...]
+        self._stack = []
+        # ゾーン名ごとの直近の所要時間（ms）
+        self.last_ms = {}
+        self._zones = {}
+        self._origin_ns = _now_ns()
+        self._thread_id = threading.get_ident()
+
+    # --- 計測 ---
+
+    def begin(self, name):
+        self._stack.append((name, _now_ns()))
+
+    def end(self, name=None):
+        """最後に開いたゾーンを閉じ、所要時間（ms）を返す
+
+        name を渡すとそのゾーンまでさかのぼって閉じる（例外で end が飛ばされた子ゾーンも一緒に閉じる）。
+        """
+        stack = self._stack
+        if not stack:
+            return 0.0
+        now = _now_ns()
+        record = self.enabled
+        while stack:
+            zone_name, start = stack.pop()
+            duration = now - start
+            if record:
+                self.events.append((zone_name, start, duration, len(stack), self.frame))
+            if name is None or zone_name == name:
+                ms = duration / 1e6
+                self.last_ms[zone_name] = ms
+                return ms
+        return 0.0
+
+    def zone(self, name):
+        """with 文で使うゾーンを返す"""
+        zone = self._zones.get(name)
+        if zone is None:
+            zone = _Zone(self, name)
+            self._zones[name] = zone
+        return zone
+
+    def begin_frame(self):
+        """フレームの開始。前フレームで閉じ忘れたゾーンを閉じて 'frame' ゾーンを開く"""
+        if self._stack:
+            self.end(self._stack[0][0])
+        self.frame += 1
+        self.begin('frame')
+
+    def end_frame(self):
+        """'frame' ゾーンを閉じ、フレーム時間（ms）を返す"""
+        return self.end('frame')
+
+    def get_ms(self, name, default=0.0):
+        return self.last_ms.get(name, default)
+
+    def toggle_recording(self):
+        """リングバッファへの記録の ON/OFF（所要時間の計測自体は常に行う）"""
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def clear(self):
+        self.events.clear()
+        self._stack = []
+        self.last_ms = {}
+
+    # --- 書き出し ---
+
+    def trace_events(self):
+        """リングバッファの内容を Chrome trace_event の辞書リストに変換（時刻はマイクロ秒）"""
+        origin = self._origin_ns
+        pid = os.getpid()
+        tid = self._thread_id
+        events = []
+        for name, start, duration, depth, frame in list(self.events):
+            events.append({
+                'name': name,
+                'cat': 'frame' if depth == 0 else 'zone',
+                'ph': 'X',
+                'ts': (start - origin) / 1000.0,
+                'dur': duration / 1000.0,
+                'pid': pid,
+                'tid': tid,
+                'args': {'frame': frame},
+            })
+        events.sort(key=lambda e: (e['ts'], -e['dur']))
+        return events
+
+    def export_chrome_trace(self, path=None):
+        """リングバッファを trace_event JSON に書き出し、書き出したパスを返す（失敗時は None）"""
+        if not self.events:
+            return None
+        if path is None:
+            path = get_log_file_path(PROFILER_TRACE_FILE)
+        try:
+            directory = os.path.dirname(path)
+            if directory and not ensure_directory_exists(directory):
+                print(f"[WARNING] Cannot create trace directory: {directory}")
+                return None
+            trace = {
+                'traceEvents': self.trace_events(),
+                'displayTimeUnit': 'ms',
+            }
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f)
+            print(f"[INFO] Profiler trace written: {path} ({len(self.events)} zones)")
+            return path
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[WARNING] Failed to write profiler trace: {e}")
+            return None
+
+
+# ゲーム全体で共有するプロファイラ
+profiler = Profiler()
+
+
+def get_profiler():
+    """プロファイラのシングルトンインスタンスを取得"""
+    return profiler
+
+
+def profiled(name=None):
+    """関数全体をゾーンとして計測するデコレータ（name 省略時は関数名）"""
+    def decorator(func):
+        zone_name = name or func.__name__
+
+        def wrapper(*args, **kwargs):
+            profiler.begin(zone_name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.end(zone_name)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorator
+
+
+__all__ = ['Profiler', 'profiler', 'get_profiler', 'profiled']
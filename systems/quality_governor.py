@@ -0,0 +1,103 @@
+"""
+フレーム予算に基づく品質ガバナー
+直近のフレーム処理時間（profiler の 'frame' ゾーン、clock.tick の待ち時間は含まない）を
+描画フレーム予算（1000 / 描画FPS）と比べ、QUALITY_LEVELS の品質段階を 1 段ずつ上げ下げする。
+
+- 平均処理時間が予算の QUALITY_DEGRADE_LOAD を QUALITY_DEGRADE_FRAMES フレーム超え続けたら 1 段下げる
+- QUALITY_UPGRADE_LOAD を QUALITY_UPGRADE_FRAMES フレーム下回り続けたら 1 段上げる
+- 2 つの閾値の間では段階を変えず、段階を変えた直後は判定窓を空にして測り直す（ヒステリシス）
+
+各システムは settings（現在の段階の辞書）から上限・頻度を読む。
+"""
+
+from collections import deque
+from constants import (QUALITY_LEVELS, QUALITY_GOVERNOR_ENABLED, QUALITY_WINDOW_FRAMES,
+                       QUALITY_DEGRADE_LOAD, QUALITY_UPGRADE_LOAD, QUALITY_DEGRADE_FRAMES,
+                       QUALITY_UPGRADE_FRAMES)
+
+
+class QualityGovernor:
+    """描画フレームごとに update() を呼び、settings の品質設定を使う"""
+
+    def __init__(self, levels=QUALITY_LEVELS, enabled=QUALITY_GOVERNOR_ENABLED):
+        self.levels = tuple(levels)
+        self.enabled = bool(enabled)
+        self.level = 0
+        self.settings = self.levels[0]
+        self.load = 0.0  # 直近の平均処理時間 / フレーム予算
+        self.changes = 0
+        self._samples = deque(maxlen=max(1, int(QUALITY_WINDOW_FRAMES)))
+        self._over = 0
+        self._under = 0
+        self._damage_number_budget = 0.0
+
+    @property
+    def max_level(self):
+        return len(self.levels) - 1
+
+    def set_level(self, level):
+        """品質段階を設定し、判定窓をリセットする"""
+        level = max(0, min(self.max_level, int(level)))
+        if level != self.level:
+            self.changes += 1
+            print(f"[INFO] Quality level {self.level} -> {level} (load {self.load * 100.0:.0f}% of frame budget)")
+        self.level = level
+        self.settings = self.levels[level]
+        self._samples.clear()
+        self._over = 0
+        self._under = 0
+
+    def update(self, frame_ms, budget_ms):
+        """1 描画フレーム分の処理時間を記録し、必要なら品質段階を変える。現在の段階を返す"""
+        if not self.enabled or budget_ms <= 0.0:
+            return self.level
+        samples = self._samples
+        samples.append(frame_ms)
+        if len(samples) < samples.maxlen:
+            return self.level
+
+        self.load = sum(samples) / len(samples) / budget_ms
+        if self.load > QUALITY_DEGRADE_LOAD and self.level < self.max_level:
+            self._over += 1
+            self._under = 0
+            if self._over >= QUALITY_DEGRADE_FRAMES:
+                self.set_level(self.level + 1)
+        elif self.load < QUALITY_UPGRADE_LOAD and self.level > 0:
+            self._under += 1
+            self._over = 0
+            if self._under >= QUALITY_UPGRADE_FRAMES:
+                self.set_level(self.level - 1)
+        else:
+            self._over = 0
+            self._under = 0
+        return self.level
+
+    # --- 各システムから使う判定 ---
+
+    def allow_damage_number(self):
+        """このヒットでダメージ数値を表示するか（damage_number_density の割合で間引く）"""
+        self._damage_number_budget += self.settings['damage_number_density']
+        if self._damage_number_budget >= 1.0:
+            self._damage_number_budget -= 1.0
+            return True
+        return False
+
+    def ai_interval(self, off_screen, enemy_count=0):
+        """敵の攻撃処理を何ティックに 1 回行うか
+
+        設定が ((敵数の上限, 間隔), ...) の表なら、enemy_count が上限以下になる最初の段の間隔を返す。
+        """
+        interval = self.settings['offscreen_ai_interval' if off_screen else 'ai_interval']
+        if isinstance(interval, tuple):
+            for limit, tier_interval in interval:
+                if enemy_count <= limit:
+                    return tier_interval
+            return interval[-1][1]
+        return interval
+
+    def publish_stats(self, stats):
+        stats['quality_level'] = self.level
+        stats['quality_load'] = self.load * 100.0
+
+
+__all__ = ['QualityGovernor']
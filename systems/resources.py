@@ -2,12 +2,20 @@ import pygame
 import os
 import sys
 from utils.file_paths import get_resource_path
+from systems import asset_pack
 
 # キャッシュ
 _icon_cache = {}
 _font_cache = {}
 _jp_font_path = None
 _sound_cache = {}
+_glyph_atlas_cache = {}
+_text_cache = {}
+
+# グリフアトラスに焼き込む文字（数字・英字・記号 = HUD やダメージ表示で使う ASCII 全体）
+GLYPH_ATLAS_CHARS = ''.join(chr(c) for c in range(32, 127))
+# render_text のキャッシュ上限（超えたらクリア）
+TEXT_CACHE_LIMIT = 512
 
 DEFAULT_ICON_NAMES = ['sword','magic_wand','stone','whip','holy_water','garlic',
                       'axe','thunder','knife','rotating_book',
@@ -23,8 +31,11 @@ def load_icons(size=32, icon_names=None, icons_dir=None):
     """
     if icon_names is None:
         icon_names = DEFAULT_ICON_NAMES
+    default_dir = get_resource_path(os.path.join('assets', 'icons'))
     if icons_dir is None:
-        icons_dir = get_resource_path(os.path.join('assets', 'icons'))
+        icons_dir = default_dir
+    # パックは既定のアイコンフォルダから作られているので、別フォルダ指定時は使わない
+    use_pack = os.path.normpath(icons_dir) == os.path.normpath(default_dir)
 
     icons = {}
     for nm in icon_names:
@@ -32,6 +43,12 @@ def load_icons(size=32, icon_names=None, icons_dir=None):
         if key in _icon_cache:
             icons[nm] = _icon_cache[key]
             continue
+        # アセットパックにあればそれを使う
+        packed = asset_pack.get_surface(f"icon/{nm}/{size}") if use_pack else None
+        if packed is not None:
+            _icon_cache[key] = packed
+            icons[nm] = packed
+            continue
         p = os.path.join(icons_dir, f"{nm}.png")
         try:
             surf = pygame.image.load(p).convert_alpha()
@@ -101,6 +118,161 @@ def get_font(size):
     _font_cache[key] = f
     return f
 
+# --- グリフアトラス ---
+class GlyphAtlas:
+    """1つのフォント・色について各文字を1枚のサーフェスに焼き込み、文字列をグリフのブリットで組み立てる
+
+    FreeType でのレンダリングは初回（アトラス生成時）だけで、以降の文字列描画はブリットのみ。
+    アトラスにない文字（日本語など）を含む文字列は通常の font.render にフォールバックする。
+    """
+
+    def __init__(self, font, color=(255, 255, 255), chars=GLYPH_ATLAS_CHARS):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+        self.rects = {}
+        self.advances = {}
+
+        glyphs = []
+        for ch in chars:
+            try:
+                glyph = font.render(ch, True, color)
+            except Exception:
+                continue
+            advance = glyph.get_width()
+            try:
+                metrics = font.metrics(ch)
+                if metrics and metrics[0]:
+                    advance = metrics[0][4]
+            except Exception:
+                pass
+            glyphs.append((ch, glyph, advance))
+
+        total_w = max(1, sum(glyph.get_width() for _, glyph, _ in glyphs))
+        self.surface = pygame.Surface((total_w, self.height), pygame.SRCALPHA)
+        x = 0
+        for ch, glyph, advance in glyphs:
+            # 透明な下地にアルファ付きで合成すると縁が暗くなるため、MAX 合成でそのまま写す
+            self.surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[ch] = pygame.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            self.advances[ch] = advance
+            x += glyph.get_width()
+
+    def supports(self, text):
+        rects = self.rects
+        return all(ch in rects for ch in text)
+
+    def size(self, text):
+        """描画サイズ (幅, 高さ)"""
+        advances = self.advances
+        width = 0
+        last_extra = 0
+        for ch in text:
+            width += advances[ch]
+            last_extra = self.rects[ch].width - advances[ch]
+        return (max(0, width + max(0, last_extra)), self.height)
+
+    def draw(self, surface, text, pos, alpha=255):
+        """グリフを直接ブリットして文字列を描く（alpha は描画ごとの不透明度）。描画範囲の Rect を返す"""
+        x, y = int(pos[0]), int(pos[1])
+        atlas = self.surface
+        rects = self.rects
+        advances = self.advances
+        sequence = []
+        for ch in text:
+            if ch != ' ':
+                sequence.append((atlas, (x, y), rects[ch]))
+            x += advances[ch]
+        if alpha < 255:
+            atlas.set_alpha(max(0, int(alpha)))
+        try:
+            surface.blits(sequence, False)
+        finally:
+            if alpha < 255:
+                atlas.set_alpha(255)
+        width, height = self.size(text)
+        return pygame.Rect(int(pos[0]), y, width, height)
+
+    def render(self, text):
+        """文字列を1枚のサーフェスに組み立てる（font.render の代替）"""
+        width, height = self.size(text)
+        surf = pygame.Surface((max(1, width), height), pygame.SRCALPHA)
+        atlas = self.surface
+        rects = self.rects
+        advances = self.advances
+        sequence = []
+        x = 0
+        for ch in text:
+            if ch != ' ':
+                sequence.append((atlas, (x, 0), rects[ch], pygame.BLEND_RGBA_MAX))
+            x += advances[ch]
+        surf.blits(sequence, False)
+        return surf
+
+
+def get_glyph_atlas(font, color=(255, 255, 255)):
+    """フォント（または get_font のサイズ）と色に対応する GlyphAtlas を返す。失敗時は None"""
+    if isinstance(font, int):
+        font = get_font(font)
+    if font is None:
+        return None
+    key = (font, tuple(color))
+    atlas = _glyph_atlas_cache.get(key)
+    if atlas is None and key not in _glyph_atlas_cache:
+        try:
+            atlas = GlyphAtlas(font, tuple(color))
+        except Exception:
+            atlas = None
+        _glyph_atlas_cache[key] = atlas
+    return atlas
+
+
+def render_text(font, text, color=(255, 255, 255)):
+    """font.render(text, True, color) の代替。グリフアトラスから組み立てた結果をキャッシュして返す
+
+    毎フレーム同じ文字列を描く HUD 向け。内容が変わった時だけ組み立て直す。
+    """
+    text = str(text)
+    key = (font, text, tuple(color))
+    surf = _text_cache.get(key)
+    if surf is not None:
+        return surf
+    atlas = get_glyph_atlas(font, color)
+    if atlas is not None and atlas.supports(text):
+        surf = atlas.render(text)
+    else:
+        if isinstance(font, int):
+            font = get_font(font)
+        surf = font.render(text, True, color)
+    if len(_text_cache) >= TEXT_CACHE_LIMIT:
+        _text_cache.clear()
+    _text_cache[key] = surf
+    return surf
+
+
+def draw_text(surface, font, text, color, pos, alpha=255):
+    """文字列をグリフのブリットで直接描く（毎フレーム内容が変わる数値表示向け）。描画範囲の Rect を返す"""
+    text = str(text)
+    atlas = get_glyph_atlas(font, color)
+    if atlas is not None and atlas.supports(text):
+        return atlas.draw(surface, text, pos, alpha)
+    surf = render_text(font, text, color)
+    if alpha < 255:
+        surf = surf.copy()
+        surf.set_alpha(alpha)
+    return surface.blit(surf, pos)
+
+
+def text_size(font, text):
+    """draw_text / render_text で描いた場合のサイズ"""
+    text = str(text)
+    atlas = get_glyph_atlas(font)
+    if atlas is not None and atlas.supports(text):
+        return atlas.size(text)
+    if isinstance(font, int):
+        font = get_font(font)
+    return font.size(text)
+
 # --- サウンド管理 ---
 def load_sound(name, sounds_dir=None):
     """名前（拡張子なし）からサウンドを読み込み、キャッシュして返す。失敗時は None。"""
@@ -133,6 +305,9 @@ def preload_all(icon_size=32, icon_names=None, font_sizes=None, sound_names=None
     """よく使うリソースを一括でプリロードするユーティリティ。
     pygame.init() を呼んだ後で実行してください。
     """
+    # 事前加工済みアセットパック（あれば全画像をまとめて Surface 化しておく）
+    asset_pack.ensure_loaded()
+
     # icons
     if icon_names is None:
         icon_names = DEFAULT_ICON_NAMES
@@ -158,4 +333,5 @@ def preload_all(icon_size=32, icon_names=None, font_sizes=None, sound_names=None
     }
 
 # エクスポート用
-__all__ = ['load_icons', 'get_font', 'load_sound', 'load_sounds', 'preload_all']
+__all__ = ['load_icons', 'get_font', 'GlyphAtlas', 'get_glyph_atlas', 'render_text', 'draw_text', 'text_size',
+           'load_sound', 'load_sounds', 'preload_all']
@@ -0,0 +1,255 @@
+"""
+起動時の読み込みパイプライン
+ウィンドウを先に表示し、CSV・セーブ・マップ・フォント・サウンド・画像をバックグラウンドスレッドで
+依存順に読み込む。メインスレッドはその間ローディング画面を描画する。
+
+ステージごとの所要時間を記録し、PerformanceLogger.log_startup() で性能ログに残す。
+"""
+
+import os
+import sys
+import time
+import threading
+import pygame
+from constants import *
+
+
+class StartupLoader:
+    """依存関係つきの読み込みステージを順に実行する
+
+    - add(name, func, deps, label): func(results) の戻り値が results[name] に入る
+    - start(): バックグラウンドスレッドで実行 / run(): 呼び出しスレッドで実行
+    - ステージで例外が出ても残りは続行し、errors[name] に記録する（結果は None）
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self.results = {}
+        self.timings = {}       # name -> 所要時間（ms、実行順）
+        self.errors = {}
+        self.current = None     # 実行中のステージ名
+        self.done = False
+        self.total_time = 0.0   # 全ステージの合計（ms）
+        self._completed = 0
+        self._thread = None
+
+    def add(self, name, func, deps=(), label=None):
+        self._stages[name] = (func, tuple(deps), label or name)
+        return self
+
+    def label(self, name):
+        stage = self._stages.get(name)
+        return stage[2] if stage else ''
+
+    @property
+    def labels(self):
+        return [stage[2] for stage in self._stages.values()]
+
+    @property
+    def progress(self):
+        """完了したステージの割合（0.0～1.0）"""
+        if not self._stages:
+            return 1.0
+        return self._completed / len(self._stages)
+
+    def order(self):
+        """依存関係を満たす実行順（登録順を保ったトポロジカルソート）"""
+        ordered = []
+        visiting = set()
+
+        def visit(name):
+            if name in ordered:
+                return
+            if name in visiting:
+                raise ValueError(f"Circular dependency in startup stage: {name}")
+            visiting.add(name)
+            for dep in self._stages[name][1]:
+                if dep in self._stages:
+                    visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+
+        for name in self._stages:
+            visit(name)
+        return ordered
+
+    def run(self):
+        """全ステージを呼び出しスレッドで実行"""
+        start = time.perf_counter()
+        for name in self.order():
+            func = self._stages[name][0]
+            self.current = name
+            stage_start = time.perf_counter()
+            try:
+                self.results[name] = func(self.results)
+            except Exception as e:
+                print(f"[ERROR] Startup stage '{name}' failed: {e}")
+                self.errors[name] = e
+                self.results[name] = None
+            self.timings[name] = (time.perf_counter() - stage_start) * 1000.0
+            self._completed += 1
+        self.current = None
+        self.total_time = (time.perf_counter() - start) * 1000.0
+        self.done = True
+
+    def start(self):
+        """バックグラウンドスレッドで実行を開始"""
+        self._thread = threading.Thread(target=self.run, name='startup-loader', daemon=True)
+        self._thread.start()
+        return self._thread
+
+
+# --- ローディング画面 ---
+
+class LoadingScreen:
+    """進捗バーと現在のステージ名を表示する
+
+    バックグラウンドスレッドがフォントを読み込んでいる間に同時にフォント描画しないよう、
+    ラベルは開始前にメインスレッドでまとめてレンダリングしておく。
+    """
+
+    def __init__(self, loader, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.loader = loader
+        self.size = size
+        self._labels = {}
+        try:
+            font = pygame.font.Font(None, 28)
+            self._title = font.render("Loading...", True, WHITE)
+            for name in loader.order():
+                self._labels[name] = font.render(loader.label(name), True, (180, 180, 180))
+        except Exception:
+            self._title = None
+
+    def draw(self, surface):
+        surface.fill(BLACK)
+        width, height = self.size
+        bar_w = int(width * 0.5)
+        bar_h = 12
+        bar_x = (width - bar_w) // 2
+        bar_y = height // 2
+        if self._title is not None:
+            surface.blit(self._title, self._title.get_rect(center=(width // 2, bar_y - 40)))
+        pygame.draw.rect(surface, (80, 80, 80), (bar_x, bar_y, bar_w, bar_h), 1)
+        fill_w = int((bar_w - 4) * self.loader.progress)
+        if fill_w > 0:
+            pygame.draw.rect(surface, WHITE, (bar_x + 2, bar_y + 2, fill_w, bar_h - 4))
+        label = self._labels.get(self.loader.current)
+        if label is not None:
+            surface.blit(label, label.get_rect(center=(width // 2, bar_y + 36)))
+
+
+# --- ゲーム用の読み込みステージ ---
+
+def _load_enemy_data(results):
+    from core.enemy import Enemy
+    Enemy.load_enemy_stats()
+    Enemy.load_boss_stats()
+    return True
+
+
+def _load_spawn_rules(results):
+    from core.enemy_spawn_manager import EnemySpawnManager
+    return EnemySpawnManager()
+
+
+def _load_save(results):
+    from systems.save_system import SaveSystem
+    return SaveSystem()
+
+
+def _load_map(results):
+    from map import MapLoader
+    map_loader = MapLoader()
+    if USE_CSV_MAP:
+        # CSVマップファイルを読み込み（存在しない場合はサンプルを作成）
+        csv_path = CSV_MAP_FILE
+
+        # 通常のPython実行時のみサンプル作成（PyInstallerの場合はリソースから読む）
+        is_frozen = getattr(sys, 'frozen', False)
+        if not is_frozen and not os.path.exists(csv_path):
+            map_loader.create_sample_csv(csv_path)
+
+        success = map_loader.load_csv_map(csv_path)
+        if not success:
+            map_loader.generate_default_map()
+    else:
+        # デフォルトマップ（市松模様）を生成
+        map_loader.generate_default_map()
+    return map_loader
+
+
+def _load_fonts(results):
+    from systems import resources
+    return {size: resources.get_font(size) for size in STARTUP_FONT_SIZES}
+
+
+def _load_sounds(results):
+    from core.audio import audio
+    return {name: audio.load(name) for name in STARTUP_SOUND_NAMES}
+
+
+def _load_asset_pack(results):
+    from systems import asset_pack
+    return asset_pack.ensure_loaded()
+
+
+def _load_icons(results):
+    from systems import resources
+    return resources.preload_all(icon_size=16, font_sizes=())
+
+
+def _load_sprites(results):
+    """ボス画像と、序盤（STARTUP_RESIDENT_SECONDS 秒まで）に出現しうる敵の画像を読み込む"""
+    from core.enemy import Enemy
+    from effects.attack import Attack
+    from ui.box import ItemBox
+
+    loaded = 0
+    # ボス画像（スポーン時のIO/変換を避ける）
+    for boss_no, cfg in Enemy.get_all_boss_configs().items():
+        try:
+            if Enemy._load_enemy_image(cfg['type'], 1, cfg.get('image_file'), boss_no=boss_no):
+                loaded += 1
+        except Exception:
+            pass
+
+    # スポーンルールのうち、序盤に有効になりうるルールの敵
+    spawn_manager = results.get('spawn_rules')
+    if spawn_manager is not None:
+        enemy_nos = set()
+        for rule in spawn_manager.spawn_rules:
+            if rule['enabled'] and rule['start_time'] <= STARTUP_RESIDENT_SECONDS:
+                enemy_nos.update(rule['enemy_no_list'])
+        for enemy_no in sorted(enemy_nos):
+            try:
+                if Enemy._load_enemy_image(enemy_no, 0):
+                    loaded += 1
+            except Exception:
+                pass
+
+    # 武器画像とアイテムボックス
+    for weapon_type in ('axe', 'rotating_book'):
+        if Attack._load_weapon_image(weapon_type) is not None:
+            loaded += 1
+    for box_type in (1, 2, 3, 4):
+        if ItemBox._load_box_image(box_type) is not None:
+            loaded += 1
+    return loaded
+
+
+def create_game_loader():
+    """ゲーム起動に必要な読み込みステージを登録した StartupLoader を返す"""
+    loader = StartupLoader()
+    loader.add('enemy_data', _load_enemy_data, label="Enemy data")
+    loader.add('spawn_rules', _load_spawn_rules, deps=('enemy_data',), label="Spawn rules")
+    loader.add('save', _load_save, label="Save data")
+    loader.add('map', _load_map, label="Stage map")
+    loader.add('fonts', _load_fonts, label="Fonts")
+    loader.add('sounds', _load_sounds, label="Sounds")
+    loader.add('asset_pack', _load_asset_pack, label="Asset pack")
+    loader.add('icons', _load_icons, deps=('asset_pack',), label="Icons")
+    loader.add('sprites', _load_sprites, deps=('enemy_data', 'spawn_rules', 'asset_pack'), label="Sprites")
+    return loader
+
+
+__all__ = ['StartupLoader', 'LoadingScreen', 'create_game_loader']
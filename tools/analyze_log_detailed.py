@@ -1,10 +1,18 @@
 import pandas as pd
 import sys
 
+# ログのパス（省略時は CSV ログ）。フレームログ（*.vsfl）も指定できる
+log_path = sys.argv[1] if len(sys.argv) > 1 else 'logs/performance_log.csv'
+
 try:
-    df = pd.read_csv('logs/performance_log.csv')
-    # コメント行を除外
-    df = df[~df['timestamp'].str.startswith('#', na=False)]
+    if log_path.endswith('.vsfl'):
+        # フレームログは read_frame_log で読み込む（列名は CSV ログと同じ）
+        from read_frame_log import load_dataframe
+        df = load_dataframe(log_path)
+    else:
+        df = pd.read_csv(log_path)
+        # コメント行を除外
+        df = df[~df['timestamp'].str.startswith('#', na=False)]
     # 数値変換
     df['enemies_count'] = pd.to_numeric(df['enemies_count'], errors='coerce')
     df['fps'] = pd.to_numeric(df['fps'], errors='coerce')
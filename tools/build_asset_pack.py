@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+アセットパック生成ツール
+
+敵・ボス・武器・アイコン・ボックスの画像をゲーム内と同じ手順で加工し
+（スケール・反転・HSV調整・ボスのオーラ生成）、1 ファイルにまとめて書き出す。
+PNG や CSV、加工パラメータを変更したら再実行すること（古いパックは自動的に無視される）。
+
+使用方法:
+    python tools/build_asset_pack.py
+    python tools/build_asset_pack.py --output assets/asset_pack.bin
+"""
+
+import sys
+import os
+import time
+import argparse
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIR)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the pre-processed sprite asset pack")
+    parser.add_argument('--output', default=None, help="出力先（既定: constants.ASSET_PACK_FILE）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # ウィンドウは不要（convert_alpha 用に最小のダミー画面だけ作る）
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    os.chdir(ROOT_DIR)
+
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    from constants import ASSET_PACK_FILE
+    from systems import asset_pack
+
+    output = args.output or ASSET_PACK_FILE
+    start = time.perf_counter()
+    try:
+        count = asset_pack.build(output)
+    except Exception as e:
+        print(f"[ERROR] Failed to build asset pack: {e}")
+        return 1
+    finally:
+        pygame.quit()
+
+    elapsed = (time.perf_counter() - start) * 1000.0
+    size_kb = os.path.getsize(output) / 1024.0
+    print(f"[INFO] Asset pack written: {output} ({count} surfaces, {size_kb:.0f}KB, {elapsed:.0f}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ヘッドレス決定論シミュレーション実行ツール
+
+ウィンドウ・サウンドなしで本番のメインループを固定シード・固定ステップで回し、
+performance_stats の各バケットの p50/p95/p99 を出力する。
+
+使用方法:
+    python tools/headless_sim.py --seconds 120 --seed 1
+    python tools/headless_sim.py --seconds 60 --no-render --json logs/sim.json
+    python tools/headless_sim.py --seconds 10 --trace logs/sim_trace.json
+"""
+
+import sys
+import os
+import json
+import argparse
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIR)
+
+from systems.headless_sim import HeadlessSimulation, use_dummy_drivers
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless deterministic simulation runner")
+    parser.add_argument('--seconds', type=float, default=60.0, help="シミュレーションする秒数（ゲーム内時間）")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    parser.add_argument('--no-render', action='store_true', help="オフスクリーン描画を省略して更新処理のみ計測する")
+    parser.add_argument('--allow-death', action='store_true', help="プレイヤーの HP 維持を行わない")
+    parser.add_argument('--parallel', action='store_true', help="並列処理を有効のままにする（実行順が変わるため再現性は落ちる）")
+    parser.add_argument('--process-backend', action='store_true', help="エネミー移動のワーカープロセス（ENEMY_PROCESS_BACKEND）を有効にする")
+    parser.add_argument('--json', dest='json_path', default=None, help="結果を JSON で書き出すパス")
+    parser.add_argument('--trace', dest='trace_path', default=None, help="ゾーンプロファイラの Chrome トレースを書き出すパス")
+    return parser.parse_args(argv)
+
+
+def run(args):
+    use_dummy_drivers()
+    # 相対パスのアセット読み込みに合わせてルートで実行する
+    os.chdir(ROOT_DIR)
+
+    import main as game
+
+    # スレッド並列の敵更新は実行順が不定になるため、既定では逐次処理にする
+    if not args.parallel:
+        game.PARALLEL_PROCESSING_ENABLED = False
+        game.performance_stats['parallel_enabled'] = False
+    if args.process_backend:
+        game.ENEMY_PROCESS_BACKEND = True
+
+    sim = HeadlessSimulation(
+        seconds=args.seconds,
+        seed=args.seed,
+        render=not args.no_render,
+        keep_alive=not args.allow_death,
+    )
+    sim.install()
+    try:
+        game.main(sim=sim)
+    finally:
+        sim.uninstall()
+    return sim
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sim = run(args)
+    print(sim.format_report())
+
+    if args.trace_path:
+        from systems.profiler import profiler
+        profiler.export_chrome_trace(args.trace_path)
+
+    if args.json_path:
+        try:
+            with open(args.json_path, 'w', encoding='utf-8') as f:
+                json.dump(sim.summary(), f, indent=2, ensure_ascii=False)
+            print(f"[INFO] Simulation summary saved: {args.json_path}")
+        except Exception as e:
+            print(f"[WARNING] Failed to save simulation summary: {e}")
+
+    # 指定フレーム数に到達しなかった場合（メインループの例外など）は失敗扱い
+    return 0 if sim.finished else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
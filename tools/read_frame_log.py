@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+フレームログ（logs/frames_*.vsfl）の読み出しツール
+
+バイナリのフレームログをヘッダの列定義に従って読み、CSV への変換や
+pandas の DataFrame としての読み込みを行う。列名は performance_log.csv と揃えているため、
+analyze_log.py / analyze_log_detailed.py にそのまま渡せる。
+
+使用方法:
+    python tools/read_frame_log.py                       # 最新のフレームログの概要を表示
+    python tools/read_frame_log.py logs/frames_xxx.vsfl --csv logs/frames.csv
+    python tools/analyze_log.py logs/frames_xxx.vsfl
+"""
+
+import os
+import sys
+import csv
+import glob
+import json
+import struct
+import argparse
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIR)
+
+from utils.file_paths import get_log_file_path
+
+FRAME_LOG_MAGIC = b'VSFL'
+FRAME_LOG_PATTERN = 'frames_*.vsfl'
+
+
+def find_latest_log(log_dir=None):
+    """最も新しいフレームログのパスを返す（無ければ None）"""
+    if log_dir:
+        directories = [log_dir]
+    else:
+        directories = [os.path.dirname(get_log_file_path(FRAME_LOG_PATTERN)), os.path.join(ROOT_DIR, 'logs')]
+    candidates = []
+    for directory in set(os.path.abspath(d) for d in directories):
+        candidates.extend(glob.glob(os.path.join(directory, FRAME_LOG_PATTERN)))
+    if not candidates:
+        return None
+    return max(candidates, key=os.path.getmtime)
+
+
+def read_frame_log(path):
+    """(header, rows) を返す。rows は列名→値の辞書のリスト
+
+    書き込み途中で終了したファイルの末尾の半端なレコードは無視する。
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != FRAME_LOG_MAGIC:
+        raise ValueError(f"not a frame log: {path}")
+    (header_len,) = struct.unpack_from('<I', data, 4)
+    header = json.loads(data[8:8 + header_len].decode('utf-8'))
+    record = struct.Struct(header['format'])
+    fields = header['fields']
+    body = memoryview(data)[8 + header_len:]
+    usable = len(body) - len(body) % record.size
+    rows = [dict(zip(fields, values)) for values in record.iter_unpack(body[:usable])]
+    return header, rows
+
+
+def add_derived_columns(rows):
+    """CSV ログにある集計列（total_processing_ms）を補う"""
+    for row in rows:
+        row['total_processing_ms'] = (row.get('particle_update_ms', 0.0) + row.get('enemy_update_ms', 0.0) +
+                                      row.get('collision_check_ms', 0.0) + row.get('render_time_ms', 0.0))
+    return rows
+
+
+def load_dataframe(path):
+    """フレームログを pandas.DataFrame として読み込む"""
+    import pandas as pd
+    header, rows = read_frame_log(path)
+    return pd.DataFrame(add_derived_columns(rows), columns=header['fields'] + ['total_processing_ms'])
+
+
+def write_csv(path, out_path):
+    """フレームログを CSV に変換し、書き出した行数を返す"""
+    header, rows = read_frame_log(path)
+    rows = add_derived_columns(rows)
+    columns = header['fields'] + ['total_processing_ms']
+    with open(out_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()})
+    return len(rows)
+
+
+def format_summary(header, rows):
+    """フレーム時間の分布とスパイクの概要"""
+    lines = [f"session: {header.get('session_start', '?')}  frames: {len(rows)}"]
+    if not rows:
+        return '\n'.join(lines)
+    frame_times = sorted(row['frame_time_ms'] for row in rows)
+    deltas = sorted(row['delta_ms'] for row in rows)
+
+    def pct(values, p):
+        return values[min(len(values) - 1, int(len(values) * p / 100.0))]
+
+    lines.append("frame_time_ms  p50 {:.2f}  p95 {:.2f}  p99 {:.2f}  max {:.2f}".format(
+        pct(frame_times, 50), pct(frame_times, 95), pct(frame_times, 99), frame_times[-1]))
+    lines.append("delta_ms       p50 {:.2f}  p95 {:.2f}  p99 {:.2f}  max {:.2f}".format(
+        pct(deltas, 50), pct(deltas, 95), pct(deltas, 99), deltas[-1]))
+    # 目標フレーム時間の 2 倍を超えたフレームをスパイクとして列挙
+    spikes = [row for row in rows if row['delta_ms'] > 2 * (1000.0 / 60.0)]
+    lines.append(f"spikes (> 33.3ms): {len(spikes)}")
+    for row in sorted(spikes, key=lambda r: r['delta_ms'], reverse=True)[:10]:
+        lines.append("  frame {frame:>7}  t={game_time:7.2f}s  delta {delta_ms:6.1f}ms  frame {frame_time_ms:6.1f}ms  "
+                     "enemy {enemy_update_ms:5.1f}  render {render_time_ms:5.1f}  enemies {enemies_count}".format(**row))
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Frame log reader")
+    parser.add_argument('path', nargs='?', default=None, help="フレームログのパス（省略時は最新のログ）")
+    parser.add_argument('--csv', dest='csv_path', default=None, help="CSV に変換して書き出すパス")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    path = args.path or find_latest_log()
+    if not path:
+        print("[ERROR] No frame log found")
+        return 1
+    try:
+        header, rows = read_frame_log(path)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Failed to read frame log: {e}")
+        return 1
+
+    print(f"[INFO] {path}")
+    print(format_summary(header, rows))
+    if args.csv_path:
+        count = write_csv(path, args.csv_path)
+        print(f"[INFO] Wrote {count} rows to {args.csv_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ import os
 import sys
 from constants import *
 from effects.items import GameItem, MoneyItem, ExperienceGem
+from systems import asset_pack
+from systems import game_clock
 
 def resource_path(relative_path):
     """PyInstallerで実行時にリソースファイルの正しいパスを取得する"""
@@ -75,12 +77,34 @@ class ItemBox:
     
     # 画像キャッシュ（クラス変数）
     _image_cache = {}
+    # ヒットフラッシュ済み画像のキャッシュ: (image, flash_level) -> surface
+    _flash_cache = {}
     
+    @classmethod
+    def _get_flash_frame(cls, image, flash_level):
+        """ヒットフラッシュ済みの画像を取得（画像・段階ごとに初回のみ構築）"""
+        key = (image, flash_level)
+        frame = cls._flash_cache.get(key)
+        if frame is None:
+            alpha = int(100 * flash_level / ENEMY_FLASH_LEVELS)
+            frame = image.copy()
+            white_overlay = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            white_overlay.fill((255, 255, 255, alpha))
+            frame.blit(white_overlay, (0, 0), special_flags=pygame.BLEND_ADD)
+            cls._flash_cache[key] = frame
+        return frame
+
     @classmethod
     def _load_box_image(cls, box_type):
         """ボックス画像を読み込む（キャッシュ機能付き）"""
         if box_type in cls._image_cache:
             return cls._image_cache[box_type]
+
+        # アセットパックにあればそれを使う（BOX_SIZE にスケール済み）
+        packed = asset_pack.get_surface(f"box/{box_type}")
+        if packed is not None:
+            cls._image_cache[box_type] = packed
+            return packed
         
         # 画像ファイルパスを構築
         image_path = get_resource_path(os.path.join("assets", "icons", f"box{box_type}.png"))
@@ -165,7 +189,7 @@ class ItemBox:
         self.animation_time = random.uniform(0, 2 * math.pi)  # アニメーションタイムをランダム初期化
         
         # 落下アニメーション用
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
         self.drop_height = 80  # 落下開始高さ
         self.drop_duration = 300  # 落下時間（ミリ秒）
         self.bounce_height = 8   # バウンス高さ
@@ -225,21 +249,11 @@ class ItemBox:
     
     def _is_position_blocked_internal(self, x, y, stage_map):
         """指定座標が障害物でブロックされているかチェック（内部用）"""
-        # ボックスの四隅をチェック
-        corners = [
-            (x - self.size//2, y - self.size//2),
-            (x + self.size//2, y - self.size//2),
-            (x - self.size//2, y + self.size//2),
-            (x + self.size//2, y + self.size//2),
-        ]
-        
-        for corner_x, corner_y in corners:
-            if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                return True
-        return False
+        # ボックスの矩形を障害物マスクで判定
+        return stage_map.is_entity_blocked(x, y, self.size)
         
         # 落下アニメーション用
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
         self.drop_height = 80  # 落下開始高さ
         self.drop_duration = 300  # 落下時間（ミリ秒）- 600から300に変更（2倍速）
         self.bounce_height = 8   # バウンス高さ
@@ -389,7 +403,7 @@ class ItemBox:
         if self.destroyed:
             return
         
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         elapsed_time = current_time - self.spawn_time
         
         # 落下アニメーション処理
@@ -470,18 +484,12 @@ class ItemBox:
         if self.image:
             current_image = self.image
             
-            # ヒット時のフラッシュ効果
+            # ヒット時のフラッシュ効果（強度を段階化して構築済みフレームを使う）
             if self.hit_flash_timer > 0:
-                # フラッシュ強度を計算
                 flash_strength = self.hit_flash_timer / self.hit_flash_duration
-                alpha = int(100 * flash_strength)
-                
-                # 白いオーバーレイを作成
-                flash_surface = current_image.copy()
-                white_overlay = pygame.Surface((BOX_SIZE, BOX_SIZE), pygame.SRCALPHA)
-                white_overlay.fill((255, 255, 255, alpha))
-                flash_surface.blit(white_overlay, (0, 0), special_flags=pygame.BLEND_ADD)
-                current_image = flash_surface
+                flash_level = int(round(max(0.0, min(1.0, flash_strength)) * ENEMY_FLASH_LEVELS))
+                if flash_level > 0:
+                    current_image = ItemBox._get_flash_frame(current_image, flash_level)
             
             screen.blit(current_image, (screen_x, screen_y))
             
@@ -677,19 +685,8 @@ class BoxManager:
             from ui.stage import get_stage_map
             stage_map = get_stage_map()
             
-            # ボックスサイズの半分だけ余裕を持たせてチェック
-            box_size = BOX_COLLISION_SIZE
-            corners = [
-                (x - box_size//2, y - box_size//2),
-                (x + box_size//2, y - box_size//2),
-                (x - box_size//2, y + box_size//2),
-                (x + box_size//2, y + box_size//2),
-            ]
-            
-            for corner_x, corner_y in corners:
-                if stage_map.is_obstacle_at_world_pos(corner_x, corner_y):
-                    return True
-            return False
+            # ボックスサイズの矩形が障害物に重なるかチェック
+            return stage_map.is_entity_blocked(x, y, BOX_COLLISION_SIZE)
             
         except Exception:
             # エラーが発生した場合は障害物なしと判定
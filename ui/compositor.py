@@ -0,0 +1,141 @@
+"""
+レイヤー合成による描画パス
+仮想画面（合成先）と背景・HUD のレイヤーサーフェスをフレーム間で使い回す。
+
+- 背景レイヤー: マップ/市松模様。カメラが動いたときだけ更新し、移動量ぶん scroll() して
+  新しく見えた帯だけを描き直す
+- エンティティ: 合成先に背景をコピーした上へ直接描画する（毎フレームの world_surf 生成・塗りつぶしは不要）
+- オーバーレイ: 全画面フラッシュなどは合成先にそのまま描画する
+- HUD レイヤー: 入力（HP・経験値・武器レベルなど）のキーが変わったときだけ描き直し、
+  内容のある範囲だけを合成先にブリットする
+"""
+
+import pygame
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+
+class LayerCompositor:
+    """永続レイヤーサーフェスを使った仮想画面の合成"""
+
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.size = (int(size[0]), int(size[1]))
+        self.target = self._create_surface()
+        self.background = self._create_surface()
+        self.hud = self._create_surface(pygame.SRCALPHA)
+
+        # 背景レイヤーの現在の描画元とカメラ位置
+        self._bg_draw = None
+        self._bg_pos = None
+        # HUD レイヤーの入力キーと内容のある範囲
+        self._hud_key = None
+        self._hud_rect = None
+
+        # 統計（デバッグ表示用）
+        self.background_redraws = 0
+        self.hud_redraws = 0
+
+    def _create_surface(self, flags=0):
+        surface = pygame.Surface(self.size, flags)
+        try:
+            surface = surface.convert_alpha() if flags & pygame.SRCALPHA else surface.convert()
+        except pygame.error:
+            pass
+        return surface
+
+    def invalidate(self):
+        """全レイヤーを次のフレームで描き直す（リスタート時など）"""
+        self._bg_draw = None
+        self._bg_pos = None
+        self._hud_key = None
+
+    # --- 背景 ---
+
+    def _update_background(self, draw_fn, camera_x, camera_y):
+        width, height = self.size
+        pos = (camera_x, camera_y)
+        if draw_fn == self._bg_draw and pos == self._bg_pos:
+            return
+
+        dirty = [pygame.Rect(0, 0, width, height)]
+        if draw_fn == self._bg_draw and self._bg_pos is not None:
+            dx = camera_x - self._bg_pos[0]
+            dy = camera_y - self._bg_pos[1]
+            if abs(dx) < width and abs(dy) < height:
+                # 残る部分はずらして再利用し、新しく見えた帯だけ描く
+                self.background.scroll(-dx, -dy)
+                dirty = []
+                if dx > 0:
+                    dirty.append(pygame.Rect(width - dx, 0, dx, height))
+                elif dx < 0:
+                    dirty.append(pygame.Rect(0, 0, -dx, height))
+                if dy > 0:
+                    dirty.append(pygame.Rect(0, height - dy, width, dy))
+                elif dy < 0:
+                    dirty.append(pygame.Rect(0, 0, width, -dy))
+
+        for rect in dirty:
+            self.background.set_clip(rect)
+            self.background.fill((0, 0, 0), rect)
+            draw_fn(self.background, camera_x, camera_y)
+        self.background.set_clip(None)
+
+        self._bg_draw = draw_fn
+        self._bg_pos = pos
+        self.background_redraws += 1
+
+    def begin_frame(self, background_draw, camera_x, camera_y):
+        """背景を合成先にコピーし、エンティティを描く合成先サーフェスを返す
+
+        background_draw(surface, camera_x, camera_y) はワールド座標に固定された背景を描く関数。
+        """
+        self._update_background(background_draw, int(camera_x), int(camera_y))
+        self.target.blit(self.background, (0, 0))
+        return self.target
+
+    # --- HUD ---
+
+    def draw_hud(self, key, draw_fn):
+        """HUD を合成する。key が前回と同じなら描き直さずにレイヤーを再利用する
+
+        draw_fn(surface) は透明な HUD レイヤーに描画する関数。
+        """
+        if key is None or key != self._hud_key:
+            self.hud.fill((0, 0, 0, 0))
+            draw_fn(self.hud)
+            self._hud_rect = self.hud.get_bounding_rect()
+            self._hud_key = key
+            self.hud_redraws += 1
+        rect = self._hud_rect
+        if rect is not None and rect.width and rect.height:
+            self.target.blit(self.hud, rect.topleft, rect)
+
+    # --- ウィンドウへの転送 ---
+
+    def present(self, screen, scale_factor=1.0, offset=(0, 0), scaled_surface=None):
+        """合成先をウィンドウに転送する。塗りつぶすのはレターボックス部分だけ
+
+        スケールする場合は scaled_surface（スケール後サイズのキャッシュ）を渡す。
+        """
+        offset_x, offset_y = int(offset[0]), int(offset[1])
+        if scale_factor != 1.0 and scaled_surface is not None:
+            pygame.transform.scale(self.target, scaled_surface.get_size(), scaled_surface)
+            source = scaled_surface
+        else:
+            source = self.target
+        area = source.get_rect(topleft=(offset_x, offset_y))
+
+        # 画面外の帯（レターボックス）を黒で塗る
+        screen_rect = screen.get_rect()
+        if not area.contains(screen_rect):
+            if area.top > 0:
+                screen.fill((0, 0, 0), (0, 0, screen_rect.width, area.top))
+            if area.bottom < screen_rect.height:
+                screen.fill((0, 0, 0), (0, area.bottom, screen_rect.width, screen_rect.height - area.bottom))
+            if area.left > 0:
+                screen.fill((0, 0, 0), (0, area.top, area.left, area.height))
+            if area.right < screen_rect.width:
+                screen.fill((0, 0, 0), (area.right, area.top, screen_rect.width - area.right, area.height))
+        screen.blit(source, area.topleft)
+
+
+__all__ = ['LayerCompositor']
@@ -0,0 +1,198 @@
+"""
+ミニマップの描画
+敵・ジェム・アイテムの位置を小さなピクセルバッファにまとめて書き込み（NumPy の scatter）、
+キャッシュした背景（パネル・マップ本体・凡例）の上に合成する。
+
+点のレイヤーは MINIMAP_REFRESH_HZ の頻度でだけ作り直すため、エンティティ数が増えても
+毎フレームのコストは一定（背景とレイヤーのブリット数回）。
+ボス・プレイヤー・カメラ範囲は毎フレーム最新の位置で描く。
+"""
+
+import pygame
+from constants import *
+from systems.resources import get_font
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+
+# ミニマップの最大サイズと画面端からの余白
+MINIMAP_MAX_WIDTH = 220
+MINIMAP_MAX_HEIGHT = 140
+MINIMAP_MARGIN = 10
+
+# 点の色とサイズ（ピクセル）
+ENEMY_DOT_COLOR = (200, 60, 60)
+ENEMY_DOT_SIZE = 3
+GEM_DOT_SIZE = 3
+ITEM_DOT_SIZE = 3
+BOSS_DOT_SIZE = 4
+# 端の点がマップ枠の外へはみ出す分（点レイヤーはこの分だけ大きく取る）
+# map_w/map_h は切り捨てなので、ワールド端の点は 1px 外から始まることがある
+DOT_OVERHANG = max(ENEMY_DOT_SIZE, GEM_DOT_SIZE, ITEM_DOT_SIZE)
+
+
+class MinimapRenderer:
+    """右上のミニマップ。draw() を毎フレーム呼ぶ"""
+
+    def __init__(self, refresh_hz=MINIMAP_REFRESH_HZ):
+        self.scale = min(MINIMAP_MAX_WIDTH / float(max(1, WORLD_WIDTH)),
+                         MINIMAP_MAX_HEIGHT / float(max(1, WORLD_HEIGHT)))
+        self.map_w = int(WORLD_WIDTH * self.scale)
+        self.map_h = int(WORLD_HEIGHT * self.scale)
+        # 右上に配置
+        self.map_x = SCREEN_WIDTH - self.map_w - MINIMAP_MARGIN
+        self.map_y = MINIMAP_MARGIN
+        self.refresh_interval = 1000.0 / max(1.0, float(refresh_hz))
+
+        self._panel = None
+        self._background = None
+        self._legend = []
+        self._dots = None
+        # 点レイヤー用のピクセルバッファ（高さ x 幅 x RGBA）
+        self._dots_size = (self.map_w + DOT_OVERHANG, self.map_h + DOT_OVERHANG)
+        self._buffer = np.zeros((self._dots_size[1], self._dots_size[0], 4), dtype=np.uint8) if NUMPY_AVAILABLE else None
+        self._last_refresh = None
+        self._camera_fill = {}
+
+    def set_refresh_hz(self, refresh_hz):
+        """点レイヤーの更新頻度を変える（品質ガバナーから毎フレーム渡される）"""
+        self.refresh_interval = 1000.0 / max(1.0, float(refresh_hz))
+
+    def invalidate(self):
+        """次の draw() で点レイヤーを作り直す"""
+        self._last_refresh = None
+
+    # --- 背景（パネル・マップ本体・凡例） ---
+
+    def _build_background(self):
+        from ui.ui import get_panel_surf, get_minimap_surf
+
+        # パネルとマップ本体は共有キャッシュのサーフェス、凡例はここで一度だけレンダリング
+        self._panel = get_panel_surf(self.map_w + 6, self.map_h + 6, radius=0, alpha=180)
+        self._background = get_minimap_surf(self.map_w, self.map_h, alpha=128)
+        font = get_font(14)
+        legend_y = self.map_y + self.map_h + 6
+        self._legend = [
+            (font.render('P: Player', True, WHITE), (self.map_x, legend_y)),
+            (font.render('E: Enemy', True, ENEMY_DOT_COLOR), (self.map_x + 80, legend_y)),
+        ]
+
+    # --- 点レイヤー ---
+
+    def _to_map(self, entities):
+        """エンティティのワールド座標をミニマップのピクセル座標配列にする"""
+        count = len(entities)
+        xs = np.fromiter((e.x for e in entities), dtype='f8', count=count)
+        ys = np.fromiter((e.y for e in entities), dtype='f8', count=count)
+        return (xs * self.scale).astype(np.int64), (ys * self.scale).astype(np.int64)
+
+    def _scatter(self, mx, my, size, color):
+        """左上 (mx, my) の size x size の正方形をまとめてバッファに書き込む"""
+        buf = self._buffer
+        height, width = buf.shape[:2]
+        offsets = np.arange(size)
+        shape = (len(mx), size, size)
+        px = np.broadcast_to(mx[:, None, None] + offsets[None, None, :], shape).ravel()
+        py = np.broadcast_to(my[:, None, None] + offsets[None, :, None], shape).ravel()
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        buf[py[inside], px[inside]] = (color[0], color[1], color[2], 255)
+
+    def _refresh_dots(self, enemies, gems, items):
+        normal = [e for e in enemies if not getattr(e, 'is_boss', False)]
+        if self._buffer is not None:
+            try:
+                self._buffer.fill(0)
+                # 描画順は 敵 → ジェム → アイテム（後に書いたものが上）
+                for entities, size, color in ((normal, ENEMY_DOT_SIZE, ENEMY_DOT_COLOR),
+                                              (gems, GEM_DOT_SIZE, CYAN),
+                                              (items, ITEM_DOT_SIZE, YELLOW)):
+                    if entities:
+                        mx, my = self._to_map(entities)
+                        self._scatter(mx, my, size, color)
+                dots = pygame.image.frombuffer(self._buffer, self._dots_size, 'RGBA')
+                # 画面と同じピクセル形式に変換しておく（未変換のままだと毎フレームのブリットが遅い）
+                try:
+                    dots = dots.convert_alpha()
+                except pygame.error:
+                    dots = dots.copy()
+                self._dots = dots
+                return
+            except Exception:
+                pass
+
+        # numpy が無い場合は小さなレイヤーに直接描く（更新頻度は同じ）
+        dots = pygame.Surface(self._dots_size, pygame.SRCALPHA)
+        scale = self.scale
+        for entities, size, color in ((normal, ENEMY_DOT_SIZE, ENEMY_DOT_COLOR),
+                                      (gems, GEM_DOT_SIZE, CYAN),
+                                      (items, ITEM_DOT_SIZE, YELLOW)):
+            for e in entities:
+                try:
+                    pygame.draw.rect(dots, color, (int(e.x * scale), int(e.y * scale), size, size))
+                except Exception:
+                    pass
+        try:
+            dots = dots.convert_alpha()
+        except pygame.error:
+            pass
+        self._dots = dots
+
+    def _get_camera_fill(self, size):
+        surf = self._camera_fill.get(size)
+        if surf is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill((255, 255, 255, 32))
+            self._camera_fill[size] = surf
+        return surf
+
+    # --- 描画 ---
+
+    def draw(self, screen, player, enemies, gems, items, camera_x=0, camera_y=0, now=None):
+        if self.map_w <= 0 or self.map_h <= 0:
+            return
+        if self._background is None:
+            self._build_background()
+        if now is None:
+            now = pygame.time.get_ticks()
+        if self._last_refresh is None or now - self._last_refresh >= self.refresh_interval or now < self._last_refresh:
+            self._refresh_dots(enemies, gems, items)
+            self._last_refresh = now
+
+        map_x, map_y, scale = self.map_x, self.map_y, self.scale
+        screen.blit(self._panel, (map_x - 3, map_y - 3))
+        screen.blit(self._background, (map_x, map_y))
+        pygame.draw.rect(screen, WHITE, (map_x, map_y, self.map_w, self.map_h), 2)
+        if self._dots is not None:
+            screen.blit(self._dots, (map_x, map_y))
+
+        # ボスは毎フレーム最新の位置で描く（大きめ&ピンク）
+        for e in enemies:
+            if getattr(e, 'is_boss', False):
+                try:
+                    pygame.draw.rect(screen, PINK, (map_x + int(e.x * scale), map_y + int(e.y * scale),
+                                                    BOSS_DOT_SIZE, BOSS_DOT_SIZE))
+                except Exception:
+                    pass
+
+        # プレイヤー（緑）を大きめの円で描画
+        try:
+            px = map_x + int(player.x * scale)
+            py = map_y + int(player.y * scale)
+            pygame.draw.circle(screen, GREEN, (px, py), 5)
+            pygame.draw.circle(screen, BLACK, (px, py), 6, 1)
+        except Exception:
+            pass
+
+        # カメラの表示領域を矩形で描画（白の半透明枠）
+        try:
+            cam_rect = pygame.Rect(map_x + int(camera_x * scale), map_y + int(camera_y * scale),
+                                   max(1, int(SCREEN_WIDTH * scale)), max(1, int(SCREEN_HEIGHT * scale)))
+            screen.blit(self._get_camera_fill(cam_rect.size), cam_rect.topleft)
+            pygame.draw.rect(screen, WHITE, cam_rect, 1)
+        except Exception:
+            pass
+
+        # 凡例
+        for text, pos in self._legend:
+            screen.blit(text, pos)
+
+
+__all__ = ['MinimapRenderer']
@@ -6,6 +6,19 @@ CSVマップによる障害物と背景を管理
 import pygame
 import math
 from constants import *
+from utils.optional_numpy import np, NUMPY_AVAILABLE
+
+# 障害物マスクの種類とタイル番号
+# obstacle: 移動を妨げるタイル 5(森), 7(水), 8(危険地帯), 9(石/岩)
+# solid: 武器をブロックするタイル
+# passthrough: 武器が貫通できるブロッカー
+# boss_bullet: ボスの弾を止めるタイル
+OBSTACLE_MASK_TILES = {
+    'obstacle': frozenset({5, 7, 8, 9}),
+    'solid': frozenset(BLOCKER_AREAS_SOLID),
+    'passthrough': frozenset(BLOCKER_AREAS_PASSTHROUGH),
+    'boss_bullet': frozenset({5, 9}),
+}
 
 class StageMap:
     """CSVマップベースのステージマップ管理クラス"""
@@ -15,6 +28,12 @@ class StageMap:
         self._csv_map_cache = None
         self._csv_map_loaded = False
         
+        # 障害物マスク（行ごとのビット列: bit x が立っていればタイル x がブロッカー）
+        self._mask_rows = {}
+        # 一括判定用の2次元ブール配列（numpy がある場合のみ）
+        self._mask_grids = {}
+        self._tile_size = TEST_TILE_SIZE
+        
         # CSVマップを読み込み
         self._load_csv_map_cache()
     
@@ -35,6 +54,95 @@ class StageMap:
             self._csv_map_cache.generate_default_map()
             
         self._csv_map_loaded = True
+        self.rebuild_obstacle_masks()
+    
+    def rebuild_obstacle_masks(self):
+        """マップデータから障害物マスクを作り直す（マップ読み込み時に一度だけ実行）"""
+        self._mask_rows = {}
+        self._mask_grids = {}
+        map_data = self._csv_map_cache.map_data if self._csv_map_cache else []
+        self._tile_size = self._csv_map_cache.tile_size if self._csv_map_cache else TEST_TILE_SIZE
+        
+        for name, tiles in OBSTACLE_MASK_TILES.items():
+            rows = []
+            for row in map_data:
+                bits = 0
+                for tile_x, tile_id in enumerate(row):
+                    if tile_id in tiles:
+                        bits |= 1 << tile_x
+                rows.append(bits)
+            self._mask_rows[name] = rows
+            
+            if NUMPY_AVAILABLE and map_data:
+                width = max(len(row) for row in map_data)
+                grid = np.zeros((len(map_data), width), dtype=bool)
+                for tile_y, row in enumerate(map_data):
+                    for tile_x, tile_id in enumerate(row):
+                        if tile_id in tiles:
+                            grid[tile_y, tile_x] = True
+                self._mask_grids[name] = grid
+    
+    def get_mask_rows(self, mask='obstacle'):
+        """障害物マスクの行ビット列・タイルサイズ・マップ幅（タイル数）を返す（経路探索用）"""
+        width = self._csv_map_cache.map_width if self._csv_map_cache else 0
+        return list(self._mask_rows.get(mask, [])), self._tile_size, width
+    
+    def is_blocked_at(self, world_x, world_y, mask='obstacle'):
+        """1点が指定マスクのブロッカー上にあるか（マップ外はブロックなし）"""
+        rows = self._mask_rows.get(mask)
+        if not rows:
+            return False
+        tile_x = int(world_x // self._tile_size)
+        tile_y = int(world_y // self._tile_size)
+        if 0 <= tile_y < len(rows) and tile_x >= 0:
+            return (rows[tile_y] >> tile_x) & 1 == 1
+        return False
+    
+    def is_area_blocked(self, left, top, right, bottom, mask='obstacle'):
+        """AABB（境界を含む）がブロッカータイルに1枚でも重なるか
+        
+        エンティティの四隅判定と同じタイル範囲を、辺の途中も含めて一度に調べる。
+        """
+        rows = self._mask_rows.get(mask)
+        if not rows:
+            return False
+        ts = self._tile_size
+        tile_x0 = max(0, int(left // ts))
+        tile_x1 = int(right // ts)
+        tile_y0 = max(0, int(top // ts))
+        tile_y1 = min(len(rows) - 1, int(bottom // ts))
+        if tile_x1 < tile_x0 or tile_y1 < tile_y0:
+            return False
+        span = ((1 << (tile_x1 - tile_x0 + 1)) - 1) << tile_x0
+        for tile_y in range(tile_y0, tile_y1 + 1):
+            if rows[tile_y] & span:
+                return True
+        return False
+    
+    def is_entity_blocked(self, center_x, center_y, size, mask='obstacle'):
+        """中心座標とサイズで表されるエンティティが障害物に重なるか"""
+        try:
+            half = size // 2
+            return self.is_area_blocked(center_x - half, center_y - half,
+                                        center_x + half, center_y + half, mask)
+        except Exception:
+            # 座標が不正な場合は安全のために障害物として扱う
+            return True
+    
+    def are_points_blocked(self, xs, ys, mask='obstacle'):
+        """N点をまとめて判定し、ブール値の配列（numpy が無い場合はリスト）を返す"""
+        grid = self._mask_grids.get(mask)
+        if grid is not None:
+            xs = np.asarray(xs, dtype='f8')
+            ys = np.asarray(ys, dtype='f8')
+            tile_x = np.floor_divide(xs, self._tile_size).astype(np.int64)
+            tile_y = np.floor_divide(ys, self._tile_size).astype(np.int64)
+            height, width = grid.shape
+            inside = (tile_x >= 0) & (tile_x < width) & (tile_y >= 0) & (tile_y < height)
+            result = np.zeros(xs.shape, dtype=bool)
+            result[inside] = grid[tile_y[inside], tile_x[inside]]
+            return result
+        return [self.is_blocked_at(x, y, mask) for x, y in zip(xs, ys)]
     
     def get_tile_at_world_pos(self, world_x, world_y):
         """ワールド座標からタイル種類を取得"""
@@ -60,18 +168,12 @@ class StageMap:
         if weapon_name not in WEAPONS_AFFECTED_BY_BLOCKERS:
             return False
         
-        tile_id = self.get_tile_at_world_pos(world_x, world_y)
-        
         # エリア5,9: ソリッドブロッカー（武器をブロック）
-        if tile_id in BLOCKER_AREAS_SOLID:
-            return True
-            
-        # エリア6,7: パススルーブロッカー（武器は貫通可能）
-        if tile_id in BLOCKER_AREAS_PASSTHROUGH:
+        # エリア6,7: パススルーブロッカー（武器は貫通可能）、その他のタイルもブロックされない
+        try:
+            return self.is_blocked_at(world_x, world_y, 'solid')
+        except Exception:
             return False
-        
-        # その他のタイル（通常エリア）: ブロックされない
-        return False
     
     def get_weapon_collision_line(self, start_x, start_y, end_x, end_y, weapon_name, step_size=8):
         """武器の軌道上で最初にブロックされる座標を取得
@@ -114,17 +216,13 @@ class StageMap:
         return None  # 衝突なし
     
     def is_obstacle_at_world_pos(self, world_x, world_y):
-        """ワールド座標が障害物かどうかチェック（軽量化版）"""
-        self._load_csv_map_cache()
-        if self._csv_map_cache:
-            try:
-                tile_id = self._csv_map_cache.get_tile_at(world_x, world_y)
-                # ブロッカータイル: 5(森), 7(水), 8(危険地帯), 9(石/岩)
-                return tile_id in [5, 7, 8, 9]
-            except Exception:
-                # エラー時は安全のために障害物として扱う（デバッグログは除去）
-                return True
-        return False
+        """ワールド座標が障害物かどうかチェック（事前計算マスク版）"""
+        try:
+            # ブロッカータイル: 5(森), 7(水), 8(危険地帯), 9(石/岩)
+            return self.is_blocked_at(world_x, world_y, 'obstacle')
+        except Exception:
+            # エラー時は安全のために障害物として扱う（デバッグログは除去）
+            return True
     
     def find_safe_spawn_position(self, preferred_x, preferred_y, entity_size):
         """障害物のない安全な開始位置を見つける（軽量化版）"""
@@ -163,19 +261,8 @@ class StageMap:
     
     def is_position_safe(self, world_x, world_y, entity_size):
         """指定位置がエンティティにとって安全かチェック（障害物と重ならない）"""
-        # エンティティの四隅をチェック
-        half_size = entity_size // 2
-        corners = [
-            (world_x - half_size, world_y - half_size),
-            (world_x + half_size, world_y - half_size),
-            (world_x - half_size, world_y + half_size),
-            (world_x + half_size, world_y + half_size),
-        ]
-        
-        for corner_x, corner_y in corners:
-            if self.is_obstacle_at_world_pos(corner_x, corner_y):
-                return False
-        return True
+        # エンティティの矩形が障害物に重ならないかチェック
+        return not self.is_entity_blocked(world_x, world_y, entity_size)
     
     def draw(self, screen, camera_x, camera_y):
         """ステージを描画"""
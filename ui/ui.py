@@ -3,7 +3,7 @@ import sys
 from constants import *
 import json
 import os
-from systems.resources import get_font
+from systems.resources import get_font, render_text
 from core.audio import audio
 from utils.file_paths import get_resource_path
 
@@ -140,7 +140,7 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
     hp_ratio = max(0.0, min(1.0, float(getattr(player, 'hp', 0)) / float(max_hp)))
     pygame.draw.rect(screen, RED, (bar_x, bar_y, int(meter_w * hp_ratio), meter_h), border_radius=6)
     # HPテキスト
-    hp_text = font.render(f"HP {int(getattr(player,'hp',0))}/{max_hp}", True, WHITE)
+    hp_text = render_text(font, f"HP {int(getattr(player,'hp',0))}/{max_hp}", WHITE)
     hp_rect = hp_text.get_rect(midleft=(bar_x + 8, bar_y + meter_h // 2))
     screen.blit(hp_text, hp_rect.topleft)
 
@@ -150,13 +150,13 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
     exp_to = max(1, getattr(player, 'exp_to_next_level', 1))
     exp_ratio = max(0.0, min(1.0, getattr(player, 'exp', 0) / exp_to))
     pygame.draw.rect(screen, (40, 200, 250), (bar_x, exp_y, int(meter_w * exp_ratio), meter_h), border_radius=6)
-    exp_text = font.render(f"LV{getattr(player,'level',1)} EXP {getattr(player,'exp',0)}/{exp_to}", True, WHITE)
+    exp_text = render_text(font, f"LV{getattr(player,'level',1)} EXP {getattr(player,'exp',0)}/{exp_to}", WHITE)
     exp_rect = exp_text.get_rect(midleft=(bar_x + 8, exp_y + meter_h // 2))
     screen.blit(exp_text, exp_rect.topleft)
 
     # 獲得金額をHPパネルの右側に表示（パネルの外側）
     panel_right = 8 + panel_w  # パネルの右端
-    money_text = font.render(f"Money: {game_money}G", True, YELLOW)
+    money_text = render_text(font, f"Money: {game_money}G", YELLOW)
     money_x = panel_right + 20  # パネルから20px右
     money_y = 8 + pad + meter_h // 2  # HPバーと同じ高さ
     money_rect = money_text.get_rect(midleft=(money_x, money_y))
@@ -312,8 +312,8 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
     # 残り時間の表示
     if not game_over and not game_clear:
         remaining_time = SURVIVAL_TIME - game_time
-        remaining_text = font.render(f"Remaining: {int(remaining_time)}s", True, 
-                                   YELLOW if remaining_time <= 30 else WHITE)
+        remaining_text = render_text(font, f"Remaining: {int(remaining_time)}s",
+                                     YELLOW if remaining_time <= 30 else WHITE)
         screen.blit(remaining_text, (600, 10))
 
     # 武器情報の表示
@@ -350,7 +350,7 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
                 if level_val >= MAX_WEAPON_LEVEL:
                     try:
                         badge_text = 'MAX'
-                        b_surf = small_font.render(badge_text, True, WHITE)
+                        b_surf = render_text(small_font, badge_text, WHITE)
                         bw = b_surf.get_width() + 8
                         bh = b_surf.get_height() + 4
                         bx = x + (icon_display_size - bw) // 2
@@ -360,7 +360,7 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
                     except Exception:
                         screen.blit(small_font.render('MAX', True, WHITE), (x, y + icon_display_size + 4))
                 else:
-                    lvl_text = small_font.render(str(level_val), True, WHITE)
+                    lvl_text = render_text(small_font, str(level_val), WHITE)
                     tx = x + (icon_display_size - lvl_text.get_width()) // 2
                     ty = y + icon_display_size + 4
                     screen.blit(lvl_text, (tx, ty))
@@ -411,7 +411,7 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
                 try:
                     if lvl_val >= MAX_SUBITEM_LEVEL:
                         badge_text = 'MAX'
-                        b_surf = small_font.render(badge_text, True, WHITE)
+                        b_surf = render_text(small_font, badge_text, WHITE)
                         bw = b_surf.get_width() + 8
                         bh = b_surf.get_height() + 4
                         bx = x + (sub_icon_size - bw) // 2
@@ -419,7 +419,7 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
                         pygame.draw.rect(screen, (200,60,60), (bx, by, bw, bh), border_radius=4)
                         screen.blit(b_surf, (bx + (bw - b_surf.get_width())//2, by + (bh - b_surf.get_height())//2))
                     else:
-                        lvl_text = small_font.render(str(lvl_val), True, WHITE)
+                        lvl_text = render_text(small_font, str(lvl_val), WHITE)
                         tx = x + (sub_icon_size - lvl_text.get_width()) // 2
                         ty = y + sub_icon_size + 4
                         screen.blit(lvl_text, (tx, ty))
@@ -500,100 +500,44 @@ def draw_ui(screen, player, game_time, game_over, game_clear, damage_stats=None,
     except Exception:
         pass
 
-# --- ミニマップ機能を追加 ---
-def draw_minimap(screen, player, enemies, gems, items, camera_x=0, camera_y=0):
-    """右上にミニマップを描画する。プレイヤー・敵・ジェム・アイテム、カメラ範囲を表示する。
-    """
-    # ミニマップの最大サイズ
-    max_w = 220
-    max_h = 140
-    margin = 10
-
-    # スケールをワールドサイズに合わせて計算
-    scale_x = max_w / float(max(1, WORLD_WIDTH))
-    scale_y = max_h / float(max(1, WORLD_HEIGHT))
-    scale = min(scale_x, scale_y)
-    if scale <= 0:
-        return
-
-    map_w = int(WORLD_WIDTH * scale)
-    map_h = int(WORLD_HEIGHT * scale)
-    # 右上に配置
-    map_x = SCREEN_WIDTH - map_w - margin
-    map_y = margin
-
-    # 背景パネル（半透明）とマップ本体をキャッシュして再利用
-    panel_surf = get_panel_surf(map_w + 6, map_h + 6, radius=0, alpha=180)
-    # (panel_surf は黒ベースなのでブリット位置を微調整)
-    screen.blit(panel_surf, (map_x - 3, map_y - 3))
-    map_surf = get_minimap_surf(map_w, map_h, alpha=128)
-    screen.blit(map_surf, (map_x, map_y))
-    pygame.draw.rect(screen, WHITE, (map_x, map_y, map_w, map_h), 2)
-
-    def world_to_map(wx, wy):
-        mx = map_x + int(wx * scale)
-        my = map_y + int(wy * scale)
-        return mx, my
-
-    # 敵を点で描画（赤）
-    for e in enemies:
-        try:
-            ex, ey = world_to_map(e.x, e.y)
-            if hasattr(e, 'is_boss') and e.is_boss:
-                pygame.draw.rect(screen, PINK, (ex, ey, 4, 4))  # ボスは大きめ&ピンク
-            else:
-                pygame.draw.rect(screen, (200, 60, 60), (ex, ey, 3, 3))
-        except Exception:
-            pass
-
-    # 経験値ジェム（シアン）
-    for g in gems:
-        try:
-            gx, gy = world_to_map(g.x, g.y)
-            pygame.draw.rect(screen, CYAN, (gx, gy, 3, 3))
-        except Exception:
-            pass
-
-    # アイテム（黄色）"
-    for it in items:
-        try:
-            ix, iy = world_to_map(it.x, it.y)
-            pygame.draw.rect(screen, YELLOW, (ix, iy, 3, 3))
-        except Exception:
-            pass
-
-    # プレイヤー（緑）を大きめの円で描画
+def hud_state_key(player, game_time, game_over, game_clear, damage_stats=None, show_status=True, game_money=0, enemy_kill_stats=None, force_ended=False):
+    """draw_ui() の表示内容を決める値をまとめたキー（変わらなければ HUD を描き直さなくてよい）"""
     try:
-        px, py = world_to_map(player.x, player.y)
-        pygame.draw.circle(screen, GREEN, (px, py), 5)
-        pygame.draw.circle(screen, BLACK, (px, py), 6, 1)
+        key = [
+            int(getattr(player, 'hp', 0)), int(player.get_max_hp()),
+            getattr(player, 'level', 1), getattr(player, 'exp', 0), getattr(player, 'exp_to_next_level', 1),
+            game_money, int(game_time), bool(game_over), bool(game_clear), bool(force_ended), bool(show_status),
+            tuple((name, getattr(w, 'level', 1)) for name, w in player.weapons.items()),
+            tuple((name, getattr(s, 'level', 1)) for name, s in getattr(player, 'subitems', {}).items()),
+        ]
+        if show_status:
+            key.append((player.get_speed(), player.get_base_damage_bonus(), player.get_defense(),
+                        player.get_effect_range_multiplier(), player.get_effect_time_multiplier(),
+                        int(player.get_extra_projectiles())))
+        if game_over or game_clear:
+            key.append(tuple(sorted((damage_stats or {}).items())))
+            key.append(tuple(sorted((enemy_kill_stats or {}).items())))
+        return tuple(key)
     except Exception:
-        pass
+        # 値が取れない場合は毎フレーム描き直す
+        return None
 
-    # カメラの表示領域を矩形で描画（白の半透明枠）
-    try:
-        vx = int(camera_x * scale)
-        vy = int(camera_y * scale)
-        vw = max(1, int(SCREEN_WIDTH * scale))
-        vh = max(1, int(SCREEN_HEIGHT * scale))
-        cam_rect = pygame.Rect(map_x + vx, map_y + vy, vw, vh)
-        # 半透明の塗りで視認性を上げる
-        s = pygame.Surface((cam_rect.width, cam_rect.height), pygame.SRCALPHA)
-        s.fill((255, 255, 255, 32))
-        screen.blit(s, (cam_rect.x, cam_rect.y))
-        pygame.draw.rect(screen, WHITE, cam_rect, 1)
-    except Exception:
-        pass
+# --- ミニマップ機能を追加 ---
+_minimap = None
 
-    # 小さな凡例を追加
-    try:
-        legend_x = map_x
-        legend_y = map_y + map_h + 6
-        font = get_font(14)
-        screen.blit(font.render('P: Player', True, WHITE), (legend_x, legend_y))
-        screen.blit(font.render('E: Enemy', True, (200,60,60)), (legend_x + 80, legend_y))
-    except Exception:
-        pass
+def draw_minimap(screen, player, enemies, gems, items, camera_x=0, camera_y=0, refresh_hz=None):
+    """右上にミニマップを描画する。プレイヤー・敵・ジェム・アイテム、カメラ範囲を表示する。
+
+    敵・ジェム・アイテムの点は MINIMAP_REFRESH_HZ（refresh_hz を渡した場合はその値）の頻度で
+    まとめてラスタライズする（ui.minimap）。
+    """
+    global _minimap
+    if _minimap is None:
+        from ui.minimap import MinimapRenderer
+        _minimap = MinimapRenderer()
+    if refresh_hz is not None:
+        _minimap.set_refresh_hz(refresh_hz)
+    _minimap.draw(screen, player, enemies, gems, items, camera_x, camera_y)
 
 def draw_background(screen, camera_x=0, camera_y=0):
     """暗めのグレーのタイル状背景を描画する簡易グリッド（ワールド座標に対応）。
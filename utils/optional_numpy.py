@@ -0,0 +1,17 @@
+"""
+numpy の任意インポート
+
+numpy はベクトル化した高速パスにだけ使う任意依存。インストールされていない環境では
+np = None / NUMPY_AVAILABLE = False となり、各モジュールは従来の 1 件ずつの処理に戻る。
+"""
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    print("[WARNING] numpy not available - vectorized paths fall back to per-object updates")
+
+
+__all__ = ['np', 'NUMPY_AVAILABLE']
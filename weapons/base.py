@@ -1,4 +1,4 @@
-import pygame
+from systems import game_clock
 
 class Weapon:
     def __init__(self):
@@ -10,11 +10,11 @@ class Weapon:
         self.damage = 5
 
     def can_attack(self):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         return current_time - self.last_attack_time >= self.cooldown
 
     def update_cooldown(self):
-        self.last_attack_time = pygame.time.get_ticks()
+        self.last_attack_time = game_clock.get_ticks()
 
     def get_upgrade_text(self):
         return f"Level {self.level} -> {self.level + 1}\nDamage: {self.damage:.1f} -> {self.damage * 1.2:.1f}"
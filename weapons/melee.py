@@ -2,6 +2,7 @@ import pygame
 import math
 from weapons.base import Weapon  # 相対インポートを絶対インポートに変更
 from constants import *
+from systems import game_clock
 from effects.attack import Attack  # 相対インポートを絶対インポートに変更
 
 class Whip(Weapon):
@@ -21,7 +22,7 @@ class Whip(Weapon):
         self.is_attacking = False
 
     def attack(self, player, camera_x=0, camera_y=0, get_virtual_mouse_pos=None):
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         
         if not self.can_attack():
             return []